@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+PISES New Campus – Budget Calibration
+The unit price book sums to ~SAR 260M while the project envelope is SAR 250M:
+COST_PER_BUA_M2 is derived from the round TOTAL_BUA (52,400 m²), but units are
+grossed with per-row factors, so their BUA adds up to more than that.
+
+This solves for the effective cost per m² BUA (one rate, or one per grossing
+class) at which the price book hits a target envelope exactly, with every
+unit price still in whole SAR:
+
+  1. Closed form – with b_i = NET_i × GF_i and B = Σ qty_i × b_i, the exact
+     price is target × b_i / B. This is done in integer arithmetic
+     (NET and GF as 0.01 fixed point), vectorised over all units.
+  2. Rounding repair – prices are floored, and the shortfall (< Σ qty) is
+     recovered by rounding up units in order of largest remainder, skipping
+     any whose qty would overshoot. This is largest-remainder allocation
+     weighted by quantity.
+
+Nothing is cached, so re-solving after UNITS changes is just another call
+(well under a millisecond for the campus price book).
+
+Usage:
+  python budget_calibration.py [--target SAR]
+"""
+
+import argparse
+
+import numpy as np
+
+from money import FIXED_SCALE, checked_product, fixed
+
+
+class CalibrationError(ValueError):
+    """The target cannot be met exactly in whole-SAR unit prices."""
+
+
+def _solve(qty, bua, target):
+    """Whole-SAR prices with Σ qty × price == target. bua is fixed-point int64."""
+    total_bua = int((qty * bua).sum())
+    if total_bua == 0:
+        raise CalibrationError("no BUA to price")
+    prices, rems = np.divmod(checked_product(bua, target), total_bua)
+    shortfall = target - int((qty * prices).sum())
+    # Largest remainder first; ties go to the earlier unit
+    for i in np.lexsort((np.arange(len(rems)), -rems)):
+        if shortfall == 0:
+            break
+        if qty[i] <= shortfall:
+            prices[i] += 1
+            shortfall -= int(qty[i])
+    if shortfall:
+        raise CalibrationError(f"cannot place the last SAR {shortfall:,} without overshooting")
+    return prices, target * FIXED_SCALE * FIXED_SCALE / total_bua
+
+
+def calibrate(qty, net_m2, factors, target_sar, classes=None, class_targets=None):
+    """Solve unit prices that sum (× qty) to target_sar exactly.
+
+    With class_targets ({class: SAR}) and a matching `classes` array, each
+    grossing class is solved to its own target and gets its own rate;
+    otherwise one rate applies to every unit. Every class present in
+    `classes` needs a target (CalibrationError otherwise).
+
+    Returns {"prices": int64 SAR per unit, "rates": {class or None: SAR/m² BUA},
+             "total": int}.
+    """
+    qty = np.asarray(qty, dtype=np.int64)
+    bua = fixed(net_m2) * fixed(factors)
+    prices = np.zeros_like(qty)
+    rates = {}
+    if class_targets is None:
+        prices, rates[None] = _solve(qty, bua, int(target_sar))
+    else:
+        classes = np.asarray(classes)
+        if classes.shape != qty.shape:
+            raise CalibrationError("classes must give one grossing class per unit")
+        missing = sorted(set(classes.tolist()) - set(class_targets))
+        if missing:
+            raise CalibrationError(f"no target for grossing class(es) {', '.join(map(str, missing))}")
+        if sum(class_targets.values()) != target_sar:
+            raise CalibrationError("class targets do not add up to the envelope")
+        for cls, cls_target in class_targets.items():
+            mask = classes == cls
+            prices[mask], rates[cls] = _solve(qty[mask], bua[mask], int(cls_target))
+    return {"prices": prices, "rates": rates, "total": int((qty * prices).sum())}
+
+
+if __name__ == "__main__":
+    from build_donor_pricing import UNITS, TOTAL_COST_SAR, COST_PER_BUA_M2, cost_per_unit
+
+    parser = argparse.ArgumentParser(description="Calibrate unit prices to a budget envelope")
+    parser.add_argument("--target", type=int, default=TOTAL_COST_SAR)
+    args = parser.parse_args()
+
+    rows = [u for u in UNITS if u[2] is not None]
+    qty = [u[2] for u in rows]
+    net = [u[3] for u in rows]
+    gf = [u[4] for u in rows]
+    current = [cost_per_unit(n, g) for n, g in zip(net, gf)]
+    result = calibrate(qty, net, gf, args.target)
+
+    print(f"Current price book: SAR {sum(q * c for q, c in zip(qty, current)):,} "
+          f"at SAR {COST_PER_BUA_M2:,.2f}/m² BUA")
+    print(f"Calibrated:         SAR {result['total']:,} (target SAR {args.target:,})")
+    print(f"Effective rate:     SAR {result['rates'][None]:,.2f}/m² BUA")
@@ -2,6 +2,18 @@
 """
 PISES New Campus – Ambassador Highlights Deck Generator
 Produces a 3-slide executive briefing PowerPoint for Embassy / SMC review.
+
+Usage:
+  python build_ambassador_deck.py [--students 6500]
+
+--students sets the design target (Scenario C, default 7,000). The adopted
+baseline – built-up area, the slide 3 cost options (SPEC_RATES × BUA) and the
+footprint / coverage line – is the price book's (PISES_Price_Book.sqlite), the
+same 52,400 m² the donor deck and workbook use. Capacity scenarios come from
+one Cost Simulator engine run (cost_engine.py): the slide 2 table, the
+classroom KPI and a separate engine Scenario C row in the cost table. The
+engine's classroom rules run ahead of the price book's hand-entered programme
+(see space_programme.py --compare).
 """
 
 from pptx import Presentation
@@ -9,8 +21,18 @@ from pptx.util import Inches, Pt, Emu
 from pptx.dml.color import RGBColor
 from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
 from pptx.enum.shapes import MSO_SHAPE
+import argparse
 import math
 
+import numpy as np
+
+import instrument
+import reproducible
+from cost_cube import PHASE_1_STUDENTS
+from cost_engine import NUM_FLOORS, SITE_AREA, recalc, section_totals
+from price_book import load_model
+from space_programme import DESIGN_STUDENTS
+
 # ─────────────────────────────────────────────────────────────────────────────
 # COLOUR PALETTE (Pakistan flag inspired + institutional)
 # ─────────────────────────────────────────────────────────────────────────────
@@ -27,6 +49,23 @@ ROW_ALT      = RGBColor(0xE8, 0xF5, 0xE9)
 ACCENT_RED   = RGBColor(0xC6, 0x28, 0x28)
 BLUE_ACCENT  = RGBColor(0x1B, 0x5E, 0x20)
 
+_parser = argparse.ArgumentParser(description="Build the ambassador highlights deck")
+_parser.add_argument("--students", type=int, default=None, help="design target for Scenario C (default 7,000)")
+_parser.add_argument("--output", default=None, help="deck path")
+_parser.add_argument("--reproducible", action="store_true",
+                     help="fixed timestamps / entry order and a .sha256 digest file")
+_parser.add_argument("--profile", action="store_true", help="print a timing summary and write a Chrome trace")
+_parser.add_argument("--profile-memory", action="store_true", help="--profile with tracemalloc peaks per slide")
+# Only a script run reads sys.argv; importing the module keeps the defaults
+if __name__ == "__main__":
+    _args = _parser.parse_args()
+    instrument.enable_from_argv()
+else:
+    _args = _parser.parse_args([])
+TARGET = _args.students or DESIGN_STUDENTS
+
+stage = instrument.stages("ambassador deck")
+stage.next("Setup")
 prs = Presentation()
 prs.slide_width  = Inches(16)
 prs.slide_height = Inches(9)
@@ -34,12 +73,14 @@ prs.slide_height = Inches(9)
 # ─────────────────────────────────────────────────────────────────────────────
 # HELPER FUNCTIONS
 # ─────────────────────────────────────────────────────────────────────────────
+@instrument.traced
 def add_bg(slide, color=DARK_GREEN):
     bg = slide.background
     fill = bg.fill
     fill.solid()
     fill.fore_color.rgb = color
 
+@instrument.traced
 def add_rect(slide, left, top, width, height, fill_color, line_color=None):
     shape = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, left, top, width, height)
     shape.fill.solid()
@@ -51,6 +92,7 @@ def add_rect(slide, left, top, width, height, fill_color, line_color=None):
         shape.line.fill.background()
     return shape
 
+@instrument.traced
 def add_text_box(slide, left, top, width, height, text, font_size=12,
                  bold=False, color=BLACK, alignment=PP_ALIGN.LEFT,
                  font_name='Calibri', line_spacing=1.0):
@@ -70,6 +112,7 @@ def add_text_box(slide, left, top, width, height, text, font_size=12,
         p.line_spacing = Pt(font_size * line_spacing)
     return txBox
 
+@instrument.traced
 def add_multiline_box(slide, left, top, width, height, lines, font_size=11,
                       color=BLACK, font_name='Calibri', alignment=PP_ALIGN.LEFT,
                       bold_first=False, line_spacing=1.15):
@@ -91,10 +134,12 @@ def add_multiline_box(slide, left, top, width, height, lines, font_size=11,
         p.line_spacing = Pt(font_size * line_spacing)
     return txBox
 
+@instrument.traced
 def add_table(slide, rows, cols, left, top, width, height):
     table_shape = slide.shapes.add_table(rows, cols, left, top, width, height)
     return table_shape.table
 
+@instrument.traced
 def style_header_cell(cell, text, font_size=9):
     cell.text = text
     cell.fill.solid()
@@ -107,6 +152,7 @@ def style_header_cell(cell, text, font_size=9):
         p.alignment = PP_ALIGN.CENTER
     cell.vertical_anchor = MSO_ANCHOR.MIDDLE
 
+@instrument.traced
 def style_data_cell(cell, text, font_size=8, bold=False, alignment=PP_ALIGN.CENTER,
                     fill_color=None, font_color=BLACK):
     cell.text = str(text)
@@ -121,13 +167,14 @@ def style_data_cell(cell, text, font_size=8, bold=False, alignment=PP_ALIGN.CENT
         p.alignment = alignment
     cell.vertical_anchor = MSO_ANCHOR.MIDDLE
 
+@instrument.traced
 def add_kpi_card(slide, left, top, width, height, label, value, sub="",
-                 bg_color=WHITE, value_color=DARK_GREEN, label_color=DARK_GREY):
+                 bg_color=WHITE, value_color=DARK_GREEN, label_color=DARK_GREY, value_size=22):
     shape = add_rect(slide, left, top, width, height, bg_color)
     shape.shadow.inherit = False
     # Value
     add_text_box(slide, left + Inches(0.15), top + Inches(0.12), width - Inches(0.3), Inches(0.55),
-                 value, font_size=22, bold=True, color=value_color, alignment=PP_ALIGN.CENTER)
+                 value, font_size=value_size, bold=True, color=value_color, alignment=PP_ALIGN.CENTER)
     # Label
     add_text_box(slide, left + Inches(0.15), top + Inches(0.62), width - Inches(0.3), Inches(0.35),
                  label, font_size=9, bold=False, color=label_color, alignment=PP_ALIGN.CENTER)
@@ -136,9 +183,81 @@ def add_kpi_card(slide, left, top, width, height, label, value, sub="",
                      sub, font_size=7, bold=False, color=MID_GREY, alignment=PP_ALIGN.CENTER)
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# CAPACITY SCENARIOS
+# ─────────────────────────────────────────────────────────────────────────────
+# Ratios from current: EY=15.2%, Primary=31.1%, Intermediate=39.0%, Secondary=14.7%
+scenarios = {
+    5500: {"label": "Scenario A\n5,500 Students"},
+    6000: {"label": "Scenario B\n6,000 Students"},
+    TARGET: {"label": f"Scenario C\n{TARGET:,} Students\n(BoD Target)"},
+}
+
+# Scenario figures come from the Cost Simulator engine (cost_engine.py), so
+# the deck and PISES_Cost_Simulator.html always agree
+SCENARIO_GROUPS = {
+    "teaching_net": ("CLASSROOMS",),
+    "labs_net": ("SCIENCE LABORATORIES", "COMPUTER & ICT LABS", "LEARNING RESOURCE CENTRES",
+                 "ARTS & MULTI-PURPOSE", "SPECIALIST STUDIOS"),
+    "support_net": ("SEN & WELLBEING", "STAFF & ADMIN", "IT & SECURITY", "TRANSPORT & OTHER"),
+    "shared_net": ("DINING & FOOD SERVICES", "SPORTS & PE (beyond TBC courts)", "OUTDOOR / COURTS",
+                   "AUDITORIUM & ASSEMBLY", "EXAM CENTRE"),
+}
+LAB_ROWS = ("SCIENCE LABORATORIES", "COMPUTER & ICT LABS")
+
+# Adopted baseline: the price book's built-up area (the SAR 250M envelope)
+BASELINE_BUA = load_model()["settings"]["total_bua"]
+BASELINE_FOOTPRINT = BASELINE_BUA / NUM_FLOORS
+
+# SAR per m² BUA (low, high) for each spec level; the mid level is the adopted
+# baseline used for every scenario's cost
+SPEC_RATES = {"minimum": (3910, 4200), "mid": (4580, 4960), "enhanced": (5150, 5630)}
+CONTINGENCY = (0.07, 0.10)
+
+
+def cost_range(bua, spec="mid"):
+    """(low, high) construction cost in SAR M for a BUA at one spec level."""
+    low, high = SPEC_RATES[spec]
+    return round(bua * low / 1e6), round(bua * high / 1e6)
+
+
+@instrument.traced
+def compute_scenarios(totals, rate_low=SPEC_RATES["mid"][0], rate_high=SPEC_RATES["mid"][1]):
+    """{students: scenario dict} for every total, in one batched engine call."""
+    r = recalc(students=np.array(totals))
+    nets = section_totals(r)
+    labs = sum(row["qty"] for row in r["tbc_rows"]
+               if row["section"] in LAB_ROWS and "Labs" in row["name"])
+    scenarios = {}
+    for i, total in enumerate(totals):
+        s = {key: int(r[src][i]) for key, src in (
+            ("ey", "ey"), ("pri", "pri"), ("inter", "int"), ("sec", "sec"),
+            ("ey_cls", "ey_cls"), ("pri_cls", "pri_cls"), ("inter_cls", "int_cls"),
+            ("sec_cls", "sec_cls"), ("total_cls", "total_cls"))}
+        for key, sections in SCENARIO_GROUPS.items():
+            s[key] = round(sum(float(nets[sec][i]) for sec in sections))
+        s["n_labs"] = int(labs[i])
+        s["total_net"] = round(float(r["grand_net"][i]))
+        s["total_gross"] = round(float(r["grand_bua"][i]))
+        s["footprint"] = round(float(r["footprint"][i]))
+        s["coverage"] = round(float(r["coverage"][i]))
+        s["cost_low"] = round(float(r["grand_bua"][i]) * rate_low / 1e6)
+        s["cost_high"] = round(float(r["grand_bua"][i]) * rate_high / 1e6)
+        scenarios[total] = s
+    return scenarios
+
+
+def compute_scenario(total):
+    return compute_scenarios([total])[total]
+
+_computed = compute_scenarios([5500, 6000, TARGET])
+s5500, s6000, s_target = _computed[5500], _computed[6000], _computed[TARGET]
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # SLIDE 1 – DESIGN FRAMEWORK & REGULATORY BASIS
 # ═══════════════════════════════════════════════════════════════════════════════
+stage.next("Slide 1")
 slide1 = prs.slides.add_slide(prs.slide_layouts[6])  # blank
 add_bg(slide1, WHITE)
 
@@ -159,23 +278,25 @@ add_text_box(slide1, Inches(12.5), Inches(0.55), Inches(3), Inches(0.4),
 # ── SECTION A: KPI CARDS ──
 kpi_y = Inches(1.4)
 kpi_h = Inches(1.15)
-kpi_w = Inches(2.15)
-gap = Inches(0.22)
+kpi_w = Inches(2.32)
+gap = Inches(0.2)
 start_x = Inches(0.5)
 
 kpis = [
     ("CATEGORY A", "TBC Classification", "Major Cities (Riyadh)"),
     ("4.8 m\u00b2/student", "Education Complex Baseline", "(K+Elem+Inter+Sec)/4"),
     ("25 students/class", "Max Classroom Capacity", "TBC Mandated Limit"),
-    ("~304 classrooms", "7,000-Student Model", "Gender-separated G2-G12"),
-    ("~52,400 m\u00b2", "Total Built-Up Area (BUA)", "NET 33,983 m\u00b2 \u00d7 Grossing"),
+    (f"~{s_target['total_cls']} classrooms", f"{TARGET:,}-Student Model", "Gender-separated G2-G12"),
+    (f"~{BASELINE_BUA:,} m\u00b2", "Total Built-Up Area (BUA)",
+     f"Adopted baseline  |  engine ~{round(s_target['total_gross'], -2):,} m\u00b2"),
     ("B + G + 2", "Building Configuration", "1 Basement + 3 Above Grade"),
 ]
 
 for i, (val, label, sub) in enumerate(kpis):
     x = start_x + i * (kpi_w + gap)
+    # 16pt keeps the longest value ("25 students/class") on one line
     add_kpi_card(slide1, x, kpi_y, kpi_w, kpi_h, label, val, sub,
-                 bg_color=RGBColor(0xF1, 0xF8, 0xE9))
+                 bg_color=RGBColor(0xF1, 0xF8, 0xE9), value_size=16)
 
 # ── SECTION B: TBC vs Non-TBC Requirements Matrix ──
 sec_b_y = Inches(2.85)
@@ -253,7 +374,7 @@ gf_lines = [
     "(K + Elem + Inter + Sec) \u00f7 4 = 4.8 m\u00b2/student",
     "(5.0 + 4.4 + 4.7 + 5.25) \u00f7 4 = 4.8375",
     "",
-    "Land Baseline: 4.8 m\u00b2 \u00d7 7,000 = 33,600 m\u00b2",
+    f"Land Baseline: 4.8 m\u00b2 \u00d7 {TARGET:,} = {round(4.8 * TARGET):,} m\u00b2",
 ]
 add_multiline_box(slide1, gf_x + Inches(0.12), rh_top + Inches(0.08),
                   Inches(3.35), Inches(1.85), gf_lines, font_size=8,
@@ -301,13 +422,14 @@ add_text_box(slide1, Inches(12), Inches(8.58), Inches(3.5), Inches(0.35),
 # ═══════════════════════════════════════════════════════════════════════════════
 # SLIDE 2 – CAPACITY SCENARIOS & AREA COMPUTATION
 # ═══════════════════════════════════════════════════════════════════════════════
+stage.next("Slide 2")
 slide2 = prs.slides.add_slide(prs.slide_layouts[6])
 add_bg(slide2, WHITE)
 
 # Top banner
 add_rect(slide2, Inches(0), Inches(0), Inches(16), Inches(1.15), DARK_GREEN)
 add_text_box(slide2, Inches(0.5), Inches(0.15), Inches(10), Inches(0.55),
-             "CAPACITY SCENARIOS  |  5,500 / 6,000 / 7,000 STUDENTS",
+             f"CAPACITY SCENARIOS  |  5,500 / 6,000 / {TARGET:,} STUDENTS",
              font_size=22, bold=True, color=WHITE)
 add_text_box(slide2, Inches(0.5), Inches(0.65), Inches(10), Inches(0.4),
              "Proportional Scaling from Actual Enrollment (5,263 current) to Design Targets  |  NET-First Model",
@@ -390,90 +512,13 @@ add_text_box(slide2, Inches(0.5), comp_y, Inches(15), Inches(0.3),
              "THREE-SCENARIO CAPACITY COMPARISON  |  NET-First Computation to BUA & Cost",
              font_size=12, bold=True, color=DARK_GREEN)
 
-# Compute scenarios
-# Ratios from current: EY=15.2%, Primary=31.1%, Intermediate=39.0%, Secondary=14.7%
-scenarios = {
-    5500: {"label": "Scenario A\n5,500 Students"},
-    6000: {"label": "Scenario B\n6,000 Students"},
-    7000: {"label": "Scenario C\n7,000 Students\n(BoD Target)"},
-}
-
-def compute_scenario(total):
-    ey = round(total * 0.152)
-    pri = round(total * 0.311)
-    inter = round(total * 0.390)
-    sec = total - ey - pri - inter
-
-    # Classrooms (25/class + 8% buffer)
-    ey_cls = math.ceil(ey / 22 * 1.08)  # EY smaller class sizes
-    pri_cls = math.ceil(pri / 25 * 1.08)
-    inter_cls = math.ceil(inter / 25 * 1.08)
-    sec_cls = math.ceil(sec / 25 * 1.08)
-    total_cls = ey_cls + pri_cls + inter_cls + sec_cls
-
-    # NET areas (from space program)
-    # Teaching: EY=62.5 avg, Primary=43.12, Inter/Sec=43.12
-    teaching_net = ey_cls * 55.0 + pri_cls * 43.12 + inter_cls * 43.12 + sec_cls * 43.12
-
-    # Labs: 1 per 10 classrooms, ~62 m² each
-    n_labs = math.ceil((pri_cls + inter_cls + sec_cls) / 10) * 2  # boys+girls
-    labs_net = n_labs * 65
-
-    # ICT labs
-    n_ict = math.ceil((pri_cls + inter_cls + sec_cls) / 15) * 2
-    ict_net = n_ict * 65
-
-    # Fixed shared facilities (scale slightly with student count)
-    scale = total / 7000
-    sen_net = round(736 * scale)
-    admin_net = round(672 * max(scale, 0.85))  # admin doesn't shrink much
-    staff_net = round(950 * scale)
-    it_ops_net = round(641 * max(scale, 0.85))
-    food_net = round(3380 * scale)
-    sports_net = round(3981 * max(scale, 0.8))
-    audit_commons_net = round(4070 * max(scale, 0.8))
-
-    total_net = teaching_net + labs_net + ict_net + sen_net + admin_net + staff_net + it_ops_net + food_net + sports_net + audit_commons_net
-
-    # Grossing
-    academic_gross = (teaching_net + labs_net + ict_net + sen_net + admin_net + staff_net) * 1.45
-    high_service_gross = (food_net + sports_net + audit_commons_net) * 1.65
-    ops_gross = it_ops_net * 1.55
-    total_gross = academic_gross + high_service_gross + ops_gross
-
-    # Cost (SAR 4,580-4,960 per m² all-in mid-level)
-    cost_low = round(total_gross * 4580 / 1e6)
-    cost_high = round(total_gross * 4960 / 1e6)
-
-    # Footprint
-    footprint = round(total_gross / 3)
-    coverage = round(footprint / 25000 * 100)
-
-    return {
-        "ey": ey, "pri": pri, "inter": inter, "sec": sec,
-        "ey_cls": ey_cls, "pri_cls": pri_cls, "inter_cls": inter_cls, "sec_cls": sec_cls,
-        "total_cls": total_cls,
-        "teaching_net": round(teaching_net),
-        "labs_net": labs_net + ict_net,
-        "support_net": sen_net + admin_net + staff_net + it_ops_net,
-        "shared_net": food_net + sports_net + audit_commons_net,
-        "total_net": round(total_net),
-        "total_gross": round(total_gross),
-        "footprint": footprint,
-        "coverage": coverage,
-        "cost_low": cost_low,
-        "cost_high": cost_high,
-    }
-
-s5500 = compute_scenario(5500)
-s6000 = compute_scenario(6000)
-s7000 = compute_scenario(7000)
-
 comp_tbl_top = comp_y + Inches(0.35)
-comp_tbl = add_table(slide2, 16, 5, Inches(0.5), comp_tbl_top, Inches(15), Inches(3.7))
+# One-line scenario headers keep the table clear of the footer band
+comp_tbl = add_table(slide2, 16, 5, Inches(0.5), comp_tbl_top, Inches(15), Inches(3.55))
 
 # Headers
-comp_headers = ["PARAMETER", "UNIT", "SCENARIO A\n5,500 Students", "SCENARIO B\n6,000 Students", "SCENARIO C\n7,000 Students\n(BoD Target)"]
+comp_headers = ["PARAMETER", "UNIT", "SCENARIO A  |  5,500 Students", "SCENARIO B  |  6,000 Students",
+                f"SCENARIO C  |  {TARGET:,} Students (BoD Target)"]
 for j, h in enumerate(comp_headers):
     style_header_cell(comp_tbl.cell(0, j), h, font_size=8)
 
@@ -485,24 +530,24 @@ def fmt_k(n):
 comp_data = [
     # STUDENTS
     ["STUDENT DISTRIBUTION", "", "", "", ""],
-    ["  Early Years (Nursery\u2013KG)", "students", str(s5500['ey']), str(s6000['ey']), str(s7000['ey'])],
-    ["  Primary (G1\u2013G4)", "students", str(s5500['pri']), str(s6000['pri']), str(s7000['pri'])],
-    ["  Intermediate (G5\u2013G9)", "students", str(s5500['inter']), str(s6000['inter']), str(s7000['inter'])],
-    ["  Secondary (G10\u2013G12)", "students", str(s5500['sec']), str(s6000['sec']), str(s7000['sec'])],
+    ["  Early Years (Nursery\u2013KG)", "students", str(s5500['ey']), str(s6000['ey']), str(s_target['ey'])],
+    ["  Primary (G1\u2013G4)", "students", str(s5500['pri']), str(s6000['pri']), str(s_target['pri'])],
+    ["  Intermediate (G5\u2013G9)", "students", str(s5500['inter']), str(s6000['inter']), str(s_target['inter'])],
+    ["  Secondary (G10\u2013G12)", "students", str(s5500['sec']), str(s6000['sec']), str(s_target['sec'])],
     # CLASSROOMS
-    ["TOTAL CLASSROOMS (incl. buffer)", "rooms", str(s5500['total_cls']), str(s6000['total_cls']), str(s7000['total_cls'])],
+    ["TOTAL CLASSROOMS (incl. buffer)", "rooms", str(s5500['total_cls']), str(s6000['total_cls']), str(s_target['total_cls'])],
     # AREAS
     ["AREA BUILD-UP", "", "", "", ""],
-    ["  Teaching Spaces NET", "m\u00b2", fmt_k(s5500['teaching_net']), fmt_k(s6000['teaching_net']), fmt_k(s7000['teaching_net'])],
-    ["  Labs & Specialist NET", "m\u00b2", fmt_k(s5500['labs_net']), fmt_k(s6000['labs_net']), fmt_k(s7000['labs_net'])],
-    ["  Support (SEN/Admin/Staff/IT)", "m\u00b2", fmt_k(s5500['support_net']), fmt_k(s6000['support_net']), fmt_k(s7000['support_net'])],
-    ["  Shared (Food/Sports/Audit)", "m\u00b2", fmt_k(s5500['shared_net']), fmt_k(s6000['shared_net']), fmt_k(s7000['shared_net'])],
-    ["  TOTAL NET AREA", "m\u00b2", fmt_k(s5500['total_net']), fmt_k(s6000['total_net']), fmt_k(s7000['total_net'])],
-    ["  TOTAL GROSS / BUA", "m\u00b2", fmt_k(s5500['total_gross']), fmt_k(s6000['total_gross']), fmt_k(s7000['total_gross'])],
+    ["  Teaching Spaces NET", "m\u00b2", fmt_k(s5500['teaching_net']), fmt_k(s6000['teaching_net']), fmt_k(s_target['teaching_net'])],
+    ["  Labs & Specialist NET", "m\u00b2", fmt_k(s5500['labs_net']), fmt_k(s6000['labs_net']), fmt_k(s_target['labs_net'])],
+    ["  Support (SEN/Admin/Staff/IT)", "m\u00b2", fmt_k(s5500['support_net']), fmt_k(s6000['support_net']), fmt_k(s_target['support_net'])],
+    ["  Shared (Food/Sports/Audit)", "m\u00b2", fmt_k(s5500['shared_net']), fmt_k(s6000['shared_net']), fmt_k(s_target['shared_net'])],
+    ["  TOTAL NET AREA", "m\u00b2", fmt_k(s5500['total_net']), fmt_k(s6000['total_net']), fmt_k(s_target['total_net'])],
+    ["  TOTAL GROSS / BUA", "m\u00b2", fmt_k(s5500['total_gross']), fmt_k(s6000['total_gross']), fmt_k(s_target['total_gross'])],
     # SITE
-    ["SITE COVERAGE (3 floors)", "%", f"{s5500['coverage']}%", f"{s6000['coverage']}%", f"{s7000['coverage']}%"],
+    ["SITE COVERAGE (3 floors)", "%", f"{s5500['coverage']}%", f"{s6000['coverage']}%", f"{s_target['coverage']}%"],
     # COST
-    ["EST. CONSTRUCTION COST (mid)", "SAR M", f"{s5500['cost_low']}\u2013{s5500['cost_high']}M", f"{s6000['cost_low']}\u2013{s6000['cost_high']}M", f"{s7000['cost_low']}\u2013{s7000['cost_high']}M"],
+    ["EST. CONSTRUCTION COST (mid)", "SAR M", f"{s5500['cost_low']}\u2013{s5500['cost_high']}M", f"{s6000['cost_low']}\u2013{s6000['cost_high']}M", f"{s_target['cost_low']}\u2013{s_target['cost_high']}M"],
 ]
 
 section_rows = [0, 6]  # rows that are section headers
@@ -543,6 +588,7 @@ add_text_box(slide2, Inches(12), Inches(8.58), Inches(3.5), Inches(0.35),
 # ═══════════════════════════════════════════════════════════════════════════════
 # SLIDE 3 – FACILITY REQUIREMENTS & TIMELINE
 # ═══════════════════════════════════════════════════════════════════════════════
+stage.next("Slide 3")
 slide3 = prs.slides.add_slide(prs.slide_layouts[6])
 add_bg(slide3, WHITE)
 
@@ -602,21 +648,18 @@ add_text_box(slide3, Inches(0.5), cls_y, Inches(8.5), Inches(0.3),
 cls_tbl_top = cls_y + Inches(0.3)
 cls_tbl = add_table(slide3, 7, 5, Inches(0.5), cls_tbl_top, Inches(8.8), Inches(2.45))
 
-cls_headers = ["Segment", "Metric", "5,500 Students", "6,000 Students", "7,000 Students"]
+cls_headers = ["Segment", "Metric", "5,500 Students", "6,000 Students", f"{TARGET:,} Students"]
 for j, h in enumerate(cls_headers):
     style_header_cell(cls_tbl.cell(0, j), h, font_size=7)
 
 # Recompute individual segment classrooms
 cls_data = [
-    ["Early Years", "Classrooms", str(s5500['ey_cls']), str(s6000['ey_cls']), str(s7000['ey_cls'])],
-    ["Primary (G1-G4)", "Classrooms", str(s5500['pri_cls']), str(s6000['pri_cls']), str(s7000['pri_cls'])],
-    ["Intermediate (G5-G9)", "Classrooms", str(s5500['inter_cls']), str(s6000['inter_cls']), str(s7000['inter_cls'])],
-    ["Secondary (G10-G12)", "Classrooms", str(s5500['sec_cls']), str(s6000['sec_cls']), str(s7000['sec_cls'])],
-    ["TOTAL CLASSROOMS", "Rooms", str(s5500['total_cls']), str(s6000['total_cls']), str(s7000['total_cls'])],
-    ["Science + ICT Labs", "Rooms",
-     str(math.ceil((s5500['pri_cls']+s5500['inter_cls']+s5500['sec_cls'])/10)*2 + math.ceil((s5500['pri_cls']+s5500['inter_cls']+s5500['sec_cls'])/15)*2),
-     str(math.ceil((s6000['pri_cls']+s6000['inter_cls']+s6000['sec_cls'])/10)*2 + math.ceil((s6000['pri_cls']+s6000['inter_cls']+s6000['sec_cls'])/15)*2),
-     str(math.ceil((s7000['pri_cls']+s7000['inter_cls']+s7000['sec_cls'])/10)*2 + math.ceil((s7000['pri_cls']+s7000['inter_cls']+s7000['sec_cls'])/15)*2)],
+    ["Early Years", "Classrooms", str(s5500['ey_cls']), str(s6000['ey_cls']), str(s_target['ey_cls'])],
+    ["Primary (G1-G4)", "Classrooms", str(s5500['pri_cls']), str(s6000['pri_cls']), str(s_target['pri_cls'])],
+    ["Intermediate (G5-G9)", "Classrooms", str(s5500['inter_cls']), str(s6000['inter_cls']), str(s_target['inter_cls'])],
+    ["Secondary (G10-G12)", "Classrooms", str(s5500['sec_cls']), str(s6000['sec_cls']), str(s_target['sec_cls'])],
+    ["TOTAL CLASSROOMS", "Rooms", str(s5500['total_cls']), str(s6000['total_cls']), str(s_target['total_cls'])],
+    ["Science + ICT Labs", "Rooms", str(s5500['n_labs']), str(s6000['n_labs']), str(s_target['n_labs'])],
 ]
 
 for i, row in enumerate(cls_data):
@@ -637,9 +680,10 @@ add_text_box(slide3, right_x, fac_y, Inches(6), Inches(0.3),
              "IMPLEMENTATION TIMELINE  |  DESIGN-BID-BUILD MODEL",
              font_size=11, bold=True, color=DARK_GREEN)
 
-# Timeline table
+# Timeline table (2.1" leaves the cost table and configuration callout clear
+# of the key assumptions band)
 tl_top = fac_y + Inches(0.35)
-tl_tbl = add_table(slide3, 9, 3, right_x, tl_top, Inches(5.8), Inches(2.9))
+tl_tbl = add_table(slide3, 9, 3, right_x, tl_top, Inches(5.8), Inches(2.1))
 
 tl_headers = ["Stage", "Duration", "Cumulative"]
 for j, h in enumerate(tl_headers):
@@ -669,23 +713,32 @@ for j, w in enumerate(tl_col_widths):
     tl_tbl.columns[j].width = w
 
 # ── Cost scenario comparison ──
-cost_y = tl_top + Inches(3.15)
+cost_y = tl_top + Inches(2.35)
 add_text_box(slide3, right_x, cost_y, Inches(5.8), Inches(0.3),
              "COST SCENARIO COMPARISON  (Excl. Land & Professional Fees)",
              font_size=10, bold=True, color=DARK_GREEN)
 
 cost_tbl_top = cost_y + Inches(0.3)
-cost_tbl = add_table(slide3, 5, 4, right_x, cost_tbl_top, Inches(5.8), Inches(1.8))
+cost_tbl = add_table(slide3, 6, 4, right_x, cost_tbl_top, Inches(5.8), Inches(2.1))
 
 cost_headers = ["Scenario", "Spec Level", "Est. Range (SAR)", "OPEX Profile"]
 for j, h in enumerate(cost_headers):
     style_header_cell(cost_tbl.cell(0, j), h, font_size=7)
 
+# Spec levels priced on the adopted baseline BUA; the last row is the engine's
+# Scenario C (slide 2) at the mid spec, shown alongside rather than adopted
+_ranges = {spec: cost_range(BASELINE_BUA, spec) for spec in SPEC_RATES}
+_contingency = (round(_ranges["mid"][0] * CONTINGENCY[0]), round(_ranges["enhanced"][1] * CONTINGENCY[1]))
 cost_data = [
-    ["Code Minimum", "VRF, reduced finish", "205\u2013220M", "HIGH"],
-    ["Mid-Institutional\n(Adopted Baseline)", "CHW HVAC, mid finish\nFull ICT, AV included", "240\u2013260M", "BALANCED"],
-    ["Enhanced Campus", "Premium facade, BMS\nAdvanced acoustics", "270\u2013295M", "LOW"],
-    ["+ Contingency (7\u201310%)", "\u2014", "+17\u201330M", "\u2014"],
+    ["Code Minimum", "VRF, reduced finish", "{}\u2013{}M".format(*_ranges["minimum"]), "HIGH"],
+    ["Mid-Institutional\n(Adopted Baseline)", "CHW HVAC, mid finish\nFull ICT, AV included",
+     "{}\u2013{}M".format(*_ranges["mid"]), "BALANCED"],
+    ["Enhanced Campus", "Premium facade, BMS\nAdvanced acoustics", "{}\u2013{}M".format(*_ranges["enhanced"]), "LOW"],
+    [f"+ Contingency ({CONTINGENCY[0] * 100:.0f}\u2013{CONTINGENCY[1]:.0%})", "\u2014",
+     "+{}\u2013{}M".format(*_contingency), "\u2014"],
+    [f"Engine Scenario C\n({TARGET:,} students)",
+     f"Mid spec on ~{round(s_target['total_gross'], -2):,} m\u00b2 BUA\n~{s_target['coverage']}% site coverage",
+     "{}\u2013{}M".format(*cost_range(s_target["total_gross"])), "\u2014"],
 ]
 
 for i, row in enumerate(cost_data):
@@ -703,13 +756,14 @@ for j, w in enumerate(cost_col_widths):
     cost_tbl.columns[j].width = w
 
 # ── Building Configuration callout ──
-config_y = cost_tbl_top + Inches(2.0)
+config_y = cost_tbl_top + Inches(2.2)
 add_rect(slide3, right_x, config_y, Inches(5.8), Inches(0.95), RGBColor(0xF1, 0xF8, 0xE9))
 config_lines = [
     "BUILDING CONFIGURATION:  Basement + Ground + Floor 1 + Floor 2  (B + G + 2)",
-    "Plot: 25,000 m\u00b2  |  Footprint: ~17,500 m\u00b2/floor  |  Site Coverage: ~70%  |  Urban high-density model",
+    f"Plot: {SITE_AREA:,} m\u00b2  |  Footprint: ~{round(BASELINE_FOOTPRINT, -2):,.0f} m\u00b2/floor  |  "
+    f"Site Coverage: ~{BASELINE_FOOTPRINT / SITE_AREA:.0%}  |  Urban high-density model",
     "Basement: Staff parking + MEP plant + Fire tanks + Storage  |  Above grade: Academic + Shared functions",
-    "Delivery: Traditional Design-Bid-Build  |  Phasing Option: Phase 1 (5,000 cap) + Phase 2 (2,000 expansion)",
+    f"Delivery: Traditional Design-Bid-Build  |  Phasing Option: Phase 1 ({PHASE_1_STUDENTS:,} cap) + Phase 2 ({TARGET - PHASE_1_STUDENTS:,} expansion)",
 ]
 add_multiline_box(slide3, right_x + Inches(0.15), config_y + Inches(0.08),
                   Inches(5.5), Inches(0.85), config_lines, font_size=7.5,
@@ -721,8 +775,8 @@ add_rect(slide3, Inches(0.5), ka_y, Inches(15), Inches(0.75), RGBColor(0xFB, 0xE
 ka_lines = [
     "KEY ASSUMPTIONS & NOTES FOR AMBASSADOR REVIEW:",
     "\u25cf All TBC-mandated areas comply with Category A (Riyadh) standards  |  \u25cf Max 25 students/classroom (TBC)  |  \u25cf Gender separation from Grade 2 per Saudi regulation",
-    "\u25cf Non-TBC items (SEN, Food, Sports, Auditorium) follow international best practice  |  \u25cf Costs are 2025 SAR planning estimates excl. land, fees & inflation  |  \u25cf 7,000 is design target; current enrollment = 5,263",
-    "\u25cf NET \u2192 GROSS factors: Academic 1.45\u00d7 / High-service 1.65\u00d7 / Ops 1.55\u00d7  |  \u25cf Structural & MEP designed for full 7,000 capacity regardless of phasing",
+    f"\u25cf Non-TBC items (SEN, Food, Sports, Auditorium) follow international best practice  |  \u25cf Costs are 2025 SAR planning estimates excl. land, fees & inflation  |  \u25cf {TARGET:,} is design target; current enrollment = 5,263",
+    f"\u25cf NET \u2192 GROSS factors: Academic 1.45\u00d7 / High-service 1.65\u00d7 / Ops 1.55\u00d7  |  \u25cf Structural & MEP designed for full {TARGET:,} capacity regardless of phasing",
 ]
 add_multiline_box(slide3, Inches(0.65), ka_y + Inches(0.05),
                   Inches(14.7), Inches(0.7), ka_lines, font_size=7,
@@ -741,8 +795,17 @@ add_text_box(slide3, Inches(12), Inches(8.58), Inches(3.5), Inches(0.35),
 # ═══════════════════════════════════════════════════════════════════════════════
 # SAVE
 # ═══════════════════════════════════════════════════════════════════════════════
-output_path = "/home/user/PISES/PISES_Ambassador_Highlights_Deck.pptx"
-prs.save(output_path)
+stage.next("Save")
+output_path = _args.output or "/home/user/PISES/PISES_Ambassador_Highlights_Deck.pptx"
+if _args.students is not None and not _args.output:
+    output_path = output_path.replace(".pptx", f"_{_args.students}.pptx")
+if _args.reproducible:
+    digest = reproducible.save(prs, output_path)
+else:
+    prs.save(output_path)
+stage.end()
 print(f"Deck saved to: {output_path}")
+if _args.reproducible:
+    print(f"SHA-256: {digest}")
 print(f"Slides: {len(prs.slides)}")
 print(f"Format: 16:9 widescreen (16\" x 9\")")
@@ -9,8 +9,14 @@ Based on:
   - Cost/m² BUA: ~SAR 4,771
   - Grossing factors: Academic 1.45×, High-Service 1.65×, Operations 1.55×
   - 1 USD = 3.75 SAR
+  - Extra currency columns from the FX snapshot (PISES_FX_Snapshot.json)
+
+Units, packages and the figures above are read from PISES_Price_Book.sqlite
+(see price_book.py).
 """
 
+import argparse
+
 import openpyxl
 from openpyxl.styles import (
     Font, PatternFill, Alignment, Border, Side, numbers
@@ -18,16 +24,29 @@ from openpyxl.styles import (
 from openpyxl.utils import get_column_letter
 from copy import copy
 
+import instrument
+import reproducible
+from budget_calibration import calibrate
+from cost_cube import DIMENSION_LABELS, build_cube, pledged_quantities
+from escalation import base_year, escalated_prices
+from fx import convert_matrix, currency_set, load_snapshot, rate_label
+from money import allocate, convert, percent_shares, sar, to_sar, unit_costs
+from price_book import load_model, legacy_units, legacy_packages, unit_classes
+from space_programme import DESIGN_STUDENTS, Programme
+
+PRICE_BOOK = load_model()
+
 # ── Constants ──────────────────────────────────────────────────────────────
-TOTAL_COST_SAR = 250_000_000
-TOTAL_BUA = 52_400
+TOTAL_COST_SAR = PRICE_BOOK["settings"]["total_cost_sar"]
+TOTAL_BUA = PRICE_BOOK["settings"]["total_bua"]
 COST_PER_BUA_M2 = TOTAL_COST_SAR / TOTAL_BUA  # ~4,771
-SAR_TO_USD = 1 / 3.75
+SAR_PER_USD = PRICE_BOOK["settings"]["sar_per_usd"]
+SAR_TO_USD = 1 / SAR_PER_USD
 
 # Grossing factors (NET → BUA)
-GF_ACADEMIC = 1.45
-GF_HIGH_SERVICE = 1.65
-GF_OPERATIONS = 1.55
+GF_ACADEMIC = PRICE_BOOK["grossing"]["academic"]
+GF_HIGH_SERVICE = PRICE_BOOK["grossing"]["high_service"]
+GF_OPERATIONS = PRICE_BOOK["grossing"]["operations"]
 
 # ── Styles ─────────────────────────────────────────────────────────────────
 DARK_GREEN = "1B5E20"
@@ -64,309 +83,83 @@ alt_row_fill = PatternFill(start_color=LIGHT_GRAY, end_color=LIGHT_GRAY, fill_ty
 
 def cost_per_unit(net_m2, grossing_factor):
     """Calculate construction cost for one unit given NET area and grossing factor."""
-    bua = net_m2 * grossing_factor
-    return round(bua * COST_PER_BUA_M2)
+    return int(to_sar(unit_costs(net_m2, grossing_factor, TOTAL_COST_SAR, TOTAL_BUA)))
 
 
-def usd(sar):
-    return round(sar * SAR_TO_USD)
+def usd(amount_sar):
+    return int(convert(sar(amount_sar), SAR_PER_USD, quantum=100)) // 100
 
 
 # ── Unit Data ──────────────────────────────────────────────────────────────
-# Each tuple: (unit_name, description, qty, net_m2, grossing_factor, students_served_note)
-
-UNITS = [
-    # ── CLASSROOMS ─────────────────────────────────────────────────────
-    ("CLASSROOMS & TEACHING SPACES", None, None, None, None, None),
-    ("Standard Classroom (Grades 1–12)",
-     "Fully equipped classroom with smart board, furniture & AC for 25 students",
-     249, 43.12, GF_ACADEMIC, "25 students per classroom"),
-    ("Kindergarten Classroom",
-     "Purpose-built early-years classroom with play area, in-class washroom & learning corners",
-     26, 62.5, GF_ACADEMIC, "25 children per classroom"),
-    ("Nursery Activity Room",
-     "Safe, stimulating activity space for youngest learners with age-appropriate furniture",
-     9, 45.0, GF_ACADEMIC, "20–25 children per room"),
-    ("Nursery Bedroom / Rest Room",
-     "Dedicated rest area for nursery children with cots and soft furnishings",
-     9, 22.5, GF_ACADEMIC, "20–25 children per room"),
-    ("Reception Classroom",
-     "Transition classroom bridging nursery to KG with learning stations",
-     20, 62.5, GF_ACADEMIC, "25 children per classroom"),
-    ("Early Years Learning Commons",
-     "Shared indoor play and exploration zone for nursery & KG wings",
-     3, 120.0, GF_ACADEMIC, "150–200 children per commons"),
-    ("Primary Multi-Purpose Room",
-     "Flexible teaching space for group work, presentations & project-based learning",
-     4, 42.5, GF_ACADEMIC, "25–50 students per session"),
-
-    # ── SCIENCE LABS ───────────────────────────────────────────────────
-    ("SCIENCE LABORATORIES", None, None, None, None, None),
-    ("Primary Science Lab",
-     "Introductory science lab with demonstration bench, sinks & safety equipment",
-     13, 60.1, GF_HIGH_SERVICE, "25 students per lab session"),
-    ("Intermediate Science Lab",
-     "General science lab with individual workstations, gas taps & fume extraction",
-     7, 62.96, GF_HIGH_SERVICE, "25 students per lab session"),
-    ("Secondary Science Lab (Physics / Chemistry / Biology)",
-     "Specialist lab with discipline-specific equipment, data-logging & safety systems",
-     12, 69.9, GF_HIGH_SERVICE, "25 students per lab session"),
-    ("Science Prep Room",
-     "Secure preparation and storage area serving a cluster of science labs",
-     6, 18.0, GF_HIGH_SERVICE, "Supports 2–3 labs each"),
-    ("Chemical Storage Room",
-     "Ventilated, fire-rated chemical store with bunding & safety shower",
-     2, 12.0, GF_HIGH_SERVICE, "Supports all secondary labs"),
-
-    # ── ICT & COMPUTER LABS ────────────────────────────────────────────
-    ("COMPUTER & ICT LABS", None, None, None, None, None),
-    ("Primary Computer / Language Lab",
-     "Age-appropriate computing lab with tablets/PCs and language learning software",
-     6, 60.1, GF_HIGH_SERVICE, "25 students per session"),
-    ("Secondary Computer / Language Lab",
-     "Full ICT suite with desktop PCs, coding stations & language lab capability",
-     10, 69.9, GF_HIGH_SERVICE, "25 students per session"),
-
-    # ── SPECIALIST STUDIOS ─────────────────────────────────────────────
-    ("SPECIALIST STUDIOS & MAKER SPACES", None, None, None, None, None),
-    ("Maker / Robotics Lab",
-     "Innovation hub with 3D printers, robotics kits, electronics workbenches",
-     2, 120.0, GF_HIGH_SERVICE, "25 students per session"),
-    ("Art Studio",
-     "Creative space with easels, kiln access, wet & dry zones, natural lighting",
-     2, 90.0, GF_HIGH_SERVICE, "25 students per session"),
-    ("Primary Art Atelier",
-     "Hands-on art workshop for younger students with washable materials & display areas",
-     4, 41.9, GF_ACADEMIC, "25 students per session"),
-    ("Music / Drama Room",
-     "Acoustically treated performance & rehearsal space with instrument storage",
-     2, 80.0, GF_HIGH_SERVICE, "30–40 students per session"),
-
-    # ── LIBRARIES & LEARNING RESOURCE CENTRES ──────────────────────────
-    ("LIBRARIES & LEARNING RESOURCE CENTRES", None, None, None, None, None),
-    ("Primary Library / LRC",
-     "Welcoming reading space with age-graded book collections & storytelling area",
-     2, 75.1, GF_ACADEMIC, "40–60 students at a time"),
-    ("Intermediate LRC",
-     "Research-capable library with digital catalogue, reading nooks & group study",
-     2, 74.7, GF_ACADEMIC, "40–60 students at a time"),
-    ("Secondary LRC",
-     "Advanced learning resource centre with digital research stations & quiet study",
-     2, 88.6, GF_ACADEMIC, "50–70 students at a time"),
-
-    # ── SPORTS & PHYSICAL EDUCATION ────────────────────────────────────
-    ("SPORTS & PHYSICAL EDUCATION", None, None, None, None, None),
-    ("Indoor Multi-Purpose Sports Hall",
-     "Full-size covered hall for basketball, volleyball, badminton, futsal & events",
-     2, 900.0, GF_HIGH_SERVICE, "200+ students per day"),
-    ("25m Swimming Pool Complex",
-     "6-lane pool with filtration plant, changing facilities, lifeguard station & spectator area",
-     1, 1717.0, GF_HIGH_SERVICE, "300+ students per week"),
-    ("Sports Changing & Shower Room",
-     "Modern changing facility with lockers, showers & accessible cubicles",
-     4, 160.0, GF_HIGH_SERVICE, "30–40 users per session"),
-    ("Sports Storage Room",
-     "Secure storage for PE equipment, balls, mats & sports gear",
-     4, 25.0, GF_HIGH_SERVICE, "Supports all sports facilities"),
-    ("Outdoor Multi-Sport Court",
-     "Hard court for basketball, volleyball or tennis with line markings & lighting",
-     6, 450.0, GF_HIGH_SERVICE, "30–40 students per court"),
-
-    # ── DINING & FOOD SERVICES ─────────────────────────────────────────
-    ("DINING & FOOD SERVICES", None, None, None, None, None),
-    ("Dining Hall (700-seat, multi-shift)",
-     "Full-service dining hall with fixed seating, servery counter & acoustic treatment",
-     2, 1100.0, GF_HIGH_SERVICE, "700 students per sitting"),
-    ("Commercial Kitchen & Prep Area",
-     "Industrial kitchen with cooking stations, wash-up, cold rooms & dry stores",
-     2, 300.0, GF_HIGH_SERVICE, "Serves 3,500 meals per day each"),
-    ("Cold Room / Dry Store",
-     "Temperature-controlled food storage with shelving and inventory management",
-     4, 37.5, GF_OPERATIONS, "Supports kitchen operations"),
-
-    # ── AUDITORIUM & ASSEMBLY ──────────────────────────────────────────
-    ("AUDITORIUM & ASSEMBLY SPACES", None, None, None, None, None),
-    ("Auditorium (300 seats)",
-     "Tiered seating performance hall with stage, backstage, AV system & lighting rig",
-     1, 740.0, GF_HIGH_SERVICE, "300-seat events, assemblies, graduations"),
-    ("Atrium / Learning Commons",
-     "Grand central gathering space for exhibitions, fairs, assemblies & informal learning",
-     1, 2000.0, GF_HIGH_SERVICE, "2,000+ students for whole-school events"),
-    ("Seminar Room",
-     "Flexible meeting/teaching space for workshops, parent meetings & PD sessions",
-     4, 45.0, GF_ACADEMIC, "20–30 attendees per room"),
-    ("Breakout Room (Glass-walled)",
-     "Small collaborative space for group work, tutoring & student projects",
-     8, 25.0, GF_ACADEMIC, "6–10 students per room"),
-
-    # ── EXAM CENTRE ────────────────────────────────────────────────────
-    ("EXAM CENTRE", None, None, None, None, None),
-    ("Exam Hall (300 candidates)",
-     "Dedicated examination hall with individual desks, invigilator stations & CCTV",
-     1, 750.0, GF_ACADEMIC, "300 candidates per session"),
-    ("Candidate Holding Room",
-     "Waiting area for students before exams with seating and bag storage",
-     2, 60.0, GF_ACADEMIC, "150 students per room"),
-
-    # ── SEN & WELLBEING ────────────────────────────────────────────────
-    ("SEN & STUDENT WELLBEING", None, None, None, None, None),
-    ("SEN Resource Room (Small Group)",
-     "Specialist learning room for small-group interventions and differentiated support",
-     10, 25.0, GF_ACADEMIC, "4–8 students per session"),
-    ("1:1 Assessment Room",
-     "Private room for individual assessments, educational psychologist evaluations",
-     8, 12.0, GF_ACADEMIC, "1 student at a time"),
-    ("Speech & Language Therapy Room",
-     "Equipped therapy space for speech-language pathologists with AV tools",
-     4, 16.0, GF_ACADEMIC, "1–3 students per session"),
-    ("Occupational Therapy Room",
-     "Sensory-motor therapy space with specialist equipment and observation area",
-     2, 20.0, GF_ACADEMIC, "1–3 students per session"),
-    ("Sensory Room",
-     "Calming environment with sensory equipment for students with regulation needs",
-     2, 24.0, GF_ACADEMIC, "1–4 students per session"),
-    ("Counsellor Room",
-     "Private space for student counselling, pastoral care & parent consultations",
-     4, 12.0, GF_ACADEMIC, "1–2 students per session"),
-    ("Medical Clinic / Nurse Room",
-     "School clinic with examination bed, first-aid supplies & medication storage",
-     2, 20.0, GF_ACADEMIC, "All students in wing"),
-    ("Isolation / Rest Room (Medical)",
-     "Short-stay room for unwell students awaiting parent collection",
-     2, 10.0, GF_ACADEMIC, "1 student at a time"),
-
-    # ── STAFF & PROFESSIONAL DEVELOPMENT ───────────────────────────────
-    ("STAFF & PROFESSIONAL DEVELOPMENT", None, None, None, None, None),
-    ("Staff Workroom (Distributed)",
-     "Teacher planning & collaboration room with desks, printers & resources",
-     12, 45.0, GF_ACADEMIC, "8–12 staff per workroom"),
-    ("Staff Lounge",
-     "Comfortable break room for staff with kitchen, seating & relaxation area",
-     2, 90.0, GF_ACADEMIC, "40–60 staff per lounge"),
-    ("Teacher Training / PD Room",
-     "Professional development room with AV, flexible seating & workshop layout",
-     2, 45.0, GF_ACADEMIC, "30–40 staff per session"),
-
-    # ── ADMINISTRATION ─────────────────────────────────────────────────
-    ("ADMINISTRATION & GOVERNANCE", None, None, None, None, None),
-    ("Reception & Welcome Desk",
-     "Visitor reception with waiting area, security check-in & information display",
-     2, 25.0, GF_ACADEMIC, "Campus entrance"),
-    ("Principal's Office",
-     "Executive office for school principal with meeting area",
-     1, 20.0, GF_ACADEMIC, "School leadership"),
-    ("Admissions Office",
-     "Parent-facing admissions suite for enrollment, interviews & documentation",
-     2, 18.0, GF_ACADEMIC, "Handles 500+ applications/year"),
-    ("Finance & Cashier Office",
-     "Secure finance office with fee collection counter and record keeping",
-     2, 40.0, GF_ACADEMIC, "All financial operations"),
-    ("Board / SMC Meeting Room",
-     "Formal boardroom for governance meetings with AV and conferencing",
-     1, 30.0, GF_ACADEMIC, "12–20 board members"),
-    ("School Store / Bookshop",
-     "Retail space for books, stationery & school supplies",
-     1, 80.0, GF_ACADEMIC, "Serves all students"),
-    ("Uniform Shop",
-     "Dedicated retail space for school uniform fittings and sales",
-     1, 60.0, GF_ACADEMIC, "Serves all students"),
-
-    # ── IT & SECURITY ──────────────────────────────────────────────────
-    ("IT INFRASTRUCTURE & SECURITY", None, None, None, None, None),
-    ("Server Room / MDF",
-     "Climate-controlled data centre with rack servers, UPS & network backbone",
-     2, 20.0, GF_OPERATIONS, "Entire campus IT"),
-    ("Main Security Control Room (CCTV)",
-     "24/7 security monitoring centre with CCTV screens, access control & fire panel",
-     1, 20.0, GF_OPERATIONS, "Entire campus security"),
-    ("IT Helpdesk Office",
-     "Technical support hub for staff and student IT issues",
-     2, 18.0, GF_OPERATIONS, "All campus users"),
-
-    # ── TRANSPORT ──────────────────────────────────────────────────────
-    ("TRANSPORT & LOGISTICS", None, None, None, None, None),
-    ("Transport Office & Driver Lounge",
-     "Bus fleet management office with driver rest area, lockers & washrooms",
-     1, 43.0, GF_OPERATIONS, "70 buses, 2,400+ bus students"),
-
-    # ── PRAYER & SPIRITUAL ─────────────────────────────────────────────
-    ("PRAYER & SPIRITUAL SPACES", None, None, None, None, None),
-    ("Prayer Room / Musalla",
-     "Dedicated prayer space with ablution facilities, carpet & qibla marker",
-     4, 60.0, GF_ACADEMIC, "100–150 worshippers per room"),
-]
-
-# ── Donor Package Tiers ────────────────────────────────────────────────────
-PACKAGES = [
-    ("INDIVIDUAL IMPACT GIFTS", "SAR 50K – 500K", [
-        ("Name a Classroom", "Sponsor one standard classroom with naming recognition",
-         "Standard Classroom (Grades 1–12)", 1),
-        ("Equip a Science Lab", "Fund one fully-equipped primary science lab",
-         "Primary Science Lab", 1),
-        ("Build a Sensory Room", "Provide a calming sensory room for SEN students",
-         "Sensory Room", 1),
-        ("Sponsor a Library Corner", "Fund one primary library / LRC",
-         "Primary Library / LRC", 1),
-        ("Create an Art Atelier", "Build one primary art workshop for budding artists",
-         "Primary Art Atelier", 1),
-    ]),
-    ("MAJOR GIFTS", "SAR 500K – 5M", [
-        ("Robotics Innovation Hub", "Fund one maker/robotics lab for STEM education",
-         "Maker / Robotics Lab", 1),
-        ("Auditorium Naming", "Sponsor the 300-seat auditorium for school events",
-         "Auditorium (300 seats)", 1),
-        ("Sports Hall Sponsor", "Fund one indoor sports hall for 200+ students/day",
-         "Indoor Multi-Purpose Sports Hall", 1),
-        ("Dining Experience", "Sponsor one dining hall serving 700 students per sitting",
-         "Dining Hall (700-seat, multi-shift)", 1),
-        ("Classroom Block (10 rooms)", "Build a block of 10 classrooms for 250 students",
-         "Standard Classroom (Grades 1–12)", 10),
-    ]),
-    ("LANDMARK GIFTS", "SAR 5M+", [
-        ("Swimming Pool Complex", "Fund the entire 25m pool with all support facilities",
-         "25m Swimming Pool Complex", 1),
-        ("Exam Centre", "Sponsor the 300-candidate exam hall with holding rooms",
-         None, None),  # Custom calculation
-        ("Learning Commons & Atrium", "Fund the grand 2,000 m² central gathering space",
-         "Atrium / Learning Commons", 1),
-        ("Entire Early Years Wing", "Build all nursery & KG classrooms (55 rooms)",
-         None, None),  # Custom
-        ("Complete SEN Suite", "Fund the entire SEN & wellbeing department (34 rooms)",
-         None, None),  # Custom
-    ]),
+# Units and donor packages live in the price book (PISES_Price_Book.sqlite).
+# UNITS tuples: (unit_name, description, qty, net_m2, grossing_factor, students_served_note)
+# PACKAGES: (tier, range, [(package_name, description, impact, [(unit_name, qty)])])
+UNITS = legacy_units(PRICE_BOOK)
+PACKAGES = legacy_packages(PRICE_BOOK)
+
+# Pivot sheets cut from the cost cube: (sheet title, row dimension, column dimension)
+PIVOTS = [
+    ("Pivot – Category × Class", "category", "grossing_class"),
+    ("Pivot – Category × Phase", "category", "phase"),
+    ("Pivot – Floor × Phase", "floor", "phase"),
+    ("Pivot – Category × Funding", "category", "funded"),
 ]
 
 
-def build_workbook():
+def build_workbook(currencies="workbook", escalation_years=6, students=None, output_path=None,
+                   reproducible_output=False):
+    """Build the donor workbook.
+
+    currencies: FX snapshot set name or ISO code list for the extra columns.
+    escalation_years: number of years (from the price base) on the escalation sheet.
+    students: derive unit quantities for this capacity from the space
+              programme rules (space_programme.py) instead of the price book.
+    output_path: where to save (default /home/user/PISES/, named by capacity).
+    reproducible_output: byte-reproducible package plus a .sha256 digest file
+                         (reproducible.py).
+    """
+    if students is None:
+        campus_units = UNITS
+    else:
+        campus_units = Programme(students=students).units(UNITS)
+    capacity = f"{students or DESIGN_STUDENTS:,}"
+    output_suffix = "" if students is None else f"_{students}"
+    stage = instrument.stages("workbook")
+    stage.next("Setup")
     wb = openpyxl.Workbook()
+    fx_snapshot = load_snapshot()
+    fx_codes = currency_set(currencies, fx_snapshot)
 
     # ══════════════════════════════════════════════════════════════════════
     # SHEET 1: UNIT PRICING
     # ══════════════════════════════════════════════════════════════════════
+    stage.next("Unit Pricing")
     ws = wb.active
     ws.title = "Unit Pricing"
     ws.sheet_properties.tabColor = DARK_GREEN
 
     # Column widths
-    col_widths = [4, 42, 58, 8, 10, 12, 18, 18, 14, 14, 22]
+    col_widths = [4, 42, 58, 8, 10, 12, 18, 18, 14, 14, 22] + [16, 18] * len(fx_codes)
     for i, w in enumerate(col_widths, 1):
         ws.column_dimensions[get_column_letter(i)].width = w
+    last_col = len(col_widths)
+    last_letter = get_column_letter(last_col)
 
     # Title block
-    ws.merge_cells("B1:K1")
+    ws.merge_cells(f"B1:{last_letter}1")
     ws["B1"] = "PISES NEW CAMPUS — UNIT-BASED DONOR PRICING"
     ws["B1"].font = title_font
     ws["B1"].alignment = Alignment(vertical="center")
     ws.row_dimensions[1].height = 40
 
-    ws.merge_cells("B2:K2")
-    ws["B2"] = "Pakistan International School (English Section), Riyadh  |  7,000-Student Campus  |  SAR 250 Million Project  |  Prices in 2025 SAR"
+    ws.merge_cells(f"B2:{last_letter}2")
+    ws["B2"] = f"Pakistan International School (English Section), Riyadh  |  {capacity}-Student Campus  |  SAR 250 Million Project  |  Prices in 2025 SAR"
     ws["B2"].font = subtitle_font
     ws["B2"].alignment = Alignment(vertical="center")
     ws.row_dimensions[2].height = 25
 
-    ws.merge_cells("B3:K3")
-    ws["B3"] = "1 USD = 3.75 SAR  |  Prices include construction, MEP, fit-out, ICT & furniture  |  Excluding land, professional fees & inflation"
+    ws.merge_cells(f"B3:{last_letter}3")
+    ws["B3"] = f"{rate_label('USD', fx_snapshot)}  |  Prices include construction, MEP, fit-out, ICT & furniture  |  Excluding land, professional fees & inflation"
     ws["B3"].font = Font(name="Calibri", size=10, italic=True, color=MED_GRAY)
     ws.row_dimensions[3].height = 20
 
@@ -376,6 +169,8 @@ def build_workbook():
         "NET m²", "BUA m²", "Cost / Unit (SAR)", "Cost / Unit (USD)",
         "Total (SAR)", "Total (USD)", "Students Impacted"
     ]
+    for code in fx_codes:
+        headers += [f"Cost / Unit ({code})", f"Total ({code})"]
     for col_idx, h in enumerate(headers, 1):
         cell = ws.cell(row=5, column=col_idx, value=h)
         cell.font = header_font
@@ -389,18 +184,32 @@ def build_workbook():
     unit_lookup = {}  # For package sheet cross-reference
     grand_total_sar = 0
 
-    for entry in UNITS:
+    # Row totals in USD and other currencies are the converted unit price ×
+    # qty, so every row reads Qty × Cost / Unit.  The grand totals convert
+    # the SAR grand total once; the difference between the two is shown on
+    # its own currency rounding line rather than spread across the rows.
+    priced_rows = [cost_per_unit(net_m2, gf) * qty for _, _, qty, net_m2, gf, _ in campus_units if qty is not None]
+    usd_rounding = usd(sum(priced_rows))
+
+    # Other currencies: one matrix multiply for unit prices and one for the
+    # grand totals
+    unit_prices = [cost_per_unit(net_m2, gf) for _, _, qty, net_m2, gf, _ in campus_units if qty is not None]
+    fx_unit = convert_matrix(unit_prices, fx_codes, fx_snapshot)
+    fx_grand = convert_matrix([sum(priced_rows)], fx_codes, fx_snapshot)[0]
+    fx_rounding = [int(fx_grand[k]) for k in range(len(fx_codes))]
+
+    for entry in campus_units:
         name, desc, qty, net_m2, gf, students = entry
 
         if qty is None:
             # Category header row
-            ws.merge_cells(start_row=row, start_column=1, end_row=row, end_column=11)
+            ws.merge_cells(start_row=row, start_column=1, end_row=row, end_column=last_col)
             cell = ws.cell(row=row, column=1, value=name)
             cell.font = category_font
             cell.fill = category_fill
             cell.alignment = Alignment(vertical="center")
             cell.border = thin_border
-            for c in range(2, 12):
+            for c in range(2, last_col + 1):
                 ws.cell(row=row, column=c).fill = category_fill
                 ws.cell(row=row, column=c).border = thin_border
             ws.row_dimensions[row].height = 28
@@ -419,13 +228,19 @@ def build_workbook():
             "qty": qty,
         }
 
+        total_usd = usd(unit_cost_sar) * qty
+        usd_rounding -= total_usd
         values = [
             item_num, name, desc, qty,
             round(net_m2, 1), bua_m2,
             unit_cost_sar, usd(unit_cost_sar),
-            total_sar, usd(total_sar),
+            total_sar, total_usd,
             students
         ]
+        for k in range(len(fx_codes)):
+            total_fx = int(fx_unit[item_num - 1, k]) * qty
+            fx_rounding[k] -= total_fx
+            values += [int(fx_unit[item_num - 1, k]), total_fx]
 
         is_alt = (item_num % 2 == 0)
         for col_idx, val in enumerate(values, 1):
@@ -445,13 +260,28 @@ def build_workbook():
             elif col_idx in (5, 6):
                 cell.alignment = Alignment(horizontal="right", vertical="center")
                 cell.number_format = "#,##0.0"
-            elif col_idx in (7, 8, 9, 10):
+            elif col_idx in (7, 8, 9, 10) or col_idx > 11:
                 cell.alignment = Alignment(horizontal="right", vertical="center")
                 cell.number_format = "#,##0"
 
         ws.row_dimensions[row].height = 36
         row += 1
 
+    # Currency rounding row: converted grand total − sum of converted rows
+    ws.merge_cells(start_row=row, start_column=1, end_row=row, end_column=8)
+    cell = ws.cell(row=row, column=1, value="Currency rounding (converted grand total − sum of rows)")
+    cell.font = Font(name="Calibri", italic=True, size=10, color=MED_GRAY)
+    cell.alignment = Alignment(horizontal="right", vertical="center")
+    rounding_cells = [(9, 0), (10, usd_rounding)] + [(13 + 2 * k, fx_rounding[k]) for k in range(len(fx_codes))]
+    for col, val in rounding_cells:
+        cell = ws.cell(row=row, column=col, value=val)
+        cell.font = Font(name="Calibri", italic=True, size=10, color=MED_GRAY)
+        cell.number_format = "#,##0;-#,##0;–"
+        cell.alignment = Alignment(horizontal="right", vertical="center")
+    for c in range(1, last_col + 1):
+        ws.cell(row=row, column=c).border = thin_border
+    row += 1
+
     # Grand total row
     row += 1
     ws.merge_cells(start_row=row, start_column=1, end_row=row, end_column=8)
@@ -459,7 +289,7 @@ def build_workbook():
     cell.font = Font(name="Calibri", bold=True, size=12, color=WHITE)
     cell.fill = PatternFill(start_color=DARK_GREEN, end_color=DARK_GREEN, fill_type="solid")
     cell.alignment = Alignment(horizontal="right", vertical="center")
-    for c in range(1, 12):
+    for c in range(1, last_col + 1):
         ws.cell(row=row, column=c).fill = PatternFill(start_color=DARK_GREEN, end_color=DARK_GREEN, fill_type="solid")
         ws.cell(row=row, column=c).border = thin_border
         ws.cell(row=row, column=c).font = Font(name="Calibri", bold=True, size=12, color=WHITE)
@@ -468,6 +298,10 @@ def build_workbook():
     ws.cell(row=row, column=9).alignment = Alignment(horizontal="right", vertical="center")
     ws.cell(row=row, column=10, value=usd(grand_total_sar)).number_format = "#,##0"
     ws.cell(row=row, column=10).alignment = Alignment(horizontal="right", vertical="center")
+    for k in range(len(fx_codes)):
+        col = 13 + 2 * k
+        ws.cell(row=row, column=col, value=int(fx_grand[k])).number_format = "#,##0"
+        ws.cell(row=row, column=col).alignment = Alignment(horizontal="right", vertical="center")
     ws.row_dimensions[row].height = 30
 
     # Note rows
@@ -482,6 +316,10 @@ def build_workbook():
         "6. All facilities comply with Saudi Building Code 2024 and TBC Category A standards.",
         f"7. Grand total reflects sum of all individual units. Full campus cost: SAR 240–260 Million (mid-range: SAR 250M).",
     ]
+    if fx_codes:
+        notes.append(f"8. Other currencies at FX snapshot of {fx_snapshot['as_of']}: "
+                     + ", ".join(rate_label(c, fx_snapshot) for c in fx_codes)
+                     + ". Indicative only; pledges are fixed in SAR.")
     for note in notes:
         cell = ws.cell(row=row, column=2, value=note)
         if note == "NOTES:":
@@ -494,7 +332,7 @@ def build_workbook():
     ws.freeze_panes = "A6"
 
     # Print setup
-    ws.print_area = f"A1:K{row}"
+    ws.print_area = f"A1:{last_letter}{row}"
     ws.page_setup.orientation = "landscape"
     ws.page_setup.paperSize = ws.PAPERSIZE_A3
     ws.page_setup.fitToWidth = 1
@@ -502,51 +340,40 @@ def build_workbook():
     # ══════════════════════════════════════════════════════════════════════
     # SHEET 2: DONOR PACKAGES
     # ══════════════════════════════════════════════════════════════════════
+    stage.next("Donor Packages")
     ws2 = wb.create_sheet("Donor Packages")
     ws2.sheet_properties.tabColor = GOLD
 
-    col_widths2 = [4, 35, 55, 20, 20, 22]
+    col_widths2 = [4, 35, 55, 20, 20, 22] + [18] * len(fx_codes)
     for i, w in enumerate(col_widths2, 1):
         ws2.column_dimensions[get_column_letter(i)].width = w
+    last_col2 = len(col_widths2)
+    last_letter2 = get_column_letter(last_col2)
 
     # Title
-    ws2.merge_cells("B1:F1")
+    ws2.merge_cells(f"B1:{last_letter2}1")
     ws2["B1"] = "PISES NEW CAMPUS — DONOR PACKAGES"
     ws2["B1"].font = title_font
     ws2.row_dimensions[1].height = 40
 
-    ws2.merge_cells("B2:F2")
+    ws2.merge_cells(f"B2:{last_letter2}2")
     ws2["B2"] = "Suggested giving levels with naming recognition  |  All amounts in SAR & USD"
     ws2["B2"].font = subtitle_font
     ws2.row_dimensions[2].height = 25
 
-    # Custom cost calculations for special packages
-    exam_centre_cost = (cost_per_unit(750, GF_ACADEMIC) +
-                        2 * cost_per_unit(60, GF_ACADEMIC) +
-                        2 * cost_per_unit(25, GF_ACADEMIC))
-    ey_wing_cost = (9 * cost_per_unit(45, GF_ACADEMIC) +
-                    9 * cost_per_unit(22.5, GF_ACADEMIC) +
-                    20 * cost_per_unit(62.5, GF_ACADEMIC) +
-                    26 * cost_per_unit(62.5, GF_ACADEMIC) +
-                    3 * cost_per_unit(120, GF_ACADEMIC))
-    sen_suite_cost = (10 * cost_per_unit(25, GF_ACADEMIC) +
-                      8 * cost_per_unit(12, GF_ACADEMIC) +
-                      4 * cost_per_unit(16, GF_ACADEMIC) +
-                      2 * cost_per_unit(20, GF_ACADEMIC) +
-                      2 * cost_per_unit(24, GF_ACADEMIC) +
-                      4 * cost_per_unit(12, GF_ACADEMIC) +
-                      2 * cost_per_unit(20, GF_ACADEMIC) +
-                      2 * cost_per_unit(10, GF_ACADEMIC))
+    pkg_costs = {pkg_name: sum(unit_lookup[u]["unit_cost_sar"] * q for u, q in contents)
+                 for _, _, items in PACKAGES for pkg_name, _, _, contents in items}
+    pkg_fx = dict(zip(pkg_costs, convert_matrix(list(pkg_costs.values()), fx_codes, fx_snapshot)))
 
     pkg_row = 4
     for tier_name, tier_range, items in PACKAGES:
         # Tier header
-        ws2.merge_cells(start_row=pkg_row, start_column=1, end_row=pkg_row, end_column=6)
+        ws2.merge_cells(start_row=pkg_row, start_column=1, end_row=pkg_row, end_column=last_col2)
         cell = ws2.cell(row=pkg_row, column=1, value=f"{tier_name}  ({tier_range})")
         cell.font = Font(name="Calibri", bold=True, size=13, color=WHITE)
         cell.fill = PatternFill(start_color=MED_GREEN, end_color=MED_GREEN, fill_type="solid")
         cell.alignment = Alignment(vertical="center")
-        for c in range(1, 7):
+        for c in range(1, last_col2 + 1):
             ws2.cell(row=pkg_row, column=c).fill = PatternFill(start_color=MED_GREEN, end_color=MED_GREEN, fill_type="solid")
             ws2.cell(row=pkg_row, column=c).border = thin_border
         ws2.row_dimensions[pkg_row].height = 32
@@ -554,6 +381,7 @@ def build_workbook():
 
         # Sub-headers
         sub_headers = ["#", "Package Name", "What You Fund", "Amount (SAR)", "Amount (USD)", "Impact"]
+        sub_headers += [f"Amount ({code})" for code in fx_codes]
         for col_idx, h in enumerate(sub_headers, 1):
             cell = ws2.cell(row=pkg_row, column=col_idx, value=h)
             cell.font = Font(name="Calibri", bold=True, size=10, color=DARK_GREEN)
@@ -563,45 +391,11 @@ def build_workbook():
         ws2.row_dimensions[pkg_row].height = 24
         pkg_row += 1
 
-        for idx, (pkg_name, pkg_desc, ref_unit, ref_qty) in enumerate(items, 1):
-            # Calculate cost
-            if ref_unit and ref_unit in unit_lookup:
-                pkg_cost = unit_lookup[ref_unit]["unit_cost_sar"] * ref_qty
-                impact = f"{ref_qty * 25} students" if ref_qty > 1 else f"25 students"
-            elif pkg_name == "Exam Centre":
-                pkg_cost = exam_centre_cost
-                impact = "300 candidates/session"
-            elif pkg_name == "Entire Early Years Wing":
-                pkg_cost = ey_wing_cost
-                impact = "800+ young learners"
-            elif pkg_name == "Complete SEN Suite":
-                pkg_cost = sen_suite_cost
-                impact = "500+ students with special needs"
-            else:
-                pkg_cost = 0
-                impact = ""
-
-            # Special impact notes
-            if "Auditorium" in pkg_name:
-                impact = "300-seat events & graduations"
-            elif "Sports Hall" in pkg_name:
-                impact = "200+ students/day"
-            elif "Dining" in pkg_name:
-                impact = "700 students/sitting"
-            elif "Swimming" in pkg_name:
-                impact = "300+ students/week"
-            elif "Learning Commons" in pkg_name:
-                impact = "2,000+ for whole-school events"
-            elif "Robotics" in pkg_name:
-                impact = "STEM for 25 students/session"
-            elif "Sensory" in pkg_name:
-                impact = "Students with regulation needs"
-            elif "Library" in pkg_name:
-                impact = "40–60 students at a time"
-            elif "Art Atelier" in pkg_name:
-                impact = "25 young artists/session"
+        for idx, (pkg_name, pkg_desc, impact, contents) in enumerate(items, 1):
+            pkg_cost = pkg_costs[pkg_name]
 
             values = [idx, pkg_name, pkg_desc, pkg_cost, usd(pkg_cost), impact]
+            values += [int(v) for v in pkg_fx[pkg_name]]
             is_alt = (idx % 2 == 0)
             for col_idx, val in enumerate(values, 1):
                 cell = ws2.cell(row=pkg_row, column=col_idx, value=val)
@@ -611,7 +405,7 @@ def build_workbook():
                     cell.fill = alt_row_fill
                 if col_idx == 1:
                     cell.alignment = Alignment(horizontal="center", vertical="center")
-                elif col_idx in (4, 5):
+                elif col_idx in (4, 5) or col_idx > 6:
                     cell.alignment = Alignment(horizontal="right", vertical="center")
                     cell.number_format = "#,##0"
                 else:
@@ -644,6 +438,7 @@ def build_workbook():
     # ══════════════════════════════════════════════════════════════════════
     # SHEET 3: SUMMARY BY CATEGORY
     # ══════════════════════════════════════════════════════════════════════
+    stage.next("Category Summary")
     ws3 = wb.create_sheet("Category Summary")
     ws3.sheet_properties.tabColor = "1565C0"
 
@@ -657,35 +452,17 @@ def build_workbook():
     ws3.row_dimensions[1].height = 40
 
     ws3.merge_cells("B2:G2")
-    ws3["B2"] = "High-level overview for donor briefings  |  7,000-Student Campus"
+    ws3["B2"] = f"High-level overview for donor briefings  |  {capacity}-Student Campus"
     ws3["B2"].font = subtitle_font
     ws3.row_dimensions[2].height = 25
 
-    # Build category totals from UNITS data
+    # Category totals from the cost cube, which also feeds the pivot sheets
+    cube = build_cube(campus_units, PRICE_BOOK["settings"], unit_classes(PRICE_BOOK),
+                      funded=pledged_quantities(PRICE_BOOK))
     category_totals = []
-    current_cat = None
-    cat_units = 0
-    cat_net = 0.0
-    cat_cost = 0
-
-    for entry in UNITS:
-        name, desc, qty, net_m2, gf, students = entry
-        if qty is None:
-            # Save previous category
-            if current_cat:
-                category_totals.append((current_cat, cat_units, cat_net, cat_cost))
-            current_cat = name
-            cat_units = 0
-            cat_net = 0.0
-            cat_cost = 0
-        else:
-            cat_units += qty
-            cat_net += net_m2 * qty
-            cat_cost += cost_per_unit(net_m2, gf) * qty
-
-    # Don't forget last category
-    if current_cat:
-        category_totals.append((current_cat, cat_units, cat_net, cat_cost))
+    for cat_name in cube.members("category"):
+        totals = cube.get(category=cat_name)
+        category_totals.append((cat_name, totals["units"], totals["net_m2"], totals["cost_sar"]))
 
     # Headers
     sum_headers = ["#", "Category", "Units", "Total NET m²", "Total Cost (SAR)", "Total Cost (USD)", "% of Budget"]
@@ -699,10 +476,12 @@ def build_workbook():
 
     sum_row = 5
     overall_total = sum(c[3] for c in category_totals)
+    cat_costs = [c[3] for c in category_totals]
+    cat_usd = allocate(usd(overall_total), cat_costs)
+    cat_pct = percent_shares(cat_costs)
 
     for idx, (cat_name, units, net, cost) in enumerate(category_totals, 1):
-        pct = cost / overall_total * 100 if overall_total else 0
-        values = [idx, cat_name, units, round(net, 0), cost, usd(cost), round(pct, 1)]
+        values = [idx, cat_name, units, round(net, 0), cost, int(cat_usd[idx - 1]), float(cat_pct[idx - 1])]
         is_alt = (idx % 2 == 0)
         for col_idx, val in enumerate(values, 1):
             cell = ws3.cell(row=sum_row, column=col_idx, value=val)
@@ -747,6 +526,7 @@ def build_workbook():
     # ══════════════════════════════════════════════════════════════════════
     # SHEET 4: QUICK REFERENCE (Single page for donors)
     # ══════════════════════════════════════════════════════════════════════
+    stage.next("Quick Reference")
     ws4 = wb.create_sheet("Quick Reference")
     ws4.sheet_properties.tabColor = GOLD
 
@@ -835,15 +615,274 @@ def build_workbook():
 
     ws4.freeze_panes = "A4"
 
+    # ══════════════════════════════════════════════════════════════════════
+    # SHEET 5: BUDGET RECONCILIATION
+    # ══════════════════════════════════════════════════════════════════════
+    stage.next("Budget Reconciliation")
+    ws5 = wb.create_sheet("Budget Reconciliation")
+    ws5.sheet_properties.tabColor = "6A1B9A"
+    recon_fill = PatternFill(start_color="6A1B9A", end_color="6A1B9A", fill_type="solid")
+
+    col_widths5 = [4, 42, 8, 12, 18, 18, 18, 18, 16]
+    for i, w in enumerate(col_widths5, 1):
+        ws5.column_dimensions[get_column_letter(i)].width = w
+
+    unit_rows = [u for u in campus_units if u[2] is not None]
+    calib = calibrate([u[2] for u in unit_rows], [u[3] for u in unit_rows],
+                      [u[4] for u in unit_rows], TOTAL_COST_SAR)
+    calib_rate = calib["rates"][None]
+
+    ws5.merge_cells("B1:I1")
+    ws5["B1"] = "PISES NEW CAMPUS — BUDGET RECONCILIATION"
+    ws5["B1"].font = title_font
+    ws5.row_dimensions[1].height = 40
+
+    ws5.merge_cells("B2:I2")
+    ws5["B2"] = f"Unit prices calibrated to the SAR {TOTAL_COST_SAR / 1e6:,.0f}M envelope  |  Whole-SAR prices, exact total"
+    ws5["B2"].font = subtitle_font
+    ws5.row_dimensions[2].height = 25
+
+    recon_summary = [
+        ("Project envelope (SAR)", TOTAL_COST_SAR, "#,##0"),
+        ("Unit price book total (SAR)", grand_total_sar, "#,##0"),
+        ("Variance vs envelope (SAR)", grand_total_sar - TOTAL_COST_SAR, "#,##0;[Red]-#,##0"),
+        ("Derived cost / m² BUA (total cost ÷ total BUA)", COST_PER_BUA_M2, "#,##0.00"),
+        ("Calibrated cost / m² BUA", calib_rate, "#,##0.00"),
+    ]
+    rc_row = 4
+    for label, val, fmt in recon_summary:
+        ws5.cell(row=rc_row, column=2, value=label).font = Font(name="Calibri", size=11, color=DARK_GRAY)
+        ws5.cell(row=rc_row, column=2).border = thin_border
+        cell = ws5.cell(row=rc_row, column=3, value=val)
+        ws5.merge_cells(start_row=rc_row, start_column=3, end_row=rc_row, end_column=4)
+        cell.font = Font(name="Calibri", size=11, bold=True, color=DARK_GREEN)
+        cell.number_format = fmt
+        cell.alignment = Alignment(horizontal="right", vertical="center")
+        for c in range(3, 5):
+            ws5.cell(row=rc_row, column=c).border = thin_border
+        ws5.row_dimensions[rc_row].height = 22
+        rc_row += 1
+
+    rc_row += 1
+    recon_headers = ["#", "Unit Name", "Qty", "BUA m²", "Book Cost / Unit", "Calibrated / Unit",
+                     "Book Total (SAR)", "Calibrated Total (SAR)", "Δ Total (SAR)"]
+    for col_idx, h in enumerate(recon_headers, 1):
+        cell = ws5.cell(row=rc_row, column=col_idx, value=h)
+        cell.font = header_font
+        cell.fill = recon_fill
+        cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+        cell.border = thin_border
+    ws5.row_dimensions[rc_row].height = 30
+    header_row5 = rc_row
+    rc_row += 1
+
+    for idx, (name, desc, qty, net_m2, gf, students) in enumerate(unit_rows, 1):
+        book = cost_per_unit(net_m2, gf)
+        cal = int(calib["prices"][idx - 1])
+        values = [idx, name, qty, round(net_m2 * gf, 1), book, cal,
+                  book * qty, cal * qty, (cal - book) * qty]
+        is_alt = (idx % 2 == 0)
+        for col_idx, val in enumerate(values, 1):
+            cell = ws5.cell(row=rc_row, column=col_idx, value=val)
+            cell.font = data_font
+            cell.border = thin_border
+            if is_alt:
+                cell.fill = alt_row_fill
+            if col_idx in (1, 3):
+                cell.alignment = Alignment(horizontal="center", vertical="center")
+            elif col_idx == 2:
+                cell.alignment = Alignment(wrap_text=True, vertical="center")
+            else:
+                cell.alignment = Alignment(horizontal="right", vertical="center")
+                cell.number_format = "#,##0.0" if col_idx == 4 else "#,##0;[Red]-#,##0"
+        ws5.row_dimensions[rc_row].height = 20
+        rc_row += 1
+
+    rc_row += 1
+    ws5.merge_cells(start_row=rc_row, start_column=1, end_row=rc_row, end_column=6)
+    for c in range(1, 10):
+        ws5.cell(row=rc_row, column=c).fill = recon_fill
+        ws5.cell(row=rc_row, column=c).font = Font(name="Calibri", bold=True, size=11, color=WHITE)
+        ws5.cell(row=rc_row, column=c).border = thin_border
+    ws5.cell(row=rc_row, column=1, value="TOTAL").alignment = Alignment(horizontal="right", vertical="center")
+    for col_idx, val in ((7, grand_total_sar), (8, calib["total"]), (9, calib["total"] - grand_total_sar)):
+        ws5.cell(row=rc_row, column=col_idx, value=val).number_format = "#,##0;-#,##0"
+        ws5.cell(row=rc_row, column=col_idx).alignment = Alignment(horizontal="right", vertical="center")
+    ws5.row_dimensions[rc_row].height = 28
+
+    ws5.freeze_panes = ws5.cell(row=header_row5 + 1, column=1)
+
+    # ══════════════════════════════════════════════════════════════════════
+    # SHEET 6: ESCALATED PRICES (year-by-year)
+    # ══════════════════════════════════════════════════════════════════════
+    stage.next("Escalated Prices")
+    ws6 = wb.create_sheet("Escalated Prices")
+    ws6.sheet_properties.tabColor = "E65100"
+    esc_fill = PatternFill(start_color="E65100", end_color="E65100", fill_type="solid")
+
+    first_year = base_year(PRICE_BOOK)
+    years = list(range(first_year, first_year + escalation_years))
+    esc_prices = escalated_prices(PRICE_BOOK, years)
+    book_units = PRICE_BOOK["units"]
+    unit_qty = {u[0]: u[2] for u in campus_units}
+
+    col_widths6 = [4, 42, 8, 10] + [14] * len(years)
+    for i, w in enumerate(col_widths6, 1):
+        ws6.column_dimensions[get_column_letter(i)].width = w
+    last_letter6 = get_column_letter(len(col_widths6))
+
+    ws6.merge_cells(f"B1:{last_letter6}1")
+    ws6["B1"] = "PISES NEW CAMPUS — ESCALATED UNIT PRICES"
+    ws6["B1"].font = title_font
+    ws6.row_dimensions[1].height = 40
+
+    ws6.merge_cells(f"B2:{last_letter6}2")
+    ws6["B2"] = (f"Cost / unit (SAR) at 1 January of each year  |  {first_year} = price book base  |  "
+                 "Annual escalation by grossing class, with category overrides")
+    ws6["B2"].font = subtitle_font
+    ws6.row_dimensions[2].height = 25
+
+    esc_headers = ["#", "Unit Name", "Qty", "Esc. % / yr"] + [str(y) for y in years]
+    for col_idx, h in enumerate(esc_headers, 1):
+        cell = ws6.cell(row=4, column=col_idx, value=h)
+        cell.font = header_font
+        cell.fill = esc_fill
+        cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+        cell.border = thin_border
+    ws6.row_dimensions[4].height = 28
+
+    esc_row = 5
+    for idx, unit in enumerate(book_units, 1):
+        values = [idx, unit["name"], unit_qty[unit["name"]], round(unit["escalation_rate"] * 100, 2)]
+        values += [int(v) for v in esc_prices[idx - 1]]
+        is_alt = (idx % 2 == 0)
+        for col_idx, val in enumerate(values, 1):
+            cell = ws6.cell(row=esc_row, column=col_idx, value=val)
+            cell.font = data_font
+            cell.border = thin_border
+            if is_alt:
+                cell.fill = alt_row_fill
+            if col_idx in (1, 3):
+                cell.alignment = Alignment(horizontal="center", vertical="center")
+            elif col_idx == 2:
+                cell.alignment = Alignment(wrap_text=True, vertical="center")
+            elif col_idx == 4:
+                cell.alignment = Alignment(horizontal="center", vertical="center")
+                cell.number_format = "0.0"
+            else:
+                cell.alignment = Alignment(horizontal="right", vertical="center")
+                cell.number_format = "#,##0"
+        ws6.row_dimensions[esc_row].height = 20
+        esc_row += 1
+
+    esc_row += 1
+    esc_totals = [unit_qty[u["name"]] for u in book_units] @ esc_prices
+    ws6.merge_cells(start_row=esc_row, start_column=1, end_row=esc_row, end_column=4)
+    for c in range(1, len(col_widths6) + 1):
+        ws6.cell(row=esc_row, column=c).fill = esc_fill
+        ws6.cell(row=esc_row, column=c).font = Font(name="Calibri", bold=True, size=11, color=WHITE)
+        ws6.cell(row=esc_row, column=c).border = thin_border
+    ws6.cell(row=esc_row, column=1, value="ALL UNITS (qty × price)").alignment = Alignment(horizontal="right", vertical="center")
+    for k, total in enumerate(esc_totals):
+        ws6.cell(row=esc_row, column=5 + k, value=int(total)).number_format = "#,##0"
+        ws6.cell(row=esc_row, column=5 + k).alignment = Alignment(horizontal="right", vertical="center")
+    ws6.row_dimensions[esc_row].height = 28
+
+    esc_row += 2
+    ws6.cell(row=esc_row, column=2,
+             value="Pledges dated between 1 January dates are priced with the index interpolated "
+                   "within the year (escalation.pledge_price).").font = Font(name="Calibri", size=9, color=MED_GRAY, italic=True)
+
+    ws6.freeze_panes = "C5"
+
+    # ══════════════════════════════════════════════════════════════════════
+    # SHEETS 7+: PIVOTS (cost cube cuts)
+    # ══════════════════════════════════════════════════════════════════════
+    pivot_fill = PatternFill(start_color="00695C", end_color="00695C", fill_type="solid")
+    for title, rows_dim, cols_dim in PIVOTS:
+        stage.next(title)
+        wsp = wb.create_sheet(title)
+        wsp.sheet_properties.tabColor = "00695C"
+        cols = cube.members(cols_dim)
+        col_widthsp = [40] + [16] * (len(cols) + 1)
+        for i, w in enumerate(col_widthsp, 1):
+            wsp.column_dimensions[get_column_letter(i)].width = w
+        last_letterp = get_column_letter(len(col_widthsp))
+
+        wsp.merge_cells(f"A1:{last_letterp}1")
+        wsp["A1"] = f"PISES NEW CAMPUS — {DIMENSION_LABELS[rows_dim].upper()} × {DIMENSION_LABELS[cols_dim].upper()}"
+        wsp["A1"].font = title_font
+        wsp.row_dimensions[1].height = 40
+        wsp.merge_cells(f"A2:{last_letterp}2")
+        wsp["A2"] = (f"{capacity}-Student Campus  |  Phase 1 = first 5,000 students, Phase 2 = expansion  |  "
+                     "Funded = covered by recorded pledges")
+        wsp["A2"].font = subtitle_font
+        wsp.row_dimensions[2].height = 25
+
+        pv_row = 4
+        for measure, label, fmt in (("cost_sar", "Cost (SAR)", "#,##0"), ("units", "Units", "#,##0"),
+                                    ("bua_m2", "BUA m²", "#,##0")):
+            table = cube.pivot(rows_dim, cols_dim, measure)
+            wsp.cell(row=pv_row, column=1, value=label).font = section_font
+            pv_row += 1
+            headers = [DIMENSION_LABELS[rows_dim]] + [str(c) for c in table["cols"]] + ["Total"]
+            for col_idx, h in enumerate(headers, 1):
+                cell = wsp.cell(row=pv_row, column=col_idx, value=h)
+                cell.font = header_font
+                cell.fill = pivot_fill
+                cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+                cell.border = thin_border
+            wsp.row_dimensions[pv_row].height = 24
+            pv_row += 1
+            body = [[str(r)] + values + [total]
+                    for r, values, total in zip(table["rows"], table["values"], table["row_totals"])]
+            for idx, values in enumerate(body + [["TOTAL"] + table["col_totals"] + [table["total"]]], 1):
+                is_total = idx > len(body)
+                for col_idx, val in enumerate(values, 1):
+                    cell = wsp.cell(row=pv_row, column=col_idx, value=val)
+                    cell.font = Font(name="Calibri", bold=True, size=10, color=DARK_GREEN) if is_total else data_font
+                    cell.border = thin_border
+                    if is_total:
+                        cell.fill = gold_fill
+                    elif idx % 2 == 0:
+                        cell.fill = alt_row_fill
+                    if col_idx == 1:
+                        cell.alignment = Alignment(wrap_text=True, vertical="center")
+                    else:
+                        cell.alignment = Alignment(horizontal="right", vertical="center")
+                        cell.number_format = fmt
+                pv_row += 1
+            pv_row += 1
+
+        wsp.freeze_panes = "B4"
+
     # ── Save ───────────────────────────────────────────────────────────
-    output_path = "/home/user/PISES/PISES_Donor_Unit_Pricing.xlsx"
-    wb.save(output_path)
+    output_path = output_path or f"/home/user/PISES/PISES_Donor_Unit_Pricing{output_suffix}.xlsx"
+    stage.next("Save")
+    if reproducible_output:
+        digest = reproducible.save(wb, output_path)
+    else:
+        wb.save(output_path)
+    stage.end()
     print(f"✓ Workbook saved: {output_path}")
+    if reproducible_output:
+        print(f"  SHA-256: {digest}")
     print(f"  Sheets: {wb.sheetnames}")
     print(f"  Grand total (all units): SAR {grand_total_sar:,.0f} / USD {usd(grand_total_sar):,.0f}")
     print(f"  Category summary total: SAR {overall_total:,.0f}")
+    print(f"  Calibrated to envelope: SAR {calib['total']:,} at SAR {calib_rate:,.2f}/m² BUA")
     return output_path
 
 
 if __name__ == "__main__":
-    build_workbook()
+    parser = argparse.ArgumentParser(description="Build the donor pricing workbook")
+    parser.add_argument("--students", type=int, default=None,
+                        help="derive quantities for this capacity (space_programme.py)")
+    parser.add_argument("--output", default=None, help="workbook path")
+    parser.add_argument("--reproducible", action="store_true",
+                        help="fixed timestamps / entry order and a .sha256 digest file")
+    parser.add_argument("--profile", action="store_true", help="print a timing summary and write a Chrome trace")
+    parser.add_argument("--profile-memory", action="store_true", help="--profile with tracemalloc peaks per sheet")
+    args = parser.parse_args()
+    instrument.enable_from_argv()
+    build_workbook(students=args.students, output_path=args.output, reproducible_output=args.reproducible)
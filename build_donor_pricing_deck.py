@@ -2,6 +2,15 @@
 """
 PISES New Campus – Donor Unit Pricing PowerPoint Deck Generator
 Produces a 5-slide executive donor briefing matching the xlsx data.
+
+Usage:
+  python build_donor_pricing_deck.py [--currency GBP] [--students 6000]
+
+SAR is always shown; --currency picks the second currency (default USD),
+converted with the FX snapshot in PISES_FX_Snapshot.json. --students derives
+the unit quantities for that capacity from the space programme rules
+(space_programme.py), as build_donor_pricing.py --students does for the
+workbook; without it the price book quantities are used.
 """
 
 from pptx import Presentation
@@ -9,8 +18,18 @@ from pptx.util import Inches, Pt, Emu
 from pptx.dml.color import RGBColor
 from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
 from pptx.enum.shapes import MSO_SHAPE
+import argparse
 import math
 
+import instrument
+import reproducible
+from cost_cube import build_cube
+from fx import convert as fx_convert, fmt_money, load_snapshot, rate_label
+from money import div_round, percent_shares
+from optimise_pptx import format_report, optimise_presentation
+from price_book import legacy_packages, legacy_units, load_model, unit_classes
+from space_programme import DESIGN_STUDENTS, Programme
+
 # ─────────────────────────────────────────────────────────────────────────────
 # COLOUR PALETTE
 # ─────────────────────────────────────────────────────────────────────────────
@@ -31,38 +50,71 @@ LIGHT_BG     = RGBColor(0xF1, 0xF8, 0xE9)
 BLUE_ACCENT  = RGBColor(0x15, 0x65, 0xC0)
 
 # ─────────────────────────────────────────────────────────────────────────────
-# CONSTANTS (from build_donor_pricing.py)
+# CONSTANTS (from the price book, as in build_donor_pricing.py)
 # ─────────────────────────────────────────────────────────────────────────────
-TOTAL_COST_SAR = 250_000_000
-TOTAL_BUA = 52_400
-COST_PER_BUA_M2 = TOTAL_COST_SAR / TOTAL_BUA
-SAR_TO_USD = 1 / 3.75
-GF_ACADEMIC = 1.45
-GF_HIGH_SERVICE = 1.65
-GF_OPERATIONS = 1.55
-
-def cost_per_unit(net_m2, gf):
-    return round(net_m2 * gf * COST_PER_BUA_M2)
-
-def usd(sar):
-    return round(sar * SAR_TO_USD)
+_PRICE_BOOK = load_model()
+PROJECT_COST_SAR = _PRICE_BOOK["settings"]["total_cost_sar"]
+PROJECT_BUA = _PRICE_BOOK["settings"]["total_bua"]
+COST_PER_BUA_M2 = int(div_round(PROJECT_COST_SAR, PROJECT_BUA))
+GROSSING = _PRICE_BOOK["grossing"]
+UNIT_COST = {u["name"]: u["unit_cost_sar"] for u in _PRICE_BOOK["units"]}
+
+def contents_cost(contents):
+    """SAR for [(unit name, qty)] at price book unit costs."""
+    return sum(UNIT_COST[name] * qty for name, qty in contents)
+
+# Second display currency (SAR is always shown)
+_parser = argparse.ArgumentParser(description="Build the donor pricing deck")
+_parser.add_argument("--currency", default="USD", choices=sorted(load_snapshot()["sar_per_unit"]))
+_parser.add_argument("--students", type=int, default=None,
+                     help="derive quantities for this capacity (space_programme.py)")
+_parser.add_argument("--output", default=None, help="deck path")
+_parser.add_argument("--reproducible", action="store_true",
+                     help="fixed timestamps / entry order and a .sha256 digest file")
+_parser.add_argument("--profile", action="store_true", help="print a timing summary and write a Chrome trace")
+_parser.add_argument("--profile-memory", action="store_true", help="--profile with tracemalloc peaks per slide")
+# Only a script run reads sys.argv; importing the module for its helpers keeps the defaults
+if __name__ == "__main__":
+    _args = _parser.parse_args()
+    instrument.enable_from_argv()
+else:
+    _args = _parser.parse_args([])
+DECK_CURRENCY = _args.currency
+STUDENTS = _args.students or DESIGN_STUDENTS
+
+def fx(sar):
+    return fx_convert(sar, DECK_CURRENCY)
 
 def fmt_sar(n):
     if n >= 1_000_000:
         return f"SAR {n/1_000_000:,.1f}M"
     return f"SAR {n:,.0f}"
 
-def fmt_usd(n):
-    if n >= 1_000_000:
-        return f"USD {n/1_000_000:,.1f}M"
-    return f"USD {n:,.0f}"
+def fmt_fx(n):
+    return fmt_money(n, DECK_CURRENCY)
 
 def fmt_both(sar):
-    return f"{fmt_sar(sar)} / {fmt_usd(usd(sar))}"
+    return f"{fmt_sar(sar)} / {fmt_fx(fx(sar))}"
+
+def fmt_sar_short(n):
+    """SAR 298K / SAR 13.5M (half-even, in integers)."""
+    if n >= 1_000_000:
+        tenths = int(div_round(n, 100_000))
+        return f"SAR {tenths // 10}.{tenths % 10}M"
+    return f"SAR {int(div_round(n, 1_000))}K"
+
+def thousands(n):
+    return int(div_round(n, 1_000)) * 1_000
+
+def fmt_band(sar):
+    """Quick-reference price: both currencies to the nearest thousand."""
+    return f"SAR {thousands(sar):,} / {DECK_CURRENCY} {thousands(fx(sar)):,}"
 
 # ─────────────────────────────────────────────────────────────────────────────
 # PRESENTATION SETUP
 # ─────────────────────────────────────────────────────────────────────────────
+stage = instrument.stages("donor deck")
+stage.next("Setup")
 prs = Presentation()
 prs.slide_width  = Inches(16)
 prs.slide_height = Inches(9)
@@ -71,11 +123,13 @@ TOTAL_SLIDES = 5
 # ─────────────────────────────────────────────────────────────────────────────
 # HELPERS
 # ─────────────────────────────────────────────────────────────────────────────
+@instrument.traced
 def add_bg(slide, color=DARK_GREEN):
     fill = slide.background.fill
     fill.solid()
     fill.fore_color.rgb = color
 
+@instrument.traced
 def add_rect(slide, left, top, width, height, fill_color, line_color=None):
     shape = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, left, top, width, height)
     shape.fill.solid()
@@ -87,6 +141,7 @@ def add_rect(slide, left, top, width, height, fill_color, line_color=None):
         shape.line.fill.background()
     return shape
 
+@instrument.traced
 def add_text_box(slide, left, top, width, height, text, font_size=12,
                  bold=False, color=BLACK, alignment=PP_ALIGN.LEFT,
                  font_name='Calibri'):
@@ -104,6 +159,7 @@ def add_text_box(slide, left, top, width, height, text, font_size=12,
     p.space_before = Pt(0)
     return txBox
 
+@instrument.traced
 def add_multiline_box(slide, left, top, width, height, lines, font_size=11,
                       color=BLACK, font_name='Calibri', alignment=PP_ALIGN.LEFT,
                       bold_first=False, line_spacing=1.15):
@@ -122,9 +178,11 @@ def add_multiline_box(slide, left, top, width, height, lines, font_size=11,
         p.line_spacing = Pt(font_size * line_spacing)
     return txBox
 
+@instrument.traced
 def add_table(slide, rows, cols, left, top, width, height):
     return slide.shapes.add_table(rows, cols, left, top, width, height).table
 
+@instrument.traced
 def style_header_cell(cell, text, font_size=9):
     cell.text = text
     cell.fill.solid()
@@ -137,6 +195,7 @@ def style_header_cell(cell, text, font_size=9):
         p.alignment = PP_ALIGN.CENTER
     cell.vertical_anchor = MSO_ANCHOR.MIDDLE
 
+@instrument.traced
 def style_data_cell(cell, text, font_size=8, bold=False, alignment=PP_ALIGN.CENTER,
                     fill_color=None, font_color=BLACK):
     cell.text = str(text)
@@ -151,6 +210,7 @@ def style_data_cell(cell, text, font_size=8, bold=False, alignment=PP_ALIGN.CENT
         p.alignment = alignment
     cell.vertical_anchor = MSO_ANCHOR.MIDDLE
 
+@instrument.traced
 def add_banner(slide, slide_num, title, subtitle, tag_line):
     add_rect(slide, Inches(0), Inches(0), Inches(16), Inches(1.15), DARK_GREEN)
     add_text_box(slide, Inches(0.5), Inches(0.15), Inches(10), Inches(0.55),
@@ -163,6 +223,7 @@ def add_banner(slide, slide_num, title, subtitle, tag_line):
     add_text_box(slide, Inches(12.5), Inches(0.55), Inches(3), Inches(0.4),
                  tag_line, font_size=10, bold=False, color=WHITE, alignment=PP_ALIGN.RIGHT)
 
+@instrument.traced
 def add_footer(slide):
     add_rect(slide, Inches(0), Inches(8.55), Inches(16), Inches(0.45), DARK_GREEN)
     add_text_box(slide, Inches(0.5), Inches(8.58), Inches(10), Inches(0.35),
@@ -172,6 +233,7 @@ def add_footer(slide):
                  "Prepared for Donor / SMC Briefing",
                  font_size=8, bold=False, color=WHITE, alignment=PP_ALIGN.RIGHT)
 
+@instrument.traced
 def add_kpi_card(slide, left, top, width, height, label, value, sub="",
                  bg_color=WHITE, value_color=DARK_GREEN, label_color=DARK_GREY):
     add_rect(slide, left, top, width, height, bg_color)
@@ -188,33 +250,56 @@ def add_kpi_card(slide, left, top, width, height, label, value, sub="",
 
 
 # ─────────────────────────────────────────────────────────────────────────────
-# CATEGORY DATA (matches xlsx Category Summary sheet)
+# CATEGORY DATA (same cost cube as the xlsx Category Summary sheet)
 # ─────────────────────────────────────────────────────────────────────────────
-CATEGORIES = [
-    ("Classrooms & Teaching", 320, 14749, 102_035_420, 39.3),
-    ("Science Laboratories", 40, 2193, 17_262_169, 6.6),
-    ("Computer & ICT Labs", 16, 1060, 8_341_310, 3.2),
-    ("Specialist Studios", 10, 748, 5_725_286, 2.2),
-    ("Libraries & LRC", 6, 477, 3_298_472, 1.3),
-    ("Sports & PE", 17, 6957, 54_766_460, 21.1),
-    ("Dining & Food", 8, 2950, 23_151_240, 8.9),
-    ("Auditorium & Assembly", 14, 3120, 24_198_469, 9.3),
-    ("Exam Centre", 3, 870, 6_018_606, 2.3),
-    ("SEN & Wellbeing", 34, 606, 4_192_264, 1.6),
-    ("Staff & PD", 16, 810, 5_603_528, 2.2),
-    ("Administration", 10, 356, 2_462_786, 0.9),
-    ("IT & Security", 5, 96, 709_925, 0.3),
-    ("Transport", 1, 43, 317_987, 0.1),
-    ("Prayer Spaces", 4, 240, 1_660_304, 0.6),
-]
-
-GRAND_TOTAL_SAR = 259_744_226
-GRAND_TOTAL_USD = 69_265_127
+CATEGORY_LABELS = {
+    "CLASSROOMS & TEACHING SPACES": "Classrooms & Teaching",
+    "SCIENCE LABORATORIES": "Science Laboratories",
+    "COMPUTER & ICT LABS": "Computer & ICT Labs",
+    "SPECIALIST STUDIOS & MAKER SPACES": "Specialist Studios",
+    "LIBRARIES & LEARNING RESOURCE CENTRES": "Libraries & LRC",
+    "SPORTS & PHYSICAL EDUCATION": "Sports & PE",
+    "DINING & FOOD SERVICES": "Dining & Food",
+    "AUDITORIUM & ASSEMBLY SPACES": "Auditorium & Assembly",
+    "EXAM CENTRE": "Exam Centre",
+    "SEN & STUDENT WELLBEING": "SEN & Wellbeing",
+    "STAFF & PROFESSIONAL DEVELOPMENT": "Staff & PD",
+    "ADMINISTRATION & GOVERNANCE": "Administration",
+    "IT INFRASTRUCTURE & SECURITY": "IT & Security",
+    "TRANSPORT & LOGISTICS": "Transport",
+    "PRAYER & SPIRITUAL SPACES": "Prayer Spaces",
+}
+
+CAMPUS_UNITS = legacy_units(_PRICE_BOOK)
+if _args.students is not None:
+    CAMPUS_UNITS = Programme(students=_args.students).units(CAMPUS_UNITS)
+_CUBE = build_cube(CAMPUS_UNITS, _PRICE_BOOK["settings"], unit_classes(_PRICE_BOOK))
+_cat_totals = [_CUBE.get(category=c) for c in _CUBE.members("category")]
+_cat_pct = percent_shares([t["cost_sar"] for t in _cat_totals])
+CATEGORIES = [(CATEGORY_LABELS.get(c, c.title()), t["units"], round(t["net_m2"]), t["cost_sar"], float(p))
+              for c, t, p in zip(_CUBE.members("category"), _cat_totals, _cat_pct)]
+
+_grand = _CUBE.get()
+GRAND_TOTAL_SAR = _grand["cost_sar"]
+GRAND_TOTAL_FX = fx(GRAND_TOTAL_SAR)
+TOTAL_UNITS = _grand["units"]
+UNIT_TYPES = sum(1 for u in CAMPUS_UNITS if u[2] is not None)
+
+# Top 5 panel: short name and what the units are called, by category
+TOP_LABELS = {
+    "CLASSROOMS & TEACHING SPACES": ("Classrooms", "rooms"),
+    "SPORTS & PHYSICAL EDUCATION": ("Sports & PE", "facilities"),
+    "AUDITORIUM & ASSEMBLY SPACES": ("Auditorium", "spaces"),
+    "DINING & FOOD SERVICES": ("Dining & Food", "facilities"),
+    "SCIENCE LABORATORIES": ("Science Labs", "labs"),
+    "COMPUTER & ICT LABS": ("ICT Labs", "labs"),
+}
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # SLIDE 1 – TITLE & PROJECT OVERVIEW
 # ═══════════════════════════════════════════════════════════════════════════════
+stage.next("Slide 1")
 slide1 = prs.slides.add_slide(prs.slide_layouts[6])
 add_bg(slide1, DARK_GREEN)
 
@@ -241,11 +326,11 @@ gap = Inches(0.35)
 start_x = Inches(1.25)
 
 kpis = [
-    ("SAR 250M", "Total Project Cost", "Mid-Institutional Spec"),
-    ("7,000", "Student Capacity", "Design Target"),
-    ("52,400 m\u00b2", "Total Built-Up Area", "NET \u00d7 Grossing Factors"),
-    ("504", "Total Donor Units", "58 Unique Unit Types"),
-    ("SAR 260M", "Sum of All Units", "Unit-level detail pricing"),
+    (f"SAR {int(div_round(PROJECT_COST_SAR, 1_000_000)):,}M", "Total Project Cost", "Mid-Institutional Spec"),
+    (f"{STUDENTS:,}", "Student Capacity", "Design Target"),
+    (f"{PROJECT_BUA:,} m\u00b2", "Total Built-Up Area", "NET \u00d7 Grossing Factors"),
+    (f"{TOTAL_UNITS:,}", "Total Donor Units", f"{UNIT_TYPES} Unique Unit Types"),
+    (f"SAR {int(div_round(GRAND_TOTAL_SAR, 1_000_000)):,}M", "Sum of All Units", "Unit-level detail pricing"),
 ]
 for i, (val, label, sub) in enumerate(kpis):
     x = start_x + i * (kpi_w + gap)
@@ -255,7 +340,7 @@ for i, (val, label, sub) in enumerate(kpis):
 
 # Bottom info
 add_text_box(slide1, Inches(1), Inches(6.5), Inches(14), Inches(0.4),
-             "1 USD = 3.75 SAR  |  Prices include construction, MEP, fit-out, ICT & furniture  |  Excluding land, professional fees & inflation",
+             f"{rate_label(DECK_CURRENCY)}  |  Prices include construction, MEP, fit-out, ICT & furniture  |  Excluding land, professional fees & inflation",
              font_size=11, bold=False, color=MID_GREY, alignment=PP_ALIGN.CENTER)
 
 add_text_box(slide1, Inches(1), Inches(7.1), Inches(14), Inches(0.4),
@@ -275,25 +360,27 @@ add_text_box(slide1, Inches(12), Inches(8.58), Inches(3.5), Inches(0.35),
 # ═══════════════════════════════════════════════════════════════════════════════
 # SLIDE 2 – COST SUMMARY BY CATEGORY
 # ═══════════════════════════════════════════════════════════════════════════════
+stage.next("Slide 2")
 slide2 = prs.slides.add_slide(prs.slide_layouts[6])
 add_bg(slide2, WHITE)
 add_banner(slide2, 2,
            "COST SUMMARY BY CATEGORY  |  15 FACILITY GROUPS",
-           "High-level budget overview for donor briefings  |  7,000-Student Campus  |  SAR 250M Project",
+           f"High-level budget overview for donor briefings  |  {STUDENTS:,}-Student Campus  |  "
+           f"SAR {int(div_round(PROJECT_COST_SAR, 1_000_000)):,}M Project",
            "Category Summary")
 
 # Main table
 tbl_top = Inches(1.45)
 tbl = add_table(slide2, 17, 7, Inches(0.5), tbl_top, Inches(10.5), Inches(6.5))
 
-headers = ["#", "Category", "Units", "Total NET m\u00b2", "Total Cost (SAR)", "Total Cost (USD)", "% of Budget"]
+headers = ["#", "Category", "Units", "Total NET m\u00b2", "Total Cost (SAR)", f"Total Cost ({DECK_CURRENCY})", "% of Budget"]
 for j, h in enumerate(headers):
     style_header_cell(tbl.cell(0, j), h, font_size=8)
 
 for i, (cat, units, net, cost, pct) in enumerate(CATEGORIES):
     bg = ROW_ALT if i % 2 == 0 else WHITE
     is_big = pct >= 5.0  # Highlight major categories
-    vals = [str(i+1), cat, str(units), f"{net:,}", f"{cost:,}", f"{usd(cost):,}", f"{pct}%"]
+    vals = [str(i+1), cat, str(units), f"{net:,}", f"{cost:,}", f"{fx(cost):,}", f"{pct}%"]
     for j, val in enumerate(vals):
         fc = DARK_GREEN if is_big and j in (4, 5) else BLACK
         style_data_cell(tbl.cell(i+1, j), val, font_size=8,
@@ -303,7 +390,8 @@ for i, (cat, units, net, cost, pct) in enumerate(CATEGORIES):
 
 # Grand total row
 gt_row = 16
-gt_vals = ["", "GRAND TOTAL", "504", "35,274", f"{GRAND_TOTAL_SAR:,}", f"{GRAND_TOTAL_USD:,}", "100%"]
+gt_vals = ["", "GRAND TOTAL", f"{TOTAL_UNITS:,}", f"{round(_grand['net_m2']):,}", f"{GRAND_TOTAL_SAR:,}",
+           f"{GRAND_TOTAL_FX:,}", "100%"]
 for j, val in enumerate(gt_vals):
     style_data_cell(tbl.cell(gt_row, j), val, font_size=9, bold=True,
                    fill_color=DARK_GREEN, font_color=WHITE,
@@ -315,18 +403,13 @@ for j, w in enumerate(col_widths):
 
 # Right panel: Top 5 breakdown
 panel_x = Inches(11.4)
+_top = sorted(zip(_CUBE.members("category"), _cat_totals, _cat_pct), key=lambda c: -c[1]["cost_sar"])[:5]
+top5 = [(*TOP_LABELS.get(c, (CATEGORY_LABELS.get(c, c.title()), "units")), t, p) for c, t, p in _top]
+top5 = [(name, fmt_sar(t["cost_sar"]), f"{p}%", f"{t['units']} {noun}") for name, noun, t, p in top5]
 add_text_box(slide2, panel_x, Inches(1.45), Inches(4.2), Inches(0.3),
-             "TOP 5 CATEGORIES (82.6% of budget)",
+             f"TOP 5 CATEGORIES ({sum(p for *_, p in _top)}% of budget)",
              font_size=11, bold=True, color=DARK_GREEN)
 
-top5 = [
-    ("Classrooms", "SAR 102.0M", "39.3%", "320 rooms"),
-    ("Sports & PE", "SAR 54.8M", "21.1%", "17 facilities"),
-    ("Auditorium", "SAR 24.2M", "9.3%", "14 spaces"),
-    ("Dining & Food", "SAR 23.2M", "8.9%", "8 facilities"),
-    ("Science Labs", "SAR 17.3M", "6.6%", "40 labs"),
-]
-
 for i, (name, cost_str, pct_str, qty_str) in enumerate(top5):
     y = Inches(1.95) + i * Inches(0.95)
     add_rect(slide2, panel_x, y, Inches(4.2), Inches(0.82), LIGHT_BG)
@@ -350,7 +433,7 @@ for i, (name, cost_str, pct_str, qty_str) in enumerate(top5):
 add_rect(slide2, panel_x, Inches(6.85), Inches(4.2), Inches(1.15), ACCENT_GOLD)
 note_lines = [
     "KEY NOTES:",
-    "\u2022 Grand total (SAR 260M) reflects sum of all",
+    f"\u2022 Grand total (SAR {GRAND_TOTAL_SAR / 1_000_000:,.0f}M) reflects sum of all",
     "  individual units at planning-level estimates",
     "\u2022 Full campus mid-range: SAR 240\u2013260M",
     "\u2022 Grossing: Academic 1.45\u00d7 / Service 1.65\u00d7",
@@ -366,45 +449,54 @@ add_footer(slide2)
 # ═══════════════════════════════════════════════════════════════════════════════
 # SLIDE 3 – TOP UNIT PRICING (Key Items from Unit Pricing sheet)
 # ═══════════════════════════════════════════════════════════════════════════════
+stage.next("Slide 3")
 slide3 = prs.slides.add_slide(prs.slide_layouts[6])
 add_bg(slide3, WHITE)
 add_banner(slide3, 3,
            "UNIT PRICING  |  KEY FACILITIES WITH COST PER UNIT",
-           "58 unique unit types  |  NET m\u00b2 \u00d7 Grossing Factor \u00d7 SAR 4,771/m\u00b2 BUA  |  Full list in Excel workbook",
+           f"{UNIT_TYPES} unique unit types  |  NET m\u00b2 \u00d7 Grossing Factor \u00d7 SAR {COST_PER_BUA_M2:,}/m\u00b2 BUA  |  "
+           "Full list in Excel workbook",
            "Unit-Level Detail")
 
-# Selected high-interest units for the slide (from xlsx data)
-units_data = [
-    # (name, qty, net_m2, cost_unit_sar, total_sar, students)
-    ("Standard Classroom (G1\u201312)", 249, 43.1, 298_302, 74_277_198, "25 students/room"),
-    ("KG Classroom", 26, 62.5, 432_371, 11_241_646, "25 children/room"),
-    ("Nursery Activity Room", 9, 45.0, 311_307, 2_801_763, "20\u201325 children"),
-    ("Reception Classroom", 20, 62.5, 432_371, 8_647_420, "25 children/room"),
-    ("Primary Science Lab", 13, 60.1, 473_115, 6_150_495, "25 students/lab"),
-    ("Intermediate Science Lab", 7, 63.0, 495_630, 3_469_410, "25 students/lab"),
-    ("Secondary Science Lab", 12, 69.9, 550_262, 6_603_144, "25 students/lab"),
-    ("Primary Computer Lab", 6, 60.1, 473_115, 2_838_690, "25 students/session"),
-    ("Secondary Computer Lab", 10, 69.9, 550_262, 5_502_620, "25 students/session"),
-    ("Maker / Robotics Lab", 2, 120.0, 944_656, 1_889_312, "25 students/session"),
-    ("Art Studio", 2, 90.0, 708_492, 1_416_984, "25 students/session"),
-    ("Music / Drama Room", 2, 80.0, 629_771, 1_259_542, "30\u201340 students"),
-    ("Primary Library / LRC", 2, 75.1, 519_537, 1_039_074, "40\u201360 students"),
-    ("Secondary LRC", 2, 88.6, 612_929, 1_225_858, "50\u201370 students"),
-    ("Sports Hall", 2, 900.0, 7_084_924, 14_169_848, "200+ students/day"),
-    ("25m Swimming Pool", 1, 1717.0, 13_516_460, 13_516_460, "300+ students/wk"),
-    ("Dining Hall (700-seat)", 2, 1100.0, 8_659_351, 17_318_702, "700 students/sitting"),
-    ("Auditorium (300 seats)", 1, 740.0, 5_825_382, 5_825_382, "300-seat events"),
-    ("Atrium / Learning Commons", 1, 2000.0, 15_744_275, 15_744_275, "2,000+ students"),
-    ("Exam Hall (300 cands)", 1, 750.0, 5_188_454, 5_188_454, "300 candidates"),
-    ("SEN Resource Room", 10, 25.0, 172_948, 1_729_480, "4\u20138 students"),
-    ("Prayer Room / Musalla", 4, 60.0, 415_076, 1_660_304, "100\u2013150 per room"),
+# Selected high-interest units for the slide: (label, price book unit, impact).
+# Quantities follow the campus programme, NET and cost per unit the price book.
+units_selected = [
+    ("Standard Classroom (G1\u201312)", "Standard Classroom (Grades 1\u201312)", "25 students/room"),
+    ("KG Classroom", "Kindergarten Classroom", "25 children/room"),
+    ("Nursery Activity Room", "Nursery Activity Room", "20\u201325 children"),
+    ("Reception Classroom", "Reception Classroom", "25 children/room"),
+    ("Primary Science Lab", "Primary Science Lab", "25 students/lab"),
+    ("Intermediate Science Lab", "Intermediate Science Lab", "25 students/lab"),
+    ("Secondary Science Lab", "Secondary Science Lab (Physics / Chemistry / Biology)", "25 students/lab"),
+    ("Primary Computer Lab", "Primary Computer / Language Lab", "25 students/session"),
+    ("Secondary Computer Lab", "Secondary Computer / Language Lab", "25 students/session"),
+    ("Maker / Robotics Lab", "Maker / Robotics Lab", "25 students/session"),
+    ("Art Studio", "Art Studio", "25 students/session"),
+    ("Music / Drama Room", "Music / Drama Room", "30\u201340 students"),
+    ("Primary Library / LRC", "Primary Library / LRC", "40\u201360 students"),
+    ("Secondary LRC", "Secondary LRC", "50\u201370 students"),
+    ("Sports Hall", "Indoor Multi-Purpose Sports Hall", "200+ students/day"),
+    ("25m Swimming Pool", "25m Swimming Pool Complex", "300+ students/wk"),
+    ("Dining Hall (700-seat)", "Dining Hall (700-seat, multi-shift)", "700 students/sitting"),
+    ("Auditorium (300 seats)", "Auditorium (300 seats)", "300-seat events"),
+    ("Atrium / Learning Commons", "Atrium / Learning Commons", "2,000+ students"),
+    ("Exam Hall (300 cands)", "Exam Hall (300 candidates)", "300 candidates"),
+    ("SEN Resource Room", "SEN Resource Room (Small Group)", "4\u20138 students"),
+    ("Prayer Room / Musalla", "Prayer Room / Musalla", "100\u2013150 per room"),
 ]
+_campus_qty = {u[0]: u[2] for u in CAMPUS_UNITS if u[2] is not None}
+_book_units = {u["name"]: u for u in _PRICE_BOOK["units"]}
+units_data = []
+for label, book_name, impact in units_selected:
+    unit, qty = _book_units[book_name], _campus_qty[book_name]
+    units_data.append((label, qty, unit["net_m2"], unit["unit_cost_sar"], qty * unit["unit_cost_sar"], impact))
 
 # Split into two columns
 half = len(units_data) // 2
 left_data = units_data[:half]
 right_data = units_data[half:]
 
+@instrument.traced
 def draw_unit_table(slide, data, left_x, top_y, table_width):
     n_rows = len(data) + 1
     tbl = add_table(slide, n_rows, 6, left_x, top_y, table_width, Inches(0.3 * n_rows))
@@ -435,9 +527,10 @@ draw_unit_table(slide3, right_data, Inches(8.2), tbl_top, Inches(7.6))
 # Bottom note
 add_rect(slide3, Inches(0.3), Inches(8.0), Inches(15.4), Inches(0.35), ACCENT_GOLD)
 add_text_box(slide3, Inches(0.5), Inches(8.03), Inches(15), Inches(0.3),
-             "Full pricing for all 58 unit types (504 total units) available in the Excel workbook  |  "
-             "Cost = NET m\u00b2 \u00d7 Grossing Factor \u00d7 SAR 4,771/m\u00b2 BUA  |  "
-             "Grossing: Academic 1.45\u00d7 / High-Service 1.65\u00d7 / Operations 1.55\u00d7",
+             f"Full pricing for all {UNIT_TYPES} unit types ({TOTAL_UNITS:,} total units) available in the Excel workbook  |  "
+             f"Cost = NET m\u00b2 \u00d7 Grossing Factor \u00d7 SAR {COST_PER_BUA_M2:,}/m\u00b2 BUA  |  "
+             f"Grossing: Academic {GROSSING['academic']}\u00d7 / High-Service {GROSSING['high_service']}\u00d7 / "
+             f"Operations {GROSSING['operations']}\u00d7",
              font_size=8, bold=False, color=DARK_GREY, alignment=PP_ALIGN.CENTER)
 
 add_footer(slide3)
@@ -446,34 +539,56 @@ add_footer(slide3)
 # ═══════════════════════════════════════════════════════════════════════════════
 # SLIDE 4 – DONOR PACKAGES
 # ═══════════════════════════════════════════════════════════════════════════════
+stage.next("Slide 4")
 slide4 = prs.slides.add_slide(prs.slide_layouts[6])
 add_bg(slide4, WHITE)
 add_banner(slide4, 4,
            "DONOR PACKAGES  |  THREE GIVING TIERS",
-           "Suggested giving levels with naming recognition  |  All amounts in SAR & USD",
+           f"Suggested giving levels with naming recognition  |  All amounts in SAR & {DECK_CURRENCY}",
            "Giving Opportunities")
 
+# Package tiers from the price book. The slide uses shorter package names and
+# impact lines; {rooms} is the number of rooms in the package.
+PACKAGE_LABELS = {
+    "Name a Classroom": ("Name a Classroom", "25 students"),
+    "Equip a Science Lab": ("Equip a Science Lab", "25 students/lab"),
+    "Build a Sensory Room": ("Build a Sensory Room", "SEN students"),
+    "Sponsor a Library Corner": ("Sponsor a Library Corner", "40\u201360 students"),
+    "Create an Art Atelier": ("Create an Art Atelier", "25 young artists"),
+    "Robotics Innovation Hub": ("Robotics Innovation Hub", "STEM education"),
+    "Auditorium Naming": ("Auditorium Naming", "300-seat events"),
+    "Sports Hall Sponsor": ("Sports Hall Sponsor", "200+ students/day"),
+    "Dining Experience": ("Dining Experience", "700 students/sitting"),
+    "Classroom Block (10 rooms)": ("Classroom Block ({rooms})", "250 students"),
+    "Swimming Pool Complex": ("Swimming Pool Complex", "300+ students/wk"),
+    "Exam Centre": ("Exam Centre", "300 candidates"),
+    "Learning Commons & Atrium": ("Learning Commons", "2,000+ students"),
+    "Entire Early Years Wing": ("Early Years Wing ({rooms} rooms)", "800+ children"),
+    "Complete SEN Suite": ("Complete SEN Suite ({rooms} rooms)", "500+ SEN students"),
+}
+PACKAGES = {name: contents for _, _, items in legacy_packages(_PRICE_BOOK) for name, _, _, contents in items}
+tiers = []
+for tier_name, tier_range, items in legacy_packages(_PRICE_BOOK):
+    rows = []
+    for name, _, impact, contents in items:
+        label, short_impact = PACKAGE_LABELS.get(name, (name, impact))
+        rows.append((label.format(rooms=sum(q for _, q in contents)), contents_cost(contents), short_impact))
+    tiers.append((f"{tier_name}  ({tier_range})", rows))
+(tier1_title, tier1_items), (tier2_title, tier2_items), (tier3_title, tier3_items) = tiers
+
 # TIER 1: Individual Impact Gifts
 tier1_y = Inches(1.45)
 add_rect(slide4, Inches(0.5), tier1_y, Inches(4.7), Inches(0.4), MED_GREEN)
 add_text_box(slide4, Inches(0.6), tier1_y + Inches(0.05), Inches(4.5), Inches(0.3),
-             "INDIVIDUAL IMPACT GIFTS  (SAR 50K \u2013 500K)",
+             tier1_title,
              font_size=11, bold=True, color=WHITE)
 
-tier1_items = [
-    ("Name a Classroom", "SAR 298,302", "USD 79,547", "25 students"),
-    ("Equip a Science Lab", "SAR 473,115", "USD 126,164", "25 students/lab"),
-    ("Build a Sensory Room", "SAR 166,031", "USD 44,275", "SEN students"),
-    ("Sponsor a Library Corner", "SAR 519,537", "USD 138,543", "40\u201360 students"),
-    ("Create an Art Atelier", "SAR 289,862", "USD 77,297", "25 young artists"),
-]
-
 t1_tbl = add_table(slide4, 6, 5, Inches(0.5), tier1_y + Inches(0.5), Inches(4.7), Inches(2.1))
-for j, h in enumerate(["#", "Package", "SAR", "USD", "Impact"]):
+for j, h in enumerate(["#", "Package", "SAR", DECK_CURRENCY, "Impact"]):
     style_header_cell(t1_tbl.cell(0, j), h, font_size=7)
-for i, (pkg, sar, usd_val, impact) in enumerate(tier1_items):
+for i, (pkg, sar, impact) in enumerate(tier1_items):
     bg = ROW_ALT if i % 2 == 0 else WHITE
-    for j, val in enumerate([str(i+1), pkg, sar, usd_val, impact]):
+    for j, val in enumerate([str(i+1), pkg, fmt_sar(sar), fmt_fx(fx(sar)), impact]):
         al = PP_ALIGN.LEFT if j in (1, 4) else PP_ALIGN.CENTER
         if j in (2, 3): al = PP_ALIGN.RIGHT
         style_data_cell(t1_tbl.cell(i+1, j), val, font_size=7.5, fill_color=bg, alignment=al)
@@ -486,23 +601,15 @@ tier2_y = Inches(1.45)
 tier2_x = Inches(5.6)
 add_rect(slide4, tier2_x, tier2_y, Inches(4.7), Inches(0.4), DARK_GREEN)
 add_text_box(slide4, tier2_x + Inches(0.1), tier2_y + Inches(0.05), Inches(4.5), Inches(0.3),
-             "MAJOR GIFTS  (SAR 500K \u2013 5M)",
+             tier2_title,
              font_size=11, bold=True, color=WHITE)
 
-tier2_items = [
-    ("Robotics Innovation Hub", "SAR 944,656", "USD 251,908", "STEM education"),
-    ("Auditorium Naming", "SAR 5.8M", "USD 1.6M", "300-seat events"),
-    ("Sports Hall Sponsor", "SAR 7.1M", "USD 1.9M", "200+ students/day"),
-    ("Dining Experience", "SAR 8.7M", "USD 2.3M", "700 students/sitting"),
-    ("Classroom Block (10)", "SAR 3.0M", "USD 795K", "250 students"),
-]
-
 t2_tbl = add_table(slide4, 6, 5, tier2_x, tier2_y + Inches(0.5), Inches(4.7), Inches(2.1))
-for j, h in enumerate(["#", "Package", "SAR", "USD", "Impact"]):
+for j, h in enumerate(["#", "Package", "SAR", DECK_CURRENCY, "Impact"]):
     style_header_cell(t2_tbl.cell(0, j), h, font_size=7)
-for i, (pkg, sar, usd_val, impact) in enumerate(tier2_items):
+for i, (pkg, sar, impact) in enumerate(tier2_items):
     bg = ROW_ALT if i % 2 == 0 else WHITE
-    for j, val in enumerate([str(i+1), pkg, sar, usd_val, impact]):
+    for j, val in enumerate([str(i+1), pkg, fmt_sar(sar), fmt_fx(fx(sar)), impact]):
         al = PP_ALIGN.LEFT if j in (1, 4) else PP_ALIGN.CENTER
         if j in (2, 3): al = PP_ALIGN.RIGHT
         style_data_cell(t2_tbl.cell(i+1, j), val, font_size=7.5, fill_color=bg, alignment=al)
@@ -515,23 +622,15 @@ tier3_y = Inches(1.45)
 tier3_x = Inches(10.7)
 add_rect(slide4, tier3_x, tier3_y, Inches(4.8), Inches(0.4), RGBColor(0xB7, 0x14, 0x1C))
 add_text_box(slide4, tier3_x + Inches(0.1), tier3_y + Inches(0.05), Inches(4.6), Inches(0.3),
-             "LANDMARK GIFTS  (SAR 5M+)",
+             tier3_title,
              font_size=11, bold=True, color=WHITE)
 
-tier3_items = [
-    ("Swimming Pool Complex", "SAR 13.5M", "USD 3.6M", "300+ students/wk"),
-    ("Exam Centre", "SAR 6.4M", "USD 1.7M", "300 candidates"),
-    ("Learning Commons", "SAR 15.7M", "USD 4.2M", "2,000+ students"),
-    ("Early Years Wing (55 rooms)", "SAR 26.6M", "USD 7.1M", "800+ children"),
-    ("Complete SEN Suite (34 rooms)", "SAR 4.2M", "USD 1.1M", "500+ SEN students"),
-]
-
 t3_tbl = add_table(slide4, 6, 5, tier3_x, tier3_y + Inches(0.5), Inches(4.8), Inches(2.1))
-for j, h in enumerate(["#", "Package", "SAR", "USD", "Impact"]):
+for j, h in enumerate(["#", "Package", "SAR", DECK_CURRENCY, "Impact"]):
     style_header_cell(t3_tbl.cell(0, j), h, font_size=7)
-for i, (pkg, sar, usd_val, impact) in enumerate(tier3_items):
+for i, (pkg, sar, impact) in enumerate(tier3_items):
     bg = ROW_ALT if i % 2 == 0 else WHITE
-    for j, val in enumerate([str(i+1), pkg, sar, usd_val, impact]):
+    for j, val in enumerate([str(i+1), pkg, fmt_sar(sar), fmt_fx(fx(sar)), impact]):
         al = PP_ALIGN.LEFT if j in (1, 4) else PP_ALIGN.CENTER
         if j in (2, 3): al = PP_ALIGN.RIGHT
         style_data_cell(t3_tbl.cell(i+1, j), val, font_size=7.5, fill_color=bg, alignment=al)
@@ -567,8 +666,9 @@ add_text_box(slide4, Inches(2), impact_y + Inches(0.15), Inches(12), Inches(0.45
              "\"EVERY CONTRIBUTION BUILDS A FUTURE\"",
              font_size=20, bold=True, color=DARK_GREEN, alignment=PP_ALIGN.CENTER)
 add_text_box(slide4, Inches(2), impact_y + Inches(0.6), Inches(12), Inches(0.45),
-             "From a single classroom (SAR 298K) to an entire early years wing (SAR 26.6M) \u2014 "
-             "every donor gift directly builds the infrastructure that will educate 7,000 Pakistani children in Riyadh.",
+             f"From a single classroom ({fmt_sar_short(contents_cost(PACKAGES['Name a Classroom']))}) to an entire "
+             f"early years wing ({fmt_sar_short(contents_cost(PACKAGES['Entire Early Years Wing']))}) \u2014 "
+             f"every donor gift directly builds the infrastructure that will educate {STUDENTS:,} Pakistani children in Riyadh.",
              font_size=11, bold=False, color=DARK_GREY, alignment=PP_ALIGN.CENTER)
 
 # Visual bar: what different amounts build
@@ -577,19 +677,20 @@ add_text_box(slide4, Inches(0.5), bar_y - Inches(0.3), Inches(5), Inches(0.25),
              "WHAT YOUR GIFT CAN BUILD:", font_size=9, bold=True, color=DARK_GREEN)
 
 gift_levels = [
-    ("SAR 83K", "Assessment\nRoom", 0.8),
-    ("SAR 173K", "Breakout\nRoom", 1.1),
-    ("SAR 298K", "Classroom", 1.5),
-    ("SAR 473K", "Science\nLab", 2.0),
-    ("SAR 945K", "Robotics\nLab", 2.8),
-    ("SAR 3.0M", "10-Room\nBlock", 4.0),
-    ("SAR 7.1M", "Sports\nHall", 5.5),
-    ("SAR 13.5M", "Swimming\nPool", 7.0),
-    ("SAR 15.7M", "Learning\nCommons", 7.5),
+    ([("1:1 Assessment Room", 1)], "Assessment\nRoom", 0.8),
+    ([("Breakout Room (Glass-walled)", 1)], "Breakout\nRoom", 1.1),
+    ([("Standard Classroom (Grades 1\u201312)", 1)], "Classroom", 1.5),
+    ([("Primary Science Lab", 1)], "Science\nLab", 2.0),
+    ([("Maker / Robotics Lab", 1)], "Robotics\nLab", 2.8),
+    ([("Standard Classroom (Grades 1\u201312)", 10)], "10-Room\nBlock", 4.0),
+    ([("Indoor Multi-Purpose Sports Hall", 1)], "Sports\nHall", 5.5),
+    ([("25m Swimming Pool Complex", 1)], "Swimming\nPool", 7.0),
+    ([("Atrium / Learning Commons", 1)], "Learning\nCommons", 7.5),
 ]
 
 x_pos = Inches(0.5)
-for amount, label, bar_h_factor in gift_levels:
+for contents, label, bar_h_factor in gift_levels:
+    amount = fmt_sar_short(contents_cost(contents))
     bar_h = Inches(bar_h_factor * 0.08)
     bar_bottom = bar_y + Inches(0.6)
     add_rect(slide4, x_pos, bar_bottom - bar_h, Inches(1.4), bar_h, MED_GREEN)
@@ -605,6 +706,7 @@ add_footer(slide4)
 # ═══════════════════════════════════════════════════════════════════════════════
 # SLIDE 5 – QUICK REFERENCE: WHAT YOUR GIFT CAN BUILD
 # ═══════════════════════════════════════════════════════════════════════════════
+stage.next("Slide 5")
 slide5 = prs.slides.add_slide(prs.slide_layouts[6])
 add_bg(slide5, WHITE)
 add_banner(slide5, 5,
@@ -612,47 +714,49 @@ add_banner(slide5, 5,
            "At-a-glance pricing by giving level  |  All amounts include construction, fit-out, ICT & furniture",
            "Quick Reference Card")
 
-# Giving bands (from Quick Reference sheet in xlsx)
-bands = [
+# Giving bands (from Quick Reference sheet in xlsx): (label, [(price book unit, qty)])
+band_units = [
     ("SAR 50,000 \u2013 100,000", MED_GREEN, [
-        ("SEN Assessment Room", "SAR 83,000 / USD 22,000"),
-        ("Counsellor Room", "SAR 83,000 / USD 22,000"),
-        ("Breakout Room", "SAR 173,000 / USD 46,000"),
-        ("Medical Clinic", "SAR 138,000 / USD 37,000"),
+        ("SEN Assessment Room", [("1:1 Assessment Room", 1)]),
+        ("Counsellor Room", [("Counsellor Room", 1)]),
+        ("Breakout Room", [("Breakout Room (Glass-walled)", 1)]),
+        ("Medical Clinic", [("Medical Clinic / Nurse Room", 1)]),
     ]),
     ("SAR 100,000 \u2013 300,000", MED_GREEN, [
-        ("Nursery Bedroom", "SAR 156,000 / USD 42,000"),
-        ("SEN Resource Room", "SAR 173,000 / USD 46,000"),
-        ("Primary Art Atelier", "SAR 290,000 / USD 77,000"),
-        ("Standard Classroom", "SAR 298,000 / USD 79,000"),
+        ("Nursery Bedroom", [("Nursery Bedroom / Rest Room", 1)]),
+        ("SEN Resource Room", [("SEN Resource Room (Small Group)", 1)]),
+        ("Primary Art Atelier", [("Primary Art Atelier", 1)]),
+        ("Standard Classroom", [("Standard Classroom (Grades 1\u201312)", 1)]),
     ]),
     ("SAR 300,000 \u2013 500,000", DARK_GREEN, [
-        ("Nursery Activity Room", "SAR 311,000 / USD 83,000"),
-        ("KG / Reception Classroom", "SAR 432,000 / USD 115,000"),
-        ("Primary Science Lab", "SAR 473,000 / USD 126,000"),
-        ("Primary Computer Lab", "SAR 473,000 / USD 126,000"),
+        ("Nursery Activity Room", [("Nursery Activity Room", 1)]),
+        ("KG / Reception Classroom", [("Kindergarten Classroom", 1)]),
+        ("Primary Science Lab", [("Primary Science Lab", 1)]),
+        ("Primary Computer Lab", [("Primary Computer / Language Lab", 1)]),
     ]),
     ("SAR 500,000 \u2013 1,000,000", DARK_GREEN, [
-        ("Secondary Science Lab", "SAR 551,000 / USD 147,000"),
-        ("Secondary Computer Lab", "SAR 551,000 / USD 147,000"),
-        ("Music / Drama Room", "SAR 630,000 / USD 168,000"),
-        ("Art Studio", "SAR 709,000 / USD 189,000"),
-        ("Early Years Learning Commons", "SAR 830,000 / USD 221,000"),
-        ("Maker / Robotics Lab", "SAR 945,000 / USD 252,000"),
+        ("Secondary Science Lab", [("Secondary Science Lab (Physics / Chemistry / Biology)", 1)]),
+        ("Secondary Computer Lab", [("Secondary Computer / Language Lab", 1)]),
+        ("Music / Drama Room", [("Music / Drama Room", 1)]),
+        ("Art Studio", [("Art Studio", 1)]),
+        ("Early Years Learning Commons", [("Early Years Learning Commons", 1)]),
+        ("Maker / Robotics Lab", [("Maker / Robotics Lab", 1)]),
     ]),
     ("SAR 1,000,000 \u2013 5,000,000", RGBColor(0xB7, 0x14, 0x1C), [
-        ("Prayer Room / Musalla (\u00d74)", "SAR 1,660,000 / USD 443,000"),
-        ("Classroom Block (10 rooms)", "SAR 2,980,000 / USD 795,000"),
-        ("Exam Hall (300 candidates)", "SAR 5,188,000 / USD 1,383,000"),
+        ("Prayer Room / Musalla (\u00d74)", [("Prayer Room / Musalla", 4)]),
+        ("Classroom Block (10 rooms)", [("Standard Classroom (Grades 1\u201312)", 10)]),
+        ("Exam Hall (300 candidates)", [("Exam Hall (300 candidates)", 1)]),
     ]),
     ("SAR 5,000,000+", RGBColor(0xB7, 0x14, 0x1C), [
-        ("Indoor Sports Hall", "SAR 7,085,000 / USD 1,889,000"),
-        ("Dining Hall + Kitchen", "SAR 11,020,000 / USD 2,939,000"),
-        ("Swimming Pool Complex", "SAR 13,519,000 / USD 3,605,000"),
-        ("Auditorium (300 seats)", "SAR 5,824,000 / USD 1,553,000"),
-        ("Atrium / Learning Commons", "SAR 15,741,000 / USD 4,198,000"),
+        ("Indoor Sports Hall", [("Indoor Multi-Purpose Sports Hall", 1)]),
+        ("Dining Hall + Kitchen", [("Dining Hall (700-seat, multi-shift)", 1), ("Commercial Kitchen & Prep Area", 1)]),
+        ("Swimming Pool Complex", [("25m Swimming Pool Complex", 1)]),
+        ("Auditorium (300 seats)", [("Auditorium (300 seats)", 1)]),
+        ("Atrium / Learning Commons", [("Atrium / Learning Commons", 1)]),
     ]),
 ]
+bands = [(name, color, [(label, fmt_band(contents_cost(contents))) for label, contents in items])
+         for name, color, items in band_units]
 
 # Lay out in 2 columns, 3 bands each
 col_x = [Inches(0.5), Inches(8.2)]
@@ -671,20 +775,21 @@ for col_idx, col_data in enumerate(col_bands):
 
         for i, (item_name, item_price) in enumerate(items):
             bg = LIGHT_BG if i % 2 == 0 else WHITE
-            add_rect(slide5, x, y, Inches(7.2), Inches(0.33), bg)
-            add_text_box(slide5, x + Inches(0.2), y + Inches(0.04), Inches(3.0), Inches(0.25),
+            add_rect(slide5, x, y, Inches(7.2), Inches(0.29), bg)
+            add_text_box(slide5, x + Inches(0.2), y + Inches(0.02), Inches(3.0), Inches(0.25),
                          item_name, font_size=10, bold=False, color=BLACK)
-            add_text_box(slide5, x + Inches(3.4), y + Inches(0.04), Inches(3.6), Inches(0.25),
+            add_text_box(slide5, x + Inches(3.4), y + Inches(0.02), Inches(3.6), Inches(0.25),
                          item_price, font_size=10, bold=True, color=DARK_GREEN,
                          alignment=PP_ALIGN.RIGHT)
-            y += Inches(0.35)
+            # 0.31" rows keep the 14-item right column clear of the callout
+            y += Inches(0.31)
 
         y += Inches(0.2)
 
 # Bottom callout
 add_rect(slide5, Inches(1.5), Inches(7.6), Inches(13), Inches(0.75), ACCENT_GOLD)
 callout_lines = [
-    "EVERY CONTRIBUTION BUILDS A FUTURE  |  PISES NEW CAMPUS  |  7,000 STUDENTS",
+    f"EVERY CONTRIBUTION BUILDS A FUTURE  |  PISES NEW CAMPUS  |  {STUDENTS:,} STUDENTS",
     "Contact the PISES Development Office for customized giving plans  |  Naming rights for gifts SAR 250,000+  |  Co-sponsorship welcomed",
 ]
 add_multiline_box(slide5, Inches(2), Inches(7.65), Inches(12), Inches(0.7),
@@ -697,8 +802,24 @@ add_footer(slide5)
 # ═══════════════════════════════════════════════════════════════════════════════
 # SAVE
 # ═══════════════════════════════════════════════════════════════════════════════
+stage.next("Optimise")
+opt_report = optimise_presentation(prs)
+
 output_path = "/home/user/PISES/PISES_Donor_Unit_Pricing_Deck.pptx"
-prs.save(output_path)
+if _args.students is not None:
+    output_path = output_path.replace(".pptx", f"_{_args.students}.pptx")
+if DECK_CURRENCY != "USD":
+    output_path = output_path.replace(".pptx", f"_{DECK_CURRENCY}.pptx")
+output_path = _args.output or output_path
+stage.next("Save")
+if _args.reproducible:
+    digest = reproducible.save(prs, output_path)
+else:
+    prs.save(output_path)
+stage.end()
 print(f"Deck saved to: {output_path}")
+if _args.reproducible:
+    print(f"SHA-256: {digest}")
 print(f"Slides: {len(prs.slides)}")
 print(f"Format: 16:9 widescreen (16\" x 9\")")
+print(f"Optimiser: {format_report(opt_report)}")
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+PISES New Campus – Cost Cube
+Board packs ask for many cuts of the same unit costs: by category, by
+grossing class, Phase 1 vs Phase 2, by floor, funded vs open. Rescanning
+UNITS for every cut adds up, so this aggregates them all in one pass over the
+units, and every cut after that is a dictionary lookup.
+
+Dimensions (DIMENSIONS):
+  - category        price book category
+  - grossing_class  academic / high_service / operations
+  - phase           "Phase 1" up to the PHASE_1_STUDENTS capacity (quantities
+                    from the space programme rules), "Phase 2" for the rest
+  - floor           B / G / 1 / 2 / outdoor, from floor_stacking.stack()
+  - funded          "Funded" for quantities covered by recorded pledges
+                    (price_history.py), else "Open"
+
+Each unit's quantity is split across phase × floor × funded. Phase 1 rooms
+fill the lower floors first, and pledges fund Phase 1 rooms first. Measures
+(MEASURES) are units, NET m², BUA m² and cost in whole SAR. Areas are summed
+as fixed-point integers, so every cut adds up exactly to its parents.
+
+Every fact is added to all 2^5 roll-ups (each dimension either set or "all")
+while the cube is built. Cube.get(phase="Phase 2", funded="Open") is then
+one lookup, and Cube.pivot() builds a cross-tab from lookups alone.
+
+Usage:
+  python cost_cube.py [--students 7000] [--rows category] [--cols phase] [--measure cost_sar]
+"""
+
+import argparse
+from itertools import product
+
+from money import to_sar, unit_costs
+
+DIMENSIONS = ("category", "grossing_class", "phase", "floor", "funded")
+MEASURES = ("units", "net_m2", "bua_m2", "cost_sar")
+MEASURE_LABELS = {"units": "Units", "net_m2": "NET m²", "bua_m2": "BUA m²", "cost_sar": "Cost (SAR)"}
+DIMENSION_LABELS = {"category": "Category", "grossing_class": "Grossing Class", "phase": "Phase",
+                    "floor": "Floor", "funded": "Funding"}
+
+PHASE_1_STUDENTS = 5000            # Phase 1 (5,000 cap) + Phase 2 (2,000 expansion)
+PHASES = ("Phase 1", "Phase 2")
+FLOORS = ("B", "G", "1", "2", "outdoor")
+UNASSIGNED_FLOOR = "unassigned"
+FUNDING = ("Funded", "Open")
+AREA_SCALE = 100                   # areas held in 0.01 m²
+_MEMBER_ORDER = {"phase": PHASES, "floor": FLOORS + (UNASSIGNED_FLOOR,), "funded": FUNDING}
+
+
+class Cube:
+    """Every roll-up of category × grossing class × phase × floor × funding."""
+
+    def __init__(self, facts):
+        """facts: iterable of ((category, class, phase, floor, funded), [units, net, bua, cost])
+        with NET in 0.01 m² and BUA in 0.0001 m² (NET × GF, both fixed point)."""
+        self.cells = {}
+        self.order = {dim: {} for dim in DIMENSIONS}      # first-seen order of members
+        masks = list(product((True, False), repeat=len(DIMENSIONS)))
+        for key, values in facts:
+            for dim, member in zip(DIMENSIONS, key):
+                self.order[dim].setdefault(member, None)
+            for mask in masks:
+                cell_key = tuple(m if keep else None for m, keep in zip(key, mask))
+                cell = self.cells.get(cell_key)
+                if cell is None:
+                    self.cells[cell_key] = list(values)
+                else:
+                    for i, v in enumerate(values):
+                        cell[i] += v
+
+    def get(self, **members):
+        """{measure: value} for a slice, e.g. get(category=…, funded="Open").
+
+        Dimensions left out are summed over. An empty slice is all zeros.
+        """
+        unknown = set(members) - set(DIMENSIONS)
+        if unknown:
+            raise KeyError(f"unknown dimension(s): {', '.join(sorted(unknown))}")
+        cell = self.cells.get(tuple(members.get(dim) for dim in DIMENSIONS), (0, 0, 0, 0))
+        units, net, bua, cost = cell
+        return {"units": units, "net_m2": net / AREA_SCALE, "bua_m2": bua / AREA_SCALE ** 2,
+                "cost_sar": cost}
+
+    def members(self, dim):
+        """Members of a dimension: phases, floors and funding in their natural
+        order, the rest in the order they appear in the price book."""
+        if dim in _MEMBER_ORDER:
+            return [m for m in _MEMBER_ORDER[dim] if m in self.order[dim]]
+        return list(self.order[dim])
+
+    def pivot(self, rows, cols, measure="cost_sar", **members):
+        """Cross-tab of one measure: {"rows", "cols", "values" (row-major), "row_totals",
+        "col_totals", "total"}, within an optional slice of the other dimensions."""
+        row_members, col_members = self.members(rows), self.members(cols)
+        values = [[self.get(**members, **{rows: r, cols: c})[measure] for c in col_members]
+                  for r in row_members]
+        return {
+            "rows": row_members, "cols": col_members, "values": values,
+            "row_totals": [self.get(**members, **{rows: r})[measure] for r in row_members],
+            "col_totals": [self.get(**members, **{cols: c})[measure] for c in col_members],
+            "total": self.get(**members)[measure],
+        }
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# FACTS FROM UNITS
+# ─────────────────────────────────────────────────────────────────────────────
+def phase_one_quantities(students=PHASE_1_STUDENTS):
+    """{unit name: qty} the space programme rules give for the Phase 1 capacity."""
+    from space_programme import Programme
+
+    return Programme(students=students).quantities()
+
+
+def _split(qty, phase_1, floors, funded):
+    """Counter of (phase, floor, funded) over one unit's qty rooms."""
+    levels = [level for level in FLOORS for _ in range(floors.get(level, 0))][:qty]
+    levels += [UNASSIGNED_FLOOR] * (qty - len(levels))
+    out = {}
+    for i, level in enumerate(levels):
+        key = (PHASES[i >= phase_1], level, FUNDING[i >= funded])
+        out[key] = out.get(key, 0) + 1
+    return out
+
+
+def unit_facts(units, settings, classes, phase_1=None, floors=None, funded=None):
+    """Cube facts from UNITS tuples (category headers have qty None).
+
+    settings: price book settings (total_cost_sar, total_bua); classes:
+    {unit name: grossing class code} (price_book.unit_classes(), since two
+    classes may share a factor); phase_1: {unit name: Phase 1 qty}; floors:
+    floor_stacking assignment {unit name: {level: count}}; funded:
+    {unit name: pledged qty}.
+    """
+    phase_1, floors, funded = phase_1 or {}, floors or {}, funded or {}
+    rows, category = [], None
+    for name, _, qty, net_m2, gf, _ in units:
+        if qty is None:
+            category = name
+        else:
+            rows.append((category, name, qty, net_m2, gf))
+    if not rows:
+        return []
+    costs = to_sar(unit_costs([r[3] for r in rows], [r[4] for r in rows],
+                              settings["total_cost_sar"], settings["total_bua"])).tolist()
+    facts = []
+    for (category, name, qty, net_m2, gf), cost in zip(rows, costs):
+        net = round(net_m2 * AREA_SCALE)
+        bua = net * round(gf * AREA_SCALE)                 # 0.01 m² × 0.01
+        split = _split(qty, min(qty, phase_1.get(name, qty)), floors.get(name, {}),
+                       min(qty, funded.get(name, 0)))
+        for (phase, level, status), n in split.items():
+            facts.append(((category, classes.get(name, f"{gf:g}×"), phase, level, status),
+                          [n, n * net, n * bua, n * int(cost)]))
+    return facts
+
+
+def build_cube(units, settings, classes, phase_1_students=PHASE_1_STUDENTS, funded=None):
+    """Cube for a campus UNITS list, with floors stacked and Phase 1 from the rules."""
+    from floor_stacking import stack
+
+    floors = stack(units)["assignment"]
+    return Cube(unit_facts(units, settings, classes, phase_one_quantities(phase_1_students),
+                           floors, funded))
+
+
+def pledged_quantities(model, history_path=None):
+    """{unit name: pledged qty} from the price history store ({} if there is none)."""
+    import os
+
+    from price_history import HISTORY_PATH, PriceHistory
+
+    path = history_path or HISTORY_PATH
+    if not os.path.exists(path):
+        return {}
+    history = PriceHistory(path)
+    try:
+        by_id = history.pledged_units()
+    finally:
+        history.close()
+    names = {u["id"]: u["name"] for u in model["units"]}
+    return {names[uid]: qty for uid, qty in by_id.items() if uid in names}
+
+
+if __name__ == "__main__":
+    from price_book import legacy_units, load_model, unit_classes
+    from space_programme import DESIGN_STUDENTS, Programme
+
+    parser = argparse.ArgumentParser(description="Pivot the unit costs over any two dimensions")
+    parser.add_argument("--students", type=int, default=None, help="derive quantities from the programme rules")
+    parser.add_argument("--rows", choices=DIMENSIONS, default="category")
+    parser.add_argument("--cols", choices=DIMENSIONS, default="phase")
+    parser.add_argument("--measure", choices=MEASURES, default="cost_sar")
+    args = parser.parse_args()
+
+    model = load_model()
+    units = legacy_units(model)
+    if args.students and args.students != DESIGN_STUDENTS:
+        units = Programme(students=args.students).units(units)
+    cube = build_cube(units, model["settings"], unit_classes(model), funded=pledged_quantities(model))
+    table = cube.pivot(args.rows, args.cols, args.measure)
+    width = max(len(str(r)) for r in table["rows"] + ["Total"])
+    print(f"  {DIMENSION_LABELS[args.rows]:<{width}} " + " ".join(f"{c:>15}" for c in table["cols"])
+          + f" {'Total':>15}")
+    for r, values, total in zip(table["rows"], table["values"], table["row_totals"]):
+        print(f"  {r:<{width}} " + " ".join(f"{v:>15,.0f}" for v in values) + f" {total:>15,.0f}")
+    print(f"  {'Total':<{width}} " + " ".join(f"{v:>15,.0f}" for v in table["col_totals"])
+          + f" {table['total']:>15,.0f}")
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+PISES New Campus – Cost Simulator Engine
+The Python twin of recalc() in PISES_Cost_Simulator.html: same sliders, same
+TBC / non-TBC room rows, same totals. Every input may be a scalar or a numpy
+array. Arrays broadcast against each other, so a whole grid of slider
+positions is evaluated in one call:
+
+  recalc(students=np.arange(2000, 10001, 100), rate=[4580, 4771, 4960][:, None]…)
+
+The arithmetic follows the JavaScript step for step in float64: JS
+Math.round (half up), the same operation order, and running totals summed
+row by row. Results therefore match the page bit for bit.
+PISES_Cost_Simulator_Fixtures.json holds outputs captured from the page
+itself. `--check` compares against them, and `--capture` regenerates them
+by running the HTML's recalc() under node with a stub DOM.
+
+Usage:
+  python cost_engine.py [--students 7000] [--rate 4771]
+  python cost_engine.py --check
+  python cost_engine.py --capture      (needs node on PATH)
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+
+import numpy as np
+
+HTML_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "PISES_Cost_Simulator.html")
+FIXTURES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "PISES_Cost_Simulator_Fixtures.json")
+
+SAR_TO_USD = 1 / 3.75
+SITE_AREA = 25000
+NUM_FLOORS = 3
+RATIO_EY = 0.152
+RATIO_PRI = 0.311
+RATIO_INT = 0.390
+
+# Slider defaults in the HTML (buffer in %, as on the slider)
+DEFAULTS = {
+    "students": 7000, "rate": 4771,
+    "consultant": 10, "core": 40, "first": 18, "second": 14, "third": 18,
+    "gfAcad": 1.45, "gfHs": 1.65, "gfOps": 1.55,
+    "maxCls": 25, "buffer": 8, "eyCls": 22,
+}
+STAGES = ("consultant", "core", "first", "second", "third")
+
+
+def js_round(x):
+    """JavaScript Math.round: nearest integer, halves toward +∞."""
+    return np.floor(np.asarray(x, dtype=np.float64) + 0.5)
+
+
+def _ceil(x):
+    return np.ceil(x)
+
+
+# (section, name, qty(v), net per unit (number or fn(v)), grossing slider)
+# v holds the sliders plus the derived counts below, as in recalc().
+TBC_ROWS = [
+    ("CLASSROOMS", "EY Classrooms (Nursery/KG)", lambda v: v["ey_cls"], 55.0, "gfAcad"),
+    ("CLASSROOMS", "Primary Classrooms (G1–G4)", lambda v: v["pri_cls"], 43.12, "gfAcad"),
+    ("CLASSROOMS", "Intermediate Classrooms (G5–G9)", lambda v: v["int_cls"], 45.90, "gfAcad"),
+    ("CLASSROOMS", "Secondary Classrooms (G10–G12)", lambda v: v["sec_cls"], 48.12, "gfAcad"),
+    ("SCIENCE LABORATORIES", "Primary Science Labs", lambda v: v["sci_pri"], 60.1, "gfHs"),
+    ("SCIENCE LABORATORIES", "Intermediate Science Labs", lambda v: v["sci_int"], 62.96, "gfHs"),
+    ("SCIENCE LABORATORIES", "Secondary Science Labs", lambda v: v["sci_sec"], 69.9, "gfHs"),
+    ("SCIENCE LABORATORIES", "Science Prep Rooms",
+     lambda v: _ceil((v["sci_pri"] + v["sci_int"] + v["sci_sec"]) / 5), 18.0, "gfHs"),
+    ("SCIENCE LABORATORIES", "Chemical Storage", 2, 12.0, "gfHs"),
+    ("COMPUTER & ICT LABS", "Primary Computer Labs", lambda v: _ceil(v["pri_cls"] / 15) * 2, 60.1, "gfHs"),
+    ("COMPUTER & ICT LABS", "Secondary Computer Labs",
+     lambda v: _ceil((v["int_cls"] + v["sec_cls"]) / 15) * 2, 69.9, "gfHs"),
+    ("LEARNING RESOURCE CENTRES", "Primary LRC / Library", 2, 75.1, "gfAcad"),
+    ("LEARNING RESOURCE CENTRES", "Intermediate LRC", 2, 74.7, "gfAcad"),
+    ("LEARNING RESOURCE CENTRES", "Secondary LRC", 2, 88.6, "gfAcad"),
+    ("ARTS & MULTI-PURPOSE", "Primary Art Atelier", lambda v: np.maximum(2, _ceil(v["pri_cls"] / 20)), 41.9, "gfAcad"),
+    ("ARTS & MULTI-PURPOSE", "Intermediate/Secondary Arts",
+     lambda v: np.maximum(2, _ceil((v["int_cls"] + v["sec_cls"]) / 25)), 51.0, "gfAcad"),
+    ("ARTS & MULTI-PURPOSE", "Multi-Purpose Rooms", lambda v: _ceil(v["total_cls"] / 30) * 2, 45.0, "gfAcad"),
+    ("OUTDOOR / COURTS", "Outdoor Multi-Sport Courts",
+     lambda v: np.maximum(4, _ceil(v["students"] / 500)), 450.0, "gfHs"),
+]
+
+NON_TBC_ROWS = [
+    ("SEN & WELLBEING", "SEN Resource Rooms", lambda v: np.maximum(4, js_round(10 * v["scale"])), 25.0, "gfAcad"),
+    ("SEN & WELLBEING", "1:1 Assessment Rooms", lambda v: np.maximum(4, js_round(8 * v["scale"])), 12.0, "gfAcad"),
+    ("SEN & WELLBEING", "Speech & Language Therapy", lambda v: np.maximum(2, js_round(4 * v["scale"])), 16.0, "gfAcad"),
+    ("SEN & WELLBEING", "Occupational Therapy", 2, 20.0, "gfAcad"),
+    ("SEN & WELLBEING", "Sensory Rooms", 2, 24.0, "gfAcad"),
+    ("SEN & WELLBEING", "Counsellor Rooms", lambda v: np.maximum(2, js_round(4 * v["scale"])), 12.0, "gfAcad"),
+    ("SEN & WELLBEING", "Medical Clinic / Nurse", 2, 20.0, "gfAcad"),
+    ("SEN & WELLBEING", "Isolation / Rest Room", 2, 10.0, "gfAcad"),
+    ("SPECIALIST STUDIOS", "Maker / Robotics Lab", 2, 120.0, "gfHs"),
+    ("SPECIALIST STUDIOS", "Art Studio", 2, 90.0, "gfHs"),
+    ("SPECIALIST STUDIOS", "Music / Drama Room", 2, 80.0, "gfHs"),
+    ("SPORTS & PE (beyond TBC courts)", "Indoor Sports Hall", 2, 900.0, "gfHs"),
+    ("SPORTS & PE (beyond TBC courts)", "25m Swimming Pool Complex", 1, 1717.0, "gfHs"),
+    ("SPORTS & PE (beyond TBC courts)", "Sports Changing Rooms", 4, 160.0, "gfHs"),
+    ("SPORTS & PE (beyond TBC courts)", "Sports Storage", 4, 25.0, "gfHs"),
+    ("DINING & FOOD SERVICES", "Dining Halls (700-seat)", lambda v: v["n_dining"], 1100.0, "gfHs"),
+    ("DINING & FOOD SERVICES", "Commercial Kitchen", lambda v: v["n_dining"], 300.0, "gfHs"),
+    ("DINING & FOOD SERVICES", "Cold Room / Dry Store", lambda v: v["n_dining"] * 2, 37.5, "gfOps"),
+    ("AUDITORIUM & ASSEMBLY", "Auditorium (300 seats)", 1, 740.0, "gfHs"),
+    ("AUDITORIUM & ASSEMBLY", "Atrium / Learning Commons", 1,
+     lambda v: np.maximum(1000, js_round(2000 * v["scale"])), "gfHs"),
+    ("AUDITORIUM & ASSEMBLY", "Seminar Rooms", lambda v: np.maximum(2, js_round(4 * v["scale"])), 45.0, "gfAcad"),
+    ("AUDITORIUM & ASSEMBLY", "Breakout Rooms", lambda v: np.maximum(4, js_round(8 * v["scale"])), 25.0, "gfAcad"),
+    ("EXAM CENTRE", "Exam Hall (300 candidates)", 1, 750.0, "gfAcad"),
+    ("EXAM CENTRE", "Candidate Holding Room", 2, 60.0, "gfAcad"),
+    ("STAFF & ADMIN", "Staff Workrooms", lambda v: np.maximum(6, js_round(12 * v["scale"])), 45.0, "gfAcad"),
+    ("STAFF & ADMIN", "Staff Lounges", 2, 90.0, "gfAcad"),
+    ("STAFF & ADMIN", "Teacher Training Rooms", 2, 45.0, "gfAcad"),
+    ("STAFF & ADMIN", "Reception & Welcome", 2, 25.0, "gfAcad"),
+    ("STAFF & ADMIN", "Principal's Office", 1, 20.0, "gfAcad"),
+    ("STAFF & ADMIN", "Admissions Office", 2, 18.0, "gfAcad"),
+    ("STAFF & ADMIN", "Finance Office", 2, 40.0, "gfAcad"),
+    ("STAFF & ADMIN", "Board / SMC Room", 1, 30.0, "gfAcad"),
+    ("STAFF & ADMIN", "School Store / Bookshop", 1, 80.0, "gfAcad"),
+    ("STAFF & ADMIN", "Uniform Shop", 1, 60.0, "gfAcad"),
+    ("IT & SECURITY", "Server Room / MDF", 2, 20.0, "gfOps"),
+    ("IT & SECURITY", "Security Control Room", 1, 20.0, "gfOps"),
+    ("IT & SECURITY", "IT Helpdesk", 2, 18.0, "gfOps"),
+    ("TRANSPORT & OTHER", "Transport Office / Driver Lounge", 1, 43.0, "gfOps"),
+    ("TRANSPORT & OTHER", "Prayer Room / Musalla", 4, 60.0, "gfAcad"),
+]
+
+
+def _value(spec, v):
+    return spec(v) if callable(spec) else spec
+
+
+def _rows(specs, v, shape):
+    """Row arrays and running totals in the page's order."""
+    rows = []
+    total_net = total_bua = total_cost = total_qty = np.zeros(shape)
+    for section, name, qty_spec, net_spec, gf in specs:
+        qty = np.broadcast_to(np.asarray(_value(qty_spec, v), dtype=np.float64), shape)
+        net = np.broadcast_to(np.asarray(_value(net_spec, v), dtype=np.float64), shape)
+        row_net = qty * net
+        bua = row_net * v[gf]
+        cost = bua * v["rate"]
+        total_net = total_net + row_net
+        total_bua = total_bua + bua
+        total_cost = total_cost + cost
+        total_qty = total_qty + qty
+        rows.append({"section": section, "name": name, "qty": qty, "net_per_unit": net,
+                     "total_net": row_net, "bua": bua, "cost": cost})
+    return rows, {"net": total_net, "bua": total_bua, "cost": total_cost, "qty": total_qty}
+
+
+def recalc(**params):
+    """Evaluate the Cost Simulator for scalar or array slider values.
+
+    Unspecified sliders take the HTML defaults. Returns a dict of float64
+    arrays (broadcast shape of the inputs) plus "tbc_rows" / "non_tbc_rows".
+    """
+    unknown = set(params) - set(DEFAULTS)
+    if unknown:
+        raise KeyError(f"unknown slider(s): {', '.join(sorted(unknown))}")
+    arrays = np.broadcast_arrays(*(np.asarray(params.get(k, d), dtype=np.float64)
+                                   for k, d in DEFAULTS.items()))
+    v = dict(zip(DEFAULTS, arrays))
+    shape = arrays[0].shape
+    students = v["students"]
+    buffer = v["buffer"] / 100
+
+    ey = js_round(students * RATIO_EY)
+    pri = js_round(students * RATIO_PRI)
+    int_ = js_round(students * RATIO_INT)
+    sec = students - ey - pri - int_
+    v["ey_cls"] = np.ceil(ey / v["eyCls"] * (1 + buffer))
+    v["pri_cls"] = np.ceil(pri / v["maxCls"] * (1 + buffer))
+    v["int_cls"] = np.ceil(int_ / v["maxCls"] * (1 + buffer))
+    v["sec_cls"] = np.ceil(sec / v["maxCls"] * (1 + buffer))
+    v["total_cls"] = v["ey_cls"] + v["pri_cls"] + v["int_cls"] + v["sec_cls"]
+    v["sci_pri"] = np.ceil(v["pri_cls"] / 10) * 2
+    v["sci_int"] = np.ceil(v["int_cls"] / 10) * 2
+    v["sci_sec"] = np.ceil(v["sec_cls"] / 10) * 2
+    v["scale"] = students / 7000
+    v["n_dining"] = np.maximum(1, js_round(2 * v["scale"]))
+
+    tbc_rows, tbc = _rows(TBC_ROWS, v, shape)
+    non_tbc_rows, non_tbc = _rows(NON_TBC_ROWS, v, shape)
+
+    grand_net = tbc["net"] + non_tbc["net"]
+    grand_bua = tbc["bua"] + non_tbc["bua"]
+    grand_cost = tbc["cost"] + non_tbc["cost"]
+    footprint = grand_bua / NUM_FLOORS
+    out = {
+        "ey": ey, "pri": pri, "int": int_, "sec": sec,
+        "ey_cls": v["ey_cls"], "pri_cls": v["pri_cls"], "int_cls": v["int_cls"],
+        "sec_cls": v["sec_cls"], "total_cls": v["total_cls"],
+        "tbc_net": tbc["net"], "tbc_bua": tbc["bua"], "tbc_cost": tbc["cost"], "tbc_qty": tbc["qty"],
+        "non_tbc_net": non_tbc["net"], "non_tbc_bua": non_tbc["bua"],
+        "non_tbc_cost": non_tbc["cost"], "non_tbc_qty": non_tbc["qty"],
+        "grand_net": grand_net, "grand_bua": grand_bua, "grand_cost": grand_cost,
+        "grand_cost_usd": grand_cost * SAR_TO_USD,
+        "total_rooms": tbc["qty"] + non_tbc["qty"],
+        "footprint": footprint,
+        "coverage": footprint / SITE_AREA * 100,
+        "pct_total": v["consultant"] + v["core"] + v["first"] + v["second"] + v["third"],
+        "tbc_pct": np.where(grand_cost > 0, tbc["cost"] / np.where(grand_cost > 0, grand_cost, 1) * 100, 50.0),
+        "m2_per_student": grand_bua / students,
+        "cost_per_student": grand_cost / students,
+        "tbc_rows": tbc_rows,
+        "non_tbc_rows": non_tbc_rows,
+    }
+    for stage in STAGES:
+        out[f"cost_{stage}"] = grand_cost * v[stage] / 100
+    return out
+
+
+def section_totals(result, key="total_net"):
+    """{section: array} summing one row field over each section."""
+    totals = {}
+    for row in result["tbc_rows"] + result["non_tbc_rows"]:
+        totals[row["section"]] = totals.get(row["section"], 0) + row[key]
+    return totals
+
+
+# ── Parity fixtures ─────────────────────────────────────────────────────────
+# Slider positions captured from the page (HTML defaults first)
+FIXTURE_CASES = [
+    {},
+    {"students": 5500}, {"students": 6000},
+    {"students": 2000, "rate": 3000, "maxCls": 20, "buffer": 0, "eyCls": 15},
+    {"students": 10000, "rate": 7000, "gfAcad": 1.8, "gfHs": 2.0, "gfOps": 1.9, "buffer": 20},
+    {"students": 6300, "rate": 4580, "consultant": 7.5, "core": 42.5, "maxCls": 30, "eyCls": 18},
+    {"students": 8700, "rate": 4960, "gfAcad": 1.33, "gfHs": 1.71, "gfOps": 1.27, "buffer": 13},
+]
+FIXTURE_SCALARS = (
+    "ey", "pri", "int", "sec", "ey_cls", "pri_cls", "int_cls", "sec_cls", "total_cls",
+    "tbc_net", "tbc_bua", "tbc_cost", "tbc_qty", "non_tbc_net", "non_tbc_bua", "non_tbc_cost",
+    "non_tbc_qty", "grand_net", "grand_bua", "grand_cost", "total_rooms", "footprint", "coverage",
+    "pct_total", "tbc_pct", "m2_per_student", "cost_per_student",
+) + tuple(f"cost_{s}" for s in STAGES)
+
+# JS names of the same values inside recalc()
+_JS_NAMES = {
+    "ey": "ey", "pri": "pri", "int": "int_", "sec": "sec", "ey_cls": "ey_cls", "pri_cls": "pri_cls",
+    "int_cls": "int_cls", "sec_cls": "sec_cls", "total_cls": "total_cls",
+    "tbc_net": "tbcTotalNet", "tbc_bua": "tbcTotalBUA", "tbc_cost": "tbcTotalCost", "tbc_qty": "tbcTotalQty",
+    "non_tbc_net": "ntbcTotalNet", "non_tbc_bua": "ntbcTotalBUA", "non_tbc_cost": "ntbcTotalCost",
+    "non_tbc_qty": "ntbcTotalQty", "grand_net": "grandNet", "grand_bua": "grandBUA",
+    "grand_cost": "grandCost", "total_rooms": "totalRooms", "footprint": "footprint",
+    "coverage": "coverage", "pct_total": "pctTotal", "tbc_pct": "tbcPct",
+    "m2_per_student": "grandBUA / students", "cost_per_student": "grandCost / students",
+    "cost_consultant": "cConsult", "cost_core": "cCore", "cost_first": "cFirst",
+    "cost_second": "cSecond", "cost_third": "cThird",
+}
+_SLIDER_IDS = {
+    "students": "sl-students", "rate": "sl-rate", "consultant": "sl-pct-consultant",
+    "core": "sl-pct-core", "first": "sl-pct-first", "second": "sl-pct-second",
+    "third": "sl-pct-third", "gfAcad": "sl-gf-acad", "gfHs": "sl-gf-hs", "gfOps": "sl-gf-ops",
+    "maxCls": "sl-maxcls", "buffer": "sl-buffer", "eyCls": "sl-eycls",
+}
+
+_NODE_HARNESS = """
+const values = %(values)s;
+const el = () => { const e = {value: '', textContent: '', innerHTML: '', className: '', style: {}};
+                   e.children = [0, 1, 2, 3, 4].map(() => ({style: {}, textContent: ''})); return e; };
+const nodes = {};
+const document = {getElementById: id => (nodes[id] = nodes[id] || el())};
+let __results = [];
+%(engine)s
+for (const v of values) {
+  for (const [id, val] of Object.entries(v)) nodes[id].value = String(val);
+  recalc();
+}
+console.log(JSON.stringify(__results));
+"""
+
+
+def _engine_source():
+    html = open(HTML_PATH, encoding="utf-8").read()
+    start = html.index("const SAR_TO_USD")
+    end = html.index("// ── BIND ALL SLIDERS")
+    engine = html[start:end]
+    capture = ", ".join(f'"{k}": {js}' for k, js in _JS_NAMES.items())
+    rows = ("tbc_rows: tbcRows.filter(r => !r.section).map(r => [r.qty, r.totalNet, r.bua, r.cost]), "
+            "non_tbc_rows: ntbcRows.filter(r => !r.section).map(r => [r.qty, r.totalNet, r.bua, r.cost])")
+    # Record the locals just before recalc() returns
+    hook = f"  __results.push({{{capture}, {rows}}});\n}}\n"
+    return re.sub(r"\n}\s*$", "\n" + hook, engine.rstrip() + "\n")
+
+
+def capture_fixtures(path=FIXTURES_PATH):
+    """Run the page's recalc() under node for FIXTURE_CASES and save the results."""
+    node = shutil.which("node") or shutil.which("nodejs")
+    if not node:
+        raise RuntimeError("node is required to capture fixtures from the HTML")
+    values = [{_SLIDER_IDS[k]: {**DEFAULTS, **case}[k] for k in DEFAULTS} for case in FIXTURE_CASES]
+    script = _NODE_HARNESS % {"values": json.dumps(values), "engine": _engine_source()}
+    out = subprocess.run([node, "-e", script], capture_output=True, text=True, check=True).stdout
+    fixtures = [{"inputs": case, "outputs": result} for case, result in zip(FIXTURE_CASES, json.loads(out))]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"source": os.path.basename(HTML_PATH), "cases": fixtures}, f, indent=1)
+    return fixtures
+
+
+def check_fixtures(path=FIXTURES_PATH):
+    """[(case index, field, expected, got)] for every mismatch (empty = parity)."""
+    with open(path, encoding="utf-8") as f:
+        cases = json.load(f)["cases"]
+    batch = {k: np.array([{**DEFAULTS, **c["inputs"]}[k] for c in cases], dtype=np.float64) for k in DEFAULTS}
+    result = recalc(**batch)
+    mismatches = []
+    for i, case in enumerate(cases):
+        expected = case["outputs"]
+        for key in FIXTURE_SCALARS:
+            if float(result[key][i]) != expected[key]:
+                mismatches.append((i, key, expected[key], float(result[key][i])))
+        for kind in ("tbc_rows", "non_tbc_rows"):
+            for r, (row, exp) in enumerate(zip(result[kind], expected[kind])):
+                got = [float(row[f][i]) for f in ("qty", "total_net", "bua", "cost")]
+                if got != exp:
+                    mismatches.append((i, f"{kind}[{r}] {row['name']}", exp, got))
+    return mismatches
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless Cost Simulator engine")
+    for key, default in DEFAULTS.items():
+        parser.add_argument(f"--{key}", type=float, default=default)
+    parser.add_argument("--check", action="store_true", help="compare against the parity fixtures")
+    parser.add_argument("--capture", action="store_true", help="re-capture fixtures from the HTML (node)")
+    args = parser.parse_args()
+
+    if args.capture:
+        print(f"✓ {len(capture_fixtures())} cases captured: {FIXTURES_PATH}")
+    elif args.check:
+        bad = check_fixtures()
+        for case, field, expected, got in bad:
+            print(f"  case {case}: {field} expected {expected} got {got}")
+        print(f"{'✓ Parity with' if not bad else '✗ Mismatch against'} {os.path.basename(FIXTURES_PATH)}")
+        raise SystemExit(1 if bad else 0)
+    else:
+        r = recalc(**{k: getattr(args, k) for k in DEFAULTS})
+        print(f"{int(args.students):,} students @ SAR {args.rate:,.0f}/m²")
+        print(f"  Rooms {r['total_rooms']:,.0f}  |  NET {r['grand_net']:,.0f} m²  |  BUA {r['grand_bua']:,.0f} m²")
+        print(f"  Cost SAR {r['grand_cost']:,.0f} / USD {r['grand_cost_usd']:,.0f}  |  coverage {r['coverage']:.1f}%")
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+PISES New Campus – Dining Simulation
+The price book has two "Dining Hall (700-seat, multi-shift)" rooms, each with
+a kitchen that "serves 3,500 meals per day". This checks that sizing against
+the lunch timetable with a discrete-event simulation of one hall:
+
+  - Arrival waves: one wave per sitting, students released over a few
+    minutes at the start of each sitting slot.
+  - Servery: one FIFO queue feeding SERVERY_LINES counters.
+  - Kitchen: meals are cooked in batches at a fixed interval on top of an
+    opening stock. The servery stops when the hot counter is empty.
+  - Seating: students eat for a random time and then leave. A student
+    with a tray and no free seat waits in a seat queue.
+
+Events are (time, seq, kind, payload) tuples on a heapq priority queue.
+Each seed is an independent run. Seeds go to a process pool, and the same
+seeds are reused for every seat count (common random numbers), so seat
+sweeps compare like with like.
+
+Queue time is servery wait plus seat wait. Seats only control the second
+part, so seats_for_target() finds the smallest seat count whose pooled
+95th-percentile seat wait meets a target, and lines_for_target() does the
+same for servery counters against the servery wait.
+
+Usage:
+  python dining_simulation.py [--students 7000] [--seeds 32] [--targets 2 5 10]
+"""
+
+import argparse
+import heapq
+import math
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+SEATS_PER_HALL = 700
+SERVERY_LINES = 12                   # two 6-counter serveries
+SERVICE_SECONDS = (15, 35, 22)       # triangular(low, high, mode)
+EAT_MINUTES = (18.0, 4.0, 8.0)       # normal(mean, sd), floor
+SITTING_MINUTES = 25
+ARRIVAL_WINDOW = 6.0                 # minutes over which a wave arrives
+KITCHEN_BATCH = 150                  # meals per batch (1,800 / hour)
+KITCHEN_INTERVAL = 5.0               # minutes between batches
+KITCHEN_OPENING_STOCK = 300
+PERCENTILES = (50, 90, 95, 99)
+
+
+def simulate_hall(seed, students, seats=SEATS_PER_HALL, lines=SERVERY_LINES):
+    """One lunch service for one hall.
+
+    Returns a 2 × students array of minutes: servery wait, seat wait.
+    """
+    rng = random.Random(seed)
+    sittings = math.ceil(students / SEATS_PER_HALL)
+    per_sitting = [students // sittings + (k < students % sittings) for k in range(sittings)]
+    events, seq = [], 0
+
+    def push(t, kind, payload=None):
+        nonlocal seq
+        heapq.heappush(events, (t, seq, kind, payload))
+        seq += 1
+
+    sid = 0
+    for k, n in enumerate(per_sitting):
+        start = k * SITTING_MINUTES
+        for _ in range(n):
+            push(start + rng.triangular(0, ARRIVAL_WINDOW, ARRIVAL_WINDOW * 0.2), "arrive", sid)
+            sid += 1
+    batches = math.ceil(max(0, students - KITCHEN_OPENING_STOCK) / KITCHEN_BATCH)
+    for b in range(1, batches + 1):
+        push(b * KITCHEN_INTERVAL, "batch")
+
+    arrived = np.zeros(students)
+    service_start = np.zeros(students)
+    service_end = np.zeros(students)
+    seated = np.zeros(students)
+    stock = KITCHEN_OPENING_STOCK
+    free_lines, free_seats = lines, seats
+    servery_q, seat_q = [], []       # FIFO lists with read heads
+    sq_head = st_head = 0
+
+    def start_service(t):
+        nonlocal free_lines, stock, sq_head
+        while free_lines and stock and sq_head < len(servery_q):
+            s = servery_q[sq_head]
+            sq_head += 1
+            free_lines -= 1
+            stock -= 1
+            service_start[s] = t
+            push(t + rng.triangular(*SERVICE_SECONDS) / 60, "served", s)
+
+    def seat(t):
+        nonlocal free_seats, st_head
+        while free_seats and st_head < len(seat_q):
+            s = seat_q[st_head]
+            st_head += 1
+            free_seats -= 1
+            seated[s] = t
+            mean, sd, floor = EAT_MINUTES
+            push(t + max(floor, rng.gauss(mean, sd)), "leave", s)
+
+    while events:
+        t, _, kind, s = heapq.heappop(events)
+        if kind == "arrive":
+            arrived[s] = t
+            servery_q.append(s)
+            start_service(t)
+        elif kind == "batch":
+            stock += KITCHEN_BATCH
+            start_service(t)
+        elif kind == "served":
+            free_lines += 1
+            service_end[s] = t
+            seat_q.append(s)
+            seat(t)
+            start_service(t)
+        elif kind == "leave":
+            free_seats += 1
+            seat(t)
+
+    return np.stack([service_start - arrived, seated - service_end])
+
+
+def _run(args):
+    return simulate_hall(*args)
+
+
+def queue_times(students, seats=SEATS_PER_HALL, seeds=32, lines=SERVERY_LINES, pool=None):
+    """Pooled (servery wait, seat wait) minutes for `seeds` runs of one hall (2 × N)."""
+    jobs = [(seed, students, seats, lines) for seed in range(seeds)]
+    runs = pool.map(_run, jobs) if pool else map(_run, jobs)
+    return np.concatenate(list(runs), axis=1)
+
+
+def percentiles(times):
+    return dict(zip(PERCENTILES, np.percentile(times, PERCENTILES)))
+
+
+def _smallest(ok, low, high, step):
+    """Smallest value in (low, high] (to `step`) for which ok() holds, or None."""
+    if not ok(high):
+        return None
+    while high - low > step:
+        mid = (low + high) // 2
+        if ok(mid):
+            high = mid
+        else:
+            low = mid
+    return high
+
+
+def seats_for_target(students, target_minutes, seeds=32, percentile=95, pool=None,
+                     lines=SERVERY_LINES):
+    """Smallest seat count (to 10 seats) whose percentile seat wait ≤ target, or None."""
+    def ok(seats):
+        waits = queue_times(students, seats, seeds, lines, pool=pool)[1]
+        return np.percentile(waits, percentile) <= target_minutes
+    return _smallest(ok, 50, 2 * SEATS_PER_HALL, 10)
+
+
+def lines_for_target(students, target_minutes, seeds=32, percentile=95, pool=None,
+                     seats=SEATS_PER_HALL):
+    """Smallest servery line count whose percentile servery wait ≤ target.
+
+    None when even 4 × SERVERY_LINES cannot meet it, i.e. the kitchen's batch
+    rate, not the counters, sets the wait.
+    """
+    def ok(lines):
+        waits = queue_times(students, seats, seeds, lines, pool=pool)[0]
+        return np.percentile(waits, percentile) <= target_minutes
+    return _smallest(ok, 0, 4 * SERVERY_LINES, 1)
+
+
+if __name__ == "__main__":
+    from space_programme import DESIGN_STUDENTS, Programme
+
+    parser = argparse.ArgumentParser(description="Dining hall discrete-event simulation")
+    parser.add_argument("--students", type=int, default=DESIGN_STUDENTS)
+    parser.add_argument("--seeds", type=int, default=32)
+    parser.add_argument("--targets", type=float, nargs="+", default=[2, 5, 10],
+                        help="95th percentile queue time targets (minutes)")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    halls = Programme(students=args.students).values["dining_halls"]
+    per_hall = math.ceil(args.students / halls)
+    print(f"Dining – {args.students:,} students, {halls} halls ({per_hall:,} per hall), "
+          f"{args.seeds} seeds")
+    with ProcessPoolExecutor(args.workers) as pool:
+        servery, seat = queue_times(per_hall, seeds=args.seeds, pool=pool)
+        print(f"  At {SEATS_PER_HALL} seats, {SERVERY_LINES} servery lines / hall:")
+        for label, times in (("Total", servery + seat), ("Servery", servery), ("Seat", seat)):
+            print(f"    {label:<8} " + "  ".join(f"P{k} {v:5.1f} min" for k, v in percentiles(times).items()))
+        for target in args.targets:
+            seats = seats_for_target(per_hall, target, args.seeds, pool=pool)
+            lines = lines_for_target(per_hall, target, args.seeds, pool=pool)
+            print(f"  P95 ≤ {target:g} min:  seats / hall {seats or 'n/a':>5}   "
+                  f"servery lines / hall {lines or 'n/a (kitchen-bound)'}")
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+PISES New Campus – Price Escalation
+Every price book figure is in base-year SAR (2025) excluding inflation. This
+adds the time dimension: each unit escalates at its grossing class's annual
+rate, or at its category's rate where the price book sets an override
+(e.g. IT infrastructure), compounded from 1 January of the base year.
+
+  escalated_prices(model, years)  → units × years int64 SAR, one array op
+  pledge_price(model, items, when) → SAR for a pledge dated any day, with the
+                                     index interpolated within the year
+
+Year columns are 1 January price levels, so a pledge dated 1 Jan 2027 costs
+exactly the 2027 column. The index is held in fixed point (INDEX_SCALE) and
+applied to the integer base prices through money.div_round, rounding to whole
+SAR with ESCALATION_ROUNDING.
+
+Usage:
+  python escalation.py [--years 2025-2030]
+  python escalation.py --pledge "Name a Classroom" --date 2027-09-01
+"""
+
+import argparse
+from datetime import date
+
+import numpy as np
+
+from money import RATE_SCALE, ROUND_HALF_EVEN, checked_product, div_round
+
+INDEX_SCALE = RATE_SCALE                  # escalation index in 0.000001
+ESCALATION_ROUNDING = ROUND_HALF_EVEN     # escalated prices → whole SAR
+
+
+def base_year(model):
+    return int(model["settings"]["base_year"])
+
+
+def _base_prices(model):
+    return np.array([u["unit_cost_sar"] for u in model["units"]], dtype=np.int64)
+
+
+def _rates(model):
+    return np.array([u["escalation_rate"] for u in model["units"]], dtype=np.float64)
+
+
+def _fixed_index(factor):
+    """Compound escalation factor(s) → int64 index at INDEX_SCALE, rounded once."""
+    return np.rint(np.asarray(factor, dtype=np.float64) * INDEX_SCALE).astype(np.int64)
+
+
+def _apply_index(prices, index):
+    """Whole-SAR prices × fixed-point index, rounded with ESCALATION_ROUNDING."""
+    return div_round(checked_product(prices, index), INDEX_SCALE, ESCALATION_ROUNDING)
+
+
+def index_matrix(model, years):
+    """Escalation index per unit per year (units × years int64 at INDEX_SCALE)."""
+    elapsed = np.asarray(years, dtype=np.float64) - base_year(model)
+    return _fixed_index(np.power(1.0 + _rates(model)[:, None], elapsed[None, :]))
+
+
+def escalated_prices(model, years):
+    """Whole-SAR unit prices for every unit in every year (units × years int64)."""
+    return _apply_index(_base_prices(model)[:, None], index_matrix(model, years))
+
+
+def _years_elapsed(model, when):
+    start = date(base_year(model), 1, 1)
+    if when < start:
+        raise ValueError(f"{when} is before the {base_year(model)} price base")
+    year_start, next_start = date(when.year, 1, 1), date(when.year + 1, 1, 1)
+    frac = (when - year_start).days / (next_start - year_start).days
+    return when.year - start.year + frac
+
+
+def pledge_price(model, items, when):
+    """SAR price of a pledge dated `when`.
+
+    items: [(unit name or id, qty)] or a package name from the price book.
+    """
+    if isinstance(items, str):
+        items = _package_items(model, items)
+    by_key = {}
+    for i, u in enumerate(model["units"]):
+        by_key[u["name"]] = by_key[u["id"]] = i
+    idx = np.array([by_key[k] for k, _ in items])
+    qty = np.array([q for _, q in items], dtype=np.int64)
+    index = _fixed_index(np.power(1.0 + _rates(model)[idx], _years_elapsed(model, when)))
+    unit = _apply_index(_base_prices(model)[idx], index)
+    return int((unit * qty).sum())
+
+
+def _package_items(model, name):
+    for tier in model["tiers"]:
+        for pkg in tier["packages"]:
+            if pkg["name"] == name:
+                return pkg["units"]
+    raise KeyError(f"no package named {name!r}")
+
+
+if __name__ == "__main__":
+    from price_book import load_model
+
+    parser = argparse.ArgumentParser(description="Escalated price book / pledge pricing")
+    parser.add_argument("--years", default=None, help="range, e.g. 2025-2030")
+    parser.add_argument("--pledge", help="package name to price")
+    parser.add_argument("--date", type=date.fromisoformat, default=date.today())
+    args = parser.parse_args()
+
+    model = load_model()
+    if args.pledge:
+        try:
+            base = pledge_price(model, args.pledge, date(base_year(model), 1, 1))
+            price = pledge_price(model, args.pledge, args.date)
+        except (KeyError, ValueError) as e:
+            parser.exit(2, f"escalation: {e.args[0] if e.args else e}\n")
+        print(f"{args.pledge}: SAR {price:,} on {args.date}  (base {base_year(model)}: SAR {base:,})")
+    else:
+        first, _, last = (args.years or f"{base_year(model)}-{base_year(model) + 5}").partition("-")
+        try:
+            years = list(range(int(first), int(last or first) + 1))
+            if years and years[0] < base_year(model):
+                raise ValueError(f"{years[0]} is before the {base_year(model)} price base")
+        except ValueError as e:
+            parser.exit(2, f"escalation: {e.args[0] if e.args else e}\n")
+        prices = escalated_prices(model, years)
+        qty = np.array([u["qty"] for u in model["units"]], dtype=np.int64)
+        totals = qty @ prices
+        for y, t in zip(years, totals):
+            print(f"  {y}  SAR {t:>14,}")
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+PISES New Campus – Floor Stacking (B+G+2)
+compute_scenario() estimates the footprint as gross BUA / 3, as if every space
+could sit on any floor. This packs every UNITS entry's BUA onto Basement,
+Ground, Level 1 and Level 2 under level and adjacency rules, and reports
+per-floor areas, the building's site coverage and the total site use
+(footprint plus outdoor courts), flagging layouts that do not fit the plot.
+
+  - Level rules: pool, sports halls, dining, auditorium and Early Years on
+    grade; plant-type rooms in the basement; SEN / Primary support no
+    higher than Level 1 (first matching rule in PLACEMENT).
+  - Double-height volumes (pool, sports halls, auditorium, atrium) also
+    take their area on the floor above as a void.
+  - Adjacency: dependent rooms travel with the room they serve (prep rooms
+    with science labs, holding rooms with the exam hall…), so a block is
+    one lead room plus its attached rooms.
+  - Outdoor courts use site area but are not covered floor area.
+
+Packing is first-fit-decreasing onto the lightest allowed floor, then a
+local search that moves or swaps blocks off the largest above-grade floor
+until the footprint (largest floor plate) stops shrinking. Blocks are
+grouped by (area, allowed levels) for the swap search, so a full campus
+packs in a few milliseconds, which is fast enough for capacity sweeps.
+
+Usage:
+  python floor_stacking.py [--students 7000] [--plot 25000]
+"""
+
+import argparse
+from collections import Counter, defaultdict
+
+SITE_AREA_M2 = 25_000
+LEVELS = ("B", "G", "1", "2")
+ABOVE_GRADE = ("G", "1", "2")
+OUTDOOR = "outdoor"
+
+# (name fragment, allowed levels, double height) – first match wins
+PLACEMENT = [
+    ("Outdoor", (OUTDOOR,), False),
+    ("Swimming Pool", ("G",), True),
+    ("Sports Hall", ("G",), True),
+    ("Auditorium", ("G",), True),
+    ("Atrium", ("G",), True),
+    ("Sports Changing", ("G",), False),
+    ("Sports Storage", ("B", "G"), False),
+    ("Dining Hall", ("G",), False),
+    ("Kitchen", ("G",), False),
+    ("Cold Room", ("B", "G"), False),
+    ("Server Room", ("B", "G"), False),
+    ("Chemical Storage", ("G",), False),
+    ("Kindergarten", ("G",), False),
+    ("Nursery", ("G",), False),
+    ("Reception Classroom", ("G",), False),
+    ("Early Years", ("G",), False),
+    ("Medical", ("G",), False),
+    ("Isolation", ("G",), False),
+    ("Reception & Welcome", ("G",), False),
+    ("Principal", ("G",), False),
+    ("Admissions", ("G",), False),
+    ("Finance", ("G",), False),
+    ("Uniform Shop", ("G",), False),
+    ("School Store", ("G",), False),
+    ("Security Control", ("G",), False),
+    ("Transport", ("G",), False),
+    ("Exam Hall", ("G", "1"), False),
+    ("Primary", ("G", "1"), False),
+    ("SEN", ("G", "1"), False),
+    ("1:1 Assessment", ("G", "1"), False),
+    ("Therapy", ("G", "1"), False),
+    ("Sensory", ("G", "1"), False),
+]
+DEFAULT_LEVELS = ABOVE_GRADE
+
+# Attached room → name fragment of the room it must share a floor with
+ADJACENT = {
+    "Science Prep Room": "Science Lab",
+    "Candidate Holding Room": "Exam Hall",
+    "Nursery Bedroom / Rest Room": "Nursery Activity Room",
+    "Commercial Kitchen & Prep Area": "Dining Hall",
+}
+
+
+def placement(name):
+    for fragment, levels, double in PLACEMENT:
+        if fragment in name:
+            return levels, double
+    return DEFAULT_LEVELS, False
+
+
+def _blocks(units):
+    """[(names, bua, levels, double)] – one per room, attached rooms merged in."""
+    rooms = []
+    for name, _, qty, net_m2, gf, _ in units:
+        if qty is None:
+            continue
+        levels, double = placement(name)
+        rooms += [[name, round(net_m2 * gf, 2), levels, double] for _ in range(qty)]
+
+    leads = defaultdict(list)
+    attached = []
+    for room in rooms:
+        if room[0] in ADJACENT:
+            attached.append(room)
+        else:
+            for lead_name in set(ADJACENT.values()):
+                if lead_name in room[0]:
+                    leads[lead_name].append(room)
+    blocks = {id(r): [[r[0]], r[1], r[2], r[3]] for r in rooms if r[0] not in ADJACENT}
+    # Spread each kind of attached room evenly over the rooms it serves
+    count, turn = Counter(r[0] for r in attached), Counter()
+    for room in attached:
+        targets = leads.get(ADJACENT[room[0]])
+        if not targets:
+            blocks[id(room)] = [[room[0]], room[1], room[2], room[3]]
+            continue
+        block = blocks[id(targets[turn[room[0]] * len(targets) // count[room[0]]])]
+        turn[room[0]] += 1
+        block[0].append(room[0])
+        block[1] = round(block[1] + room[1], 2)
+        block[2] = tuple(l for l in block[2] if l in room[2]) or block[2]
+    return list(blocks.values())
+
+
+def stack(units, plot_m2=SITE_AREA_M2, basement_cap=None):
+    """Assign every unit's BUA to B/G/1/2.
+
+    basement_cap: m² available below grade (None = no limit). Returns
+    {"floors": {level: {"bua", "void", "plate"}}, "footprint", "coverage",
+     "outdoor", "site_use", "site_share", "fits", "assignment": {unit name:
+     {level: count}}, "estimate"}. coverage is the building alone; site_use
+    adds the outdoor courts, and fits is False when that exceeds the plot.
+    """
+    blocks = sorted(_blocks(units), key=lambda b: -b[1])
+    bua = dict.fromkeys(LEVELS + (OUTDOOR,), 0.0)
+    void = dict.fromkeys(LEVELS, 0.0)
+    where = []
+
+    def plate(level):
+        return bua[level] + void[level]
+
+    # First-fit decreasing: basement if allowed and it fits, else the
+    # lightest allowed above-grade floor
+    for names, area, levels, double in blocks:
+        if OUTDOOR in levels:
+            level = OUTDOOR
+        elif "B" in levels and (basement_cap is None or bua["B"] + area <= basement_cap):
+            level = "B"
+        else:
+            level = min((l for l in levels if l in ABOVE_GRADE), key=plate)
+        bua[level] += area
+        if double:
+            void[ABOVE_GRADE[ABOVE_GRADE.index(level) + 1]] += area
+        where.append(level)
+
+    # Local search on the above-grade footprint
+    movable = [i for i, b in enumerate(blocks)
+               if where[i] in ABOVE_GRADE and sum(l in ABOVE_GRADE for l in b[2]) > 1]
+    while True:
+        top = max(ABOVE_GRADE, key=plate)
+        peak = plate(top)
+        best = None
+        # Single move off the top floor
+        for i in movable:
+            if where[i] != top:
+                continue
+            area = blocks[i][1]
+            for level in blocks[i][2]:
+                score = max(peak - area, plate(level) + area)
+                if level != top and level in ABOVE_GRADE and score < peak - 1e-9:
+                    if best is None or score < best[0]:
+                        best = (score, i, level, None)
+        if best is None:
+            # Swap a larger block on the top floor for a smaller one elsewhere
+            kinds = defaultdict(list)
+            for i in movable:
+                kinds[(where[i], blocks[i][1], blocks[i][2])].append(i)
+            for (lvl_a, area_a, allowed_a), ids_a in kinds.items():
+                if lvl_a != top:
+                    continue
+                for (lvl_b, area_b, allowed_b), ids_b in kinds.items():
+                    if lvl_b == top or area_b >= area_a or lvl_b not in allowed_a or top not in allowed_b:
+                        continue
+                    delta = area_a - area_b
+                    score = max(peak - delta, plate(lvl_b) + delta)
+                    if score < peak - 1e-9 and (best is None or score < best[0]):
+                        best = (score, ids_a[0], lvl_b, ids_b[0])
+        if best is None:
+            break
+        _, i, level, j = best
+        bua[top] -= blocks[i][1]
+        bua[level] += blocks[i][1]
+        where[i] = level
+        if j is not None:
+            bua[level] -= blocks[j][1]
+            bua[top] += blocks[j][1]
+            where[j] = top
+
+    assignment = defaultdict(Counter)
+    for (names, *_), level in zip(blocks, where):
+        for name in names:
+            assignment[name][level] += 1
+    footprint = max(plate(l) for l in ABOVE_GRADE)
+    covered = sum(bua[l] for l in LEVELS)
+    site_use = footprint + bua[OUTDOOR]
+    return {
+        "floors": {l: {"bua": round(bua[l]), "void": round(void[l]), "plate": round(plate(l))}
+                   for l in LEVELS},
+        "footprint": round(footprint),
+        "coverage": footprint / plot_m2,
+        "outdoor": round(bua[OUTDOOR]),
+        "site_use": round(site_use),
+        "site_share": site_use / plot_m2,
+        "fits": site_use <= plot_m2,
+        "assignment": {name: dict(c) for name, c in assignment.items()},
+        "estimate": {"footprint": round(covered / 3), "coverage": covered / 3 / plot_m2},
+    }
+
+
+if __name__ == "__main__":
+    from build_donor_pricing import UNITS
+    from space_programme import DESIGN_STUDENTS, Programme
+
+    parser = argparse.ArgumentParser(description="Pack the space programme onto B+G+2 floors")
+    parser.add_argument("--students", type=int, default=None,
+                        help="derive quantities for this capacity (default: price book)")
+    parser.add_argument("--plot", type=float, default=SITE_AREA_M2, help="site area m²")
+    args = parser.parse_args()
+
+    units = UNITS if args.students is None else Programme(students=args.students).units(UNITS)
+    result = stack(units, plot_m2=args.plot)
+    print(f"Floor stacking – {args.students or DESIGN_STUDENTS:,} students, plot {args.plot:,.0f} m²")
+    print(f"  {'Level':<6} {'BUA m²':>10} {'Void m²':>10} {'Plate m²':>10}")
+    for level, f in result["floors"].items():
+        print(f"  {level:<6} {f['bua']:>10,} {f['void']:>10,} {f['plate']:>10,}")
+    print(f"  Outdoor courts: {result['outdoor']:,} m² (uncovered)")
+    print(f"  Footprint: {result['footprint']:,} m²  →  coverage {result['coverage']:.1%}  "
+          f"(BUA / 3 estimate: {result['estimate']['coverage']:.1%})")
+    mark = "✓" if result["fits"] else "✗"
+    print(f"{mark} Site use (footprint + courts): {result['site_use']:,} m² = {result['site_share']:.1%} of the plot"
+          + ("" if result["fits"] else f"  –  over by {result['site_use'] - args.plot:,.0f} m², does not fit"))
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+PISES New Campus – Currency Conversion
+Donor prices in currencies other than SAR, from a local FX snapshot
+(PISES_FX_Snapshot.json) rather than live rates, so every workbook and deck
+built from the same snapshot quotes the same numbers.
+
+The snapshot gives SAR per 1 unit of each currency plus named currency sets
+(e.g. "workbook", "diaspora"). Rates must be exact at money.RATE_SCALE
+(6 decimals). Conversion goes through money.convert(): integer halalas over
+the fixed-point rate, rounded half-even once to whole units. This is the same
+rule as the workbook's USD columns, so every artifact quotes the same amount.
+
+Usage:
+  python fx.py [AMOUNT_SAR] [--set NAME | --currencies GBP,PKR]
+"""
+
+import argparse
+import json
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from money import RATE_SCALE, convert as convert_halalas, fixed, sar
+
+FX_SNAPSHOT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                "PISES_FX_Snapshot.json")
+
+
+@lru_cache(maxsize=None)
+def load_snapshot(path=FX_SNAPSHOT_PATH):
+    """Parsed FX snapshot (cached per path)."""
+    with open(path, encoding="utf-8") as f:
+        snap = json.load(f)
+    if snap.get("base") != "SAR":
+        raise ValueError(f"{path}: FX snapshot must be SAR-based")
+    for code, rate in snap["sar_per_unit"].items():
+        if rate <= 0:
+            raise ValueError(f"{path}: non-positive rate for {code}")
+        try:
+            fixed(rate, RATE_SCALE)
+        except ValueError:
+            raise ValueError(f"{path}: rate for {code} has more than 6 decimals") from None
+    return snap
+
+
+def currency_set(name_or_codes, snapshot=None):
+    """Resolve a named currency set or an explicit list of ISO codes."""
+    snap = snapshot or load_snapshot()
+    codes = (snap["currency_sets"][name_or_codes] if isinstance(name_or_codes, str)
+             else list(name_or_codes))
+    missing = [c for c in codes if c not in snap["sar_per_unit"]]
+    if missing:
+        raise KeyError(f"no rate for {', '.join(missing)} in FX snapshot {snap['as_of']}")
+    return codes
+
+
+def sar_per_unit(code, snapshot=None):
+    return (snapshot or load_snapshot())["sar_per_unit"][code]
+
+
+def convert_matrix(prices_sar, codes, snapshot=None):
+    """Whole-unit amounts for every price in every currency: int64 (n, k)."""
+    snap = snapshot or load_snapshot()
+    halalas = sar(np.asarray(prices_sar).reshape(-1))
+    out = np.empty((len(halalas), len(codes)), dtype=np.int64)
+    for k, code in enumerate(codes):
+        out[:, k] = convert_halalas(halalas, snap["sar_per_unit"][code], quantum=100) // 100
+    return out
+
+
+def convert(amount_sar, code, snapshot=None):
+    """Single amount → whole units of `code`."""
+    return int(convert_matrix([amount_sar], [code], snapshot)[0, 0])
+
+
+def fmt_money(amount, code):
+    if amount >= 1_000_000:
+        return f"{code} {amount/1_000_000:,.1f}M"
+    return f"{code} {amount:,.0f}"
+
+
+def rate_label(code, snapshot=None):
+    """e.g. '1 GBP = 5.142 SAR'."""
+    return f"1 {code} = {sar_per_unit(code, snapshot):g} SAR"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert SAR amounts with the FX snapshot")
+    parser.add_argument("amount", nargs="?", type=float, default=1_000_000)
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--set", default="workbook")
+    group.add_argument("--currencies")
+    args = parser.parse_args()
+
+    snap = load_snapshot()
+    try:
+        codes = currency_set(args.currencies.split(",") if args.currencies else args.set)
+        row = convert_matrix([args.amount], codes)[0]
+    except (KeyError, ValueError) as e:
+        parser.exit(2, f"fx: {e.args[0] if e.args else e}\n")
+    print(f"FX snapshot {snap['as_of']}:  SAR {args.amount:,.0f}")
+    for code, value in zip(codes, row):
+        print(f"  {code} {value:>16,}   ({rate_label(code)})")
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+PISES New Campus – Donor Workbook Importer
+Reads edits made by the development office in PISES_Donor_Unit_Pricing.xlsx
+back into the price book, instead of re-typing them into the data file.
+
+The "Unit Pricing" sheet is streamed with openpyxl read-only mode (one row in
+memory at a time, other sheets never parsed). Rows are matched to units by
+the "#" column, and each row's category header must agree with the price
+book so that a shifted or pasted-over block is rejected rather than
+mis-applied. Only editable columns are compared:
+
+  Unit Name, Description, Qty, NET m², Students Impacted
+
+Cost columns are derived and ignored. Applying a change set re-prices only
+the units whose NET area changed. Qty must be a whole number and NET areas
+are rounded to 0.01 m² as they are read; a bad cell, or a rename onto
+another unit's name, is reported with its row and nothing is written.
+
+Each applied import is recorded as a version in PISES_Price_History.sqlite
+(price_history.py), so earlier quotes can still be reproduced.
+
+Usage:
+  python import_donor_pricing.py WORKBOOK.xlsx            # show change set
+  python import_donor_pricing.py WORKBOOK.xlsx --apply    # write to price book
+"""
+
+import argparse
+import math
+import os
+import sqlite3
+import sys
+
+import openpyxl
+
+from money import quantise
+from price_book import PRICE_BOOK_PATH, connect, reprice
+from price_history import HISTORY_PATH, PriceHistory
+
+SHEET_NAME = "Unit Pricing"
+FIRST_DATA_ROW = 6
+
+# Workbook column (0-based) → (units column, comparison)
+EDITABLE_COLUMNS = {
+    1: ("name", "text"),
+    2: ("description", "text"),
+    3: ("qty", "int"),
+    4: ("net_m2", "area"),
+    10: ("students_note", "text"),
+}
+
+
+class WorkbookImportError(ValueError):
+    """The workbook layout does not line up with the price book."""
+
+
+def _current_units(path):
+    conn = connect(path)
+    try:
+        cur = conn.execute(
+            "SELECT u.sort_order, u.id, c.name, u.name, u.description, u.qty, u.net_m2, "
+            "u.students_note FROM units u JOIN categories c ON c.id = u.category_id")
+        return {row[0]: {"id": row[1], "category": row[2], "name": row[3],
+                         "description": row[4], "qty": row[5], "net_m2": row[6],
+                         "students_note": row[7]} for row in cur}
+    finally:
+        conn.close()
+
+
+def _coerce(kind, value):
+    """Workbook cell → price book value; ValueError if it cannot be one.
+
+    NET areas go through money.quantise() (half-even to 0.01 m², the price
+    book's fixed-point scale), so every stored area can be re-priced exactly.
+    """
+    if kind == "text":
+        return str(value).strip()
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError("is not a number") from None
+    if not math.isfinite(number):
+        raise ValueError("is not a number")
+    if kind == "int":
+        if number != int(number) or number < 0:
+            raise ValueError("is not a whole number of units")
+        return int(number)
+    if not number > 0:
+        raise ValueError("is not a positive area")
+    return quantise(number)
+
+
+def _changed(kind, old, new):
+    if kind == "area":
+        # NET m² is written rounded to 0.1, so only a different rounded value is an edit
+        return round(new, 1) != round(old, 1)
+    return new != old
+
+
+def read_changes(workbook_path, price_book_path=PRICE_BOOK_PATH):
+    """Stream the Unit Pricing sheet and return a list of change dicts.
+
+    Each change: {"unit_id", "row", "field", "old", "new"}.
+    """
+    units = _current_units(price_book_path)
+    wb = openpyxl.load_workbook(workbook_path, read_only=True, data_only=True)
+    try:
+        if SHEET_NAME not in wb.sheetnames:
+            raise WorkbookImportError(f"no '{SHEET_NAME}' sheet in {workbook_path}")
+        ws = wb[SHEET_NAME]
+        changes, seen, category = [], set(), None
+        for row_num, row in enumerate(ws.iter_rows(min_row=FIRST_DATA_ROW, values_only=True),
+                                      FIRST_DATA_ROW):
+            first = row[0] if row else None
+            if first is None:
+                continue
+            if isinstance(first, str):
+                if first.startswith("GRAND TOTAL"):
+                    break
+                category = first.strip()
+                continue
+            try:
+                num = int(first)
+            except (TypeError, ValueError):
+                raise WorkbookImportError(f"row {row_num}: '#' cell {first!r} is not a unit number") from None
+            unit = units.get(num)
+            if unit is None:
+                raise WorkbookImportError(f"row {row_num}: no unit #{num} in the price book")
+            if unit["category"] != category:
+                raise WorkbookImportError(
+                    f"row {row_num}: unit #{num} is under '{category}', "
+                    f"price book has it under '{unit['category']}'")
+            if num in seen:
+                raise WorkbookImportError(f"row {row_num}: unit #{num} appears twice")
+            seen.add(num)
+            for col, (field, kind) in EDITABLE_COLUMNS.items():
+                new = row[col] if col < len(row) else None
+                if new is None:
+                    continue  # blank cell: leave the price book value alone
+                try:
+                    new = _coerce(kind, new)
+                except ValueError as exc:
+                    raise WorkbookImportError(f"row {row_num}: {field} {row[col]!r} {exc}") from None
+                if _changed(kind, unit[field], new):
+                    changes.append({"unit_id": unit["id"], "row": row_num, "field": field,
+                                    "old": unit[field], "new": new})
+    finally:
+        wb.close()
+    return changes
+
+
+def apply_changes(changes, price_book_path=PRICE_BOOK_PATH):
+    """Write a change set to the price book; re-price only re-sized units.
+
+    Nothing is written if any change is rejected (e.g. a rename onto another
+    unit's name); WorkbookImportError names the row.
+    """
+    resized = {c["unit_id"] for c in changes if c["field"] == "net_m2"}
+    conn = sqlite3.connect(price_book_path)
+    try:
+        with conn:
+            for c in changes:
+                # field names come from EDITABLE_COLUMNS, never from the workbook
+                try:
+                    conn.execute(f"UPDATE units SET {c['field']} = ? WHERE id = ?",
+                                 (c["new"], c["unit_id"]))
+                except sqlite3.IntegrityError as exc:
+                    detail = "another unit already has that name" if "UNIQUE" in str(exc) else str(exc)
+                    raise WorkbookImportError(f"row {c['row']}: {c['field']} {c['new']!r}: {detail}") from None
+            if resized:
+                reprice(conn, resized)
+    finally:
+        conn.close()
+    return resized
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import donor workbook edits into the price book")
+    parser.add_argument("workbook")
+    parser.add_argument("--price-book", default=PRICE_BOOK_PATH)
+    parser.add_argument("--apply", action="store_true", help="write the change set")
+    parser.add_argument("--history", default=HISTORY_PATH, help="price book version store (price_history.py)")
+    args = parser.parse_args()
+
+    try:
+        changes = read_changes(args.workbook, args.price_book)
+    except WorkbookImportError as exc:
+        print(f"✗ {exc}")
+        sys.exit(1)
+
+    for c in changes:
+        print(f"  Row {c['row']:>3}  unit {c['unit_id']:>3}  {c['field']:<14} {c['old']!r} → {c['new']!r}")
+    print(f"{len(changes)} change(s)")
+    if args.apply and changes:
+        history = PriceHistory(args.history)
+        if history.latest() is None:
+            history.snapshot("Price book before first workbook import", args.price_book)
+        try:
+            resized = apply_changes(changes, args.price_book)
+        except WorkbookImportError as exc:
+            history.close()
+            print(f"✗ {exc}  (price book left unchanged)")
+            sys.exit(1)
+        print(f"✓ Price book updated: {args.price_book}  ({len(resized)} unit(s) re-priced)")
+        version = history.snapshot(f"Imported {os.path.basename(args.workbook)} ({len(changes)} change(s))",
+                                   args.price_book)
+        history.close()
+        print(f"✓ Recorded as price book version {version}")
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+PISES New Campus – Build Instrumentation
+Opt-in timing for the builders: where does build_workbook() spend its time
+(styling, merge_cells, the zip compression inside wb.save), and where do the
+decks spend theirs (style_data_cell, add_text_box, prs.save)?
+
+  - Stages: sequential sections such as one sheet or one slide, marked with
+    stages(...).next(name) so the builders need no re-indenting.
+  - span(name): a context manager for any other block.
+  - traced: a decorator for helpers. It records every call (count, total,
+    max) and nests the call under the open stage in the trace.
+  - Library hot paths are patched by enable(): openpyxl style assignment,
+    Worksheet.merge_cells, Workbook.save, Presentation.save and
+    ZipFile.writestr (the compression inside both saves).
+  - Memory: with memory=True, tracemalloc records each stage's peak above
+    its starting allocation.
+
+Disabled (the default), nothing is patched or wrapped. traced returns the
+function unchanged, and span() / stages() return shared no-op objects, so
+the builders run exactly as before. enable() must run before the helpers are
+defined: a builder calls enable_from_argv() right after its imports.
+
+Output is a Chrome trace-event JSON (chrome://tracing or ui.perfetto.dev)
+and a summary table.
+
+Usage:
+  python build_donor_pricing_deck.py --profile [--profile-memory]
+  python instrument.py [--trace out.json] [--memory] SCRIPT [ARGS…]
+"""
+
+import argparse
+import atexit
+import contextlib
+import functools
+import json
+import os
+import runpy
+import sys
+import threading
+import time
+import tracemalloc
+
+ENABLED = False
+MEMORY = False
+TRACE_DIR = "/home/user/PISES"
+
+_events = []                 # Chrome "X" (complete) events
+_stats = {}                  # name → [category, calls, total s, max s, peak bytes]
+_memory_stack = []           # [start bytes, peak seen in children] per open stage
+_t0 = time.perf_counter()
+_NULL = contextlib.nullcontext()
+
+
+def _record(name, cat, start, end, peak=None):
+    row = _stats.setdefault(name, [cat, 0, 0.0, 0.0, None])
+    row[1] += 1
+    row[2] += end - start
+    row[3] = max(row[3], end - start)
+    event = {"name": name, "cat": cat, "ph": "X", "pid": os.getpid(), "tid": threading.get_ident(),
+             "ts": (start - _t0) * 1e6, "dur": (end - start) * 1e6}
+    if peak is not None:
+        row[4] = max(row[4] or 0, peak)
+        event["args"] = {"peak_kb": round(peak / 1024, 1)}
+    _events.append(event)
+
+
+class _Span:
+    __slots__ = ("name", "cat", "start")
+
+    def __init__(self, name, cat):
+        self.name, self.cat = name, cat
+
+    def __enter__(self):
+        if MEMORY:
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            _memory_stack.append([current, 0])
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        peak = None
+        if MEMORY:
+            start_bytes, child_peak = _memory_stack.pop()
+            _, traced_peak = tracemalloc.get_traced_memory()
+            absolute = max(traced_peak, child_peak)
+            peak = absolute - start_bytes
+            if _memory_stack:
+                _memory_stack[-1][1] = max(_memory_stack[-1][1], absolute)
+        _record(self.name, self.cat, self.start, end, peak)
+
+
+def span(name, cat="stage"):
+    """Time a block (no-op unless enabled)."""
+    return _Span(name, cat) if ENABLED else _NULL
+
+
+class _Stages:
+    """Sequential stages: next() closes the previous stage and opens another."""
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self.current = None
+
+    def next(self, name):
+        self.end()
+        self.current = _Span(f"{self.prefix}: {name}", "stage")
+        self.current.__enter__()
+
+    def end(self):
+        if self.current is not None:
+            self.current.__exit__(None, None, None)
+            self.current = None
+
+
+class _NoStages:
+    def next(self, name):
+        pass
+
+    def end(self):
+        pass
+
+
+_NO_STAGES = _NoStages()
+
+
+def stages(prefix):
+    """Stage marker for a builder (shared no-op unless enabled)."""
+    return _Stages(prefix) if ENABLED else _NO_STAGES
+
+
+def _wrap(fn, name, cat):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _record(name, cat, start, time.perf_counter())
+    wrapper.__wrapped_by_instrument__ = True
+    return wrapper
+
+
+def traced(fn=None, *, name=None, cat="helper"):
+    """Decorator: count and time every call (returns fn itself unless enabled)."""
+    if fn is None:
+        return lambda f: traced(f, name=name, cat=cat)
+    if not ENABLED:
+        return fn
+    return _wrap(fn, name or fn.__name__, cat)
+
+
+def _patch(owner, attr, name, cat="library"):
+    fn = getattr(owner, attr)
+    if not getattr(fn, "__wrapped_by_instrument__", False):
+        setattr(owner, attr, _wrap(fn, name, cat))
+
+
+def _patch_libraries():
+    import zipfile
+    _patch(zipfile.ZipFile, "writestr", "zip.writestr")
+    with contextlib.suppress(ImportError):
+        from openpyxl.styles.styleable import StyleDescriptor
+        from openpyxl.workbook.workbook import Workbook
+        from openpyxl.worksheet.worksheet import Worksheet
+        _patch(StyleDescriptor, "__set__", "openpyxl style assignment")
+        _patch(Worksheet, "merge_cells", "Worksheet.merge_cells")
+        _patch(Workbook, "save", "Workbook.save")
+    with contextlib.suppress(ImportError):
+        from pptx.presentation import Presentation
+        _patch(Presentation, "save", "Presentation.save")
+
+
+def enable(memory=False):
+    """Turn instrumentation on (before the instrumented code is defined)."""
+    global ENABLED, MEMORY
+    if ENABLED:
+        return
+    ENABLED, MEMORY = True, memory
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _patch_libraries()
+
+
+def enable_from_argv(argv=None):
+    """Enable for --profile / --profile-memory on a builder's command line.
+
+    The trace and summary are written when the process exits.
+    """
+    argv = sys.argv if argv is None else argv
+    if "--profile" not in argv and "--profile-memory" not in argv:
+        return False
+    enable(memory="--profile-memory" in argv)
+    stem = os.path.splitext(os.path.basename(argv[0] or "build"))[0]
+    atexit.register(report, os.path.join(TRACE_DIR, f"{stem}.trace.json"))
+    return True
+
+
+def summary():
+    """[(name, category, calls, total ms, mean ms, max ms, peak KB)] by total time."""
+    rows = [(name, cat, calls, total * 1e3, total * 1e3 / calls, worst * 1e3,
+             None if peak is None else peak / 1024)
+            for name, (cat, calls, total, worst, peak) in _stats.items()]
+    return sorted(rows, key=lambda r: -r[3])
+
+
+def format_summary(rows=None):
+    rows = summary() if rows is None else rows
+    lines = [f"  {'Span':<44} {'Cat':<8} {'Calls':>7} {'Total ms':>10} {'Mean ms':>9} {'Max ms':>9} {'Peak KB':>9}"]
+    for name, cat, calls, total, mean, worst, peak in rows:
+        peak_text = "" if peak is None else f"{peak:,.0f}"
+        lines.append(f"  {name[:44]:<44} {cat:<8} {calls:>7,} {total:>10,.1f} {mean:>9.3f} {worst:>9.1f} {peak_text:>9}")
+    return "\n".join(lines)
+
+
+def export_chrome_trace(path):
+    """Write the recorded spans as Chrome trace-event JSON."""
+    meta = [{"name": "process_name", "ph": "M", "pid": os.getpid(), "args": {"name": os.path.basename(sys.argv[0])}}]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": meta + _events, "displayTimeUnit": "ms"}, f)
+    return path
+
+
+def report(trace_path):
+    """Print the summary and write the trace (called at exit when profiling)."""
+    if not _events:
+        return
+    os.makedirs(os.path.dirname(trace_path) or ".", exist_ok=True)
+    export_chrome_trace(trace_path)
+    print(f"\nProfile ({len(_events):,} events)\n{format_summary()}")
+    print(f"✓ Chrome trace: {trace_path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run any build script with instrumentation enabled")
+    parser.add_argument("--trace", default=None, help="trace JSON path")
+    parser.add_argument("--memory", action="store_true", help="tracemalloc peaks per stage")
+    parser.add_argument("script")
+    parser.add_argument("args", nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+
+    # The script's own `import instrument` must get this module, not a second,
+    # disabled copy (this one is __main__)
+    sys.modules["instrument"] = sys.modules[__name__]
+    enable(memory=args.memory)
+    stem = os.path.splitext(os.path.basename(args.script))[0]
+    trace = args.trace or os.path.join(TRACE_DIR, f"{stem}.trace.json")
+    sys.argv = [args.script] + args.args
+    sys.path.insert(0, os.path.dirname(os.path.abspath(args.script)))
+    try:
+        with span(f"run {os.path.basename(args.script)}", "script"):
+            runpy.run_path(args.script, run_name="__main__")
+    finally:
+        report(trace)
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+PISES New Campus – Fixed-Point Money
+Amounts are int64 halalas (1 SAR = 100 halalas) held in numpy arrays, so a
+whole price book or a million-scenario sweep is priced with integer array
+maths and no float drift.
+
+Rules:
+  - Inputs with decimals (areas, grossing factors, FX rates) are converted to
+    scaled integers with fixed(); a value that does not fit the scale exactly
+    is an error rather than a silent rounding.
+  - Values are brought onto that scale once, where they enter the price book
+    (builder data, workbook imports, derived versions), with quantise():
+    half-even to 0.01 unless another policy is named.
+  - Every division names its rounding policy (the decimal-module names).
+  - A total split into parts uses largest-remainder allocation, so printed
+    subtotals (and percentages) always add up to the printed total.
+"""
+
+import decimal
+
+import numpy as np
+
+HALALAS_PER_SAR = 100
+FIXED_SCALE = 100          # areas in 0.01 m², factors in 0.01×
+RATE_SCALE = 1_000_000     # FX rates (SAR per unit) in 0.000001
+
+ROUND_HALF_EVEN = "half_even"   # Python round(); the workbook default
+ROUND_HALF_UP = "half_up"       # half away from zero (commercial rounding)
+ROUND_DOWN = "down"             # toward zero
+ROUND_UP = "up"                 # away from zero
+POLICIES = (ROUND_HALF_EVEN, ROUND_HALF_UP, ROUND_DOWN, ROUND_UP)
+
+_INT64_LIMIT = 2 ** 63 - 1
+
+
+def fixed(values, scale=FIXED_SCALE):
+    """Decimal value(s) → int64 scaled by `scale`, exactly or ValueError."""
+    arr = np.asarray(values, dtype=np.float64)
+    scaled = np.rint(arr * scale)
+    if np.any(np.abs(arr * scale - scaled) > 1e-6):
+        raise ValueError(f"value(s) not representable at 1/{scale}: {arr[np.abs(arr * scale - scaled) > 1e-6]}")
+    return scaled.astype(np.int64)
+
+
+_DECIMAL_ROUNDING = {ROUND_HALF_EVEN: decimal.ROUND_HALF_EVEN, ROUND_HALF_UP: decimal.ROUND_HALF_UP,
+                     ROUND_DOWN: decimal.ROUND_DOWN, ROUND_UP: decimal.ROUND_UP}
+
+
+def quantise(value, scale=FIXED_SCALE, policy=ROUND_HALF_EVEN):
+    """One decimal value rounded onto the 1/scale grid (as a float fixed() accepts).
+
+    Rounds the value as written (repr), so 95.125 → 95.12 half-even.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"unknown rounding policy {policy!r}")
+    step = decimal.Decimal(1) / decimal.Decimal(scale)
+    exact = decimal.Decimal(repr(float(value)))
+    return float(exact.quantize(step, rounding=_DECIMAL_ROUNDING[policy]))
+
+
+def sar(amounts):
+    """SAR amount(s) → int64 halalas."""
+    return fixed(amounts, HALALAS_PER_SAR)
+
+
+def div_round(num, den, policy=ROUND_HALF_EVEN):
+    """Integer division of int64 array(s) by a positive integer with a rounding policy."""
+    if policy not in POLICIES:
+        raise ValueError(f"unknown rounding policy {policy!r}")
+    num = np.asarray(num, dtype=np.int64)
+    den = np.int64(den)
+    if den <= 0:
+        raise ValueError("denominator must be positive")
+    sign = np.where(num < 0, -1, 1).astype(np.int64)
+    q, r = np.divmod(np.abs(num), den)
+    if policy == ROUND_UP:
+        q = q + (r > 0)
+    elif policy == ROUND_HALF_UP:
+        q = q + (2 * r >= den)
+    elif policy == ROUND_HALF_EVEN:
+        q = q + ((2 * r > den) | ((2 * r == den) & (q % 2 == 1)))
+    return sign * q
+
+
+def checked_product(*factors):
+    """Elementwise int64 product, refusing to overflow."""
+    bound = np.ones(np.broadcast(*factors).shape, dtype=np.float64)
+    for f in factors:
+        bound = bound * np.abs(np.asarray(f, dtype=np.float64))
+    if np.any(bound >= _INT64_LIMIT):
+        raise OverflowError("fixed-point product exceeds int64")
+    out = np.asarray(factors[0], dtype=np.int64)
+    for f in factors[1:]:
+        out = out * np.asarray(f, dtype=np.int64)
+    return out
+
+
+def unit_costs(net_m2, factors, total_cost_sar, total_bua, policy=ROUND_HALF_EVEN,
+               quantum=HALALAS_PER_SAR):
+    """Cost per unit in halalas: NET × grossing factor × (total cost / total BUA).
+
+    The result is rounded once, to a multiple of `quantum` halalas (whole SAR
+    by default), using `policy`.
+    """
+    num = checked_product(fixed(net_m2), fixed(factors), sar(total_cost_sar))
+    den = FIXED_SCALE * int(fixed(total_bua))
+    return div_round(num, den * quantum, policy) * quantum
+
+
+def convert(halalas, sar_per_unit, policy=ROUND_HALF_EVEN, quantum=1):
+    """Halalas → minor units (1/100) of a currency quoted as SAR per unit.
+
+    The rate is held at RATE_SCALE. Rounded once to a multiple of `quantum`
+    minor units (100 = whole units).
+    """
+    den = int(fixed(sar_per_unit, RATE_SCALE)) * quantum
+    return div_round(checked_product(halalas, RATE_SCALE), den, policy) * quantum
+
+
+def allocate(total, weights):
+    """Split integer `total` in proportion to `weights` (largest remainder).
+
+    The parts always sum to `total`. Ties in the remainder go to the earlier
+    index, so the result is deterministic.
+    """
+    weights = np.asarray(weights, dtype=np.int64)
+    if np.any(weights < 0):
+        raise ValueError("weights must be non-negative")
+    wsum = int(weights.sum())
+    if wsum == 0:
+        return np.zeros_like(weights)
+    total = int(total)
+    # Python ints for the products: total × weight can exceed int64
+    quotas = [divmod(total * int(w), wsum) for w in weights]
+    parts = np.array([q for q, _ in quotas], dtype=np.int64)
+    shortfall = total - int(parts.sum())
+    if shortfall:
+        rems = np.array([r for _, r in quotas], dtype=np.int64)
+        order = np.lexsort((np.arange(len(rems)), -rems))
+        parts[order[:shortfall]] += 1
+    return parts
+
+
+def percent_shares(parts, decimals=1):
+    """Percentages of `parts` rounded to `decimals` that sum to exactly 100."""
+    steps = 100 * 10 ** decimals
+    return allocate(steps, parts) / 10 ** decimals
+
+
+def to_sar(halalas, policy=ROUND_HALF_EVEN):
+    """Halalas → whole SAR (int64)."""
+    return div_round(halalas, HALALAS_PER_SAR, policy)
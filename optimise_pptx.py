@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+PISES New Campus – Post-Render Deck Optimiser
+Shrinks a built python-pptx Presentation before it is saved or emailed.
+
+Two passes, both layout-preserving:
+  - Shape consolidation: stacked single-line text boxes that share a column,
+    size and style (e.g. the band item names / prices on the donor deck's
+    quick-reference slide) are merged into one box with one paragraph per line.
+    A box only counts as single-line if it does not wrap (wrap="none") or its
+    text fits the box width at a fixed, font-independent estimate of
+    AVG_CHAR_EM per character, so the result is the same on every host.
+  - Property hoisting: run properties repeated on every run are moved to the
+    paragraph default, and paragraph properties repeated on every paragraph
+    of a text body are moved into that body's list style (lvl1pPr).
+
+Usage:
+  python optimise_pptx.py INPUT.pptx [OUTPUT.pptx]
+"""
+
+import io
+import sys
+from copy import deepcopy
+
+from lxml import etree
+from pptx import Presentation
+from pptx.oxml.ns import qn
+
+from slide_preview import TEXTBOX_INSETS
+
+# Single-spaced line height as a multiple of font size (Calibri renders ~1.2×).
+LINE_HEIGHT_FACTOR = 1.2
+# Average character advance as a multiple of font size for the single-line
+# test: wider than Calibri's average, regular or bold, so a box judged to fit
+# does not wrap in PowerPoint. Fixed rather than measured with whatever fonts
+# are installed, so the optimised deck is the same bytes on every machine.
+AVG_CHAR_EM = 0.6
+EMU_PER_PT = 12700
+
+# pPr children in schema order (CT_TextParagraphProperties)
+PPR_CHILD_ORDER = [
+    "a:lnSpc", "a:spcBef", "a:spcAft",
+    "a:buClrTx", "a:buClr", "a:buSzTx", "a:buSzPct", "a:buSzPts",
+    "a:buFontTx", "a:buFont", "a:buNone", "a:buAutoNum", "a:buChar", "a:buBlip",
+    "a:tabLst", "a:defRPr", "a:extLst",
+]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# HELPERS
+# ─────────────────────────────────────────────────────────────────────────────
+def _xml(el):
+    return b"" if el is None else etree.tostring(el, with_tail=False)
+
+
+def _shape_count(prs):
+    return sum(len(slide.shapes) for slide in prs.slides)
+
+
+def _saved_size(prs):
+    buf = io.BytesIO()
+    prs.save(buf)
+    return buf.tell()
+
+
+def _is_plain_text_box(sp):
+    """True for an unfilled, unrotated, single-paragraph text box."""
+    if sp.tag != qn("p:sp"):
+        return False
+    cnv = sp.find(qn("p:nvSpPr") + "/" + qn("p:cNvSpPr"))
+    if cnv is None or cnv.get("txBox") != "1":
+        return False
+    sppr = sp.find(qn("p:spPr"))
+    xfrm = sppr.find(qn("a:xfrm")) if sppr is not None else None
+    if xfrm is None or xfrm.get("rot") or xfrm.get("flipH") or xfrm.get("flipV"):
+        return False
+    if sppr.find(qn("a:ln")) is not None or sppr.find(qn("a:solidFill")) is not None:
+        return False
+    txbody = sp.find(qn("p:txBody"))
+    return txbody is not None and len(txbody.findall(qn("a:p"))) == 1
+
+
+def _geometry(sp):
+    xfrm = sp.find(qn("p:spPr") + "/" + qn("a:xfrm"))
+    off, ext = xfrm.find(qn("a:off")), xfrm.find(qn("a:ext"))
+    return (int(off.get("x")), int(off.get("y")),
+            int(ext.get("cx")), int(ext.get("cy")))
+
+
+def _bbox(el):
+    """Bounding box of any drawable spTree child, or None if it has none."""
+    for path in ("p:spPr/a:xfrm", "p:xfrm", "p:grpSpPr/a:xfrm"):
+        xfrm = el.find("/".join(qn(t) for t in path.split("/")))
+        if xfrm is not None and xfrm.find(qn("a:off")) is not None:
+            off, ext = xfrm.find(qn("a:off")), xfrm.find(qn("a:ext"))
+            return (int(off.get("x")), int(off.get("y")),
+                    int(ext.get("cx")), int(ext.get("cy")))
+    return None
+
+
+def _font_size_pt(p):
+    """Font size (pt) of a paragraph from its defRPr or first run, else None."""
+    for rpr in p.iter(qn("a:defRPr"), qn("a:rPr")):
+        if rpr.get("sz"):
+            return int(rpr.get("sz")) / 100
+    return None
+
+
+def _fits_one_line(sp):
+    """True if the box cannot wrap (wrap="none") or its text fits on one line.
+
+    A merged box keeps its members' line pitch only while no line wraps.
+    """
+    txbody = sp.find(qn("p:txBody"))
+    body_pr = txbody.find(qn("a:bodyPr"))
+    insets = TEXTBOX_INSETS
+    if body_pr is not None:
+        if body_pr.get("wrap") == "none":
+            return True
+        insets = (int(body_pr.get("lIns", insets[0])), 0, int(body_pr.get("rIns", insets[2])), 0)
+    width = _geometry(sp)[2] - insets[0] - insets[2]
+    p = txbody.find(qn("a:p"))
+    if p.find(qn("a:br")) is not None:
+        return False
+    text = "".join(t.text or "" for t in p.iter(qn("a:t")))
+    return len(text) * _font_size_pt(p) * AVG_CHAR_EM * EMU_PER_PT <= width
+
+
+def _style_key(sp):
+    """Everything that must match for two text boxes to share one body."""
+    txbody = sp.find(qn("p:txBody"))
+    p = txbody.find(qn("a:p"))
+    if p.find(qn("a:br")) is not None:
+        return None
+    ppr = p.find(qn("a:pPr"))
+    ppr_key = b""
+    if ppr is not None:
+        if ppr.find(qn("a:lnSpc")) is not None:
+            return None  # line height is no longer a function of font size
+        ppr = deepcopy(ppr)
+        for tag in ("a:spcBef", "a:spcAft"):
+            el = ppr.find(qn(tag))
+            if el is not None:
+                # Only zero spacing can be rewritten safely
+                pts = el.find(qn("a:spcPts"))
+                if pts is None or pts.get("val") != "0":
+                    return None
+                ppr.remove(el)
+        ppr_key = _xml(ppr)
+    run_keys = tuple(_xml(r.find(qn("a:rPr"))) for r in p.findall(qn("a:r")))
+    if len(set(run_keys)) > 1:
+        return None
+    return (_xml(txbody.find(qn("a:bodyPr"))), _xml(txbody.find(qn("a:lstStyle"))),
+            ppr_key, run_keys[:1])
+
+
+def _overlaps(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    return ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah
+
+
+def _set_space_before(p, pts):
+    ppr = p.find(qn("a:pPr"))
+    if ppr is None:
+        ppr = etree.Element(qn("a:pPr"))
+        p.insert(0, ppr)
+    old = ppr.find(qn("a:spcBef"))
+    if old is not None:
+        ppr.remove(old)
+    spc = etree.Element(qn("a:spcBef"))
+    etree.SubElement(spc, qn("a:spcPts")).set("val", str(int(round(pts * 100))))
+    # spcBef follows lnSpc if present, otherwise leads
+    lnspc = ppr.find(qn("a:lnSpc"))
+    ppr.insert(1 if lnspc is not None else 0, spc)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# PASS 1 – MERGE STACKED TEXT BOXES
+# ─────────────────────────────────────────────────────────────────────────────
+def _stacked_runs(members):
+    """Split same-column boxes (sorted by y) into runs with a constant pitch."""
+    runs, i = [], 0
+    while i < len(members) - 1:
+        pitch = members[i + 1][1][1] - members[i][1][1]
+        j = i + 1
+        while j + 1 < len(members) and members[j + 1][1][1] - members[j][1][1] == pitch:
+            j += 1
+        if pitch >= members[i][1][3]:
+            runs.append((pitch, members[i:j + 1]))
+            i = j + 1
+        else:
+            i += 1
+    return runs
+
+
+def _run_is_safe(spTree, run):
+    """Moving each member up to the last member's z-position must not lift it
+    above any intervening shape it overlaps."""
+    children = list(spTree)
+    last_z = children.index(run[-1][2])
+    member_ids = {id(m[2]) for m in run}
+    for _, geom, sp in run[:-1]:
+        for other in children[children.index(sp) + 1:last_z]:
+            if id(other) in member_ids:
+                continue
+            box = _bbox(other)
+            if box is None or _overlaps(geom, box):
+                return False
+    return True
+
+
+def merge_stacked_text(slide):
+    """Merge stacked same-styled text boxes on one slide. Returns shapes removed."""
+    spTree = slide.shapes._spTree
+    buckets = {}
+    for z, sp in enumerate(spTree):
+        if not _is_plain_text_box(sp):
+            continue
+        key = _style_key(sp)
+        p = sp.find(qn("p:txBody") + "/" + qn("a:p"))
+        if key is None or _font_size_pt(p) is None or not _fits_one_line(sp):
+            continue
+        x, y, cx, cy = _geometry(sp)
+        buckets.setdefault((key, x, cx, cy), []).append((z, (x, y, cx, cy), sp))
+
+    removed = 0
+    for members in buckets.values():
+        if len(members) < 2:
+            continue
+        members.sort(key=lambda m: m[1][1])
+        for pitch, run in _stacked_runs(members):
+            first_p = run[0][2].find(qn("p:txBody") + "/" + qn("a:p"))
+            line_pt = _font_size_pt(first_p) * LINE_HEIGHT_FACTOR
+            gap_pt = pitch / EMU_PER_PT - line_pt
+            if gap_pt < 0:
+                continue
+            # Merge in z-order so the kept shape lands at the topmost position
+            if sorted(run, key=lambda m: m[0]) != run or not _run_is_safe(spTree, run):
+                continue
+
+            head = run[0][2]
+            # Lift the merged box to where the last member was drawn
+            run[-1][2].addprevious(head)
+            body = head.find(qn("p:txBody"))
+            for _, _, sp in run[1:]:
+                p = sp.find(qn("p:txBody") + "/" + qn("a:p"))
+                _set_space_before(p, gap_pt)
+                body.append(p)
+                spTree.remove(sp)
+                removed += 1
+
+            x, y, cx, cy = run[0][1]
+            last_y = run[-1][1][1]
+            head.find(qn("p:spPr") + "/" + qn("a:xfrm") + "/" + qn("a:ext")).set(
+                "cy", str(last_y + cy - y))
+    return removed
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# PASS 2 – HOIST REPEATED PROPERTIES
+# ─────────────────────────────────────────────────────────────────────────────
+def _hoist_run_props(p):
+    """Move an rPr shared by every run into the paragraph defRPr."""
+    runs = p.findall(qn("a:r"))
+    if not runs:
+        return 0
+    rprs = [r.find(qn("a:rPr")) for r in runs]
+    if any(rpr is None for rpr in rprs) or len({_xml(rpr) for rpr in rprs}) != 1:
+        return 0
+    ppr = p.find(qn("a:pPr"))
+    if ppr is not None and ppr.find(qn("a:defRPr")) is not None:
+        return 0
+    if ppr is None:
+        ppr = etree.Element(qn("a:pPr"))
+        p.insert(0, ppr)
+    defrpr = deepcopy(rprs[0])
+    defrpr.tag = qn("a:defRPr")
+    ext = ppr.find(qn("a:extLst"))
+    if ext is not None:
+        ext.addprevious(defrpr)
+    else:
+        ppr.append(defrpr)
+    for r, rpr in zip(runs, rprs):
+        r.remove(rpr)
+    return len(runs)
+
+
+def _hoist_paragraph_props(txbody):
+    """Move pPr attributes and children shared by every paragraph into lstStyle."""
+    paras = txbody.findall(qn("a:p"))
+    if len(paras) < 2:
+        return 0
+    pprs = [p.find(qn("a:pPr")) for p in paras]
+    if any(ppr is None for ppr in pprs):
+        return 0
+    lst = txbody.find(qn("a:lstStyle"))
+    if lst is None or len(lst):
+        return 0  # never override an existing list style
+
+    common_attrs = dict(pprs[0].attrib)
+    for ppr in pprs[1:]:
+        common_attrs = {k: v for k, v in common_attrs.items() if ppr.get(k) == v}
+    common_children = []
+    for child in pprs[0]:
+        blob = _xml(child)
+        if all(any(_xml(c) == blob for c in ppr if c.tag == child.tag) for ppr in pprs[1:]):
+            common_children.append(child)
+    if not common_attrs and not common_children:
+        return 0
+
+    lvl1 = etree.SubElement(lst, qn("a:lvl1pPr"))
+    for k, v in common_attrs.items():
+        lvl1.set(k, v)
+    for child in common_children:
+        lvl1.append(deepcopy(child))
+    order = {qn(t): i for i, t in enumerate(PPR_CHILD_ORDER)}
+    lvl1[:] = sorted(lvl1, key=lambda c: order.get(c.tag, len(order)))
+
+    common_blobs = {_xml(c) for c in common_children}
+    hoisted = 0
+    for p, ppr in zip(paras, pprs):
+        for k in common_attrs:
+            del ppr.attrib[k]
+        for child in list(ppr):
+            if _xml(child) in common_blobs:
+                ppr.remove(child)
+        if not len(ppr) and not ppr.attrib:
+            p.remove(ppr)
+        hoisted += 1
+    return hoisted
+
+
+def hoist_properties(slide):
+    """Hoist repeated run / paragraph properties on one slide. Returns paragraphs touched."""
+    touched = 0
+    for txbody in slide.shapes._spTree.iter(qn("p:txBody"), qn("a:txBody")):
+        for p in txbody.findall(qn("a:p")):
+            if _hoist_run_props(p):
+                touched += 1
+        touched += _hoist_paragraph_props(txbody)
+    return touched
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# DRIVER
+# ─────────────────────────────────────────────────────────────────────────────
+def optimise_presentation(prs, merge=True, hoist=True):
+    """Optimise a built Presentation in place and return a savings report."""
+    report = {
+        "shapes_before": _shape_count(prs),
+        "bytes_before": _saved_size(prs),
+        "shapes_merged": 0,
+        "paragraphs_hoisted": 0,
+    }
+    for slide in prs.slides:
+        if merge:
+            report["shapes_merged"] += merge_stacked_text(slide)
+        if hoist:
+            report["paragraphs_hoisted"] += hoist_properties(slide)
+    report["shapes_after"] = _shape_count(prs)
+    report["bytes_after"] = _saved_size(prs)
+    return report
+
+
+def format_report(report):
+    saved = report["bytes_before"] - report["bytes_after"]
+    pct = saved / report["bytes_before"] * 100 if report["bytes_before"] else 0
+    return (f"Shapes: {report['shapes_before']} → {report['shapes_after']}  |  "
+            f"Bytes: {report['bytes_before']:,} → {report['bytes_after']:,} "
+            f"({saved:,} saved, {pct:.1f}%)  |  "
+            f"Paragraphs hoisted: {report['paragraphs_hoisted']}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        print(__doc__)
+        sys.exit(1)
+    src = sys.argv[1]
+    dst = sys.argv[2] if len(sys.argv) == 3 else src
+    prs = Presentation(src)
+    report = optimise_presentation(prs)
+    prs.save(dst)
+    print(f"Optimised deck saved to: {dst}")
+    print(format_report(report))
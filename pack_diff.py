@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+PISES New Campus – Donor Pack Diff
+What changed between two builds of the donor workbook or a deck, without
+opening either. Deltas are reported as value (cell / text / table contents),
+style (number format, font, fill, alignment, border) or layout (column
+widths, merged ranges, frozen panes, shape position and size), plus added /
+removed sheets, rows, slides and shapes.
+
+Workbooks are streamed: both files are opened read-only and their rows are
+read in lock-step. A row is keyed by its label, the first text cell (e.g.
+the unit name), with a repeat count for duplicates; rows without text are
+keyed by position. A row whose key has not yet appeared on the other side
+waits in a pending table until its partner arrives. Time is linear in the
+number of cells, and memory holds only the rows that are displaced or
+changed, not the sheets. At the end of a sheet, unmatched rows at the same
+row number are reported as one changed row (e.g. a retitled header).
+Column widths, merges and panes are picked out of the sheet XML with a
+chunked byte scan.
+
+Decks are compared slide by slide. Slides are aligned on their first line of
+text and shapes on (kind, text). The generated shape names ("TextBox 12")
+are numbered by creation order and shift when a shape is inserted, so they
+only label the output. Slide and shape alignment uses difflib on the
+per-slide lists, which are small and bounded. Table rows are aligned on the
+first cell.
+
+Usage:
+  python pack_diff.py OLD.xlsx NEW.xlsx [--no-style] [--no-layout] [--json]
+  python pack_diff.py OLD.pptx NEW.pptx [--no-style] [--no-layout] [--json]
+Exit status 1 when the files differ (like diff).
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import zipfile
+from difflib import SequenceMatcher
+from itertools import zip_longest
+
+EMU_PER_INCH = 914400
+_LAYOUT_TAG = re.compile(rb"<(?:\w+:)?(col|mergeCell|pane)\s([^>]*)>")
+_ATTR = re.compile(rb'(\w+)="([^"]*)"')
+
+
+def _delta(part, kind, where, old=None, new=None):
+    return {"part": part, "kind": kind, "where": where, "old": old, "new": new}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# WORKBOOKS
+# ─────────────────────────────────────────────────────────────────────────────
+def _color(color):
+    if color is None:
+        return None
+    return color.rgb if color.type == "rgb" else f"{color.type}:{color.value}"
+
+
+def _cell_style(cell):
+    """Resolved style of a read-only cell (comparable across workbooks)."""
+    font, fill, align, border = cell.font, cell.fill, cell.alignment, cell.border
+    return {
+        "number_format": cell.number_format,
+        "font": (font.name, font.sz, bool(font.b), bool(font.i), _color(font.color)),
+        "fill": (fill.fill_type, _color(fill.fgColor)) if fill.fill_type else None,
+        "align": (align.horizontal, align.vertical, bool(align.wrap_text)),
+        "border": tuple(getattr(border, side).style for side in ("left", "right", "top", "bottom")),
+    }
+
+
+def _keyed_rows(ws, styles):
+    """(key, row number, [(column, value, style)]) for each row of a sheet."""
+    from openpyxl.cell.read_only import EMPTY_CELL
+
+    seen = {}
+    for row in ws.iter_rows():
+        cells = [c for c in row if c.value is not None or (styles and c is not EMPTY_CELL and c.has_style)]
+        if not cells:
+            continue
+        number = cells[0].row
+        label = next((c.value for c in cells if isinstance(c.value, str) and c.value.strip()), None)
+        if label is None:
+            key = ("#", number)
+        else:
+            seen[label] = seen.get(label, 0) + 1
+            key = (label, seen[label])
+        yield key, number, [(c.column_letter, c.value, _cell_style(c) if styles else None) for c in cells]
+
+
+def _row_deltas(sheet, key, old, new):
+    where = f"row {key[0]!r}" if key[0] != "#" else f"row {key[1]}"
+    (n_old, cells_old), (n_new, cells_new) = old, new
+    if n_old != n_new:
+        where += f" ({n_old}→{n_new})"
+    a = {col: (value, style) for col, value, style in cells_old}
+    b = {col: (value, style) for col, value, style in cells_new}
+    for col in sorted(a.keys() | b.keys(), key=lambda c: (len(c), c)):
+        (va, sa), (vb, sb) = a.get(col, (None, None)), b.get(col, (None, None))
+        if va != vb:
+            yield _delta(sheet, "value", f"{where} {col}", va, vb)
+        if sa is not None and sb is not None and sa != sb:
+            for prop in sa:
+                if sa[prop] != sb[prop]:
+                    yield _delta(sheet, "style", f"{where} {col} {prop}", sa[prop], sb[prop])
+
+
+def _sheet_rows(sheet, ws_old, ws_new, styles):
+    """Stream both sheets; pending tables hold only rows not yet matched."""
+    pending_old, pending_new = {}, {}
+    for old, new in zip_longest(_keyed_rows(ws_old, styles), _keyed_rows(ws_new, styles)):
+        if old is not None:
+            key, number, cells = old
+            if key in pending_new:
+                yield from _row_deltas(sheet, key, (number, cells), pending_new.pop(key))
+            else:
+                pending_old[key] = (number, cells)
+        if new is not None:
+            key, number, cells = new
+            if key in pending_old:
+                yield from _row_deltas(sheet, key, pending_old.pop(key), (number, cells))
+            else:
+                pending_new[key] = (number, cells)
+    # Unmatched rows at the same position are one changed row (e.g. a retitled header)
+    new_at = {number: key for key, (number, _) in pending_new.items()}
+    for key, (number, cells) in sorted(pending_old.items(), key=lambda kv: kv[1][0]):
+        partner = new_at.pop(number, None)
+        if partner is not None:
+            yield from _row_deltas(sheet, ("#", number), (number, cells), pending_new.pop(partner))
+        else:
+            yield _delta(sheet, "removed", f"row {number}", _row_text(cells))
+    for key, (number, cells) in sorted(pending_new.items(), key=lambda kv: kv[1][0]):
+        yield _delta(sheet, "added", f"row {number}", None, _row_text(cells))
+
+
+def _row_text(cells):
+    return " | ".join(str(value) for _, value, _ in cells if value is not None)
+
+
+def _sheet_layout(archive, part):
+    """Column widths, merged ranges and frozen pane from a sheet's XML.
+
+    The part is scanned in chunks for just these tags; its cell data is never
+    parsed or held in memory.
+    """
+    cols, merges, pane = {}, set(), None
+    tail = b""
+    with archive.open(part) as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            text = tail + chunk
+            cut = text.rfind(b"<")                          # a tag may straddle chunks
+            text, tail = text[:cut], text[cut:]
+            for tag, attrs in _LAYOUT_TAG.findall(text):
+                a = dict(_ATTR.findall(attrs))
+                if tag == b"col":
+                    width = float(a.get(b"width", 0))
+                    for i in range(int(a[b"min"]), int(a[b"max"]) + 1):
+                        cols[i] = width
+                elif tag == b"mergeCell":
+                    merges.add(a[b"ref"].decode())
+                elif tag == b"pane" and b"topLeftCell" in a:
+                    pane = a[b"topLeftCell"].decode()
+    return cols, merges, pane
+
+
+def _layout_deltas(sheet, old, new):
+    from openpyxl.utils import get_column_letter
+
+    (cols_a, merges_a, pane_a), (cols_b, merges_b, pane_b) = old, new
+    for i in sorted(cols_a.keys() | cols_b.keys()):
+        if cols_a.get(i) != cols_b.get(i):
+            yield _delta(sheet, "layout", f"column {get_column_letter(i)} width", cols_a.get(i), cols_b.get(i))
+    for ref in sorted(merges_a - merges_b):
+        yield _delta(sheet, "layout", f"merge {ref}", ref, None)
+    for ref in sorted(merges_b - merges_a):
+        yield _delta(sheet, "layout", f"merge {ref}", None, ref)
+    if pane_a != pane_b:
+        yield _delta(sheet, "layout", "frozen pane", pane_a, pane_b)
+
+
+def diff_xlsx(old_path, new_path, styles=True, layout=True):
+    """Yield deltas between two workbooks (streamed, see module docstring)."""
+    import openpyxl
+
+    wb_old = openpyxl.load_workbook(old_path, read_only=True)
+    wb_new = openpyxl.load_workbook(new_path, read_only=True)
+    try:
+        with zipfile.ZipFile(old_path) as zip_old, zipfile.ZipFile(new_path) as zip_new:
+            for name in wb_old.sheetnames:
+                if name not in wb_new.sheetnames:
+                    yield _delta(name, "removed", "sheet", name)
+            for name in wb_new.sheetnames:
+                if name not in wb_old.sheetnames:
+                    yield _delta(name, "added", "sheet", None, name)
+                    continue
+                ws_old, ws_new = wb_old[name], wb_new[name]
+                # Rows are keyed by column letter, so the sheets need not be
+                # padded to their dimensions (which can cost a pre-scan)
+                ws_old.reset_dimensions()
+                ws_new.reset_dimensions()
+                yield from _sheet_rows(name, ws_old, ws_new, styles)
+                if layout:
+                    yield from _layout_deltas(name, _sheet_layout(zip_old, ws_old._worksheet_path),
+                                              _sheet_layout(zip_new, ws_new._worksheet_path))
+    finally:
+        wb_old.close()
+        wb_new.close()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# DECKS
+# ─────────────────────────────────────────────────────────────────────────────
+def _xml_color(parent):
+    from pptx.oxml.ns import qn
+
+    if parent is None:
+        return None
+    fill = parent.find(qn("a:solidFill"))
+    if fill is None or len(fill) == 0:
+        return None
+    return fill[0].get("val")
+
+
+def _text_style(shape):
+    """Effective (size, bold, italic, colour) per run: paragraph defaults, then run."""
+    from pptx.oxml.ns import qn
+
+    styles = []
+    for p in shape.text_frame.paragraphs:
+        ppr = p._p.find(qn("a:pPr"))
+        base = ppr.find(qn("a:defRPr")) if ppr is not None else None
+        for r in p.runs:
+            style = {}
+            for props in (base, r._r.find(qn("a:rPr"))):
+                if props is None:
+                    continue
+                for attr in ("sz", "b", "i"):
+                    if props.get(attr) is not None:
+                        style[attr] = props.get(attr)
+                color = _xml_color(props)
+                if color is not None:
+                    style["color"] = color
+            styles.append(tuple(sorted(style.items())))
+    return tuple(dict.fromkeys(styles))
+
+
+def _shapes(shapes, prefix=""):
+    """Flattened shape records for a slide (group members included)."""
+    from pptx.enum.dml import MSO_FILL
+    from pptx.enum.shapes import MSO_SHAPE_TYPE
+
+    for shape in shapes:
+        if shape.shape_type == MSO_SHAPE_TYPE.GROUP:
+            yield from _shapes(shape.shapes, f"{prefix}{shape.name}/")
+            continue
+        record = {"name": prefix + shape.name,
+                  "kind": "table" if shape.has_table else ("text" if shape.has_text_frame else "shape"),
+                  "text": None, "rows": None, "style": None,
+                  "box": tuple(round((v or 0) / EMU_PER_INCH, 2)
+                               for v in (shape.left, shape.top, shape.width, shape.height))}
+        if shape.has_table:
+            record["rows"] = [[cell.text for cell in row.cells] for row in shape.table.rows]
+            record["text"] = record["rows"][0][0] if record["rows"] and record["rows"][0] else ""
+        elif shape.has_text_frame:
+            record["text"] = shape.text_frame.text
+            record["style"] = _text_style(shape)
+        fill = None
+        try:
+            if shape.fill.type == MSO_FILL.SOLID:
+                fill = str(shape.fill.fore_color.rgb)
+        except (AttributeError, TypeError, ValueError):
+            pass
+        record["fill"] = fill
+        yield record
+
+
+def _slide_label(records):
+    return next((r["text"].split("\n")[0][:60] for r in records if r["text"] and r["text"].strip()), "")
+
+
+def _table_deltas(part, where, rows_a, rows_b):
+    matcher = SequenceMatcher(None, [r[0] if r else "" for r in rows_a],
+                              [r[0] if r else "" for r in rows_b], autojunk=False)
+    for op, a0, a1, b0, b1 in matcher.get_opcodes():
+        pairs = list(zip(range(a0, a1), range(b0, b1))) if op in ("equal", "replace") else []
+        for i, j in pairs:
+            for col, (va, vb) in enumerate(zip_longest(rows_a[i], rows_b[j])):
+                if va != vb:
+                    yield _delta(part, "value", f"{where} row {rows_b[j][0]!r} col {col + 1}", va, vb)
+        for i in range(a0 + len(pairs), a1):
+            yield _delta(part, "removed", f"{where} row {i + 1}", " | ".join(rows_a[i]))
+        for j in range(b0 + len(pairs), b1):
+            yield _delta(part, "added", f"{where} row {j + 1}", None, " | ".join(rows_b[j]))
+
+
+def _shape_deltas(part, a, b, styles, layout):
+    where = a["name"] if a["name"] == b["name"] else f"{a['name']}→{b['name']}"
+    if a["kind"] == "table" and b["kind"] == "table":
+        yield from _table_deltas(part, where, a["rows"], b["rows"])
+    elif a["text"] != b["text"]:
+        yield _delta(part, "value", where, a["text"], b["text"])
+    if styles:
+        for prop in ("style", "fill"):
+            if a[prop] != b[prop]:
+                yield _delta(part, "style", f"{where} {prop}", a[prop], b[prop])
+    if layout and a["box"] != b["box"]:
+        yield _delta(part, "layout", f"{where} box (in)", a["box"], b["box"])
+
+
+def _slide_deltas(part, old, new, styles, layout):
+    sig = lambda r: (r["kind"], r["text"])
+    matcher = SequenceMatcher(None, [sig(r) for r in old], [sig(r) for r in new], autojunk=False)
+    for op, a0, a1, b0, b1 in matcher.get_opcodes():
+        pairs = [(i, j) for i, j in zip(range(a0, a1), range(b0, b1)) if old[i]["kind"] == new[j]["kind"]]
+        if op in ("equal", "replace"):
+            for i, j in pairs:
+                yield from _shape_deltas(part, old[i], new[j], styles, layout)
+        paired_a, paired_b = {i for i, _ in pairs}, {j for _, j in pairs}
+        for i in range(a0, a1):
+            if op == "delete" or i not in paired_a:
+                yield _delta(part, "removed", old[i]["name"], old[i]["text"] or old[i]["kind"])
+        for j in range(b0, b1):
+            if op == "insert" or j not in paired_b:
+                yield _delta(part, "added", new[j]["name"], None, new[j]["text"] or new[j]["kind"])
+
+
+def diff_pptx(old_path, new_path, styles=True, layout=True):
+    """Yield deltas between two decks (slide by slide, see module docstring)."""
+    from pptx import Presentation
+
+    old = [list(_shapes(s.shapes)) for s in Presentation(old_path).slides]
+    new = [list(_shapes(s.shapes)) for s in Presentation(new_path).slides]
+    labels_old, labels_new = [_slide_label(s) for s in old], [_slide_label(s) for s in new]
+    matcher = SequenceMatcher(None, labels_old, labels_new, autojunk=False)
+    for op, a0, a1, b0, b1 in matcher.get_opcodes():
+        pairs = list(zip(range(a0, a1), range(b0, b1))) if op in ("equal", "replace") else []
+        for i, j in pairs:
+            part = f"slide {j + 1} {labels_new[j]!r}" if i == j else f"slide {i + 1}→{j + 1} {labels_new[j]!r}"
+            yield from _slide_deltas(part, old[i], new[j], styles, layout)
+        for i in range(a0 + len(pairs), a1):
+            yield _delta(f"slide {i + 1}", "removed", "slide", labels_old[i])
+        for j in range(b0 + len(pairs), b1):
+            yield _delta(f"slide {j + 1}", "added", "slide", None, labels_new[j])
+
+
+def diff_files(old_path, new_path, styles=True, layout=True):
+    ext = os.path.splitext(old_path)[1].lower()
+    if ext != os.path.splitext(new_path)[1].lower():
+        raise ValueError("both files must be .xlsx or both .pptx")
+    if ext == ".xlsx":
+        return diff_xlsx(old_path, new_path, styles, layout)
+    if ext == ".pptx":
+        return diff_pptx(old_path, new_path, styles, layout)
+    raise ValueError(f"unsupported file type {ext!r}")
+
+
+def _show(value, width=60):
+    text = re.sub(r"\s+", " ", repr(value) if not isinstance(value, str) else value)
+    return text if len(text) <= width else text[:width - 1] + "…"
+
+
+def format_delta(d):
+    mark = {"added": "+", "removed": "-"}.get(d["kind"], "~")
+    if d["kind"] == "added":
+        return f"  {mark} {d['where']}: {_show(d['new'])}"
+    if d["kind"] == "removed":
+        return f"  {mark} {d['where']}: {_show(d['old'])}"
+    return f"  {mark} [{d['kind']}] {d['where']}: {_show(d['old'])} → {_show(d['new'])}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Semantic diff of two workbooks or two decks")
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--no-style", action="store_true", help="ignore style deltas")
+    parser.add_argument("--no-layout", action="store_true", help="ignore layout deltas")
+    parser.add_argument("--json", action="store_true", help="one JSON delta per line")
+    args = parser.parse_args()
+
+    counts, part = {}, None
+    for d in diff_files(args.old, args.new, not args.no_style, not args.no_layout):
+        counts[d["kind"]] = counts.get(d["kind"], 0) + 1
+        if args.json:
+            print(json.dumps(d, ensure_ascii=False, default=str))
+            continue
+        if d["part"] != part:
+            part = d["part"]
+            print(part)
+        print(format_delta(d))
+    if not args.json:
+        summary = ", ".join(f"{n} {kind}" for kind, n in sorted(counts.items())) or "no differences"
+        print(f"{'✓' if not counts else '✗'} {summary}")
+    sys.exit(1 if counts else 0)
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+PISES New Campus – Command Line
+One entry point for quick prices and for the builds:
+
+  pises quote standard-classroom-grades-1-12 --qty 2 --currency GBP --date 2027-09-01
+  pises package "Name a Classroom" --currency USD
+  pises bundle art-studio:1,sensory-room:2 --date 2026-09-01
+  pises build-xlsx [--students 5000] [--reproducible] [--profile]
+  pises build-decks [--currency PKR] [--only donor|ambassador] [--reproducible]
+
+Quotes answer in tens of milliseconds so staff and scripts can call them in a
+loop. The quote path imports neither openpyxl / python-pptx nor numpy: it
+reads a precompiled snapshot of the price book and FX snapshot
+(__pycache__/pises_model.marshal) and prices in plain Python, with the same
+arithmetic as escalation.pledge_price() and fx.convert(). The snapshot is
+rebuilt automatically, once, whenever PISES_Price_Book.sqlite or
+PISES_FX_Snapshot.json changes. The build subcommands run the builder
+scripts in their own processes (the two decks in parallel).
+
+Units take an ID, code or name and packages a name or code, as in
+pricing_api.py. --json prints the same response as the pricing API and
+--total only the total (for scripts).
+
+Usage:
+  python pises.py {quote,package,bundle,build-xlsx,build-decks} …
+  ./pises …                       # wrapper script, same arguments
+"""
+
+import argparse
+import marshal
+import os
+import sys
+from datetime import date
+
+from price_book import PRICE_BOOK_PATH, load_model, unit_code
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FX_SNAPSHOT_PATH = os.path.join(HERE, "PISES_FX_Snapshot.json")
+COMPILED_PATH = os.path.join(HERE, "__pycache__", "pises_model.marshal")
+COMPILED_VERSION = 3
+MAX_QTY = 10_000
+
+BUILDERS = {
+    "xlsx": "build_donor_pricing.py",
+    "donor": "build_donor_pricing_deck.py",
+    "ambassador": "build_ambassador_deck.py",
+}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# PRECOMPILED MODEL
+# ─────────────────────────────────────────────────────────────────────────────
+def _sources():
+    """(mtime_ns, size) of every input the snapshot is compiled from."""
+    out = {}
+    for path in (PRICE_BOOK_PATH, FX_SNAPSHOT_PATH):
+        st = os.stat(path)
+        out[os.path.basename(path)] = [st.st_mtime_ns, st.st_size]
+    return out
+
+
+def compile_model(path=COMPILED_PATH):
+    """Write the quote snapshot: price book, FX rates and lookup keys."""
+    from escalation import INDEX_SCALE
+    from fx import load_snapshot
+    from money import RATE_SCALE, fixed
+
+    model = load_model()
+    snap = load_snapshot()
+    unit_keys = {}
+    for u in model["units"]:
+        for key in (str(u["id"]), u["code"], u["name"].lower()):
+            unit_keys[key] = u["id"]
+    package_keys = {}
+    for tier in model["tiers"]:
+        for pkg in tier["packages"]:
+            for key in (pkg["name"].lower(), unit_code(pkg["name"])):
+                package_keys[key] = pkg["id"]
+    compiled = {
+        "version": COMPILED_VERSION, "sources": _sources(),
+        "base_year": int(model["settings"]["base_year"]), "index_scale": INDEX_SCALE,
+        "units": {u["id"]: {"code": u["code"], "name": u["name"], "cost": u["unit_cost_sar"],
+                            "rate": u["escalation_rate"]} for u in model["units"]},
+        "packages": {pkg["id"]: {"name": pkg["name"], "tier": tier["name"], "range": tier["range"],
+                                 "units": [list(item) for item in pkg["units"]]}
+                     for tier in model["tiers"] for pkg in tier["packages"]},
+        "unit_keys": unit_keys, "package_keys": package_keys,
+        "fx": {"as_of": snap["as_of"], "sar_per_unit": snap["sar_per_unit"],
+               "scaled": {code: int(fixed(rate, RATE_SCALE)) for code, rate in snap["sar_per_unit"].items()},
+               "scale": RATE_SCALE},
+    }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        marshal.dump(compiled, f)
+    os.replace(tmp, path)
+    return compiled
+
+
+def load_compiled(path=COMPILED_PATH):
+    """The quote snapshot, recompiled if missing, unreadable or stale."""
+    try:
+        with open(path, "rb") as f:
+            compiled = marshal.load(f)
+        if compiled["version"] == COMPILED_VERSION and compiled["sources"] == _sources():
+            return compiled
+    except (OSError, EOFError, ValueError, TypeError, KeyError):
+        pass
+    return compile_model(path)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# QUOTES
+# ─────────────────────────────────────────────────────────────────────────────
+def _unit_id(compiled, ref):
+    keys = compiled["unit_keys"]
+    uid = keys.get(ref.strip().lower()) or keys.get(unit_code(ref))
+    if uid is None:
+        raise KeyError(f"no unit {ref!r} in the price book")
+    return uid
+
+
+def _items(compiled, pairs):
+    """Merged, sorted [(unit id, qty)] from [(unit ref, qty)]."""
+    merged = {}
+    for ref, qty in pairs:
+        try:
+            n = int(qty)
+        except ValueError:
+            raise ValueError(f"quantity {qty!r} is not a whole number") from None
+        if not 0 < n <= MAX_QTY:
+            raise ValueError(f"quantity {n} outside 1–{MAX_QTY:,}")
+        uid = _unit_id(compiled, ref)
+        merged[uid] = merged.get(uid, 0) + n
+    if not merged:
+        raise ValueError("no items to price")
+    return sorted(merged.items())
+
+
+def _years_elapsed(compiled, when):
+    """Fractional years since the price base (as escalation._years_elapsed)."""
+    start = date(compiled["base_year"], 1, 1)
+    if when < start:
+        raise ValueError(f"{when} is before the {compiled['base_year']} price base")
+    year_start, next_start = date(when.year, 1, 1), date(when.year + 1, 1, 1)
+    frac = (when - year_start).days / (next_start - year_start).days
+    return when.year - start.year + frac
+
+
+def _div_half_even(num, den):
+    """num / den rounded half-even, in integers (money.div_round for one value)."""
+    q, r = divmod(num, den)
+    return q + (2 * r > den or (2 * r == den and q % 2 == 1))
+
+
+def price(compiled, items, currency="SAR", when=None, package=None):
+    """Response dict in the pricing API's shape for [(unit id, qty)].
+
+    Unit prices apply a fixed-point index and round half-even like
+    escalation.pledge_price(); currency amounts like fx.convert() (integer
+    SAR over the fixed-point rate).
+    """
+    when = when or date(compiled["base_year"], 1, 1)
+    elapsed = _years_elapsed(compiled, when)
+    units, scale = compiled["units"], compiled["index_scale"]
+    unit_sar = [_div_half_even(units[uid]["cost"] * round((1.0 + units[uid]["rate"]) ** elapsed * scale), scale)
+                for uid, _ in items]
+    total_sar = sum(p * qty for p, (_, qty) in zip(unit_sar, items))
+    out = {}
+    if package is not None:
+        pkg = compiled["packages"][package]
+        out.update(package=pkg["name"], tier=pkg["tier"], range=pkg["range"])
+    if currency == "SAR":
+        unit_cur, total = unit_sar, total_sar
+    else:
+        rates = compiled["fx"]["sar_per_unit"]
+        if currency not in rates:
+            raise KeyError(f"no rate for {currency} in FX snapshot {compiled['fx']['as_of']}")
+        fx = compiled["fx"]
+        scale, rate = fx["scale"], fx["scaled"][currency]
+        unit_cur, total = [_div_half_even(p * scale, rate) for p in unit_sar], _div_half_even(total_sar * scale, rate)
+        out["fx"] = f"1 {currency} = {rates[currency]:g} SAR"
+    out["items"] = [{"unit": units[uid]["code"], "name": units[uid]["name"], "qty": qty,
+                     "unit_price": p, "amount": p * qty} for (uid, qty), p in zip(items, unit_cur)]
+    out.update(currency=currency, date=when.isoformat(), total=total, total_sar=total_sar)
+    return out
+
+
+def quote(args):
+    compiled = load_compiled()
+    package = None
+    if args.command == "quote":
+        items = _items(compiled, [(args.unit, args.qty)])
+    elif args.command == "bundle":
+        pairs = [item.rpartition(":")[::2] if ":" in item else (item, "1")
+                 for item in args.items.split(",") if item.strip()]
+        items = _items(compiled, pairs)
+    else:
+        keys = compiled["package_keys"]
+        package = keys.get(args.name.strip().lower()) or keys.get(unit_code(args.name))
+        if package is None:
+            raise KeyError(f"no package {args.name!r} in the price book")
+        items = [tuple(item) for item in compiled["packages"][package]["units"]]
+    return price(compiled, items, args.currency.upper(), args.date, package)
+
+
+def format_quote(result):
+    cur = result["currency"]
+    lines = []
+    if "package" in result:
+        lines.append(f"{result['package']}  ({result['tier']}, {result['range']})")
+    for item in result["items"]:
+        lines.append(f"  {item['name'][:48]:<48} {item['qty']:>4} × {cur} {item['unit_price']:>12,}"
+                     f"  = {cur} {item['amount']:>14,}")
+    lines.append(f"  {'Total':<48} {'':>4}   {'':>{len(cur) + 13}}  = {cur} {result['total']:>14,}")
+    note = f"priced {result['date']}"
+    if cur != "SAR":
+        note += f", SAR {result['total_sar']:,} at {result['fx']}"
+    lines.append(f"  ({note})")
+    return "\n".join(lines)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# BUILDS
+# ─────────────────────────────────────────────────────────────────────────────
+def _start(builder, argv):
+    """Run a builder script in its own process (its imports stay out of ours)."""
+    import subprocess
+
+    return subprocess.Popen([sys.executable, os.path.join(HERE, BUILDERS[builder])] + argv, cwd=HERE)
+
+
+def build(args):
+    flags = (["--profile"] * args.profile + ["--profile-memory"] * args.profile_memory
+               + ["--reproducible"] * args.reproducible)
+    if args.command == "build-xlsx":
+        argv = flags
+        if args.students is not None:
+            argv += ["--students", str(args.students)]
+        if args.output:
+            argv += ["--output", args.output]
+        procs = [_start("xlsx", argv)]
+    else:
+        names = [args.only] if args.only else ["donor", "ambassador"]
+        procs = [_start(name, flags + (["--currency", args.currency] if name == "donor" else []))
+                 for name in names]
+    return max(p.wait() for p in procs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="pises", description="PISES quotes and builds")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def quote_parser(name, help_text):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("--currency", default="SAR", help="ISO code from the FX snapshot (default SAR)")
+        p.add_argument("--date", type=date.fromisoformat, default=None,
+                       help="pledge date YYYY-MM-DD (default 1 January of the price base year)")
+        out = p.add_mutually_exclusive_group()
+        out.add_argument("--json", action="store_true", help="pricing API response as JSON")
+        out.add_argument("--total", action="store_true", help="print only the total")
+        return p
+
+    quote_parser("quote", "price one unit").add_argument("unit", help="unit ID, code or name")
+    sub.choices["quote"].add_argument("--qty", default="1")
+    quote_parser("package", "price a donor package").add_argument("name", help="package name or code")
+    quote_parser("bundle", "price several units").add_argument("items", help="unit[:qty],… e.g. art-studio:1,sensory-room:2")
+
+    for name, help_text in (("build-xlsx", "build the donor pricing workbook"),
+                            ("build-decks", "build the donor and ambassador decks")):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("--reproducible", action="store_true",
+                       help="byte-reproducible output plus .sha256 digests (reproducible.py)")
+        p.add_argument("--profile", action="store_true", help="timing summary and Chrome trace (instrument.py)")
+        p.add_argument("--profile-memory", action="store_true", help="--profile with tracemalloc peaks")
+    sub.choices["build-xlsx"].add_argument("--students", type=int, default=None)
+    sub.choices["build-xlsx"].add_argument("--output", default=None)
+    sub.choices["build-decks"].add_argument("--currency", default="USD", help="donor deck second currency")
+    sub.choices["build-decks"].add_argument("--only", choices=["donor", "ambassador"])
+
+    args = parser.parse_args(argv)
+    if args.command.startswith("build-"):
+        return build(args)
+    try:
+        result = quote(args)
+    except (KeyError, ValueError) as e:
+        parser.exit(2, f"pises {args.command}: {e.args[0] if e.args else e}\n")
+    if args.json:
+        import json
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    elif args.total:
+        print(result["total"])
+    else:
+        print(format_quote(result))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
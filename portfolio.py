@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+PISES New Campus – Multi-Campus Portfolio
+Prices several campuses side by side. Each campus in the portfolio file
+(PISES_Portfolio.json) has its own programme, grossing factors and envelope:
+
+  - Programme: with "students" (and optionally "programme" inputs such as
+    mix_ey or class_size) the unit quantities come from the space programme
+    rules (space_programme.py). Without them the price book quantities are
+    used as entered.
+  - Grossing: "grossing" overrides the price book factor per class code.
+  - Envelope: "total_cost_sar" or "cost_per_bua_m2" (default: the price
+    book's rate). "total_bua" defaults to the price book's BUA scaled by
+    the campus's gross area, so a campus with no overrides prices exactly
+    like the price book.
+  - Price book: "price_book" names another PISES_Price_Book.sqlite.
+
+Campuses are independent, so they are evaluated in a process pool (one
+worker per core by default, campuses handed out in chunks). Each worker
+loads a price book once and keeps one Programme, which it updates
+incrementally from campus to campus. Unit costs are the same fixed-point
+arithmetic as the workbook (money.unit_costs()), plus unit prices
+calibrated to the envelope (budget_calibration.calibrate()).
+
+The roll-up workbook has a Portfolio Summary sheet (one row per campus, then
+every package priced at every campus with the cheapest marked) and one sheet
+per campus. It is written in openpyxl's write-only mode, which streams rows
+to disk instead of holding every styled cell.
+
+search() is the cross-campus package search: every package at every
+campus, filtered by name and / or budget and sorted by price.
+
+Usage:
+  python portfolio.py [PORTFOLIO.json] [--workers N] [--output FILE] [--reproducible]
+  python portfolio.py [PORTFOLIO.json] --search "Name a Classroom"
+  python portfolio.py [PORTFOLIO.json] --search "" --max-sar 1000000
+"""
+
+import argparse
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PORTFOLIO_PATH = os.path.join(HERE, "PISES_Portfolio.json")
+OUTPUT_PATH = "/home/user/PISES/PISES_Portfolio_Pricing.xlsx"
+CAMPUS_KEYS = {"name", "note", "students", "programme", "grossing", "total_cost_sar",
+               "cost_per_bua_m2", "total_bua", "price_book"}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# PORTFOLIO FILE
+# ─────────────────────────────────────────────────────────────────────────────
+def load_portfolio(path=PORTFOLIO_PATH):
+    """Campus definitions from a portfolio file, checked."""
+    with open(path, encoding="utf-8") as f:
+        campuses = json.load(f)["campuses"]
+    seen = set()
+    for campus in campuses:
+        name = campus.get("name")
+        if not name:
+            raise ValueError("every campus needs a name")
+        if name in seen:
+            raise ValueError(f"campus {name!r} appears twice")
+        seen.add(name)
+        unknown = set(campus) - CAMPUS_KEYS
+        if unknown:
+            raise ValueError(f"campus {name!r}: unknown key(s) {', '.join(sorted(unknown))}")
+        if "total_cost_sar" in campus and "cost_per_bua_m2" in campus:
+            raise ValueError(f"campus {name!r}: give total_cost_sar or cost_per_bua_m2, not both")
+        if campus.get("price_book") and not os.path.isabs(campus["price_book"]):
+            campus["price_book"] = os.path.join(os.path.dirname(os.path.abspath(path)),
+                                                campus["price_book"])
+    return campuses
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CAMPUS EVALUATION (runs in the pool workers)
+# ─────────────────────────────────────────────────────────────────────────────
+_models = {}           # price book path → model, per process
+_programme = None      # one incrementally updated Programme per process
+
+
+def _model(path):
+    from price_book import PRICE_BOOK_PATH, load_model
+
+    path = path or PRICE_BOOK_PATH
+    if path not in _models:
+        _models[path] = load_model(path)
+    return _models[path]
+
+
+def _students(campus):
+    """Student target (the price book is sized for the design target)."""
+    from space_programme import DESIGN_STUDENTS
+
+    return campus.get("students", DESIGN_STUDENTS)
+
+
+def _quantities(campus):
+    """{unit name: qty} from the programme rules, or None for price book quantities."""
+    global _programme
+    from space_programme import DEFAULT_INPUTS, Programme
+
+    if "students" not in campus and "programme" not in campus:
+        return None
+    inputs = {**DEFAULT_INPUTS, **campus.get("programme", {}), "students": _students(campus)}
+    if _programme is None:
+        _programme = Programme(**inputs)
+    else:
+        _programme.update(**inputs)
+    return _programme.quantities()
+
+
+def evaluate_campus(campus):
+    """Unit and package prices for one campus definition (a plain dict)."""
+    import numpy as np
+    from budget_calibration import CalibrationError, calibrate
+    from money import fixed, to_sar, unit_costs
+
+    model = _model(campus.get("price_book"))
+    settings = model["settings"]
+    grossing = {**model["grossing"], **campus.get("grossing", {})}
+    programme = _quantities(campus)
+    units = model["units"]
+    qty = np.array([u["qty"] if programme is None else programme.get(u["name"], u["qty"])
+                    for u in units], dtype=np.int64)
+    nets = [u["net_m2"] for u in units]
+    factors = [grossing[u["grossing_class"]] for u in units]
+    book_factors = [u["factor"] for u in units]
+
+    # Gross area in 0.0001 m² (NET and GF both 0.01 fixed point)
+    gross = int((qty * fixed(nets) * fixed(factors)).sum())
+    book_gross = int((np.array([u["qty"] for u in units], dtype=np.int64)
+                      * fixed(nets) * fixed(book_factors)).sum())
+    book_rate = settings["total_cost_sar"] / settings["total_bua"]
+    total_bua = campus.get("total_bua") or round(settings["total_bua"] * gross / book_gross)
+    if "total_cost_sar" in campus:
+        envelope = int(campus["total_cost_sar"])
+    elif "cost_per_bua_m2" in campus:
+        envelope = round(campus["cost_per_bua_m2"] * total_bua)
+    elif total_bua == settings["total_bua"]:
+        envelope = int(settings["total_cost_sar"])
+    else:
+        envelope = round(book_rate * total_bua)
+
+    costs = to_sar(unit_costs(nets, factors, envelope, total_bua))
+    try:
+        calib = calibrate(qty, nets, factors, envelope)
+        calibrated, calibrated_rate = calib["prices"].tolist(), calib["rates"][None]
+    except CalibrationError:
+        # No exact whole-SAR split for this programme; the book prices still stand
+        calibrated, calibrated_rate = [None] * len(units), None
+    cost_by_id = {u["id"]: int(c) for u, c in zip(units, costs.tolist())}
+    rows = [{"id": u["id"], "code": u["code"], "name": u["name"], "category": u["category"],
+             "qty": int(q), "net_m2": u["net_m2"], "grossing_class": u["grossing_class"],
+             "factor": gf, "unit_cost_sar": int(c), "total_sar": int(q) * int(c),
+             "calibrated_sar": p}
+            for u, q, gf, c, p in zip(units, qty.tolist(), factors, costs.tolist(), calibrated)]
+    packages = [{"id": pkg["id"], "name": pkg["name"], "tier": tier["name"], "range": tier["range"],
+                 "total_sar": sum(cost_by_id[uid] * n for uid, n in pkg["units"])}
+                for tier in model["tiers"] for pkg in tier["packages"]]
+    return {
+        "name": campus["name"], "note": campus.get("note", ""),
+        "students": _students(campus), "programme": programme is not None,
+        "grossing": grossing, "total_cost_sar": envelope, "total_bua": total_bua,
+        "cost_per_bua_m2": envelope / total_bua, "gross_bua_m2": gross / 1e4,
+        "book_total_sar": sum(r["total_sar"] for r in rows),
+        "calibrated_rate": calibrated_rate, "units": rows, "packages": packages,
+    }
+
+
+def evaluate(campuses, workers=None):
+    """evaluate_campus() for every campus, in order, across a process pool.
+
+    workers=1 (or a single campus) evaluates in this process.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(campuses))
+    if workers <= 1:
+        return [evaluate_campus(c) for c in campuses]
+    chunksize = max(1, len(campuses) // (workers * 4))
+    with ProcessPoolExecutor(workers) as pool:
+        return list(pool.map(evaluate_campus, campuses, chunksize=chunksize))
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CROSS-CAMPUS PACKAGE SEARCH
+# ─────────────────────────────────────────────────────────────────────────────
+def search(results, query="", max_sar=None, min_sar=None, campuses=None):
+    """[(package, tier, campus, SAR)] matching name / budget, cheapest first.
+
+    query matches package names case-insensitively (or a package code);
+    campuses limits the search to those campus names.
+    """
+    from price_book import unit_code
+
+    query = query.strip().lower()
+    code = unit_code(query) if query else ""
+    hits = []
+    for result in results:
+        if campuses and result["name"] not in campuses:
+            continue
+        for pkg in result["packages"]:
+            if query and query not in pkg["name"].lower() and unit_code(pkg["name"]) != code:
+                continue
+            total = pkg["total_sar"]
+            if (max_sar is not None and total > max_sar) or (min_sar is not None and total < min_sar):
+                continue
+            hits.append((pkg["name"], pkg["tier"], result["name"], total))
+    return sorted(hits, key=lambda h: (h[3], h[0], h[2]))
+
+
+def package_matrix(results):
+    """[(package, tier, [SAR per campus], cheapest campus)] in price book order."""
+    rows = []
+    for i, pkg in enumerate(results[0]["packages"]):
+        totals = [r["packages"][i]["total_sar"] for r in results]
+        cheapest = results[totals.index(min(totals))]["name"]
+        rows.append((pkg["name"], pkg["tier"], totals, cheapest))
+    return rows
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# ROLL-UP WORKBOOK
+# ─────────────────────────────────────────────────────────────────────────────
+def _sheet_titles(names):
+    """Unique Excel-safe sheet titles (≤ 31 characters)."""
+    titles, used = [], {"portfolio summary"}
+    for name in names:
+        base = re.sub(r"[\[\]:*?/\\]", "-", name).strip("' ")[:31] or "Campus"
+        title, n = base, 1
+        while title.lower() in used:
+            n += 1
+            title = f"{base[:31 - len(str(n)) - 1]}~{n}"
+        used.add(title.lower())
+        titles.append(title)
+    return titles
+
+
+def build_rollup(results, output_path=OUTPUT_PATH, reproducible_output=False):
+    """Write the portfolio workbook: summary sheet plus one sheet per campus."""
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+    from openpyxl.utils import get_column_letter
+
+    DARK_GREEN, LIGHT_GREEN, LIGHT_GOLD, DARK_GRAY = "1B5E20", "E8F5E9", "FFF8E1", "333333"
+    side = Side(style="thin", color="BDBDBD")
+    border = Border(left=side, right=side, top=side, bottom=side)
+    styles = {
+        "title": {"font": Font(name="Calibri", bold=True, size=18, color=DARK_GREEN)},
+        "subtitle": {"font": Font(name="Calibri", size=12, color="666666")},
+        "header": {"font": Font(name="Calibri", bold=True, size=11, color="FFFFFF"),
+                   "fill": PatternFill("solid", start_color=DARK_GREEN, end_color=DARK_GREEN),
+                   "alignment": Alignment(horizontal="center", vertical="center", wrap_text=True),
+                   "border": border},
+        "text": {"font": Font(name="Calibri", size=10, color=DARK_GRAY), "border": border},
+        "category": {"font": Font(name="Calibri", bold=True, size=10, color=DARK_GREEN),
+                     "fill": PatternFill("solid", start_color=LIGHT_GREEN, end_color=LIGHT_GREEN),
+                     "border": border},
+        "total": {"font": Font(name="Calibri", bold=True, size=11, color=DARK_GREEN),
+                  "fill": PatternFill("solid", start_color=LIGHT_GOLD, end_color=LIGHT_GOLD),
+                  "border": border},
+        "best": {"font": Font(name="Calibri", bold=True, size=10, color=DARK_GREEN),
+                 "fill": PatternFill("solid", start_color=LIGHT_GREEN, end_color=LIGHT_GREEN),
+                 "border": border},
+    }
+    formats = {int: "#,##0", float: "#,##0.00"}
+
+    wb = Workbook(write_only=True)
+
+    def row(ws, values, style="text", fmt=None):
+        cells = []
+        for value in values:
+            if isinstance(value, tuple):          # (value, style) for a one-off cell style
+                value, cell_style = value
+            else:
+                cell_style = style
+            cell = WriteOnlyCell(ws, value=value)
+            for attr, obj in styles[cell_style].items():
+                setattr(cell, attr, obj)
+            if type(value) in formats:
+                cell.number_format = fmt or formats[type(value)]
+            cells.append(cell)
+        ws.append(cells)
+
+    def sheet(title, widths, freeze):
+        ws = wb.create_sheet(title)
+        for i, w in enumerate(widths, 1):
+            ws.column_dimensions[get_column_letter(i)].width = w
+        ws.freeze_panes = freeze
+        return ws
+
+    # Portfolio Summary
+    titles = _sheet_titles([r["name"] for r in results])
+    ws = sheet("Portfolio Summary", [36, 10, 18, 12, 14, 18, 18, 14, 36],
+               "B5" if len(results) > 1 else "A5")
+    row(ws, ["PISES PORTFOLIO — UNIT PRICING ROLL-UP"], "title")
+    row(ws, [f"{len(results)} campus(es)  |  Unit costs = NET × grossing factor × cost/m² BUA, "
+             f"whole SAR"], "subtitle")
+    row(ws, [])
+    row(ws, ["Campus", "Students", "Envelope (SAR)", "Total BUA m²", "Cost / m² BUA",
+             "Unit Price Book (SAR)", "Variance (SAR)", "Calibrated / m²", "Note"], "header")
+    for r in results:
+        row(ws, [r["name"], r["students"], r["total_cost_sar"], r["total_bua"],
+                 r["cost_per_bua_m2"], r["book_total_sar"], r["book_total_sar"] - r["total_cost_sar"],
+                 r["calibrated_rate"], r["note"]])
+    envelope = sum(r["total_cost_sar"] for r in results)
+    bua = sum(r["total_bua"] for r in results)
+    book = sum(r["book_total_sar"] for r in results)
+    row(ws, ["PORTFOLIO TOTAL", sum(r["students"] for r in results), envelope, bua,
+             envelope / bua if bua else 0.0, book, book - envelope, "", ""], "total")
+    row(ws, [])
+    row(ws, ["PACKAGE PRICES BY CAMPUS (SAR)"], "title")
+    row(ws, ["Package", "Tier"] + [r["name"] for r in results] + ["Cheapest Campus"], "header")
+    for name, tier, totals, cheapest in package_matrix(results):
+        low = min(totals)
+        row(ws, [name, tier] + [(t, "best") if t == low else t for t in totals] + [cheapest])
+
+    # One sheet per campus
+    for r, title in zip(results, titles):
+        ws = sheet(title, [5, 44, 30, 8, 10, 8, 16, 18, 16], "C5")
+        row(ws, [r["name"]], "title")
+        source = f"{r['students']:,} students, " + ("programme rules" if r["programme"]
+                                                     else "price book quantities")
+        row(ws, [f"{source}  |  SAR {r['total_cost_sar']:,} over {r['total_bua']:,} m² BUA  |  "
+                 f"SAR {r['cost_per_bua_m2']:,.2f}/m²  |  grossing "
+                 + ", ".join(f"{k} {v:g}×" for k, v in r["grossing"].items())], "subtitle")
+        row(ws, [])
+        row(ws, ["#", "Unit", "Category", "Qty", "NET m²", "GF", "Cost / Unit (SAR)",
+                 "Total (SAR)", "Calibrated / Unit"], "header")
+        category = None
+        for n, u in enumerate(r["units"], 1):
+            if u["category"] != category:
+                category = u["category"]
+                row(ws, ["", category, "", "", "", "", "", "", ""], "category")
+            row(ws, [n, u["name"], u["category"], u["qty"], float(u["net_m2"]), float(u["factor"]),
+                     u["unit_cost_sar"], u["total_sar"], u["calibrated_sar"]])
+        row(ws, ["", "TOTAL", "", sum(u["qty"] for u in r["units"]), "", "", "",
+                 r["book_total_sar"], ""], "total")
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    if reproducible_output:
+        import reproducible
+        return reproducible.save(wb, output_path)
+    wb.save(output_path)
+    return None
+
+
+def format_summary(results):
+    lines = [f"  {'Campus':<32} {'Students':>9} {'Envelope SAR':>15} {'BUA m²':>9} "
+             f"{'SAR/m²':>9} {'Price book SAR':>15}"]
+    for r in results:
+        lines.append(f"  {r['name'][:32]:<32} {r['students']:>9,} {r['total_cost_sar']:>15,} "
+                     f"{r['total_bua']:>9,} {r['cost_per_bua_m2']:>9,.2f} {r['book_total_sar']:>15,}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import time
+
+    parser = argparse.ArgumentParser(description="Price a portfolio of campuses")
+    parser.add_argument("portfolio", nargs="?", default=PORTFOLIO_PATH)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per core)")
+    parser.add_argument("--output", default=OUTPUT_PATH)
+    parser.add_argument("--reproducible", action="store_true",
+                        help="byte-reproducible workbook plus .sha256 digest (reproducible.py)")
+    parser.add_argument("--search", default=None, metavar="PACKAGE",
+                        help="list package prices across campuses instead of building ('' for all)")
+    parser.add_argument("--max-sar", type=int, default=None, help="with --search: budget ceiling")
+    parser.add_argument("--min-sar", type=int, default=None, help="with --search: budget floor")
+    parser.add_argument("--campus", action="append", default=None, help="with --search: limit to campus (repeatable)")
+    args = parser.parse_args()
+
+    try:
+        campuses = load_portfolio(args.portfolio)
+    except (OSError, ValueError, KeyError) as e:
+        parser.exit(2, f"portfolio: {e}\n")
+    started = time.perf_counter()
+    results = evaluate(campuses, args.workers)
+    elapsed = time.perf_counter() - started
+
+    if args.search is not None:
+        hits = search(results, args.search, args.max_sar, args.min_sar, args.campus)
+        for name, tier, campus, total in hits:
+            print(f"  SAR {total:>13,}  {name[:40]:<40} {campus}")
+        print(f"{len(hits)} match(es)")
+        raise SystemExit(0 if hits else 1)
+
+    print(format_summary(results))
+    print(f"✓ {len(results)} campus(es) evaluated in {elapsed * 1e3:,.0f} ms")
+    digest = build_rollup(results, args.output, args.reproducible)
+    print(f"✓ Saved: {args.output}" + (f"  (sha256 {digest})" if digest else ""))
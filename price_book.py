@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+PISES New Campus – Price Book Data File
+The unit price book (units, categories, grossing classes, donor packages and
+pricing assumptions) is stored in PISES_Price_Book.sqlite rather than as
+Python literals, with stable unit IDs, category foreign keys and indexes on
+category, grossing class and unit price.
+
+The loader builds the in-memory model in one pass per table and can also
+hand back the historical UNITS / PACKAGES tuple shapes used by the builders.
+
+Usage:
+  python price_book.py dump                      # SQL text, for review / diff
+  python price_book.py query [--category NAME] [--class CODE]
+                             [--min-cost SAR] [--max-cost SAR]
+"""
+
+import argparse
+import os
+import re
+import sqlite3
+
+PRICE_BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                               "PISES_Price_Book.sqlite")
+
+SCHEMA = """
+CREATE TABLE settings (
+    key         TEXT PRIMARY KEY,
+    value       NUMERIC NOT NULL
+);
+CREATE TABLE grossing_classes (
+    code        TEXT PRIMARY KEY,
+    label       TEXT NOT NULL,
+    factor      REAL NOT NULL CHECK (factor >= 1)
+);
+CREATE TABLE categories (
+    id          INTEGER PRIMARY KEY,
+    name        TEXT NOT NULL UNIQUE,
+    sort_order  INTEGER NOT NULL
+);
+CREATE TABLE units (
+    id              INTEGER PRIMARY KEY,
+    code            TEXT NOT NULL UNIQUE,
+    category_id     INTEGER NOT NULL REFERENCES categories(id),
+    name            TEXT NOT NULL UNIQUE,
+    description     TEXT NOT NULL,
+    qty             INTEGER NOT NULL CHECK (qty >= 0),
+    net_m2          REAL NOT NULL CHECK (net_m2 > 0),
+    grossing_class  TEXT NOT NULL REFERENCES grossing_classes(code),
+    students_note   TEXT NOT NULL,
+    sort_order      INTEGER NOT NULL,
+    unit_cost_sar   INTEGER NOT NULL
+);
+CREATE INDEX idx_units_category ON units (category_id, sort_order);
+CREATE INDEX idx_units_grossing ON units (grossing_class);
+CREATE INDEX idx_units_price ON units (unit_cost_sar);
+CREATE TABLE package_tiers (
+    id          INTEGER PRIMARY KEY,
+    name        TEXT NOT NULL UNIQUE,
+    range_label TEXT NOT NULL,
+    sort_order  INTEGER NOT NULL
+);
+CREATE TABLE packages (
+    id          INTEGER PRIMARY KEY,
+    tier_id     INTEGER NOT NULL REFERENCES package_tiers(id),
+    name        TEXT NOT NULL UNIQUE,
+    description TEXT NOT NULL,
+    impact      TEXT NOT NULL,
+    sort_order  INTEGER NOT NULL
+);
+CREATE INDEX idx_packages_tier ON packages (tier_id, sort_order);
+CREATE TABLE package_items (
+    package_id  INTEGER NOT NULL REFERENCES packages(id),
+    unit_id     INTEGER NOT NULL REFERENCES units(id),
+    qty         INTEGER NOT NULL CHECK (qty > 0),
+    PRIMARY KEY (package_id, unit_id)
+);
+CREATE INDEX idx_package_items_unit ON package_items (unit_id);
+CREATE TABLE escalation_rates (
+    grossing_class  TEXT PRIMARY KEY REFERENCES grossing_classes(code),
+    annual_rate     REAL NOT NULL
+);
+CREATE TABLE category_escalation (
+    category_id     INTEGER PRIMARY KEY REFERENCES categories(id),
+    annual_rate     REAL NOT NULL
+);
+"""
+
+# Grossing class codes → labels used in reports
+GROSSING_LABELS = {
+    "academic": "Academic / Admin / SEN",
+    "high_service": "High-Service (Labs / Sports / Dining)",
+    "operations": "Operations / Back-of-House",
+}
+
+
+def unit_code(name):
+    """Stable slug ID for a unit name, e.g. 'primary-science-lab'."""
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# WRITE
+# ─────────────────────────────────────────────────────────────────────────────
+def reprice(conn, unit_ids=None):
+    """Recompute stored unit_cost_sar from the current settings.
+
+    unit_ids limits the update to those units (e.g. rows edited by an import).
+    """
+    # numpy (via money) is only needed to write; readers such as pises.py stay light
+    from money import FIXED_SCALE, fixed, to_sar, unit_costs
+
+    settings = dict(conn.execute("SELECT key, value FROM settings"))
+    sql = ("SELECT u.id, u.net_m2, g.factor, u.name FROM units u "
+           "JOIN grossing_classes g ON g.code = u.grossing_class")
+    args = []
+    if unit_ids is not None:
+        args = sorted(unit_ids)
+        sql += f" WHERE u.id IN ({', '.join('?' * len(args))})"
+    rows = conn.execute(sql, args).fetchall()
+    if not rows:
+        return
+    ids, nets, factors, names = zip(*rows)
+    try:
+        costs = to_sar(unit_costs(nets, factors, settings["total_cost_sar"], settings["total_bua"]))
+    except ValueError:
+        # Name the offending rows instead of fixed()'s bare array of values
+        bad = []
+        for uid, net, factor, name in rows:
+            for label, value in (("NET m²", net), ("grossing factor", factor)):
+                try:
+                    fixed(value)
+                except ValueError:
+                    bad.append(f"unit {uid} ({name}): {label} {value!r}")
+        if not bad:
+            raise
+        raise ValueError(f"cannot re-price, not a multiple of 1/{FIXED_SCALE} "
+                         f"(store values through money.quantise()): {'; '.join(bad)}") from None
+    conn.executemany("UPDATE units SET unit_cost_sar = ? WHERE id = ?",
+                     zip(costs.tolist(), ids))
+
+
+def create_price_book(path, settings, grossing, units, packages, escalation=None):
+    """Write a new price book.
+
+    settings : {"total_cost_sar", "total_bua", "sar_per_usd", "base_year"}
+    grossing : {class_code: factor}
+    units    : legacy UNITS tuples, category headers marked by qty None, with
+               the grossing factor replaced by its class code
+    packages : [(tier_name, range_label, [(name, desc, impact, [(unit_name, qty)])])]
+    escalation : {class_code: annual rate}, optionally with "categories":
+                 {category_name: annual rate} overrides
+    """
+    from money import quantise
+
+    if os.path.exists(path):
+        os.remove(path)
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.executescript(SCHEMA)
+        conn.executemany("INSERT INTO settings VALUES (?, ?)", settings.items())
+        conn.executemany("INSERT INTO grossing_classes VALUES (?, ?, ?)",
+                         [(code, GROSSING_LABELS.get(code, code), quantise(gf)) for code, gf in grossing.items()])
+        cat_id, cat_order, unit_order, unit_ids = None, 0, 0, {}
+        for name, desc, qty, net_m2, gf_class, students in units:
+            if qty is None:
+                cat_order += 1
+                cat_id = conn.execute("INSERT INTO categories (name, sort_order) VALUES (?, ?)",
+                                      (name, cat_order)).lastrowid
+                continue
+            unit_order += 1
+            unit_ids[name] = conn.execute(
+                "INSERT INTO units (id, code, category_id, name, description, qty, net_m2, "
+                "grossing_class, students_note, sort_order, unit_cost_sar) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)",
+                (unit_order, unit_code(name), cat_id, name, desc, qty, quantise(net_m2), gf_class,
+                 students, unit_order)).lastrowid
+        for t, (tier_name, range_label, items) in enumerate(packages, 1):
+            tier_id = conn.execute("INSERT INTO package_tiers (name, range_label, sort_order) "
+                                   "VALUES (?, ?, ?)", (tier_name, range_label, t)).lastrowid
+            for p, (pkg_name, desc, impact, contents) in enumerate(items, 1):
+                pkg_id = conn.execute("INSERT INTO packages (tier_id, name, description, impact, "
+                                      "sort_order) VALUES (?, ?, ?, ?, ?)",
+                                      (tier_id, pkg_name, desc, impact, p)).lastrowid
+                conn.executemany("INSERT INTO package_items VALUES (?, ?, ?)",
+                                 [(pkg_id, unit_ids[u], q) for u, q in contents])
+        escalation = dict(escalation or {})
+        overrides = escalation.pop("categories", {})
+        conn.executemany("INSERT INTO escalation_rates VALUES (?, ?)", escalation.items())
+        conn.executemany("INSERT INTO category_escalation SELECT id, ? FROM categories WHERE name = ?",
+                         [(rate, name) for name, rate in overrides.items()])
+        reprice(conn)
+    conn.close()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# READ
+# ─────────────────────────────────────────────────────────────────────────────
+def connect(path=PRICE_BOOK_PATH):
+    """Read-only connection to a price book."""
+    return sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+
+
+def load_model(path=PRICE_BOOK_PATH):
+    """Load the whole price book into plain dicts / lists.
+
+    Returns {"settings", "grossing", "categories", "units", "tiers"} where
+    units are dicts keyed by column name (plus "factor", "category" and
+    "escalation_rate") in sort order, and each tier carries its packages and
+    their unit contents.
+    """
+    conn = connect(path)
+    try:
+        settings = dict(conn.execute("SELECT key, value FROM settings"))
+        grossing = dict(conn.execute("SELECT code, factor FROM grossing_classes"))
+        categories = [{"id": i, "name": n} for i, n in
+                      conn.execute("SELECT id, name FROM categories ORDER BY sort_order")]
+        cat_names = {c["id"]: c["name"] for c in categories}
+        class_rates = dict(conn.execute("SELECT grossing_class, annual_rate FROM escalation_rates"))
+        cat_rates = dict(conn.execute("SELECT category_id, annual_rate FROM category_escalation"))
+
+        cur = conn.execute("SELECT * FROM units ORDER BY sort_order")
+        cols = [d[0] for d in cur.description]
+        units = []
+        for row in cur:
+            unit = dict(zip(cols, row))
+            unit["factor"] = grossing[unit["grossing_class"]]
+            unit["category"] = cat_names[unit["category_id"]]
+            unit["escalation_rate"] = cat_rates.get(unit["category_id"],
+                                                    class_rates.get(unit["grossing_class"], 0.0))
+            units.append(unit)
+
+        contents = {}
+        for pkg_id, unit_id, qty in conn.execute(
+                "SELECT package_id, unit_id, qty FROM package_items ORDER BY rowid"):
+            contents.setdefault(pkg_id, []).append((unit_id, qty))
+        tiers = [{"id": i, "name": n, "range": r, "packages": []} for i, n, r in
+                 conn.execute("SELECT id, name, range_label FROM package_tiers ORDER BY sort_order")]
+        by_tier = {t["id"]: t for t in tiers}
+        for pkg_id, tier_id, name, desc, impact in conn.execute(
+                "SELECT id, tier_id, name, description, impact FROM packages "
+                "ORDER BY tier_id, sort_order"):
+            by_tier[tier_id]["packages"].append({
+                "id": pkg_id, "name": name, "description": desc, "impact": impact,
+                "units": contents.get(pkg_id, []),
+            })
+    finally:
+        conn.close()
+    return {"settings": settings, "grossing": grossing, "categories": categories,
+            "units": units, "tiers": tiers}
+
+
+def legacy_units(model):
+    """UNITS tuples (category headers as qty-None rows) for the builders."""
+    out, current = [], None
+    for u in model["units"]:
+        if u["category_id"] != current:
+            current = u["category_id"]
+            out.append((u["category"], None, None, None, None, None))
+        out.append((u["name"], u["description"], u["qty"], u["net_m2"], u["factor"],
+                    u["students_note"]))
+    return out
+
+
+def unit_classes(model):
+    """{unit name: grossing class code}, for callers working from UNITS tuples."""
+    return {u["name"]: u["grossing_class"] for u in model["units"]}
+
+
+def legacy_packages(model):
+    """PACKAGES as (tier, range, [(name, desc, impact, [(unit_name, qty)])])."""
+    names = {u["id"]: u["name"] for u in model["units"]}
+    return [(t["name"], t["range"],
+             [(p["name"], p["description"], p["impact"],
+               [(names[uid], q) for uid, q in p["units"]]) for p in t["packages"]])
+            for t in model["tiers"]]
+
+
+def query_units(conn, category=None, grossing_class=None, min_cost=None, max_cost=None):
+    """Partial query over units using the category / class / price indexes."""
+    sql = ("SELECT u.id, u.code, c.name, u.name, u.qty, u.net_m2, u.grossing_class, "
+           "u.unit_cost_sar FROM units u JOIN categories c ON c.id = u.category_id")
+    where, args = [], []
+    if category is not None:
+        where.append("c.name = ?")
+        args.append(category)
+    if grossing_class is not None:
+        where.append("u.grossing_class = ?")
+        args.append(grossing_class)
+    if min_cost is not None:
+        where.append("u.unit_cost_sar >= ?")
+        args.append(min_cost)
+    if max_cost is not None:
+        where.append("u.unit_cost_sar <= ?")
+        args.append(max_cost)
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    return conn.execute(sql + " ORDER BY u.unit_cost_sar, u.sort_order", args).fetchall()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect the PISES price book")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("dump")
+    q = sub.add_parser("query")
+    q.add_argument("--category")
+    q.add_argument("--class", dest="grossing_class", choices=sorted(GROSSING_LABELS))
+    q.add_argument("--min-cost", type=int)
+    q.add_argument("--max-cost", type=int)
+    args = parser.parse_args()
+
+    conn = connect()
+    if args.cmd == "dump":
+        for line in conn.iterdump():
+            print(line)
+    else:
+        rows = query_units(conn, args.category, args.grossing_class, args.min_cost, args.max_cost)
+        for uid, code, cat, name, qty, net, gf_class, cost in rows:
+            print(f"{uid:>3}  {name:<52} {qty:>4} × {net:>7.1f} m²  {gf_class:<12} SAR {cost:>12,}")
+        print(f"{len(rows)} unit(s)")
+    conn.close()
@@ -0,0 +1,478 @@
+#!/usr/bin/env python3
+"""
+PISES New Campus – Price Book History
+Pricing assumptions change (cost envelope, grossing factors, unit areas and
+quantities), and donors must be held to the price they were quoted. This is
+an append-only version store for the price model, kept in
+PISES_Price_History.sqlite next to the price book.
+
+  - Structural sharing: a version is a root object listing the hashes of its
+    parts (settings, grossing, escalation, categories, one object per unit,
+    one per package tier). Objects are content-addressed (SHA-256 of
+    canonical JSON), so a version that changes one unit stores one new unit
+    object plus a new root, and shares everything else with its parent.
+  - Fast checkout: one query fetches a version's objects. Decoded objects are
+    cached by hash, so checking out a neighbouring version decodes only what
+    differs. The result has the same shape as price_book.load_model(), so
+    escalation, fx and the builders work on any version.
+  - Delta pricing: derive() applies a change set and re-prices only the
+    units it affects. The cost envelope changes every unit, a grossing
+    factor changes its class, and an area or class edit changes that unit.
+    Quantity and text edits re-price nothing. The arithmetic is
+    money.unit_costs(), as in price_book.reprice().
+  - Pledges: a pledge is stored with the version it was quoted at and is
+    re-priced at that version, never at the current one.
+
+Versions and pledges cannot be updated or deleted (triggers abort).
+
+Usage:
+  python price_history.py snapshot --note "Board-approved envelope"
+  python price_history.py log
+  python price_history.py derive 3 --setting total_cost_sar=260000000 \\
+                                   --grossing academic=1.5 --unit art-studio:net_m2=95 --note …
+  python price_history.py compare 2 5              # side-by-side unit prices
+  python price_history.py quote --as-of 2026-03-31 --package "Name a Classroom"
+  python price_history.py pledge --donor "Al-Faisal Trust" --package "Name a Classroom" --date 2026-03-12
+  python price_history.py pledges [--donor NAME]   # quoted vs honoured
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import date, datetime, timezone
+
+from escalation import pledge_price
+from money import quantise, to_sar, unit_costs
+from price_book import PRICE_BOOK_PATH, connect, load_model, unit_code
+
+HISTORY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            "PISES_Price_History.sqlite")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    hash        TEXT PRIMARY KEY,
+    body        TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS versions (
+    id          INTEGER PRIMARY KEY,
+    parent_id   INTEGER REFERENCES versions(id),
+    root        TEXT NOT NULL REFERENCES objects(hash),
+    created_at  TEXT NOT NULL,
+    note        TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_versions_created ON versions (created_at);
+CREATE TABLE IF NOT EXISTS pledges (
+    id          INTEGER PRIMARY KEY,
+    donor       TEXT NOT NULL,
+    version_id  INTEGER NOT NULL REFERENCES versions(id),
+    items       TEXT NOT NULL,
+    label       TEXT NOT NULL,
+    pledge_date TEXT NOT NULL,
+    quoted_sar  INTEGER NOT NULL,
+    created_at  TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pledges_donor ON pledges (donor);
+CREATE TRIGGER IF NOT EXISTS versions_append_only BEFORE UPDATE ON versions
+    BEGIN SELECT RAISE(ABORT, 'price book versions are append-only'); END;
+CREATE TRIGGER IF NOT EXISTS versions_no_delete BEFORE DELETE ON versions
+    BEGIN SELECT RAISE(ABORT, 'price book versions are append-only'); END;
+CREATE TRIGGER IF NOT EXISTS pledges_append_only BEFORE UPDATE ON pledges
+    BEGIN SELECT RAISE(ABORT, 'pledges are append-only'); END;
+CREATE TRIGGER IF NOT EXISTS pledges_no_delete BEFORE DELETE ON pledges
+    BEGIN SELECT RAISE(ABORT, 'pledges are append-only'); END;
+"""
+
+# Model fields derived at checkout rather than stored on each unit
+_DERIVED = ("factor", "category", "escalation_rate")
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def _encode(obj):
+    body = json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(body.encode()).hexdigest(), body
+
+
+def _rates(path):
+    """Escalation rates by grossing class and by category ID from a price book."""
+    conn = connect(path)
+    try:
+        return {"classes": dict(conn.execute("SELECT grossing_class, annual_rate FROM escalation_rates")),
+                "categories": {str(k): v for k, v in
+                               conn.execute("SELECT category_id, annual_rate FROM category_escalation")}}
+    finally:
+        conn.close()
+
+
+def reprice_units(settings, grossing, units):
+    """{unit id: whole-SAR cost} for `units` (price_book.reprice arithmetic)."""
+    if not units:
+        return {}
+    costs = to_sar(unit_costs([u["net_m2"] for u in units], [grossing[u["grossing_class"]] for u in units],
+                              settings["total_cost_sar"], settings["total_bua"]))
+    return dict(zip((u["id"] for u in units), costs.tolist()))
+
+
+class PriceHistory:
+    """Append-only, content-addressed store of price model versions."""
+
+    def __init__(self, path=HISTORY_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+        self._objects = {}                  # hash → decoded object (shared by versions)
+        self._roots = {}                    # version id → root object
+
+    def close(self):
+        self.conn.close()
+
+    # ── Objects ──────────────────────────────────────────────────────────────
+    def _put(self, obj, pending):
+        digest, body = _encode(obj)
+        if digest not in self._objects:
+            pending[digest] = body
+        return digest
+
+    def _fetch(self, hashes):
+        missing = [h for h in dict.fromkeys(hashes) if h not in self._objects]
+        for i in range(0, len(missing), 500):
+            chunk = missing[i:i + 500]
+            rows = self.conn.execute(f"SELECT hash, body FROM objects WHERE hash IN "
+                                     f"({', '.join('?' * len(chunk))})", chunk)
+            for digest, body in rows:
+                self._objects[digest] = json.loads(body)
+        return [self._objects[h] for h in hashes]
+
+    # ── Versions ─────────────────────────────────────────────────────────────
+    def commit(self, model, rates, note, parent=None):
+        """Store a model (load_model() shape) as a new version; return its ID.
+
+        rates: {"classes": {class: rate}, "categories": {category id: rate}}.
+        """
+        pending = {}
+        units = [{k: v for k, v in u.items() if k not in _DERIVED} for u in model["units"]]
+        tiers = [{**t, "packages": [{**p, "units": [list(item) for item in p["units"]]}
+                                    for p in t["packages"]]} for t in model["tiers"]]
+        root = {
+            "settings": self._put(model["settings"], pending),
+            "grossing": self._put(model["grossing"], pending),
+            "escalation": self._put(rates, pending),
+            "categories": self._put(model["categories"], pending),
+            "units": [self._put(u, pending) for u in units],
+            "tiers": [self._put(t, pending) for t in tiers],
+        }
+        root_hash = self._put(root, pending)
+        with self.conn:
+            self.conn.executemany("INSERT OR IGNORE INTO objects VALUES (?, ?)", pending.items())
+            version = self.conn.execute(
+                "INSERT INTO versions (parent_id, root, created_at, note) VALUES (?, ?, ?, ?)",
+                (parent, root_hash, _now(), note)).lastrowid
+        # Cached only once stored, and decoded from JSON so callers cannot alias it
+        self._objects.update((digest, json.loads(body)) for digest, body in pending.items())
+        return version
+
+    def snapshot(self, note, path=PRICE_BOOK_PATH):
+        """Record the current price book as a version (parent: the latest)."""
+        return self.commit(load_model(path), _rates(path), note, parent=self.latest())
+
+    def latest(self):
+        row = self.conn.execute("SELECT MAX(id) FROM versions").fetchone()
+        return row[0]
+
+    def as_of(self, when):
+        """Version in force at `when` (date or ISO date / timestamp): the last created by then."""
+        when = when.isoformat() if isinstance(when, date) else str(when)
+        if len(when) == 10:
+            when += "T23:59:59+00:00"
+        row = self.conn.execute("SELECT MAX(id) FROM versions WHERE created_at <= ?", (when,)).fetchone()
+        if row[0] is None:
+            raise KeyError(f"no price book version on or before {when[:10]}")
+        return row[0]
+
+    def log(self):
+        return self.conn.execute("SELECT id, parent_id, created_at, note FROM versions ORDER BY id").fetchall()
+
+    def _root(self, version):
+        if version not in self._roots:
+            row = self.conn.execute("SELECT root FROM versions WHERE id = ?", (version,)).fetchone()
+            if row is None:
+                raise KeyError(f"no price book version {version}")
+            self._roots[version] = self._fetch([row[0]])[0]
+        return self._roots[version]
+
+    def checkout(self, version):
+        """(model, rates) for a version; model has the price_book.load_model() shape."""
+        root = self._root(version)
+        settings, grossing, rates, categories = self._fetch(
+            [root["settings"], root["grossing"], root["escalation"], root["categories"]])
+        cat_names = {c["id"]: c["name"] for c in categories}
+        units = []
+        for stored in self._fetch(root["units"]):
+            unit = dict(stored)
+            unit["factor"] = grossing[unit["grossing_class"]]
+            unit["category"] = cat_names[unit["category_id"]]
+            unit["escalation_rate"] = rates["categories"].get(
+                str(unit["category_id"]), rates["classes"].get(unit["grossing_class"], 0.0))
+            units.append(unit)
+        tiers = [{**t, "packages": [{**p, "units": [tuple(item) for item in p["units"]]}
+                                    for p in t["packages"]]} for t in self._fetch(root["tiers"])]
+        model = {"settings": dict(settings), "grossing": dict(grossing),
+                 "categories": [dict(c) for c in categories], "units": units, "tiers": tiers}
+        return model, {"classes": dict(rates["classes"]), "categories": dict(rates["categories"])}
+
+    def changed_units(self, a, b):
+        """Unit IDs whose stored record differs between two versions (hash compare)."""
+        ra, rb = self._root(a), self._root(b)
+        old = {u["id"]: h for h, u in zip(ra["units"], self._fetch(ra["units"]))}
+        new = {u["id"]: h for h, u in zip(rb["units"], self._fetch(rb["units"]))}
+        return sorted(uid for uid in old.keys() | new.keys() if old.get(uid) != new.get(uid))
+
+    # ── Delta pricing ────────────────────────────────────────────────────────
+    def derive(self, version, note, settings=None, grossing=None, units=None, rates=None):
+        """Commit a child of `version` with changes applied; return (new ID, re-priced unit IDs).
+
+        settings / grossing: {key: new value}; units: {unit ref: {column: value}};
+        rates: {"classes": {…}, "categories": {…}} entries to override.
+        """
+        model, current_rates = self.checkout(version)
+        settings, grossing, units = settings or {}, grossing or {}, units or {}
+        by_ref = {}
+        for u in model["units"]:
+            for key in (str(u["id"]), u["code"], u["name"].lower()):
+                by_ref[key] = u
+        affected = set()
+        if {"total_cost_sar", "total_bua"} & settings.keys():
+            affected.update(u["id"] for u in model["units"])
+        model["settings"].update(settings)
+        for code, factor in grossing.items():
+            if code not in model["grossing"]:
+                raise KeyError(f"no grossing class {code!r}")
+            model["grossing"][code] = quantise(factor)
+            affected.update(u["id"] for u in model["units"] if u["grossing_class"] == code)
+        for ref, edits in units.items():
+            unit = by_ref.get(str(ref).strip().lower()) or by_ref.get(unit_code(str(ref)))
+            if unit is None:
+                raise KeyError(f"no unit {ref!r} in version {version}")
+            unknown = set(edits) - (unit.keys() - set(_DERIVED) - {"id", "unit_cost_sar"})
+            if unknown:
+                raise KeyError(f"cannot edit {', '.join(sorted(unknown))} on a unit")
+            if "grossing_class" in edits and edits["grossing_class"] not in model["grossing"]:
+                raise KeyError(f"no grossing class {edits['grossing_class']!r}")
+            if {"net_m2", "grossing_class"} & edits.keys():
+                affected.add(unit["id"])
+            if "net_m2" in edits:
+                edits = {**edits, "net_m2": quantise(edits["net_m2"])}
+            unit.update(edits)
+        for group in ("classes", "categories"):
+            current_rates[group].update({str(k) if group == "categories" else k: v
+                                         for k, v in ((rates or {}).get(group) or {}).items()})
+        targets = [u for u in model["units"] if u["id"] in affected]
+        costs = reprice_units(model["settings"], model["grossing"], targets)
+        for u in targets:
+            u["unit_cost_sar"] = costs[u["id"]]
+        return self.commit(model, current_rates, note, parent=version), sorted(affected)
+
+    # ── Pledges ──────────────────────────────────────────────────────────────
+    def _resolve(self, model, package=None, items=None):
+        """([(unit id, qty)], label) for a package name or [(unit ref, qty)]."""
+        if package is not None:
+            key = package.strip().lower()
+            for tier in model["tiers"]:
+                for pkg in tier["packages"]:
+                    if key in (pkg["name"].lower(), unit_code(pkg["name"])):
+                        return [tuple(i) for i in pkg["units"]], pkg["name"]
+            raise KeyError(f"no package {package!r} in the price book")
+        by_ref = {}
+        for u in model["units"]:
+            for key in (str(u["id"]), u["code"], u["name"].lower()):
+                by_ref[key] = u["id"]
+        resolved = []
+        for ref, qty in items:
+            uid = by_ref.get(str(ref).strip().lower()) or by_ref.get(unit_code(str(ref)))
+            if uid is None:
+                raise KeyError(f"no unit {ref!r} in the price book")
+            resolved.append((uid, int(qty)))
+        return resolved, ", ".join(f"{ref}×{qty}" for ref, qty in items)
+
+    def quote(self, version, when, package=None, items=None):
+        """(SAR, label) for a pledge dated `when` priced at `version`."""
+        model, _ = self.checkout(version)
+        resolved, label = self._resolve(model, package, items)
+        return pledge_price(model, resolved, when), label
+
+    def record_pledge(self, donor, when, package=None, items=None, version=None):
+        """Quote at `version` (default: latest) and store the pledge; return (pledge ID, SAR)."""
+        version = version or self.latest()
+        model, _ = self.checkout(version)
+        resolved, label = self._resolve(model, package, items)
+        quoted = pledge_price(model, resolved, when)
+        with self.conn:
+            pledge_id = self.conn.execute(
+                "INSERT INTO pledges (donor, version_id, items, label, pledge_date, quoted_sar, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (donor, version, json.dumps(resolved), label, when.isoformat(), quoted, _now())).lastrowid
+        return pledge_id, quoted
+
+    def pledged_units(self):
+        """{unit id: qty} summed over every stored pledge."""
+        out = {}
+        for (items,) in self.conn.execute("SELECT items FROM pledges"):
+            for uid, qty in json.loads(items):
+                out[uid] = out.get(uid, 0) + qty
+        return out
+
+    def pledges(self, donor=None):
+        """Stored pledges, each re-priced at its own version ("honoured_sar")."""
+        sql = ("SELECT id, donor, version_id, items, label, pledge_date, quoted_sar, created_at "
+               "FROM pledges")
+        args = ()
+        if donor:
+            sql += " WHERE donor = ?"
+            args = (donor,)
+        out = []
+        for pid, name, version, items, label, when, quoted, created in self.conn.execute(sql + " ORDER BY id", args):
+            model, _ = self.checkout(version)
+            honoured = pledge_price(model, [tuple(i) for i in json.loads(items)], date.fromisoformat(when))
+            out.append({"id": pid, "donor": name, "version": version, "label": label, "date": when,
+                        "quoted_sar": quoted, "honoured_sar": honoured, "created_at": created})
+        return out
+
+
+def compare_report(history, a, b, all_units=False):
+    """Side-by-side unit prices for two versions (changed units unless all_units)."""
+    model_a, rates_a = history.checkout(a)
+    model_b, rates_b = history.checkout(b)
+    units_a = {u["id"]: u for u in model_a["units"]}
+    units_b = {u["id"]: u for u in model_b["units"]}
+    ids = list(units_b) + [uid for uid in units_a if uid not in units_b]
+    changed = set(history.changed_units(a, b))
+    lines = [f"  {'Unit':<44} {'v' + str(a):>12} {'v' + str(b):>12} {'Δ SAR':>12} {'Δ %':>7}"]
+    for uid in ids:
+        if not all_units and uid not in changed:
+            continue
+        ua, ub = units_a.get(uid), units_b.get(uid)
+        pa = f"{ua['unit_cost_sar']:,}" if ua else "—"
+        pb = f"{ub['unit_cost_sar']:,}" if ub else "—"
+        delta = pct = ""
+        if ua and ub:
+            d = ub["unit_cost_sar"] - ua["unit_cost_sar"]
+            delta = f"{d:+,}"
+            pct = f"{100 * d / ua['unit_cost_sar']:+.1f}" if ua["unit_cost_sar"] else ""
+        lines.append(f"  {(ub or ua)['name'][:44]:<44} {pa:>12} {pb:>12} {delta:>12} {pct:>7}")
+    for key in sorted(model_a["settings"].keys() | model_b["settings"].keys()):
+        va, vb = model_a["settings"].get(key), model_b["settings"].get(key)
+        if va != vb:
+            lines.append(f"  setting {key}: {va} → {vb}")
+    for code in sorted(model_a["grossing"].keys() | model_b["grossing"].keys()):
+        va, vb = model_a["grossing"].get(code), model_b["grossing"].get(code)
+        if va != vb:
+            lines.append(f"  grossing {code}: {va} → {vb}")
+    for group, label in (("classes", "class"), ("categories", "category")):
+        for key in sorted(rates_a[group].keys() | rates_b[group].keys()):
+            va, vb = rates_a[group].get(key), rates_b[group].get(key)
+            if va != vb:
+                lines.append(f"  escalation {label} {key}: {va} → {vb}")
+    total_a = sum(u["unit_cost_sar"] * u["qty"] for u in model_a["units"])
+    total_b = sum(u["unit_cost_sar"] * u["qty"] for u in model_b["units"])
+    lines.append(f"  {'All units × qty':<44} {total_a:>12,} {total_b:>12,} {total_b - total_a:>+12,}")
+    return "\n".join(lines)
+
+
+def _assignments(pairs, cast=float):
+    out = {}
+    for pair in pairs or []:
+        key, _, value = pair.partition("=")
+        out[key] = cast(value)
+    return out
+
+
+def _number(text):
+    value = float(text)
+    return int(value) if value.is_integer() else value
+
+
+def _run(history, args):
+    """Run one CLI command."""
+    if args.command == "snapshot":
+        print(f"✓ Version {history.snapshot(args.note)}: {args.note}")
+    elif args.command == "log":
+        for vid, parent, created, note in history.log():
+            print(f"  v{vid:<4} {created}  {'from v' + str(parent) if parent else 'root':<9} {note}")
+    elif args.command == "derive":
+        units = {}
+        for spec in args.unit or []:
+            ref, _, assignment = spec.rpartition(":")
+            key, _, value = assignment.partition("=")
+            units.setdefault(ref, {})[key] = _number(value) if key in ("qty", "net_m2") else value
+        version, repriced = history.derive(
+            args.version, args.note, settings=_assignments(args.setting, _number),
+            grossing=_assignments(args.grossing), units=units,
+            rates={"classes": _assignments(args.rate)})
+        print(f"✓ Version {version} from v{args.version}: {len(repriced)} unit(s) re-priced")
+        print(compare_report(history, args.version, version))
+    elif args.command == "compare":
+        print(compare_report(history, args.a, args.b, args.all))
+    elif args.command in ("quote", "pledge"):
+        items = None
+        if args.items:
+            items = [item.rpartition(":")[::2] if ":" in item else (item, "1")
+                     for item in args.items.split(",") if item.strip()]
+        if args.command == "quote":
+            version = args.version or (history.as_of(args.as_of) if args.as_of else history.latest())
+            sar, label = history.quote(version, args.date, args.package, items)
+            print(f"{label}: SAR {sar:,} for a pledge dated {args.date} (price book v{version})")
+        else:
+            pledge_id, sar = history.record_pledge(args.donor, args.date, args.package, items, args.version)
+            print(f"✓ Pledge {pledge_id}: {args.donor} – SAR {sar:,} (v{args.version or history.latest()})")
+    elif args.command == "pledges":
+        for p in history.pledges(args.donor):
+            mark = "✓" if p["honoured_sar"] == p["quoted_sar"] else "✗"
+            print(f"  {mark} #{p['id']:<4} {p['donor'][:28]:<28} {p['label'][:32]:<32} {p['date']}  "
+                  f"v{p['version']:<3} SAR {p['quoted_sar']:>12,}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Versioned price book history and pledges")
+    parser.add_argument("--history", default=HISTORY_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("snapshot", help="record the current price book as a version")
+    p.add_argument("--note", required=True)
+    sub.add_parser("log", help="list versions")
+    p = sub.add_parser("derive", help="new version from VERSION with changes, re-pricing only affected units")
+    p.add_argument("version", type=int)
+    p.add_argument("--setting", action="append", help="key=value, e.g. total_cost_sar=260000000")
+    p.add_argument("--grossing", action="append", help="class=factor, e.g. academic=1.5")
+    p.add_argument("--unit", action="append", help="unit:column=value, e.g. art-studio:net_m2=95")
+    p.add_argument("--rate", action="append", help="class=annual escalation rate, e.g. academic=0.035")
+    p.add_argument("--note", required=True)
+    p = sub.add_parser("compare", help="side-by-side unit prices of two versions")
+    p.add_argument("a", type=int)
+    p.add_argument("b", type=int)
+    p.add_argument("--all", action="store_true", help="every unit, not only changed ones")
+    for name in ("quote", "pledge"):
+        p = sub.add_parser(name, help="price (and for pledge, record) a package or units")
+        what = p.add_mutually_exclusive_group(required=True)
+        what.add_argument("--package")
+        what.add_argument("--items", help="unit:qty,… e.g. art-studio:1,sensory-room:2")
+        p.add_argument("--date", type=date.fromisoformat, default=date.today(), help="pledge date")
+        p.add_argument("--version", type=int, default=None)
+        if name == "quote":
+            p.add_argument("--as-of", type=date.fromisoformat, default=None,
+                           help="price with the version in force on this day")
+        else:
+            p.add_argument("--donor", required=True)
+    p = sub.add_parser("pledges", help="stored pledges, re-priced at their quoted versions")
+    p.add_argument("--donor")
+    args = parser.parse_args()
+
+    history = PriceHistory(args.history)
+    try:
+        _run(history, args)
+    except (KeyError, ValueError) as e:
+        parser.exit(2, f"price_history {args.command}: {e.args[0] if e.args else e}\n")
+    finally:
+        history.close()
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+PISES New Campus – Pricing API
+A local HTTP service that answers "what does X cost under assumptions Y"
+from a browser or a spreadsheet (=WEBSERVICE(...) with format=text) without
+running a script. The price book model is loaded once at start-up.
+
+  GET /quote?unit=standard-classroom-grades-1-12&qty=2&currency=GBP&date=2027-09-01
+  GET /package?name=Name a Classroom&currency=USD
+  GET /bundle?items=art-studio:1,sensory-room:2&date=2026-01-01
+  GET /stats
+
+unit takes a unit ID, code or name, and package names are matched the same
+way. date prices a pledge on that day with escalation.pledge_price(); the
+default is 1 January of the base year. currency converts with the FX
+snapshot and defaults to SAR. The total converts the SAR total, so it can
+differ from the sum of converted line amounts by rounding. format=text
+returns only the total.
+
+Responses are cached in an LRU keyed on the normalised query: resolved unit
+IDs with merged, sorted quantities, plus currency and date. "Art Studio",
+"art-studio" and "29" therefore share one entry. Identical queries that
+arrive while the first is still being priced await the same future instead
+of pricing again (single flight). Pricing runs on a worker thread, so the
+event loop keeps answering cached queries meanwhile.
+
+Usage:
+  python pricing_api.py [--host 127.0.0.1] [--port 8765] [--cache-size 4096]
+  python pricing_api.py --bench [--concurrency 200] [--requests 20000]
+"""
+
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+from collections import Counter, OrderedDict, deque
+from datetime import date
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from escalation import base_year, pledge_price
+from fx import convert_matrix, load_snapshot, rate_label
+from price_book import load_model, unit_code
+
+DEFAULT_PORT = 8765
+CACHE_SIZE = 4096
+MAX_QTY = 10_000
+TIMING_WINDOW = 10_000           # recent requests kept for /stats percentiles
+
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+class PricingService:
+    """Normalise, price and cache queries against one loaded price book."""
+
+    def __init__(self, model, cache_size=CACHE_SIZE, snapshot=None):
+        self.model = model
+        self.snapshot = snapshot or load_snapshot()
+        self.base_date = date(base_year(model), 1, 1)
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.inflight = {}
+        self.counts = Counter()
+        self.timings = deque(maxlen=TIMING_WINDOW)
+
+        self.units = {u["id"]: u for u in model["units"]}
+        self.unit_keys = {}
+        for u in model["units"]:
+            for key in (str(u["id"]), u["code"], u["name"].lower()):
+                self.unit_keys[key] = u["id"]
+        self.packages = {}
+        for tier in model["tiers"]:
+            for pkg in tier["packages"]:
+                for key in (pkg["name"].lower(), unit_code(pkg["name"])):
+                    self.packages[key] = pkg
+
+    # ── Normalisation ────────────────────────────────────────────────────────
+    def _unit_id(self, ref):
+        uid = self.unit_keys.get(ref.strip().lower()) or self.unit_keys.get(unit_code(ref))
+        if uid is None:
+            raise KeyError(f"no unit {ref!r} in the price book")
+        return uid
+
+    def _items(self, pairs):
+        """Merged, sorted ((unit id, qty), …) from [(unit ref, qty text)]."""
+        merged = Counter()
+        for ref, qty in pairs:
+            try:
+                n = int(qty)
+            except ValueError:
+                raise ValueError(f"quantity {qty!r} is not a whole number") from None
+            if not 0 < n <= MAX_QTY:
+                raise ValueError(f"quantity {n} outside 1–{MAX_QTY:,}")
+            merged[self._unit_id(ref)] += n
+        if not merged:
+            raise ValueError("no items to price")
+        return tuple(sorted(merged.items()))
+
+    def _terms(self, params):
+        """(currency, ISO date) assumptions shared by every query."""
+        currency = params.get("currency", "SAR").upper()
+        if currency != "SAR" and currency not in self.snapshot["sar_per_unit"]:
+            raise KeyError(f"no rate for {currency} in FX snapshot {self.snapshot['as_of']}")
+        try:
+            when = date.fromisoformat(params["date"]) if "date" in params else self.base_date
+        except ValueError:
+            raise ValueError(f"date {params['date']!r} is not YYYY-MM-DD") from None
+        if when < self.base_date:
+            raise ValueError(f"{when} is before the {self.base_date.year} price base")
+        return currency, when.isoformat()
+
+    def normalise(self, kind, params):
+        """Cache key for a query: (kind, items or package, currency, date)."""
+        if kind == "quote":
+            if "unit" not in params:
+                raise ValueError("quote needs unit=")
+            what = self._items([(params["unit"], params.get("qty", "1"))])
+        elif kind == "bundle":
+            pairs = [item.rpartition(":")[::2] if ":" in item else (item, "1")
+                     for item in params.get("items", "").split(",") if item.strip()]
+            what = self._items(pairs)
+        elif kind == "package":
+            pkg = self.packages.get(params.get("name", "").strip().lower())
+            if pkg is None:
+                raise KeyError(f"no package {params.get('name', '')!r} in the price book")
+            what = pkg["id"]
+        else:
+            raise KeyError(kind)
+        return (kind, what) + self._terms(params)
+
+    # ── Pricing ──────────────────────────────────────────────────────────────
+    def _package(self, pkg_id):
+        for tier in self.model["tiers"]:
+            for pkg in tier["packages"]:
+                if pkg["id"] == pkg_id:
+                    return tier, pkg
+        raise KeyError(pkg_id)
+
+    def price(self, key):
+        """Response dict for a normalised key (runs on a worker thread)."""
+        kind, what, currency, when = key
+        when = date.fromisoformat(when)
+        out = {}
+        if kind == "package":
+            tier, pkg = self._package(what)
+            out.update(package=pkg["name"], tier=tier["name"], range=tier["range"])
+            what = tuple(pkg["units"])
+        unit_sar = [pledge_price(self.model, [(uid, 1)], when) for uid, _ in what]
+        total_sar = pledge_price(self.model, list(what), when)
+        if currency == "SAR":
+            unit_cur, total = unit_sar, total_sar
+        else:
+            converted = convert_matrix(unit_sar + [total_sar], [currency], self.snapshot)[:, 0].tolist()
+            unit_cur, total = converted[:-1], converted[-1]
+            out["fx"] = rate_label(currency, self.snapshot)
+        out["items"] = [{"unit": self.units[uid]["code"], "name": self.units[uid]["name"],
+                         "qty": qty, "unit_price": price, "amount": price * qty}
+                        for (uid, qty), price in zip(what, unit_cur)]
+        out.update(currency=currency, date=when.isoformat(), total=total, total_sar=total_sar)
+        return out
+
+    async def query(self, kind, params):
+        """Cached, single-flight price for one query."""
+        key = self.normalise(kind, params)
+        hit = self.cache.get(key)
+        if hit is not None:
+            self.cache.move_to_end(key)
+            self.counts["hits"] += 1
+            return hit
+        pending = self.inflight.get(key)
+        if pending is not None:
+            self.counts["coalesced"] += 1
+            return await asyncio.shield(pending)
+        self.counts["misses"] += 1
+        future = asyncio.get_running_loop().run_in_executor(None, self.price, key)
+        self.inflight[key] = future
+        try:
+            # Shielded so a disconnecting first caller does not cancel the others
+            result = await asyncio.shield(future)
+        finally:
+            del self.inflight[key]
+        self.cache[key] = result
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return result
+
+    def stats(self):
+        ms = np.array(self.timings) * 1000 if self.timings else np.zeros(1)
+        return {**{k: self.counts[k] for k in ("hits", "misses", "coalesced", "errors")},
+                "cached": len(self.cache), "cache_size": self.cache_size,
+                "service_ms": {f"p{p}": round(float(np.percentile(ms, p)), 4) for p in (50, 95, 99)}}
+
+    # ── HTTP ─────────────────────────────────────────────────────────────────
+    async def respond(self, method, target):
+        """(status, body bytes, content type) for one request."""
+        url = urlsplit(target)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        kind = url.path.strip("/")
+        if method != "GET":
+            return 405, _json({"error": "only GET is supported"}), "application/json"
+        if kind == "stats":
+            return 200, _json(self.stats()), "application/json"
+        if kind not in ("quote", "package", "bundle"):
+            return 404, _json({"error": f"unknown endpoint {url.path}"}), "application/json"
+        try:
+            result = await self.query(kind, params)
+        except KeyError as e:
+            self.counts["errors"] += 1
+            return 404, _json({"error": e.args[0] if e.args else str(e)}), "application/json"
+        except ValueError as e:
+            self.counts["errors"] += 1
+            return 400, _json({"error": str(e)}), "application/json"
+        if params.get("format") == "text":
+            return 200, str(result["total"]).encode(), "text/plain"
+        return 200, _json(result), "application/json"
+
+    async def handle(self, reader, writer):
+        """One keep-alive connection: GET requests until the client closes."""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                start = time.perf_counter()
+                parts = line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = header.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                if len(parts) != 3:
+                    break
+                method, target, version = parts
+                status, body, ctype = await self.respond(method, target)
+                keep_alive = (version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                              and "content-length" not in headers)
+                writer.write((f"{version} {status} {STATUS_TEXT[status]}\r\n"
+                              f"Content-Type: {ctype}; charset=utf-8\r\n"
+                              f"Content-Length: {len(body)}\r\n"
+                              "Access-Control-Allow-Origin: *\r\n"
+                              f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode() + body)
+                await writer.drain()
+                self.timings.append(time.perf_counter() - start)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+def _json(obj):
+    return json.dumps(obj, ensure_ascii=False).encode()
+
+
+async def serve(host="127.0.0.1", port=DEFAULT_PORT, cache_size=CACHE_SIZE, model=None):
+    service = PricingService(model or load_model(), cache_size)
+    server = await asyncio.start_server(service.handle, host, port, backlog=1024)
+    print(f"✓ Pricing API on http://{host}:{port}  ({len(service.units)} units, "
+          f"{len(service.packages) // 2} packages, cache {cache_size:,})", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+# ── Benchmark ────────────────────────────────────────────────────────────────
+async def _client(host, port, paths, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    for path in paths:
+        start = time.perf_counter()
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            if line.lower().startswith(b"content-length:"):
+                length = int(line.split(b":")[1])
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+
+async def _bench(host, port, concurrency, requests):
+    model = load_model()
+    paths = [f"/quote?unit={u['code']}&qty={q}" for u in model["units"] for q in (1, 2)]
+    per_client = max(1, requests // concurrency)
+    latencies = []
+    # Warm the cache, then every client cycles through the same cached quotes
+    await _client(host, port, paths, [])
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, [paths[(c + i) % len(paths)] for i in range(per_client)],
+                                   latencies) for c in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(b"GET /stats HTTP/1.1\r\nConnection: close\r\n\r\n")
+    stats = json.loads((await reader.read()).split(b"\r\n\r\n", 1)[1])
+    return np.array(latencies) * 1000, elapsed, stats
+
+
+def benchmark(concurrency=200, requests=20_000, port=DEFAULT_PORT + 1):
+    """Run a server process and hit it with `concurrency` keep-alive clients."""
+    server = subprocess.Popen([sys.executable, __file__, "--port", str(port)], stdout=subprocess.PIPE, text=True)
+    try:
+        server.stdout.readline()                 # start-up banner = listening
+        return asyncio.run(_bench("127.0.0.1", port, concurrency, requests))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local HTTP pricing API over the price book")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--cache-size", type=int, default=CACHE_SIZE)
+    parser.add_argument("--bench", action="store_true", help="measure cached-quote latency")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=20_000)
+    args = parser.parse_args()
+
+    if args.bench:
+        ms, elapsed, stats = benchmark(args.concurrency, args.requests, args.port + 1)
+        print(f"Cached quotes – {len(ms):,} requests over {args.concurrency} connections in {elapsed:.2f} s "
+              f"({len(ms) / elapsed:,.0f} req/s)")
+        print(f"  Server service time  p50 {stats['service_ms']['p50']:.3f} ms  "
+              f"p95 {stats['service_ms']['p95']:.3f} ms  p99 {stats['service_ms']['p99']:.3f} ms")
+        print(f"  Client round trip    p50 {np.percentile(ms, 50):.3f} ms  "
+              f"p95 {np.percentile(ms, 95):.3f} ms  (includes queueing behind the other clients)")
+        print(f"  Cache: {stats['hits']:,} hits, {stats['misses']:,} misses, {stats['coalesced']:,} coalesced")
+    else:
+        try:
+            asyncio.run(serve(args.host, args.port, args.cache_size))
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+PISES New Campus – Render Queue
+Workbook and deck renders take seconds each, and requests bunch up before a
+fundraising event. This runs them through a job queue:
+
+  - Workers: a process pool. A dispatcher thread hands a job to the pool only
+    when a worker is free, so a job's state is accurate: queued → running →
+    done / failed.
+  - Back-pressure: at most `max_queued` jobs wait for a worker. submit()
+    blocks (or raises QueueFull after `timeout`) when the queue is full.
+  - Coalescing: a job's ID is a hash of its kind, its parameters (defaults
+    filled in) and the bytes of every local module and data file (INPUTS:
+    the builders import money, fx, cost_engine, cost_cube… and read the price
+    book, price history and FX snapshot). Submitting a job that is already
+    queued or running returns the same ID.
+  - Cache: finished artifacts live in a size-bounded directory on the local
+    filesystem, named by job ID. A hit returns the file without rendering,
+    reading a file refreshes its mtime, and the least recently used files are
+    evicted when the directory exceeds its budget.
+
+Workers render into a staging directory inside the cache and the result is
+moved into place with os.replace(), so a partial file is never served.
+
+  q = RenderQueue(workers=4)
+  job = q.submit("donor_deck", currency="PKR")
+  q.status(job)        → {"state": "running", …}
+  q.result(job)        → path of the cached .pptx
+
+Usage:
+  python render_queue.py workbook:students=5000 donor_deck:currency=PKR ambassador_deck
+                         [--workers 4] [--queue 16] [--cache-mb 500]
+"""
+
+import argparse
+import contextlib
+import glob
+import hashlib
+import io
+import json
+import os
+import queue
+import runpy
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = "/home/user/PISES/.render_cache"
+CACHE_BYTES = 500 * 1024 * 1024
+INPUTS = ("*.py", "*.sqlite", "*.json")     # globs in HERE that a render may read
+
+# kind → (builder script, artifact extension, {parameter: default})
+RENDERERS = {
+    "workbook": ("build_donor_pricing.py", ".xlsx",
+                 {"currencies": "workbook", "escalation_years": 6, "students": None}),
+    "donor_deck": ("build_donor_pricing_deck.py", ".pptx", {"currency": "USD", "students": None}),
+    "ambassador_deck": ("build_ambassador_deck.py", ".pptx", {"students": None}),
+}
+
+
+class QueueFull(RuntimeError):
+    """The render queue stayed full for the whole submit() timeout."""
+
+
+def _render(kind, params, output_path):
+    """Worker: render one artifact to output_path (builder output silenced)."""
+    script = os.path.join(HERE, RENDERERS[kind][0])
+    if HERE not in sys.path:
+        sys.path.insert(0, HERE)
+    with contextlib.redirect_stdout(io.StringIO()):
+        if kind == "workbook":
+            from build_donor_pricing import build_workbook
+            build_workbook(**params, output_path=output_path)
+        else:
+            # The decks are top-level scripts: run them fresh with their CLI
+            argv = [script, "--output", output_path]
+            for key, value in params.items():
+                if value is not None:        # None = the script's own default
+                    argv += [f"--{key.replace('_', '-')}", str(value)]
+            saved, sys.argv = sys.argv, argv
+            try:
+                runpy.run_path(script, run_name="__main__")
+            finally:
+                sys.argv = saved
+    return output_path
+
+
+class DiskCache:
+    """Directory of artifacts named by key, bounded in bytes, LRU by mtime."""
+
+    def __init__(self, root=CACHE_DIR, max_bytes=CACHE_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.staging = os.path.join(root, ".staging")
+        os.makedirs(self.staging, exist_ok=True)
+
+    def path(self, key, ext):
+        return os.path.join(self.root, key + ext)
+
+    def get(self, key, ext):
+        """Path of a cached artifact (and mark it recently used), or None."""
+        path = self.path(key, ext)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, key, ext, src):
+        """Move a rendered file into the cache, then evict to the budget."""
+        path = self.path(key, ext)
+        os.replace(src, path)
+        self.evict(keep=path)
+        return path
+
+    def evict(self, keep=None):
+        """Delete least recently used artifacts until under max_bytes."""
+        entries = []
+        with os.scandir(self.root) as it:
+            for entry in it:
+                if entry.is_file():
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        removed = []
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+            total -= size
+            removed.append(path)
+        return removed
+
+
+def _file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def input_fingerprint(root=HERE, patterns=INPUTS):
+    """[(file name, sha256)] for every module and data file a builder may read."""
+    paths = sorted({p for pattern in patterns for p in glob.glob(os.path.join(root, pattern))})
+    return [(os.path.basename(p), _file_digest(p)) for p in paths]
+
+
+class RenderQueue:
+    """Bounded, coalescing render queue over a process pool."""
+
+    def __init__(self, workers=None, max_queued=16, cache_dir=CACHE_DIR, cache_bytes=CACHE_BYTES):
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(self.workers)
+        self.pending = queue.Queue(max_queued)
+        self.slots = threading.Semaphore(self.workers)
+        self.cache = DiskCache(cache_dir, cache_bytes)
+        self.jobs = {}
+        self.lock = threading.Lock()
+        # Inputs are fingerprinted once, when the queue starts. Builders share
+        # most modules, so any local change invalidates every kind.
+        self.fingerprint = input_fingerprint()
+        self.dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+        self.dispatcher.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def job_id(self, kind, params):
+        """(job ID, params with defaults) for a render request."""
+        if kind not in RENDERERS:
+            raise KeyError(f"unknown render kind {kind!r}")
+        defaults = RENDERERS[kind][2]
+        unknown = set(params) - set(defaults)
+        if unknown:
+            raise KeyError(f"{kind} takes no parameter(s) {', '.join(sorted(unknown))}")
+        full = {**defaults, **params}
+        blob = json.dumps([kind, full, self.fingerprint], sort_keys=True)
+        return hashlib.sha256(blob.encode()).hexdigest()[:24], full
+
+    def submit(self, kind, block=True, timeout=None, **params):
+        """Queue a render and return its job ID.
+
+        Coalesces with a queued / running job of the same ID and returns
+        at once for a cached artifact. Raises QueueFull when the queue is
+        still full after `timeout` seconds (or at once if block=False).
+        """
+        job_id, full = self.job_id(kind, params)
+        ext = RENDERERS[kind][1]
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job and job["state"] in ("queued", "running"):
+                job["coalesced"] += 1
+                return job_id
+            job = {"id": job_id, "kind": kind, "params": full, "state": "queued", "path": None,
+                   "error": None, "cached": False, "coalesced": 0, "submitted": time.time(),
+                   "started": None, "finished": None, "done": threading.Event()}
+            path = self.cache.get(job_id, ext)
+            if path:
+                job.update(state="done", path=path, cached=True, finished=job["submitted"])
+                job["done"].set()
+            self.jobs[job_id] = job
+        if job["cached"]:
+            return job_id
+        try:
+            self.pending.put(job_id, block, timeout)
+        except queue.Full:
+            with self.lock:
+                job.update(state="rejected", error="render queue full", finished=time.time())
+                job["done"].set()
+            raise QueueFull(f"render queue full ({self.pending.maxsize} waiting)") from None
+        return job_id
+
+    def _dispatch(self):
+        while True:
+            job_id = self.pending.get()
+            if job_id is None:
+                break
+            self.slots.acquire()
+            with self.lock:
+                job = self.jobs[job_id]
+                job.update(state="running", started=time.time())
+            ext = RENDERERS[job["kind"]][1]
+            staging = os.path.join(self.cache.staging, f"{job_id}-{os.getpid()}{ext}")
+            future = self.pool.submit(_render, job["kind"], job["params"], staging)
+            future.add_done_callback(lambda f, job=job, ext=ext: self._finished(job, ext, f))
+
+    def _finished(self, job, ext, future):
+        self.slots.release()
+        try:
+            path = self.cache.put(job["id"], ext, future.result())
+            update = {"state": "done", "path": path}
+        except Exception as e:
+            update = {"state": "failed", "error": f"{type(e).__name__}: {e}"}
+        with self.lock:
+            job.update(update, finished=time.time())
+            job["done"].set()
+
+    def status(self, job_id):
+        """Job record without the wait handle; KeyError for an unknown ID."""
+        with self.lock:
+            job = self.jobs[job_id]
+            return {k: v for k, v in job.items() if k != "done"}
+
+    def result(self, job_id, timeout=None):
+        """Wait for a job and return its artifact path (raises if it did not finish)."""
+        job = self.jobs[job_id]
+        if not job["done"].wait(timeout):
+            raise TimeoutError(f"job {job_id} still {job['state']} after {timeout} s")
+        if job["state"] == "rejected":
+            raise QueueFull(job["error"])
+        if job["state"] != "done":
+            raise RuntimeError(f"job {job_id} failed: {job['error']}")
+        # A hit on an already finished job still counts as a use for the LRU
+        return self.cache.get(job_id, RENDERERS[job["kind"]][1]) or job["path"]
+
+    def close(self):
+        self.pending.put(None)
+        self.dispatcher.join()
+        self.pool.shutdown(wait=True)
+
+
+def _parse_job(text):
+    """'workbook:students=5000,currencies=gulf' → ("workbook", {"students": 5000, …})."""
+    kind, _, rest = text.partition(":")
+    params = {}
+    for pair in filter(None, rest.split(",")):
+        key, _, value = pair.partition("=")
+        default = RENDERERS.get(kind, (None, None, {}))[2].get(key)
+        params[key] = int(value) if isinstance(default, int) or (default is None and value.isdigit()) else value
+    return kind, params
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render workbooks / decks through a job queue")
+    parser.add_argument("jobs", nargs="+", help="kind[:key=value,…], e.g. donor_deck:currency=PKR")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--queue", type=int, default=16, help="max jobs waiting for a worker")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--cache-mb", type=float, default=CACHE_BYTES / 1024 / 1024)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    with RenderQueue(args.workers, args.queue, args.cache_dir, int(args.cache_mb * 1024 * 1024)) as q:
+        ids = [q.submit(kind, **params) for kind, params in map(_parse_job, args.jobs)]
+        for job_id in dict.fromkeys(ids):
+            try:
+                q.result(job_id)
+            except RuntimeError:
+                pass
+            s = q.status(job_id)
+            took = "cache hit" if s["cached"] else f"{s['finished'] - s['started']:.1f} s"
+            extra = f", +{s['coalesced']} coalesced" if s["coalesced"] else ""
+            print(f"{'✓' if s['state'] == 'done' else '✗'} {s['kind']:<16} {took:>10}{extra}  "
+                  f"{s['path'] or s['error']}")
+    print(f"{len(ids)} request(s), {len(set(ids))} job(s) in {time.perf_counter() - start:.1f} s")
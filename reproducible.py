@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+PISES New Campus – Reproducible Output
+wb.save() and prs.save() stamp the zip entries with the wall-clock time, and
+openpyxl also writes the build time into docProps/core.xml, so two identical
+builds differ byte for byte. In reproducible mode a workbook or deck is saved
+to memory and its package rewritten before it reaches disk:
+
+  - Core properties: dcterms:created / dcterms:modified set to SOURCE_DATE_EPOCH
+    (environment variable, seconds since 1970) or, if unset, 1 January of
+    DEFAULT_YEAR.
+  - Zip entries: [Content_Types].xml first, then sorted by name, each with
+    that timestamp, fixed permissions / host system and deflate level 6.
+  - Relationship IDs: openpyxl and python-pptx number rIds in creation order,
+    so the same build script gives the same IDs; the package is rewritten
+    as-is rather than renumbered.
+
+The SHA-256 of the written file goes in <artifact>.sha256 (sha256sum format),
+so a cache or mirror can compare digests instead of uploading. Identical
+inputs give identical bytes on the same Python / zlib; a different zlib build
+may compress differently.
+
+Usage:
+  python build_donor_pricing.py --reproducible          (likewise both decks)
+  python reproducible.py FILE.xlsx|FILE.pptx …          # normalise in place
+  python reproducible.py --check FILE …                 # compare with .sha256
+"""
+
+import argparse
+import hashlib
+import io
+import os
+import re
+import time
+import zipfile
+from datetime import datetime, timezone
+
+DEFAULT_YEAR = 2025
+COMPRESS_LEVEL = 6
+CONTENT_TYPES = "[Content_Types].xml"
+CORE_PROPS = "docProps/core.xml"
+
+_CORE_DATE = re.compile(rb"(<dcterms:(created|modified)\b[^>]*>)[^<]*(</dcterms:\2>)")
+
+
+def source_epoch():
+    """Build timestamp (UTC seconds): SOURCE_DATE_EPOCH or DEFAULT_YEAR-01-01."""
+    value = os.environ.get("SOURCE_DATE_EPOCH")
+    if value:
+        return int(value)
+    return int(datetime(DEFAULT_YEAR, 1, 1, tzinfo=timezone.utc).timestamp())
+
+
+def normalise_package(data, epoch=None):
+    """Bytes of an xlsx / pptx package rewritten deterministically."""
+    epoch = source_epoch() if epoch is None else epoch
+    stamp = time.gmtime(max(epoch, 315532800))             # zip dates start in 1980
+    date_time = stamp[:6]
+    iso = time.strftime("%Y-%m-%dT%H:%M:%SZ", stamp).encode()
+    out = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(data)) as src, \
+            zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED, compresslevel=COMPRESS_LEVEL) as dst:
+        names = sorted(src.namelist(), key=lambda n: (n != CONTENT_TYPES, n))
+        for name in names:
+            body = src.read(name)
+            if name == CORE_PROPS:
+                body = _CORE_DATE.sub(lambda m: m.group(1) + iso + m.group(3), body)
+            info = zipfile.ZipInfo(name, date_time)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.create_system = 3
+            info.external_attr = 0o644 << 16
+            dst.writestr(info, body, compresslevel=COMPRESS_LEVEL)
+    return out.getvalue()
+
+
+def digest_path(path):
+    return f"{path}.sha256"
+
+
+def write(path, data):
+    """Write normalised bytes and their digest file atomically; return the hex digest."""
+    digest = hashlib.sha256(data).hexdigest()
+    for target, body in ((path, data),
+                         (digest_path(path), f"{digest}  {os.path.basename(path)}\n".encode())):
+        tmp = f"{target}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(body)
+        os.replace(tmp, target)
+    return digest
+
+
+def save(document, path, epoch=None):
+    """Reproducible document.save(path) for an openpyxl Workbook or pptx Presentation."""
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return write(path, normalise_package(buffer.getvalue(), epoch))
+
+
+def check(path):
+    """True if the file matches the digest recorded next to it."""
+    with open(digest_path(path), encoding="ascii") as f:
+        expected = f.read().split()[0]
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest() == expected
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Normalise xlsx / pptx packages for reproducible builds")
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--check", action="store_true", help="compare with the .sha256 files instead")
+    args = parser.parse_args()
+
+    failed = 0
+    for path in args.files:
+        if args.check:
+            ok = os.path.exists(digest_path(path)) and check(path)
+            failed += not ok
+            print(f"{'✓' if ok else '✗'} {path}")
+        else:
+            with open(path, "rb") as f:
+                digest = write(path, normalise_package(f.read()))
+            print(f"✓ {digest}  {path}")
+    raise SystemExit(1 if failed else 0)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+PISES New Campus – Room Utilisation Simulator
+Lab and specialist room counts come from static ratios ("1 per 10
+classrooms"). This checks them against a timetable: every section's weekly
+specialist periods are placed on a period grid, and the peak number of
+sessions in any one period is the number of rooms needed to avoid clashes.
+
+  - Sections: segment enrolment (space_programme) split per grade and per
+    gender (separate from Grade 2), 25 per section.
+  - Grid: 5 days × 8 periods (single shift), or Morning + Afternoon shifts
+    of 6 periods with boys in one shift and girls in the other, sharing
+    the same rooms.
+  - SUBJECT_PERIODS: periods / week per section for each room pool.
+  - Allocation: per room pool and shift, a min-heap of grid slots keyed
+    by sessions already placed. Each session goes to the least-loaded
+    slot where its section is free and has no other session in that pool
+    that day. This levels demand across the week, so the peak load is the
+    minimum room count.
+
+Utilisation = sessions / (rooms × slots per week); above 100% at the
+provisioned count means the timetable cannot run without clashes.
+
+Usage:
+  python room_utilisation.py [--students 5500 6000 7000] [--shifts single double]
+"""
+
+import argparse
+import heapq
+import math
+from collections import defaultdict
+
+DAYS = 5
+SHIFTS = {
+    "single": {"shifts": ("day",), "periods": 8},
+    "double": {"shifts": ("morning", "afternoon"), "periods": 6},
+}
+SECTION_SIZE = 25
+BOYS_SHARE = 0.511
+# Segment grade bands as in cost_engine / the ambassador deck: G1–G4, G5–G9, G10–G12
+GRADES = {"pri": range(1, 5), "inter": range(5, 10), "sec": range(10, 13)}
+
+# Room pool → (units it draws on, {segment: periods / week per section})
+SUBJECT_PERIODS = {
+    "Primary science": (("Primary Science Lab",), {"pri": 2}),
+    "Intermediate science": (("Intermediate Science Lab",), {"inter": 3}),
+    "Secondary science": (("Secondary Science Lab (Physics / Chemistry / Biology)",), {"sec": 4}),
+    "Primary ICT": (("Primary Computer / Language Lab",), {"pri": 2}),
+    "Secondary ICT": (("Secondary Computer / Language Lab",), {"inter": 2, "sec": 2}),
+    "Maker / robotics": (("Maker / Robotics Lab",), {"inter": 1}),
+    "Art": (("Art Studio",), {"inter": 1, "sec": 1}),
+    "Primary atelier": (("Primary Art Atelier",), {"pri": 1}),
+    "Music / drama": (("Music / Drama Room",), {"pri": 1, "inter": 1}),
+    "Primary MPR": (("Primary Multi-Purpose Room",), {"pri": 1}),
+    "Primary LRC": (("Primary Library / LRC",), {"pri": 1}),
+    "Intermediate LRC": (("Intermediate LRC",), {"inter": 1}),
+    "Secondary LRC": (("Secondary LRC",), {"sec": 1}),
+}
+
+
+def sections(enrolment, section_size=SECTION_SIZE):
+    """[(section id, segment, gender)] from {"pri": n, "inter": n, "sec": n}."""
+    out = []
+    for segment, grades in GRADES.items():
+        per_grade = enrolment[segment] / len(grades)
+        for grade in grades:
+            if grade < 2:
+                genders = (("mixed", per_grade),)
+            else:
+                genders = (("boys", per_grade * BOYS_SHARE), ("girls", per_grade * (1 - BOYS_SHARE)))
+            for gender, n in genders:
+                for k in range(math.ceil(n / section_size)):
+                    out.append((f"G{grade}-{gender[0].upper()}{k + 1}", segment, gender))
+    return out
+
+
+def _shift_of(gender, shifts):
+    if len(shifts) == 1:
+        return shifts[0]
+    # Boys in the morning; mixed Grade 1 sections share the girls' shift
+    return shifts[0] if gender == "boys" else shifts[1]
+
+
+def simulate(enrolment, shift_pattern="single", provisioned=None):
+    """Timetable every pool's sessions and size each pool.
+
+    provisioned: {unit name: qty} to report utilisation of the rooms
+    actually in the programme. Returns {pool: {"sessions", "rooms_needed",
+    "provisioned", "utilisation", "utilisation_needed"}}.
+    """
+    grid = SHIFTS[shift_pattern]
+    slots_per_shift = [(d, p) for d in range(DAYS) for p in range(grid["periods"])]
+    slots_per_week = DAYS * grid["periods"] * len(grid["shifts"])
+    secs = sections(enrolment)
+    busy = defaultdict(set)          # section → {(day, period)}
+    result = {}
+
+    for pool, (unit_names, periods) in SUBJECT_PERIODS.items():
+        heaps = {s: [(0, slot) for slot in slots_per_shift] for s in grid["shifts"]}
+        load = defaultdict(int)
+        sessions = 0
+        # Sections with the most periods first, as in first-fit decreasing
+        demand = sorted(((periods[seg], sid, gender) for sid, seg, gender in secs if seg in periods),
+                        reverse=True)
+        for n_periods, sid, gender in demand:
+            shift = _shift_of(gender, grid["shifts"])
+            heap = heaps[shift]
+            days_used = set()
+            for _ in range(n_periods):
+                skipped = []
+                while heap:
+                    n, (day, period) = heapq.heappop(heap)
+                    if (day, period) in busy[sid] or (day in days_used and n_periods <= DAYS):
+                        skipped.append((n, (day, period)))
+                        continue
+                    break
+                else:
+                    raise RuntimeError(f"{sid}: no free period for {pool}")
+                load[shift, day, period] = n + 1
+                heapq.heappush(heap, (n + 1, (day, period)))
+                for entry in skipped:
+                    heapq.heappush(heap, entry)
+                busy[sid].add((day, period))
+                days_used.add(day)
+                sessions += 1
+        needed = max(load.values(), default=0)
+        have = sum((provisioned or {}).get(u, 0) for u in unit_names) if provisioned else None
+        result[pool] = {
+            "sessions": sessions,
+            "rooms_needed": needed,
+            "provisioned": have,
+            "utilisation_needed": sessions / (needed * slots_per_week) if needed else 0.0,
+            "utilisation": sessions / (have * slots_per_week) if have else None,
+        }
+    return result
+
+
+if __name__ == "__main__":
+    from build_donor_pricing import UNITS
+    from space_programme import DESIGN_STUDENTS, Programme
+
+    parser = argparse.ArgumentParser(description="Timetable-driven room utilisation")
+    parser.add_argument("--students", type=int, nargs="+", default=[DESIGN_STUDENTS])
+    parser.add_argument("--shifts", nargs="+", default=["single", "double"], choices=sorted(SHIFTS))
+    args = parser.parse_args()
+
+    for students in args.students:
+        prog = Programme(students=students)
+        # The price book is the provisioned programme at the design capacity
+        units = UNITS if students == DESIGN_STUDENTS else prog.units(UNITS)
+        provisioned = {u[0]: u[2] for u in units if u[2] is not None}
+        for pattern in args.shifts:
+            print(f"{students:,} students – {pattern} shift")
+            print(f"  {'Room pool':<22} {'Sessions':>8} {'Need':>5} {'Have':>5} {'Util@need':>10} {'Util@have':>10}")
+            for pool, r in simulate(prog.values, pattern, provisioned).items():
+                have = "\u2014" if r["provisioned"] is None else r["provisioned"]
+                util = "\u2014" if r["utilisation"] is None else f"{r['utilisation']:.0%}"
+                print(f"  {pool:<22} {r['sessions']:>8} {r['rooms_needed']:>5} {have:>5} "
+                      f"{r['utilisation_needed']:>10.0%} {util:>10}")
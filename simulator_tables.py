@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+PISES New Campus – Simulator Lookup Tables
+Both HTML simulators rebuild their room / enrollment counts from scratch on
+every slider event. This precomputes those counts over the slider grid and
+embeds them in each page as base64 typed arrays (a PISES_LUT script block),
+so a slider move becomes a table lookup plus the money arithmetic on top:
+
+  - Cost Simulator: roomCounts() for every sl-students × sl-maxcls position
+    (EY classrooms over sl-students × sl-eycls) at the default buffer.
+    Rate, grossing factors and the stage split still apply live.
+  - Revenue Simulator: enrollment and sections per grade and year for every
+    sl-target × sl-max-cls position (EY sections over sl-ey-cls) at the
+    current roster and default growth period. Staff, revenue and costs are
+    derived from the looked-up counts as before.
+
+Counts are step functions of the sliders (ceil / round), so the tables hold
+every slider position exactly rather than interpolating between grid
+points. Anything off the tables – a moved buffer or growth period, edited
+per-grade numbers – falls back to the page's own calc functions.
+`--verify` runs each page's calc functions under node over the whole grid
+and compares them with the embedded lookup.
+
+Usage:
+  python simulator_tables.py            (embed tables in both HTML files)
+  python simulator_tables.py --verify   (needs node on PATH)
+"""
+
+import argparse
+import base64
+import json
+import os
+import re
+import shutil
+import subprocess
+
+import numpy as np
+
+from cost_engine import DEFAULTS, js_round, recalc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+COST_HTML = os.path.join(HERE, "PISES_Cost_Simulator.html")
+REVENUE_HTML = os.path.join(HERE, "PISES_Revenue_Simulator.html")
+
+# (min, step, count) of each tabulated slider
+COST_AXES = {"students": (2000, 100, 81), "maxCls": (20, 1, 16), "eyCls": (15, 1, 11)}
+REVENUE_AXES = {"target": (5000, 100, 51), "maxCls": (20, 1, 16), "eyCls": (15, 1, 11)}
+
+# roomCounts() keys, by the slider(s) they depend on
+COST_STUDENT_KEYS = ("ey", "pri", "int_", "sec", "courts", "sen", "assess", "speech", "counsel",
+                     "dining", "atrium", "seminar", "breakout", "workrooms")
+COST_CLASS_KEYS = ("pri_cls", "int_cls", "sec_cls", "sci_pri", "sci_int", "sci_sec", "sci_prep",
+                   "ict_pri", "ict_sec", "atelier", "arts")
+# roomCounts() key → cost_engine row (quantity, or net per unit for the atrium)
+_COST_ROWS = {
+    "sci_pri": "Primary Science Labs", "sci_int": "Intermediate Science Labs",
+    "sci_sec": "Secondary Science Labs", "sci_prep": "Science Prep Rooms",
+    "ict_pri": "Primary Computer Labs", "ict_sec": "Secondary Computer Labs",
+    "atelier": "Primary Art Atelier", "arts": "Intermediate/Secondary Arts",
+    "courts": "Outdoor Multi-Sport Courts", "sen": "SEN Resource Rooms",
+    "assess": "1:1 Assessment Rooms", "speech": "Speech & Language Therapy",
+    "counsel": "Counsellor Rooms", "dining": "Dining Halls (700-seat)",
+    "seminar": "Seminar Rooms", "breakout": "Breakout Rooms", "workrooms": "Staff Workrooms",
+}
+
+LUT_BLOCK = re.compile(r'<script id="pises-lut">.*?</script>\n', re.S)
+
+
+def _axis(spec):
+    start, step, count = spec
+    return start + step * np.arange(count)
+
+
+def _pack(values, dtype):
+    """base64 of `values` as a little-endian typed array, range-checked."""
+    info = np.iinfo(dtype)
+    if values.min() < info.min or values.max() > info.max:
+        raise ValueError(f"table values {values.min()}–{values.max()} do not fit {np.dtype(dtype).name}")
+    return base64.b64encode(np.ascontiguousarray(values, dtype=np.dtype(dtype).newbyteorder("<")).tobytes()).decode()
+
+
+def cost_tables():
+    """PISES_LUT for the Cost Simulator, from the cost_engine twin of recalc()."""
+    students = _axis(COST_AXES["students"])[:, None]
+    r = recalc(students=students, maxCls=_axis(COST_AXES["maxCls"])[None, :])
+    rows = {row["name"]: row for row in r["tbc_rows"] + r["non_tbc_rows"]}
+
+    def field(key):
+        if key == "atrium":
+            return rows["Atrium / Learning Commons"]["net_per_unit"]
+        if key in _COST_ROWS:
+            return rows[_COST_ROWS[key]]["qty"]
+        return r["int" if key == "int_" else key]
+
+    by_students = np.stack([field(k)[:, 0] for k in COST_STUDENT_KEYS], axis=-1)
+    by_class = np.stack([field(k) for k in COST_CLASS_KEYS], axis=-1)
+    ey_cls = recalc(students=students, eyCls=_axis(COST_AXES["eyCls"])[None, :])["ey_cls"]
+    return {
+        "axes": COST_AXES, "buffer": DEFAULTS["buffer"],
+        "student_keys": COST_STUDENT_KEYS, "class_keys": COST_CLASS_KEYS,
+        "by_students": _pack(by_students, np.uint16),
+        "by_class": _pack(by_class, np.uint8),
+        "ey_cls": _pack(ey_cls, np.uint8),
+    }
+
+
+def _revenue_model(html):
+    """(grades [(id, segment, current)], years, default growth years) from the page."""
+    grades = re.findall(r"\{id:'(\w+)',\s*name:'[^']*',\s*segment:'(\w+)',\s*current:(\d+)", html)
+    years = int(re.search(r"NUM_YEARS\s*=\s*(\d+)", html).group(1))
+    growth = int(re.search(r'id="sl-growth-yrs"[^>]*value="(\d+)"', html).group(1))
+    return [(g, seg, int(n)) for g, seg, n in grades], years, growth
+
+
+def enrollment(targets, base, years, growth):
+    """calcEnrollment() over an array of targets: (targets, years, grades)."""
+    bt = float(base.sum())
+    targets = np.asarray(targets, dtype=np.float64)[:, None]
+    y = np.arange(years, dtype=np.float64)[None, :]
+    total = np.where(y == 0, bt, np.where(y >= growth, targets, bt + (targets - bt) * (y / growth)))
+    e = js_round(total[..., None] * base[None, None, :-1] / max(1.0, bt))
+    last = js_round(total) - e.sum(axis=-1)
+    return np.concatenate([e, last[..., None]], axis=-1)
+
+
+def revenue_tables(html):
+    """PISES_LUT for the Revenue Simulator, from a port of calcEnrollment / calcSections."""
+    grades, years, growth = _revenue_model(html)
+    base = np.array([n for _, _, n in grades], dtype=np.float64)
+    ey = np.array([seg == "EY" for _, seg, _ in grades])
+    e = enrollment(_axis(REVENUE_AXES["target"]), base, years, growth)
+    sec = np.ceil(e[:, None, :, ~ey] / _axis(REVENUE_AXES["maxCls"])[None, :, None, None])
+    sec_ey = np.ceil(e[:, None, :, ey] / _axis(REVENUE_AXES["eyCls"])[None, :, None, None])
+    return {
+        "axes": REVENUE_AXES, "years": years, "growthYears": growth,
+        "roster": [n for _, _, n in grades],
+        "enrol": _pack(e, np.uint16),
+        "sec": _pack(sec, np.uint8),
+        "sec_ey": _pack(sec_ey, np.uint8),
+    }
+
+
+def embed(path, tables):
+    """Write (or replace) the PISES_LUT script block ahead of the page's engine."""
+    html = open(path, encoding="utf-8").read()
+    block = ('<script id="pises-lut">\n// Generated by simulator_tables.py – do not edit\n'
+             f"const PISES_LUT = {json.dumps(tables, separators=(',', ':'))};\n</script>\n")
+    if LUT_BLOCK.search(html):
+        html = LUT_BLOCK.sub(lambda _: block, html, count=1)
+    else:
+        i = html.index("<script>")
+        html = html[:i] + block + html[i:]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(html)
+    return len(block)
+
+
+# ── Verification under node ─────────────────────────────────────────────────
+_NODE_STUB = """
+const el = () => ({value: '', textContent: '', innerHTML: '', className: '', style: {}, children: [],
+                   classList: {toggle() {}}, addEventListener() {}});
+const nodes = {};
+const document = {getElementById: id => (nodes[id] = nodes[id] || el()), querySelectorAll: () => []};
+const atob = b64 => Buffer.from(b64, 'base64').toString('binary');
+"""
+_COST_CHECK = """
+let bad = 0, n = 0;
+const ax = LUT.axes, bufferFrac = LUT.buffer / 100;
+for (let s = 0; s < ax.students[2]; s++) for (let m = 0; m < ax.maxCls[2]; m++) for (let k = 0; k < ax.eyCls[2]; k++) {
+  const args = [ax.students[0] + s * ax.students[1], ax.maxCls[0] + m * ax.maxCls[1], bufferFrac, ax.eyCls[0] + k * ax.eyCls[1]];
+  const live = roomCounts(...args), hit = lutRoomCounts(...args); n++;
+  if (!hit || Object.keys(live).some(key => live[key] !== hit[key])) bad++;
+}
+if (lutRoomCounts(7000, 25, 0.09, 22) !== null) bad++;
+console.log(JSON.stringify({cells: n, mismatches: bad}));
+"""
+_REVENUE_CHECK = """
+let bad = 0, n = 0;
+const ax = LUT.axes, baseStudents = {};
+GRADES.forEach(g => baseStudents[g.id] = g.current);
+for (let t = 0; t < ax.target[2]; t++) for (let m = 0; m < ax.maxCls[2]; m++) for (let k = 0; k < ax.eyCls[2]; k++) {
+  const cfg = {targetTotal: ax.target[0] + t * ax.target[1], maxCls: ax.maxCls[0] + m * ax.maxCls[1],
+               eyCls: ax.eyCls[0] + k * ax.eyCls[1], growthYears: LUT.growthYears, baseStudents, baseTotal: CURRENT_TOTAL};
+  const e = calcEnrollment(cfg), live = [e, calcSections(e, cfg)], hit = lutEnrollmentSections(cfg); n++;
+  if (JSON.stringify(live) !== JSON.stringify(hit)) bad++;
+}
+if (lutEnrollmentSections({...{targetTotal: 7000, maxCls: 25, eyCls: 22, baseStudents}, growthYears: LUT.growthYears + 1}) !== null) bad++;
+console.log(JSON.stringify({cells: n, mismatches: bad}));
+"""
+
+
+def verify():
+    """{page: {"cells", "mismatches"}} comparing lookup against the calc functions."""
+    node = shutil.which("node") or shutil.which("nodejs")
+    if not node:
+        raise RuntimeError("node is required to verify the tables against the HTML")
+    report = {}
+    for path, end, check in ((COST_HTML, "// ── BIND ALL SLIDERS", _COST_CHECK),
+                             (REVENUE_HTML, "// ── RENDERING", _REVENUE_CHECK)):
+        html = open(path, encoding="utf-8").read()
+        lut = LUT_BLOCK.search(html)
+        if not lut:
+            raise RuntimeError(f"{os.path.basename(path)} has no PISES_LUT block – run without --verify first")
+        data = lut.group(0).split("\n", 1)[1].rsplit("</script>", 1)[0]
+        engine = html[html.index("const SAR_TO_USD"):html.index(end)]
+        script = _NODE_STUB + data + engine + check
+        out = subprocess.run([node], input=script, capture_output=True, text=True, check=True).stdout
+        report[os.path.basename(path)] = json.loads(out)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Embed slider lookup tables in the HTML simulators")
+    parser.add_argument("--verify", action="store_true", help="check the embedded tables under node")
+    args = parser.parse_args()
+
+    if args.verify:
+        report = verify()
+        for page, r in report.items():
+            print(f"  {page}: {r['cells']:,} slider positions, {r['mismatches']} mismatches")
+        ok = not any(r["mismatches"] for r in report.values())
+        print("✓ Lookup matches the live calculation" if ok else "✗ Lookup differs from the live calculation")
+        raise SystemExit(0 if ok else 1)
+
+    size = embed(COST_HTML, cost_tables())
+    print(f"✓ {os.path.basename(COST_HTML)}: PISES_LUT {size / 1024:.0f} KB")
+    html = open(REVENUE_HTML, encoding="utf-8").read()
+    size = embed(REVENUE_HTML, revenue_tables(html))
+    print(f"✓ {os.path.basename(REVENUE_HTML)}: PISES_LUT {size / 1024:.0f} KB")
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+PISES New Campus – Slide Layout Linter
+Checks built decks for overlapping content, off-slide shapes and text that
+overflows its box. Our decks are laid out with absolute Inches(...) positions,
+so a longer number or label can silently spill into a neighbouring panel.
+
+Every shape is reduced to one or more items with a bounding box:
+  - text  : the measured extent of each laid-out line (slide_preview engine)
+  - table : the frame, grown to fit any row whose text needs more height
+  - fill  : a filled rectangle (backgrounds, cards, bars)
+Items are bucketed into a uniform grid so only shapes sharing a cell are
+compared – near-linear in the number of shapes rather than O(n²).
+
+A collision is text/table overlapping other text/table, or a fill drawn on
+top of text/table. Fills stacked on fills and text on its own background are
+intentional layering and are not reported.
+
+Text is measured with whatever font Pillow can find (Calibri or Carlito when
+installed). Fallback fonts are scaled to Calibri widths (slide_preview
+WIDTH_SCALE), so a DejaVu-only machine does not report wrapping that Calibri
+would not do. Near-miss results should still be confirmed in PowerPoint.
+
+Usage:
+  python slide_lint.py DECK.pptx [DECK2.pptx ...] [--tolerance 0.02]
+"""
+
+import argparse
+import sys
+
+from pptx import Presentation
+from pptx.oxml.ns import qn
+
+from slide_preview import CELL_INSETS, EMU_PER_INCH, TEXTBOX_INSETS, layout_text_body
+
+MEASURE_DPI = 96
+GRID_CELL_EMU = EMU_PER_INCH          # 1" buckets
+DEFAULT_TOLERANCE_IN = 0.02
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# ITEM EXTRACTION
+# ─────────────────────────────────────────────────────────────────────────────
+def _xfrm_emu(xfrm):
+    off, ext = xfrm.find(qn("a:off")), xfrm.find(qn("a:ext"))
+    x, y = int(off.get("x")), int(off.get("y"))
+    return (x, y, x + int(ext.get("cx")), y + int(ext.get("cy")))
+
+
+def _name(el):
+    for path in ("p:nvSpPr", "p:nvGraphicFramePr", "p:nvPicPr", "p:nvGrpSpPr", "p:nvCxnSpPr"):
+        nv = el.find(qn(path))
+        if nv is not None:
+            return nv.find(qn("p:cNvPr")).get("name")
+    return el.tag
+
+
+def _text_ink(txbody, box, insets, anchor):
+    """Measured per-line text extents (EMU) of a txBody laid out in `box` (EMU)."""
+    px_per_emu = MEASURE_DPI / EMU_PER_INCH
+    x0, y0, x1, y1 = box
+    _, ink = layout_text_body(txbody, (x0 * px_per_emu, y0 * px_per_emu,
+                                       (x1 - x0) * px_per_emu, (y1 - y0) * px_per_emu),
+                              insets, anchor, px_per_emu)
+    return [tuple(round(v / px_per_emu) for v in line) for line in ink]
+
+
+def _union(boxes):
+    return (min(b[0] for b in boxes), min(b[1] for b in boxes),
+            max(b[2] for b in boxes), max(b[3] for b in boxes))
+
+
+def _sp_items(sp, z):
+    sppr = sp.find(qn("p:spPr"))
+    xfrm = sppr.find(qn("a:xfrm")) if sppr is not None else None
+    if xfrm is None:
+        return []
+    box = _xfrm_emu(xfrm)
+    name = _name(sp)
+    items = []
+    if sppr.find(qn("a:solidFill")) is not None:
+        items.append({"kind": "fill", "name": name, "box": box, "frame": box, "z": z})
+    txbody = sp.find(qn("p:txBody"))
+    if txbody is not None:
+        cnv = sp.find(qn("p:nvSpPr") + "/" + qn("p:cNvSpPr"))
+        anchor = "t" if cnv is not None and cnv.get("txBox") == "1" else "ctr"
+        for line in _text_ink(txbody, box, TEXTBOX_INSETS, anchor):
+            items.append({"kind": "text", "name": name, "box": line, "frame": box, "z": z})
+    return items
+
+
+def _table_item(frame, z, tol):
+    xfrm = frame.find(qn("p:xfrm"))
+    tbl = frame.find(qn("a:graphic") + "/" + qn("a:graphicData") + "/" + qn("a:tbl"))
+    if xfrm is None or tbl is None:
+        return None
+    fx0, fy0, fx1, fy1 = _xfrm_emu(xfrm)
+    col_w = [int(gc.get("w")) for gc in tbl.find(qn("a:tblGrid")).findall(qn("a:gridCol"))]
+    overflows = []
+    y = fy0
+    for r, tr in enumerate(tbl.findall(qn("a:tr"))):
+        row_h = int(tr.get("h"))
+        needed = row_h
+        x = fx0
+        for j, tc in enumerate(tr.findall(qn("a:tc"))):
+            w = sum(col_w[j:j + int(tc.get("gridSpan", 1))])
+            txbody = tc.find(qn("a:txBody"))
+            tcpr = tc.find(qn("a:tcPr"))
+            if txbody is not None and not (tc.get("hMerge") or tc.get("vMerge")):
+                insets = CELL_INSETS
+                if tcpr is not None:
+                    insets = tuple(int(tcpr.get(k, d)) for k, d in
+                                   zip(("marL", "marT", "marR", "marB"), CELL_INSETS))
+                lines = _text_ink(txbody, (x, y, x + w, y + row_h), insets, "t")
+                if lines:
+                    ink = _union(lines)
+                    needed = max(needed, ink[3] - ink[1] + insets[1] + insets[3])
+                    if ink[2] > x + w + tol:
+                        overflows.append((r, j, "text wider than cell"))
+            x += col_w[j] if j < len(col_w) else 0
+        if needed > row_h + tol:
+            overflows.append((r, None, f"row grows {(needed - row_h) / EMU_PER_INCH:.2f}\""))
+        y += needed
+    box = (fx0, fy0, fx0 + sum(col_w), y)
+    return {"kind": "table", "name": _name(frame), "box": box,
+            "frame": (fx0, fy0, fx1, fy1), "z": z, "cell_overflows": overflows}
+
+
+def slide_items(slide, tol=0):
+    """Flatten a slide's shapes into lintable items, in z-order."""
+    items = []
+    for z, el in enumerate(slide.shapes._spTree):
+        if el.tag == qn("p:sp"):
+            items.extend(_sp_items(el, z))
+        elif el.tag == qn("p:graphicFrame"):
+            item = _table_item(el, z, tol)
+            if item:
+                items.append(item)
+        elif el.tag in (qn("p:pic"), qn("p:grpSp"), qn("p:cxnSp")):
+            xfrm = el.find(qn("p:spPr") + "/" + qn("a:xfrm"))
+            if xfrm is None:
+                xfrm = el.find(qn("p:grpSpPr") + "/" + qn("a:xfrm"))
+            if xfrm is not None:
+                box = _xfrm_emu(xfrm)
+                items.append({"kind": "fill", "name": _name(el), "box": box, "frame": box, "z": z})
+    return items
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# GRID INDEX
+# ─────────────────────────────────────────────────────────────────────────────
+def _candidate_pairs(items, cell=GRID_CELL_EMU):
+    """Index pairs of items sharing at least one grid cell."""
+    grid = {}
+    for idx, item in enumerate(items):
+        x0, y0, x1, y1 = item["box"]
+        for gx in range(x0 // cell, x1 // cell + 1):
+            for gy in range(y0 // cell, y1 // cell + 1):
+                grid.setdefault((gx, gy), []).append(idx)
+    pairs = set()
+    for bucket in grid.values():
+        for i in range(len(bucket)):
+            for j in range(i + 1, len(bucket)):
+                pairs.add((bucket[i], bucket[j]))
+    return pairs
+
+
+def _overlap(a, b, tol):
+    w = min(a[2], b[2]) - max(a[0], b[0])
+    h = min(a[3], b[3]) - max(a[1], b[1])
+    return w > tol and h > tol
+
+
+def _is_collision(a, b):
+    if a["z"] == b["z"]:
+        return False  # text on its own shape's fill
+    content = ("text", "table")
+    if a["kind"] in content and b["kind"] in content:
+        return True
+    lower, upper = (a, b) if a["z"] < b["z"] else (b, a)
+    return upper["kind"] == "fill" and lower["kind"] in content
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# LINT
+# ─────────────────────────────────────────────────────────────────────────────
+def lint_slide(slide, slide_num, slide_w, slide_h, tolerance_in=DEFAULT_TOLERANCE_IN):
+    """Return a list of issue dicts for one slide."""
+    tol = int(tolerance_in * EMU_PER_INCH)
+    items = slide_items(slide, tol)
+    issues = []
+
+    def issue(kind, names, detail):
+        issues.append({"slide": slide_num, "kind": kind, "shapes": names, "detail": detail})
+
+    # Per-shape extents: a text shape contributes one item per line
+    shapes = {}
+    for item in items:
+        shapes.setdefault((item["z"], item["kind"]), []).append(item)
+
+    for (_, kind), group in shapes.items():
+        name, (fx0, fy0, fx1, fy1) = group[0]["name"], group[0]["frame"]
+        x0, y0, x1, y1 = _union([item["box"] for item in group])
+        if x0 < -tol or y0 < -tol or x1 > slide_w + tol or y1 > slide_h + tol:
+            issue("off_slide", (name,),
+                  f"{kind} extends to ({x1 / EMU_PER_INCH:.2f}\", {y1 / EMU_PER_INCH:.2f}\")")
+        if kind == "text":
+            if x0 < fx0 - tol or x1 > fx1 + tol or y1 > fy1 + tol:
+                issue("overflow", (name,),
+                      f"text needs {(x1 - x0) / EMU_PER_INCH:.2f}\" × {(y1 - y0) / EMU_PER_INCH:.2f}\", "
+                      f"box is {(fx1 - fx0) / EMU_PER_INCH:.2f}\" × {(fy1 - fy0) / EMU_PER_INCH:.2f}\"")
+        elif kind == "table":
+            item = group[0]
+            for r, c, detail in item["cell_overflows"]:
+                where = f"row {r}" if c is None else f"cell ({r}, {c})"
+                issue("overflow", (item["name"],), f"{where}: {detail}")
+
+    reported = set()
+    for i, j in sorted(_candidate_pairs(items)):
+        a, b = items[i], items[j]
+        key = (min(a["z"], b["z"]), max(a["z"], b["z"]))
+        if key in reported:
+            continue
+        if _is_collision(a, b) and _overlap(a["box"], b["box"], tol):
+            reported.add(key)
+            issue("collision", (a["name"], b["name"]), f"{a['kind']} × {b['kind']}")
+    return issues
+
+
+def lint_presentation(prs, tolerance_in=DEFAULT_TOLERANCE_IN):
+    """Lint every slide of a Presentation (object or path)."""
+    if isinstance(prs, str):
+        prs = Presentation(prs)
+    issues = []
+    for num, slide in enumerate(prs.slides, 1):
+        issues.extend(lint_slide(slide, num, prs.slide_width, prs.slide_height, tolerance_in))
+    return issues
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check decks for overlaps, off-slide shapes and overflow")
+    parser.add_argument("decks", nargs="+")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE_IN,
+                        help="ignore overlaps / overflow smaller than this (inches)")
+    args = parser.parse_args()
+
+    total = 0
+    for path in args.decks:
+        issues = lint_presentation(path, args.tolerance)
+        total += len(issues)
+        print(f"{path}: {len(issues)} issue(s)")
+        for iss in issues:
+            print(f"  Slide {iss['slide']}  {iss['kind']:<10} {' / '.join(iss['shapes'])}  —  {iss['detail']}")
+    sys.exit(1 if total else 0)
@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+PISES New Campus – Offline Slide Preview Rasteriser
+Renders built decks to PNG thumbnails with Pillow and diffs them against
+golden images, so layout changes to the deck helpers (add_kpi_card,
+draw_unit_table, the quick-reference bands) can be checked without PowerPoint.
+
+Only the primitives our generators emit are drawn:
+  - slide background solid fill
+  - rectangles with solid fill and optional outline
+  - text boxes / shape text with word wrap, alignment, spacing and anchoring
+  - tables with per-cell fills and text
+Anything else is drawn as a light outline so it still shows up in diffs.
+
+Usage:
+  python slide_preview.py DECK.pptx OUT_DIR [--golden GOLDEN_DIR] [--dpi 60]
+"""
+
+import argparse
+import os
+import sys
+from functools import lru_cache
+
+from PIL import Image, ImageChops, ImageDraw, ImageFilter, ImageFont
+from pptx import Presentation
+from pptx.oxml.ns import qn
+
+EMU_PER_INCH = 914400
+EMU_PER_PT = 12700
+DEFAULT_DPI = 60            # 16" × 9" slide → 960 × 540 thumbnail
+LINE_HEIGHT_FACTOR = 1.2
+
+# Body insets (EMU) when bodyPr / tcPr leave them unset
+TEXTBOX_INSETS = (91440, 45720, 91440, 45720)   # l, t, r, b
+CELL_INSETS = (91440, 45720, 91440, 45720)
+
+# Diff tuning: per-pixel luminance delta counted as "changed" after blur
+DIFF_PIXEL_THRESHOLD = 24
+DIFF_FAIL_FRACTION = 0.002
+
+# Carlito is metric-compatible with Calibri; DejaVu runs ~15% wider
+BOLD_FONT_FILES = ["calibrib.ttf", "Carlito-Bold.ttf", "DejaVuSans-Bold.ttf", "arialbd.ttf", "LiberationSans-Bold.ttf"]
+REGULAR_FONT_FILES = ["calibri.ttf", "Carlito-Regular.ttf", "DejaVuSans.ttf", "arial.ttf", "LiberationSans-Regular.ttf"]
+# Measured widths are scaled by (family, style) so a fallback font wraps and
+# reports ink extents like Calibri, the decks' font. Glyphs are still placed by
+# the width they are drawn at. Bold DejaVu / Arial widen more than Calibri Bold
+# does. Unknown fonts are measured as they are.
+WIDTH_SCALE = {
+    ("DejaVu Sans", "Book"): 0.86, ("DejaVu Sans", "Bold"): 0.79,
+    ("Arial", "Regular"): 0.92, ("Arial", "Bold"): 0.89,
+    ("Liberation Sans", "Regular"): 0.92, ("Liberation Sans", "Bold"): 0.89,
+}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# FONTS & COLOURS
+# ─────────────────────────────────────────────────────────────────────────────
+@lru_cache(maxsize=None)
+def _font(size_px, bold):
+    for name in (BOLD_FONT_FILES if bold else []) + REGULAR_FONT_FILES:
+        try:
+            return ImageFont.truetype(name, size_px)
+        except OSError:
+            continue
+    return ImageFont.load_default(size=size_px)
+
+
+def text_width(font, text):
+    """Width of `text` in px as Calibri would set it (see WIDTH_SCALE).
+
+    For measuring (wrap, ink) only; drawing positions use font.getlength().
+    """
+    return font.getlength(text) * WIDTH_SCALE.get(font.getname(), 1.0)
+
+
+def _aligned_x(algn, inner_x, inner_w, width):
+    if algn == "ctr":
+        return inner_x + (inner_w - width) / 2
+    if algn == "r":
+        return inner_x + inner_w - width
+    return inner_x
+
+
+def _color(parent, default=None):
+    """RGB tuple from a solidFill/srgbClr under `parent`, None for noFill."""
+    if parent is None:
+        return default
+    if parent.find(qn("a:noFill")) is not None:
+        return None
+    clr = parent.find(qn("a:solidFill") + "/" + qn("a:srgbClr"))
+    if clr is None:
+        return default
+    val = clr.get("val")
+    return (int(val[0:2], 16), int(val[2:4], 16), int(val[4:6], 16))
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# TEXT LAYOUT
+# ─────────────────────────────────────────────────────────────────────────────
+def _merge_props(props, ppr):
+    """Layer paragraph-level properties (pPr or lvlNpPr) onto `props`."""
+    if ppr is None:
+        return
+    if ppr.get("algn"):
+        props["algn"] = ppr.get("algn")
+    for tag, key in (("a:spcBef", "spc_before"), ("a:spcAft", "spc_after"), ("a:lnSpc", "ln_spc")):
+        el = ppr.find(qn(tag))
+        if el is None:
+            continue
+        pts, pct = el.find(qn("a:spcPts")), el.find(qn("a:spcPct"))
+        if pts is not None:
+            props[key] = ("pt", int(pts.get("val")) / 100)
+        elif pct is not None:
+            props[key] = ("pct", int(pct.get("val")) / 100000)
+    _merge_run_props(props, ppr.find(qn("a:defRPr")))
+
+
+def _merge_run_props(props, rpr):
+    if rpr is None:
+        return
+    if rpr.get("sz"):
+        props["size"] = int(rpr.get("sz")) / 100
+    if rpr.get("b") is not None:
+        props["bold"] = rpr.get("b") in ("1", "true")
+    color = _color(rpr)
+    if color is not None:
+        props["color"] = color
+
+
+def _paragraph_props(txbody, p):
+    props = {"algn": "l", "size": 18.0, "bold": False, "color": (0, 0, 0),
+             "spc_before": ("pt", 0), "spc_after": ("pt", 0), "ln_spc": ("pct", 1.0)}
+    lst = txbody.find(qn("a:lstStyle"))
+    if lst is not None:
+        _merge_props(props, lst.find(qn("a:lvl1pPr")))
+    _merge_props(props, p.find(qn("a:pPr")))
+    return props
+
+
+def _paragraph_lines(txbody, p, width_px, px_per_pt, wrap):
+    """Wrap one paragraph; returns (props, run_props, font, lines)."""
+    props = _paragraph_props(txbody, p)
+    runs = p.findall(qn("a:r"))
+    # Runs in a paragraph generated by our helpers share one style; take the first
+    run_props = dict(props)
+    if runs:
+        _merge_run_props(run_props, runs[0].find(qn("a:rPr")))
+    font = _font(max(1, round(run_props["size"] * px_per_pt)), run_props["bold"])
+
+    # Hard breaks (<a:br/>) split the paragraph into segments
+    segments, current = [], []
+    for child in p:
+        if child.tag == qn("a:r"):
+            current.append(child.findtext(qn("a:t")) or "")
+        elif child.tag == qn("a:br"):
+            segments.append("".join(current))
+            current = []
+    segments.append("".join(current))
+
+    lines = []
+    for seg in segments:
+        if not wrap or width_px <= 0:
+            lines.append(seg)
+            continue
+        words, line = seg.split(" "), ""
+        for word in words:
+            candidate = word if not line else line + " " + word
+            if line and text_width(font, candidate) > width_px:
+                lines.append(line)
+                line = word
+            else:
+                line = candidate
+        lines.append(line)
+    return props, run_props, font, lines
+
+
+def _spacing_px(spec, size_pt, px_per_pt):
+    kind, val = spec
+    if kind == "pt":
+        return val * px_per_pt
+    return val * size_pt * LINE_HEIGHT_FACTOR * px_per_pt
+
+
+def layout_text_body(txbody, box, insets, anchor, px_per_emu):
+    """Lay out a txBody inside `box` (x, y, w, h in px).
+
+    Returns (ops, ink) where ops are (x, y, text, font, colour) draw calls
+    and ink is a list of (x0, y0, x1, y1) extents, one per non-empty line.
+    Ink may extend past `box` when the text overflows.
+    """
+    x, y, w, h = box
+    body_pr = txbody.find(qn("a:bodyPr"))
+    l_ins, t_ins, r_ins, b_ins = insets
+    wrap = True
+    if body_pr is not None:
+        l_ins = int(body_pr.get("lIns", l_ins))
+        t_ins = int(body_pr.get("tIns", t_ins))
+        r_ins = int(body_pr.get("rIns", r_ins))
+        b_ins = int(body_pr.get("bIns", b_ins))
+        wrap = body_pr.get("wrap", "square") != "none"
+        anchor = body_pr.get("anchor", anchor)
+    inner_x = x + l_ins * px_per_emu
+    inner_w = w - (l_ins + r_ins) * px_per_emu
+    px_per_pt = px_per_emu * EMU_PER_PT
+
+    laid_out, total_h = [], 0.0
+    for i, p in enumerate(txbody.findall(qn("a:p"))):
+        props, run_props, font, lines = _paragraph_lines(txbody, p, inner_w, px_per_pt, wrap)
+        line_h = _spacing_px(props["ln_spc"], run_props["size"], px_per_pt)
+        before = _spacing_px(props["spc_before"], run_props["size"], px_per_pt) if i else 0
+        after = _spacing_px(props["spc_after"], run_props["size"], px_per_pt)
+        laid_out.append((props, font, lines, line_h, before, after, run_props["color"]))
+        total_h += before + line_h * len(lines) + after
+
+    inner_top = y + t_ins * px_per_emu
+    inner_h = h - (t_ins + b_ins) * px_per_emu
+    if anchor == "ctr":
+        cursor = inner_top + (inner_h - total_h) / 2
+    elif anchor == "b":
+        cursor = inner_top + inner_h - total_h
+    else:
+        cursor = inner_top
+
+    ops, ink = [], []
+    for props, font, lines, line_h, before, after, color in laid_out:
+        cursor += before
+        for line in lines:
+            # Draw at the fallback font's own width so aligned text lands on
+            # its edge; report ink at the Calibri width
+            lx = _aligned_x(props["algn"], inner_x, inner_w, font.getlength(line))
+            lw = text_width(font, line)
+            ix = _aligned_x(props["algn"], inner_x, inner_w, lw)
+            if line:
+                ops.append((lx, cursor + (line_h - font.size) / 2, line, font, color))
+                ink.append((ix, cursor, ix + lw, cursor + line_h))
+            cursor += line_h
+        cursor += after
+    return ops, ink
+
+
+def draw_text_body(draw, txbody, box, insets, anchor, px_per_emu):
+    """Lay out and draw a txBody inside `box` (x, y, w, h in px)."""
+    ops, _ = layout_text_body(txbody, box, insets, anchor, px_per_emu)
+    for lx, ly, line, font, color in ops:
+        draw.text((lx, ly), line, font=font, fill=color)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SHAPES
+# ─────────────────────────────────────────────────────────────────────────────
+def _xfrm_box(xfrm, px_per_emu):
+    off, ext = xfrm.find(qn("a:off")), xfrm.find(qn("a:ext"))
+    return (int(off.get("x")) * px_per_emu, int(off.get("y")) * px_per_emu,
+            int(ext.get("cx")) * px_per_emu, int(ext.get("cy")) * px_per_emu)
+
+
+def _draw_sp(draw, sp, px_per_emu):
+    sppr = sp.find(qn("p:spPr"))
+    xfrm = sppr.find(qn("a:xfrm")) if sppr is not None else None
+    if xfrm is None:
+        return
+    x, y, w, h = _xfrm_box(xfrm, px_per_emu)
+    fill = _color(sppr)
+    ln = sppr.find(qn("a:ln"))
+    outline = _color(ln) if ln is not None else None
+    geom = sppr.find(qn("a:prstGeom"))
+    is_rect = geom is not None and geom.get("prst") == "rect"
+    if fill is not None or outline is not None:
+        draw.rectangle([x, y, x + w, y + h], fill=fill, outline=outline)
+    elif not is_rect:
+        draw.rectangle([x, y, x + w, y + h], outline=(220, 220, 220))
+    txbody = sp.find(qn("p:txBody"))
+    if txbody is not None:
+        # Autoshapes centre their text; text boxes hang from the top
+        cnv = sp.find(qn("p:nvSpPr") + "/" + qn("p:cNvSpPr"))
+        anchor = "t" if cnv is not None and cnv.get("txBox") == "1" else "ctr"
+        draw_text_body(draw, txbody, (x, y, w, h), TEXTBOX_INSETS, anchor, px_per_emu)
+
+
+def _draw_table(draw, frame, px_per_emu):
+    xfrm = frame.find(qn("p:xfrm"))
+    tbl = frame.find(qn("a:graphic") + "/" + qn("a:graphicData") + "/" + qn("a:tbl"))
+    if xfrm is None or tbl is None:
+        return
+    x0, y0, _, _ = _xfrm_box(xfrm, px_per_emu)
+    col_w = [int(gc.get("w")) * px_per_emu
+             for gc in tbl.find(qn("a:tblGrid")).findall(qn("a:gridCol"))]
+    y = y0
+    for tr in tbl.findall(qn("a:tr")):
+        row_h = int(tr.get("h")) * px_per_emu
+        x = x0
+        for j, tc in enumerate(tr.findall(qn("a:tc"))):
+            w = col_w[j] if j < len(col_w) else 0
+            if tc.get("hMerge") or tc.get("vMerge"):
+                x += w
+                continue
+            span = int(tc.get("gridSpan", 1))
+            w = sum(col_w[j:j + span])
+            tcpr = tc.find(qn("a:tcPr"))
+            fill = _color(tcpr, default=(255, 255, 255))
+            draw.rectangle([x, y, x + w, y + row_h], fill=fill, outline=(255, 255, 255))
+            insets, anchor = CELL_INSETS, "t"
+            if tcpr is not None:
+                insets = (int(tcpr.get("marL", CELL_INSETS[0])), int(tcpr.get("marT", CELL_INSETS[1])),
+                          int(tcpr.get("marR", CELL_INSETS[2])), int(tcpr.get("marB", CELL_INSETS[3])))
+                anchor = tcpr.get("anchor", "t")
+            txbody = tc.find(qn("a:txBody"))
+            if txbody is not None:
+                draw_text_body(draw, txbody, (x, y, w, row_h), insets, anchor, px_per_emu)
+            x += w
+        y += row_h
+
+
+def _draw_tree(draw, tree, px_per_emu):
+    for el in tree:
+        if el.tag == qn("p:sp"):
+            _draw_sp(draw, el, px_per_emu)
+        elif el.tag == qn("p:graphicFrame"):
+            _draw_table(draw, el, px_per_emu)
+        elif el.tag == qn("p:grpSp"):
+            _draw_tree(draw, el, px_per_emu)
+        elif el.tag in (qn("p:pic"), qn("p:cxnSp")):
+            xfrm = el.find(qn("p:spPr") + "/" + qn("a:xfrm"))
+            if xfrm is not None:
+                x, y, w, h = _xfrm_box(xfrm, px_per_emu)
+                draw.rectangle([x, y, x + w, y + h], outline=(200, 200, 200))
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# RENDER & DIFF
+# ─────────────────────────────────────────────────────────────────────────────
+def render_slide(slide, slide_width, slide_height, dpi=DEFAULT_DPI):
+    """Rasterise one slide to an RGB Pillow image."""
+    px_per_emu = dpi / EMU_PER_INCH
+    size = (round(slide_width * px_per_emu), round(slide_height * px_per_emu))
+    bg = slide._element.find(qn("p:cSld") + "/" + qn("p:bg") + "/" + qn("p:bgPr"))
+    img = Image.new("RGB", size, _color(bg, default=(255, 255, 255)) or (255, 255, 255))
+    draw = ImageDraw.Draw(img)
+    _draw_tree(draw, slide.shapes._spTree, px_per_emu)
+    return img
+
+
+def render_presentation(prs, dpi=DEFAULT_DPI):
+    """Rasterise every slide of a Presentation (object or path)."""
+    if isinstance(prs, str):
+        prs = Presentation(prs)
+    return [render_slide(s, prs.slide_width, prs.slide_height, dpi) for s in prs.slides]
+
+
+def diff_images(candidate, golden):
+    """Perceptual diff of two renders.
+
+    Both images are converted to luminance and lightly blurred so anti-aliasing
+    and sub-pixel text shifts do not register; remaining pixels whose
+    luminance moved by more than DIFF_PIXEL_THRESHOLD are counted as changed.
+    Returns {"changed_fraction", "mean_delta", "bbox", "mask"}.
+    """
+    if candidate.size != golden.size:
+        candidate = candidate.resize(golden.size, Image.BILINEAR)
+    a = candidate.convert("L").filter(ImageFilter.BoxBlur(1))
+    b = golden.convert("L").filter(ImageFilter.BoxBlur(1))
+    delta = ImageChops.difference(a, b)
+    mask = delta.point(lambda v: 255 if v > DIFF_PIXEL_THRESHOLD else 0)
+    hist = delta.histogram()
+    n_px = a.size[0] * a.size[1]
+    return {
+        "changed_fraction": mask.histogram()[255] / n_px,
+        "mean_delta": sum(i * c for i, c in enumerate(hist)) / n_px,
+        "bbox": mask.getbbox(),
+        "mask": mask,
+    }
+
+
+def highlight_diff(golden, mask):
+    """Golden image with changed pixels painted red, for reviewer output."""
+    red = Image.new("RGB", golden.size, (220, 0, 0))
+    return Image.composite(red, golden.convert("RGB"), mask)
+
+
+def preview_deck(pptx_path, out_dir, golden_dir=None, dpi=DEFAULT_DPI):
+    """Write slide_NN.png thumbnails; compare with golden_dir when given.
+
+    Returns a list of (slide_num, diff_result_or_None).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    results = []
+    for i, img in enumerate(render_presentation(pptx_path, dpi), 1):
+        name = f"slide_{i:02d}.png"
+        img.save(os.path.join(out_dir, name), compress_level=1)
+        result = None
+        golden_path = os.path.join(golden_dir, name) if golden_dir else None
+        if golden_path and os.path.exists(golden_path):
+            golden = Image.open(golden_path)
+            result = diff_images(img, golden)
+            if result["bbox"]:
+                highlight_diff(golden, result["mask"]).save(
+                    os.path.join(out_dir, f"slide_{i:02d}_diff.png"), compress_level=1)
+        results.append((i, result))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render deck thumbnails and diff against golden images")
+    parser.add_argument("pptx")
+    parser.add_argument("out_dir")
+    parser.add_argument("--golden", help="directory of golden slide_NN.png images")
+    parser.add_argument("--dpi", type=int, default=DEFAULT_DPI)
+    args = parser.parse_args()
+
+    failed = 0
+    for num, result in preview_deck(args.pptx, args.out_dir, args.golden, args.dpi):
+        if result is None:
+            print(f"  Slide {num}: rendered")
+            continue
+        status = "FAIL" if result["changed_fraction"] > DIFF_FAIL_FRACTION else "ok"
+        failed += status == "FAIL"
+        print(f"  Slide {num}: {status}  changed {result['changed_fraction']:.2%}  "
+              f"mean Δ {result['mean_delta']:.2f}  region {result['bbox']}")
+    print(f"Previews written to: {args.out_dir}")
+    sys.exit(1 if failed else 0)
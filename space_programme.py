@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+PISES New Campus – Space Programme Rules
+Derives every UNITS quantity from a student target and enrolment mix instead
+of hand-entering them. The rules are the ones the ambassador deck already
+uses (compute_scenario / facility matrix):
+
+  - Enrolment mix: EY 15.2%, Primary 31.1%, Intermediate 39.0%, Secondary rest
+  - 25 students per class (EY 22), +8% classroom buffer
+  - 1 Science Lab per 10 classrooms in each segment (TBC Category A)
+  - 1 Computer / Language Lab per 15 classrooms
+  - Shared facilities (dining, sports, SEN, prayer…) per N students
+
+The rules form a dependency graph. Programme.update() re-evaluates only the
+rules downstream of inputs that actually changed, and stops propagating when
+a rule's value comes out the same. For example, changing the EY class size
+does not touch labs, dining or sports.
+
+At the 7,000 design target the rules give 258 standard classrooms, where the
+price book's hand-entered programme has 249. compare_with_price_book() lists
+every such difference.
+
+Usage:
+  python space_programme.py [--students 7000] [--compare]
+"""
+
+import argparse
+import math
+
+from money import allocate
+
+DESIGN_STUDENTS = 7000
+
+DEFAULT_INPUTS = {
+    "students": DESIGN_STUDENTS,
+    "mix_ey": 0.152,
+    "mix_pri": 0.311,
+    "mix_inter": 0.390,
+    "class_size": 25,
+    "ey_class_size": 22,
+    "buffer": 0.08,
+    # EY rooms split Nursery : Reception : KG, as in the design programme
+    "ey_split": (9, 20, 26),
+}
+
+
+def _ceil_div(n, d):
+    return math.ceil(n / d) if n > 0 else 0
+
+
+def _per_students(per, minimum=0):
+    return lambda students: max(minimum, _ceil_div(students, per))
+
+
+# Each rule: name → (input names, function). Names are other rules or inputs.
+RULES = {
+    # Enrolment
+    "ey": (("students", "mix_ey"), lambda s, m: round(s * m)),
+    "pri": (("students", "mix_pri"), lambda s, m: round(s * m)),
+    "inter": (("students", "mix_inter"), lambda s, m: round(s * m)),
+    "sec": (("students", "ey", "pri", "inter"), lambda s, e, p, i: s - e - p - i),
+
+    # Classrooms (25/class + 8% buffer; EY at 22)
+    "ey_cls": (("ey", "ey_class_size", "buffer"), lambda n, c, b: math.ceil(n / c * (1 + b))),
+    "pri_cls": (("pri", "class_size", "buffer"), lambda n, c, b: math.ceil(n / c * (1 + b))),
+    "inter_cls": (("inter", "class_size", "buffer"), lambda n, c, b: math.ceil(n / c * (1 + b))),
+    "sec_cls": (("sec", "class_size", "buffer"), lambda n, c, b: math.ceil(n / c * (1 + b))),
+    "std_cls": (("pri_cls", "inter_cls", "sec_cls"), lambda a, b, c: a + b + c),
+    "ey_rooms": (("ey_cls", "ey_split"), lambda n, split: tuple(allocate(n, split).tolist())),
+
+    # Labs (per segment, TBC)
+    "pri_labs": (("pri_cls",), lambda n: _ceil_div(n, 10)),
+    "inter_labs": (("inter_cls",), lambda n: _ceil_div(n, 10)),
+    "sec_labs": (("sec_cls",), lambda n: _ceil_div(n, 10)),
+    "pri_ict": (("pri_cls",), lambda n: _ceil_div(n, 15)),
+    "upper_ict": (("inter_cls", "sec_cls"), lambda a, b: _ceil_div(a + b, 15)),
+
+    # Shared facilities
+    "sports_halls": (("students",), lambda s: max(1, math.ceil(2 * max(s / DESIGN_STUDENTS, 0.8)))),
+    "dining_halls": (("students",), _per_students(3500, 1)),   # 3,500 meals/day per kitchen
+}
+
+# Unit name → quantity rule (a rule name, a fixed count, or (rule names, fn))
+UNIT_RULES = {
+    "Standard Classroom (Grades 1–12)": "std_cls",
+    "Kindergarten Classroom": (("ey_rooms",), lambda r: r[2]),
+    "Nursery Activity Room": (("ey_rooms",), lambda r: r[0]),
+    "Nursery Bedroom / Rest Room": (("ey_rooms",), lambda r: r[0]),
+    "Reception Classroom": (("ey_rooms",), lambda r: r[1]),
+    "Early Years Learning Commons": (("ey_cls",), lambda n: _ceil_div(n, 20)),
+    "Primary Multi-Purpose Room": (("pri_cls",), lambda n: _ceil_div(n, 25)),
+
+    "Primary Science Lab": "pri_labs",
+    "Intermediate Science Lab": "inter_labs",
+    "Secondary Science Lab (Physics / Chemistry / Biology)": "sec_labs",
+    "Science Prep Room": (("pri_labs", "inter_labs", "sec_labs"), lambda a, b, c: _ceil_div(a + b + c, 5)),
+    "Chemical Storage Room": (("inter_labs", "sec_labs"), lambda a, b: _ceil_div(a + b, 10)),
+
+    "Primary Computer / Language Lab": "pri_ict",
+    "Secondary Computer / Language Lab": "upper_ict",
+
+    "Maker / Robotics Lab": (("inter_cls", "sec_cls"), lambda a, b: _ceil_div(a + b, 100)),
+    "Art Studio": (("inter_cls", "sec_cls"), lambda a, b: _ceil_div(a + b, 100)),
+    "Primary Art Atelier": (("pri_cls",), lambda n: _ceil_div(n, 25)),
+    "Music / Drama Room": (("std_cls",), lambda n: _ceil_div(n, 150)),
+
+    # Boys / girls sections get one LRC each per segment
+    "Primary Library / LRC": (("pri",), lambda n: 2 if n else 0),
+    "Intermediate LRC": (("inter",), lambda n: 2 if n else 0),
+    "Secondary LRC": (("sec",), lambda n: 2 if n else 0),
+
+    "Indoor Multi-Purpose Sports Hall": "sports_halls",
+    "25m Swimming Pool Complex": 1,
+    "Sports Changing & Shower Room": (("sports_halls",), lambda n: 2 * n),
+    "Sports Storage Room": (("sports_halls",), lambda n: 2 * n),
+    "Outdoor Multi-Sport Court": (("students",), _per_students(1200, 2)),
+
+    "Dining Hall (700-seat, multi-shift)": "dining_halls",
+    "Commercial Kitchen & Prep Area": "dining_halls",
+    "Cold Room / Dry Store": (("dining_halls",), lambda n: 2 * n),
+
+    "Auditorium (300 seats)": 1,
+    "Atrium / Learning Commons": 1,
+    "Seminar Room": (("students",), _per_students(1750, 2)),
+    "Breakout Room (Glass-walled)": (("students",), _per_students(875, 2)),
+
+    "Exam Hall (300 candidates)": 1,
+    "Candidate Holding Room": 2,
+
+    "SEN Resource Room (Small Group)": (("students",), _per_students(700, 2)),
+    "1:1 Assessment Room": (("students",), _per_students(875, 2)),
+    "Speech & Language Therapy Room": (("students",), _per_students(1750, 1)),
+    "Occupational Therapy Room": (("students",), _per_students(3500, 1)),
+    "Sensory Room": (("students",), _per_students(3500, 1)),
+    "Counsellor Room": (("students",), _per_students(1750, 2)),
+    "Medical Clinic / Nurse Room": 2,
+    "Isolation / Rest Room (Medical)": 2,
+
+    "Staff Workroom (Distributed)": (("std_cls",), lambda n: _ceil_div(n, 22)),
+    "Staff Lounge": 2,
+    "Teacher Training / PD Room": 2,
+
+    "Reception & Welcome Desk": 2,
+    "Principal's Office": 1,
+    "Admissions Office": 2,
+    "Finance & Cashier Office": 2,
+    "Board / SMC Meeting Room": 1,
+    "School Store / Bookshop": 1,
+    "Uniform Shop": 1,
+
+    "Server Room / MDF": 2,
+    "Main Security Control Room (CCTV)": 1,
+    "IT Helpdesk Office": 2,
+
+    "Transport Office & Driver Lounge": 1,
+
+    "Prayer Room / Musalla": (("students",), _per_students(1750, 1)),
+}
+
+
+def _compile_rules():
+    """Merge quantity and unit rules into one graph, in dependency order."""
+    graph = dict(RULES)
+    for unit, rule in UNIT_RULES.items():
+        if isinstance(rule, int):
+            graph[unit] = ((), lambda n=rule: n)
+        elif isinstance(rule, str):
+            graph[unit] = ((rule,), lambda v: v)
+        else:
+            graph[unit] = rule
+    order, seen = [], set()
+
+    def visit(name):
+        if name in seen or name not in graph:
+            return
+        seen.add(name)
+        for dep in graph[name][0]:
+            visit(dep)
+        order.append(name)
+
+    for name in graph:
+        visit(name)
+    return graph, order
+
+
+class Programme:
+    """Incrementally evaluated space programme."""
+
+    def __init__(self, **inputs):
+        self.graph, self.order = _compile_rules()
+        self.values = {}
+        self.evaluations = 0
+        self.update(**{**DEFAULT_INPUTS, **inputs})
+
+    def update(self, **inputs):
+        """Change inputs; re-run only the rules that depend on a changed value."""
+        unknown = set(inputs) - set(DEFAULT_INPUTS)
+        if unknown:
+            raise KeyError(f"unknown programme input(s): {', '.join(sorted(unknown))}")
+        changed = {k for k, v in inputs.items() if self.values.get(k, object()) != v}
+        self.values.update(inputs)
+        first = not any(name in self.values for name in self.graph)
+        for name in self.order:
+            deps, fn = self.graph[name]
+            if not first and not changed.intersection(deps):
+                continue
+            value = fn(*(self.values[d] for d in deps))
+            self.evaluations += 1
+            if first or self.values.get(name) != value:
+                self.values[name] = value
+                changed.add(name)
+        return self
+
+    def quantities(self):
+        """{unit name: qty} for every unit with a rule."""
+        return {unit: self.values[unit] for unit in UNIT_RULES}
+
+    def units(self, units):
+        """UNITS tuples (same shape / order as `units`) with derived quantities."""
+        qty = self.quantities()
+        return [u if u[2] is None else (u[0], u[1], qty.get(u[0], u[2])) + u[3:] for u in units]
+
+
+def compare_with_price_book(programme, units):
+    """[(unit name, price book qty, rule qty)] where they differ."""
+    qty = programme.quantities()
+    return [(u[0], u[2], qty[u[0]]) for u in units
+            if u[2] is not None and u[0] in qty and qty[u[0]] != u[2]]
+
+
+if __name__ == "__main__":
+    from build_donor_pricing import UNITS, cost_per_unit
+
+    parser = argparse.ArgumentParser(description="Derive the space programme from capacity rules")
+    parser.add_argument("--students", type=int, default=DESIGN_STUDENTS)
+    parser.add_argument("--compare", action="store_true", help="list differences from the price book")
+    args = parser.parse_args()
+
+    prog = Programme(students=args.students)
+    derived = prog.units(UNITS)
+    total = sum(cost_per_unit(net, gf) * qty for _, _, qty, net, gf, _ in derived if qty is not None)
+    v = prog.values
+    print(f"{args.students:,} students: EY {v['ey']:,} / Primary {v['pri']:,} / "
+          f"Intermediate {v['inter']:,} / Secondary {v['sec']:,}")
+    print(f"  Classrooms: {v['std_cls']} standard + {v['ey_cls']} EY  |  "
+          f"Units: {sum(prog.quantities().values())}  |  Cost: SAR {total:,}")
+    if args.compare:
+        for name, book, rule in compare_with_price_book(prog, UNITS):
+            print(f"  {name:<55} price book {book:>4}   rules {rule:>4}")